@@ -256,14 +256,16 @@ class PythonMLClient {
 
   /**
    * 학습 패턴 분석
+   *
+   * allTime이면 days 대신 전체 기간 누적 카운터로 응답 (플랜 조회 없음)
    */
   async getLearningPatterns(
     studentId: string,
-    days: number = 90
+    days: number = 90,
+    allTime: boolean = false
   ): Promise<LearningPatternResponse> {
-    return this.fetch(
-      `/api/analysis/learning-patterns/${studentId}?days=${days}`
-    );
+    const query = allTime ? "all_time=true" : `days=${days}`;
+    return this.fetch(`/api/analysis/learning-patterns/${studentId}?${query}`);
   }
 
   /**
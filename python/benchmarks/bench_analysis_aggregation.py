@@ -0,0 +1,140 @@
+"""
+학습 패턴 / 성적 트렌드 집계 벤치마크
+
+기존 방식(항목마다 groupby·value_counts·필터, 과목 groupby 두 번, 쓰지 않는 이동평균)과
+결합 키 bincount 한 번으로 집계하는 방식을 같은 데이터에서 비교하고, 결과가 같은지 확인합니다.
+플랜 날짜는 DB 응답처럼 문자열로 바꿔 파싱 비용을 포함합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_analysis_aggregation --students 25000   # 플랜 약 100만 행
+"""
+
+import argparse
+import math
+import time
+from typing import Any
+
+import pandas as pd
+
+from src.analysis import PreparedPlans, analyze_learning_patterns, analyze_score_trends
+from src.evaluation.data_sources import SyntheticDataSource
+
+
+def legacy_learning_patterns(plans_df: pd.DataFrame) -> dict[str, Any]:
+    """기존 구현 (항목별 groupby, 입력에 파생 컬럼 추가)"""
+    analysis = {}
+    plans_df["day_of_week"] = pd.to_datetime(plans_df["scheduled_date"]).dt.dayofweek
+    daily_counts = plans_df.groupby("day_of_week").size()
+    analysis["daily_distribution"] = {
+        "counts": {int(k): int(v) for k, v in daily_counts.to_dict().items()},
+        "most_active_day": int(daily_counts.idxmax()),
+        "least_active_day": int(daily_counts.idxmin()),
+    }
+
+    plans_df["hour"] = pd.to_datetime(
+        plans_df["start_time"], format="%H:%M", errors="coerce"
+    ).dt.hour
+    hourly_counts = plans_df.dropna(subset=["hour"]).groupby("hour").size()
+    analysis["hourly_distribution"] = {
+        "peak_hours": [int(h) for h in hourly_counts.nlargest(3).index.tolist()],
+        "low_hours": [int(h) for h in hourly_counts.nsmallest(3).index.tolist()],
+    }
+
+    subject_counts = plans_df["subject"].value_counts()
+    analysis["subject_distribution"] = {
+        "counts": {str(k): int(v) for k, v in subject_counts.to_dict().items()},
+        "most_studied": str(subject_counts.index[0]),
+    }
+
+    total = len(plans_df)
+    completed = len(plans_df[plans_df["status"] == "completed"])
+    analysis["completion_rate"] = {
+        "total": total,
+        "completed": completed,
+        "rate": round(completed / total * 100, 2),
+    }
+
+    avg_duration = plans_df["actual_duration"].mean()
+    analysis["average_duration"] = {"minutes": round(avg_duration, 1)}
+    return analysis
+
+
+def legacy_score_trends(scores_df: pd.DataFrame, window: int = 5) -> dict[str, Any]:
+    """기존 구현 (과목 groupby 두 번 + 전체 정렬 + 이동평균, 날짜 동률은 행 순서)"""
+    analysis = {}
+    subject_avg = scores_df.groupby("subject")["score"].agg(["mean", "std", "count"])
+    analysis["subject_averages"] = subject_avg.to_dict("index")
+
+    scores_df = scores_df.sort_values("created_at", kind="stable")
+    scores_df["score_ma"] = scores_df["score"].rolling(window=window).mean()
+    first_score = float(scores_df["score"].iloc[0])
+    last_score = float(scores_df["score"].iloc[-1])
+    analysis["overall_trend"] = {
+        "direction": "improving" if last_score > first_score else "declining",
+        "first_score": first_score,
+        "last_score": last_score,
+        "change": round(last_score - first_score, 2),
+    }
+
+    analysis["grade_distribution"] = scores_df["grade"].value_counts().sort_index().to_dict()
+    analysis["weak_subjects"] = scores_df.groupby("subject")["score"].mean().nsmallest(3).to_dict()
+    return analysis
+
+
+def same(a: Any, b: Any) -> bool:
+    """중첩 dict/list 비교 (실수는 상대 오차 1e-9, NaN끼리 같음)"""
+    if isinstance(a, dict):
+        return isinstance(b, dict) and list(a) == list(b) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(same, a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+
+def timed(label: str, fn, repeat: int) -> Any:
+    """최소 실행 시간 출력"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:>34}: {best * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=25000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = SyntheticDataSource(n_students=args.students, seed=args.seed)
+    plans_df = source.get_plans()
+    plans_df["scheduled_date"] = plans_df["scheduled_date"].dt.strftime("%Y-%m-%d")
+    scores_df = source.get_scores()
+    print(f"플랜 {len(plans_df):,}행, 성적 {len(scores_df):,}행")
+
+    print("학습 패턴")
+    legacy = timed(
+        "기존 (groupby × 5)", lambda: legacy_learning_patterns(plans_df.copy()), args.repeat
+    )
+    prepared = timed("PreparedPlans 생성", lambda: PreparedPlans(plans_df), args.repeat)
+    timed("PreparedPlans 생성 + 코드", lambda: PreparedPlans(plans_df).codes, args.repeat)
+    prepared.codes
+    fused = timed(
+        "결합 bincount (준비된 플랜)", lambda: analyze_learning_patterns(prepared), args.repeat
+    )
+    timed("결합 bincount (DataFrame 입력)", lambda: analyze_learning_patterns(plans_df), args.repeat)
+    print(f"{'결과 일치':>34}: {same(legacy, fused)}")
+
+    print("성적 트렌드")
+    legacy = timed("기존 (groupby × 2 + 정렬)", lambda: legacy_score_trends(scores_df), args.repeat)
+    fused = timed("과목 bincount", lambda: analyze_score_trends(scores_df), args.repeat)
+    print(f"{'결과 일치':>34}: {same(legacy, fused)}")
+
+
+if __name__ == "__main__":
+    main()
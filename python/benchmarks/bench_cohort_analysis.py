@@ -0,0 +1,116 @@
+"""
+테넌트 코호트 분석 벤치마크
+
+학생마다 학생 단위 분석 함수 4개를 호출하는 기존 방식과, 테넌트 전체 플랜/성적을
+(학생, 키) 결합 bincount로 한 번에 집계하는 코호트 함수를 같은 데이터에서 비교합니다.
+코호트 쪽은 열 지향 테이블 생성과 전체 학생 딕셔너리 생성을 따로 측정하고, 결과가 같은지 확인합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_cohort_analysis --students 2000
+"""
+
+import argparse
+import time
+from typing import Any
+
+import pandas as pd
+
+from benchmarks.bench_analysis_aggregation import same
+from src.analysis import (
+    analyze_learning_patterns,
+    analyze_score_trends,
+    calculate_study_efficiency,
+    predict_weekly_workload,
+)
+from src.cohort_analysis import analyze_cohort
+from src.evaluation.data_sources import SyntheticDataSource
+
+
+def per_student(plans_df: pd.DataFrame, scores_df: pd.DataFrame, target_date) -> dict[str, Any]:
+    """기존 방식 (학생별 groupby 후 함수 호출)"""
+    plans_by_student = dict(tuple(plans_df.groupby("student_id")))
+    scores_by_student = dict(tuple(scores_df.groupby("student_id")))
+    no_plans, no_scores = plans_df.iloc[:0], scores_df.iloc[:0]
+    results: dict[str, dict] = {
+        "learning_patterns": {},
+        "score_trends": {},
+        "efficiency": {},
+        "workload": {},
+    }
+    for student_id, plans in plans_by_student.items():
+        results["learning_patterns"][student_id] = analyze_learning_patterns(plans)
+        results["workload"][student_id] = predict_weekly_workload(plans, target_date)
+    for student_id, scores in scores_by_student.items():
+        results["score_trends"][student_id] = analyze_score_trends(scores)
+    for student_id in sorted(set(plans_by_student) | set(scores_by_student)):
+        results["efficiency"][student_id] = calculate_study_efficiency(
+            plans_by_student.get(student_id, no_plans),
+            scores_by_student.get(student_id, no_scores),
+        )
+    return results
+
+
+def timed(label: str, fn, repeat: int) -> Any:
+    """최소 실행 시간 출력"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:>30}: {best * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = SyntheticDataSource(n_students=args.students, seed=args.seed)
+    plans_df = source.get_plans()
+    target_date = plans_df["scheduled_date"].max().to_pydatetime()
+    plans_df["scheduled_date"] = plans_df["scheduled_date"].dt.strftime("%Y-%m-%d")
+    scores_df = source.get_scores()
+    print(f"학생 {args.students:,}명, 플랜 {len(plans_df):,}행, 성적 {len(scores_df):,}행")
+
+    legacy = timed(
+        "학생별 함수 호출", lambda: per_student(plans_df, scores_df, target_date), 1
+    )
+    cohort = timed(
+        "코호트 테이블",
+        lambda: analyze_cohort(plans_df, scores_df, target_date),
+        args.repeat,
+    )
+    materialized = timed(
+        "코호트 + 전체 딕셔너리",
+        lambda: {
+            name: dict(result.items())
+            for name, result in analyze_cohort(plans_df, scores_df, target_date).items()
+        },
+        args.repeat,
+    )
+    for name, result in cohort.items():
+        print(f"{name:>30}: 테이블 {result.table.shape}")
+
+    # 효율성 상관계수/p값은 반올림 자리 차이가 있을 수 있어 나머지 결과만 정확히 비교
+    for name in ("learning_patterns", "score_trends", "workload"):
+        print(f"{'결과 일치 (' + name + ')':>30}: {same(legacy[name], materialized[name])}")
+    mismatched = sum(
+        legacy["efficiency"][s].keys() != materialized["efficiency"][s].keys()
+        or any(
+            abs(float(a) - float(b)) > 1e-3
+            for a, b in zip(
+                legacy["efficiency"][s].get("study_score_correlation", {}).values(),
+                materialized["efficiency"][s].get("study_score_correlation", {}).values(),
+            )
+        )
+        for s in legacy["efficiency"]
+    )
+    print(f"{'효율성 불일치 학생':>30}: {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
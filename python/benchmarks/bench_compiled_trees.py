@@ -0,0 +1,67 @@
+"""
+XGBoost 컴파일 트리 추론 벤치마크
+
+같은 모델을 XGBoost predict(DMatrix 경유)와 CompiledForest(numpy)로 평가하여
+배치 크기별 지연 시간을 비교하고, 결과가 비트 단위로 같은지 확인합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_compiled_trees --trees 50 --depth 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+from xgboost import XGBRegressor
+
+from src.ml.compiled_trees import CompiledForest
+
+
+def best_of(fn, repeat: int) -> float:
+    """반복 실행 중 최단 시간 (ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trees", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128, 1024, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    X = rng.normal(size=(2000, args.features)).astype(np.float32)
+    y = 70 + 5 * X[:, 0] + rng.normal(0, 2, size=len(X))
+    model = XGBRegressor(
+        n_estimators=args.trees,
+        max_depth=args.depth,
+        learning_rate=0.1,
+        random_state=42,
+        n_jobs=1,
+    ).fit(X, y)
+
+    start = time.perf_counter()
+    forest = CompiledForest.from_model(model)
+    print(f"컴파일: {(time.perf_counter() - start) * 1000:.2f}ms ({forest.n_nodes:,} 노드)")
+
+    print(f"{'batch':>6} {'xgboost_ms':>11} {'numpy_ms':>9} {'speedup':>8} {'exact':>6}")
+    for batch in args.batch_sizes:
+        rows = rng.normal(size=(batch, args.features)).astype(np.float32)
+        repeat = 50 if batch <= 1024 else 5
+        native = best_of(lambda: model.predict(rows), repeat)
+        compiled = best_of(lambda: forest.predict(rows), repeat)
+        exact = np.array_equal(model.predict(rows), forest.predict(rows))
+        speedup = native / compiled
+        print(f"{batch:>6} {native:>11.3f} {compiled:>9.3f} {speedup:>7.2f}x {exact!s:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+암묵적 피드백 ALS 벤치마크
+
+1) 합성 데이터에서 학생마다 콘텐츠 하나를 숨기고 학습한 뒤
+   HitRate@10을 전체 인기순 추천과 비교합니다.
+2) 카탈로그 크기별 서빙 지연 (float32 행렬-벡터 곱 + argpartition)을 측정합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_implicit_als --students 3000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.evaluation.data_sources import SyntheticDataSource
+from src.ml.implicit_als import ImplicitFactors
+
+
+def hit_rate(args: argparse.Namespace) -> None:
+    """학생별 콘텐츠 1개를 숨긴 HitRate@10"""
+    plans = SyntheticDataSource(n_students=args.students).get_plans()
+    pairs = plans[["student_id", "content_id"]].drop_duplicates()
+    held = pairs.groupby("student_id").sample(1, random_state=args.seed)
+    keep = ~plans.set_index(["student_id", "content_id"]).index.isin(
+        held.set_index(["student_id", "content_id"]).index
+    )
+    train = plans[keep]
+
+    start = time.perf_counter()
+    model = ImplicitFactors.train(train, factors=args.factors, iterations=args.iterations)
+    train_time = time.perf_counter() - start
+
+    seen = train.groupby("student_id")["content_id"].apply(set)
+    popular = train["content_id"].value_counts().index.tolist()
+    als_hits = popular_hits = 0
+    for student_id, content_id in held.itertuples(index=False):
+        als_hits += content_id in {c for c, _ in model.recommend(student_id, limit=10)}
+        top = [c for c in popular[: 10 + len(seen[student_id])] if c not in seen[student_id]]
+        popular_hits += content_id in top[:10]
+
+    print(f"플랜 {len(train):,}행, 학생 {len(held):,}명, 학습 {train_time:.1f}s")
+    print(f"  HitRate@10 ALS {als_hits / len(held):.3f} / 인기순 {popular_hits / len(held):.3f}")
+
+
+def serving(args: argparse.Namespace) -> None:
+    """카탈로그 크기별 추천 1건 지연"""
+    rng = np.random.default_rng(args.seed)
+    for n_items in (1_000, 10_000, 100_000):
+        model = ImplicitFactors(
+            [f"s{i}" for i in range(100)],
+            [f"c{i}" for i in range(n_items)],
+            rng.normal(size=(100, args.factors)),
+            rng.normal(size=(n_items, args.factors)),
+            np.arange(0, 101 * 40, 40, dtype=np.int64),
+            rng.integers(0, n_items, 100 * 40).astype(np.int32),
+        )
+        timings = []
+        for i in range(200):
+            start = time.perf_counter()
+            model.recommend(f"s{i % 100}", limit=10)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"  콘텐츠 {n_items:>7,}개: 중앙값 {np.median(timings) * 1000:.3f}ms, "
+            f"p99 {np.percentile(timings, 99) * 1000:.3f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--factors", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    hit_rate(args)
+    print("서빙 지연 (k=%d, float32)" % args.factors)
+    serving(args)
+
+
+if __name__ == "__main__":
+    main()
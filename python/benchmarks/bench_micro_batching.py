@@ -0,0 +1,99 @@
+"""
+성적 예측 마이크로 배칭 처리량 벤치마크
+
+동시에 도착한 예측 요청을 개별 predict()로 처리할 때와 MicroBatcher로 모아
+predict_many()로 처리할 때의 처리량, 배치 크기/대기 시간 히스토그램을 비교합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_micro_batching --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.metrics import MetricsRegistry
+from src.ml.batching import MicroBatcher
+from src.ml.score_predictor import ScorePredictor
+
+
+def make_requests(n: int, seed: int) -> list[tuple[pd.DataFrame, None, str, int]]:
+    """릿지 계층 길이(10-29)의 합성 예측 요청"""
+    rng = np.random.default_rng(seed)
+    requests = []
+    for _ in range(n):
+        length = int(rng.integers(10, 30))
+        frame = pd.DataFrame(
+            {
+                "subject": ["수학"] * length,
+                "score": np.round(rng.uniform(40, 95, size=length)),
+                "created_at": pd.date_range("2024-01-01", periods=length, freq="W"),
+            }
+        )
+        requests.append((frame, None, "수학", 30))
+    return requests
+
+
+async def run_unbatched(predictor: ScorePredictor, requests, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(request):
+        async with semaphore:
+            frame, plans, subject, days = request
+            predictor.predict(frame, plans, subject, days)
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in requests))
+    return time.perf_counter() - start
+
+
+async def run_batched(batcher: MicroBatcher, requests, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(request):
+        async with semaphore:
+            await batcher.submit(request)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in requests))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests, args.seed)
+    predictor = ScorePredictor()
+    metrics = MetricsRegistry()
+    batcher = MicroBatcher(
+        predictor.predict_many,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        name="score_prediction",
+        metrics=metrics,
+    )
+
+    unbatched = asyncio.run(run_unbatched(predictor, requests, args.concurrency))
+    batched = asyncio.run(run_batched(batcher, requests, args.concurrency))
+
+    print(f"개별 처리: {args.requests / unbatched:,.0f} req/s ({unbatched:.2f}s)")
+    print(f"배치 처리: {args.requests / batched:,.0f} req/s ({batched:.2f}s)")
+    print(json.dumps(metrics.snapshot()["histograms"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+MinHash-LSH 유사 학생 탐색 벤치마크
+
+반(코호트)별 커리큘럼을 공유하는 합성 테넌트에서
+정확 탐색(CSR 상호작용 행렬)과 MinHash-LSH 근사 탐색의 조회 시간과
+Recall@10 (정확 상위 10명 중 LSH 결과에 포함된 비율)을 비교합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_minhash_lsh --students 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ml.content_recommender import CollaborativeRecommender
+from src.ml.interaction_matrix import InteractionMatrix
+from src.ml.minhash_lsh import MinHashLSH
+
+
+def synthetic_plans(
+    rng: np.random.Generator,
+    n_students: int,
+    n_contents: int,
+    n_cohorts: int,
+    curriculum_size: int,
+) -> pd.DataFrame:
+    """코호트 커리큘럼의 일부(약 70%) + 개인 선택 콘텐츠 몇 개를 학습한 학생들"""
+    curricula = [rng.choice(n_contents, curriculum_size, replace=False) for _ in range(n_cohorts)]
+    cohorts = rng.integers(0, n_cohorts, n_students)
+    student_ids, content_ids = [], []
+    for student, cohort in enumerate(cohorts):
+        curriculum = curricula[cohort]
+        taken = curriculum[rng.random(curriculum_size) < 0.7]
+        extra = rng.integers(0, n_contents, rng.integers(0, 6))
+        items = np.concatenate([taken, extra])
+        student_ids.extend([f"student-{student:06d}"] * len(items))
+        content_ids.extend(f"content-{i}" for i in items)
+    return pd.DataFrame({"student_id": student_ids, "content_id": content_ids})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--contents", type=int, default=20000)
+    parser.add_argument("--cohorts", type=int, default=2000)
+    parser.add_argument("--curriculum", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    plans = synthetic_plans(rng, args.students, args.contents, args.cohorts, args.curriculum)
+    matrix = InteractionMatrix.from_plans(plans)
+    queries = matrix.student_ids[rng.choice(len(matrix.student_ids), args.queries)]
+    recommender = CollaborativeRecommender(min_common_items=3)
+    print(f"학생 {args.students:,}명, 플랜 {len(plans):,}행, 조회 {args.queries}회")
+
+    start = time.perf_counter()
+    exact = [recommender.find_similar_students(q, matrix=matrix) for q in queries]
+    exact_time = (time.perf_counter() - start) / args.queries
+    print(f"{'exact (CSR)':>16}: {exact_time * 1000:8.2f}ms/조회")
+
+    for num_perm, bands in ((64, 16), (128, 32), (128, 64)):
+        start = time.perf_counter()
+        lsh = MinHashLSH.from_matrix(matrix, num_perm=num_perm, bands=bands)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = [recommender.find_similar_students(q, lsh=lsh) for q in queries]
+        query_time = (time.perf_counter() - start) / args.queries
+        n_candidates = np.mean([len(lsh.candidates(q)) for q in queries])
+
+        hits = sum(len(set(a) & set(e)) for a, e in zip(approx, exact))
+        recall = hits / max(sum(len(e) for e in exact), 1)
+        print(
+            f"{f'lsh {num_perm}/{bands}':>16}: {query_time * 1000:8.2f}ms/조회 "
+            f"({exact_time / query_time:.1f}x), 빌드 {build_time:.1f}s, "
+            f"평균 후보 {n_candidates:,.0f}명, Recall@10 {recall:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+콘텐츠 추천 점수 커널 벤치마크
+
+기존 방식(DataFrame 복사 + 행별 apply + nlargest + iterrows)과
+범주 코드/조회 테이블 커널 + 부분 정렬 상위 N개 선택을 같은 카탈로그에서 비교하고,
+두 결과가 같은지 확인합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_recommender_kernel --items 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ml.content_recommender import ContentRecommender
+
+SUBJECTS = ["국어", "수학", "영어", "과학", "사회", "한국사"]
+CONTENT_TYPES = ["book", "lecture", "video", "quiz"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def legacy_recommend(
+    recommender: ContentRecommender,
+    scores_df: pd.DataFrame,
+    contents_df: pd.DataFrame,
+    plans_df: pd.DataFrame,
+    limit: int,
+) -> list[dict]:
+    """기존 구현 (복사 + apply + nlargest + iterrows)"""
+    weak_set = set(recommender._identify_weak_subjects(scores_df))
+    studied_ids = recommender._get_studied_content_ids(plans_df)
+    recent_types = recommender._get_studied_content_types(plans_df)
+    avg_score = scores_df["score"].mean()
+    preferred = "hard" if avg_score >= 80 else "medium" if avg_score >= 60 else "easy"
+    difficulty_map = {
+        "easy": {"easy": 30, "medium": 20, "hard": 10},
+        "medium": {"easy": 15, "medium": 30, "hard": 20},
+        "hard": {"easy": 10, "medium": 20, "hard": 30},
+    }
+
+    scored = contents_df.copy()
+    scored["is_studied"] = scored["id"].isin(studied_ids)
+    scored = scored.copy()
+    scored["relevance_score"] = (
+        scored["subject"].apply(lambda x: 40.0 if x in weak_set else 10.0)
+        + scored["difficulty"].apply(lambda x: difficulty_map[preferred].get(x, 15))
+        + scored["content_type"].apply(lambda x: 20.0 if x not in recent_types else 10.0)
+        + scored["is_studied"].apply(lambda x: 0.0 if x else 10.0)
+    )
+
+    recommendations = []
+    for _, row in scored.nlargest(limit, "relevance_score").iterrows():
+        recommendations.append(
+            {
+                "content_id": row["id"],
+                "relevance_score": round(row["relevance_score"], 2),
+                "reason": recommender._generate_reason(row, sorted(weak_set)),
+            }
+        )
+    return recommendations
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    """최솟값 기준 실행 시간"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    n = args.items
+    contents_df = pd.DataFrame(
+        {
+            "id": [f"content-{i}" for i in range(n)],
+            "title": [f"콘텐츠 {i}" for i in range(n)],
+            "subject": rng.choice(SUBJECTS, n),
+            "content_type": rng.choice(CONTENT_TYPES, n),
+            "difficulty": rng.choice(DIFFICULTIES, n),
+        }
+    )
+    scores_df = pd.DataFrame(
+        {
+            "subject": np.repeat(SUBJECTS, 4),
+            "score": rng.normal(65, 15, 4 * len(SUBJECTS)).clip(0, 100),
+        }
+    )
+    plans_df = pd.DataFrame(
+        {
+            "content_id": rng.choice(contents_df["id"].to_numpy(), 200, replace=False),
+            "content_type": rng.choice(CONTENT_TYPES[:2], 200),
+        }
+    )
+    recommender = ContentRecommender()
+    print(f"콘텐츠 {n:,}개, 상위 {args.limit}개")
+
+    legacy_time, legacy = timed(
+        lambda: legacy_recommend(recommender, scores_df, contents_df, plans_df, args.limit),
+        args.repeat,
+    )
+    kernel_time, result = timed(
+        lambda: recommender.recommend(scores_df, contents_df, plans_df, limit=args.limit),
+        args.repeat,
+    )
+
+    # 카탈로그를 범주형으로 저장해 두면 factorize도 생략
+    categorical_df = contents_df.astype(
+        {"subject": "category", "content_type": "category", "difficulty": "category"}
+    )
+    categorical_time, categorical = timed(
+        lambda: recommender.recommend(scores_df, categorical_df, plans_df, limit=args.limit),
+        args.repeat,
+    )
+
+    def key(recommendations: list[dict]) -> list[tuple]:
+        return [(r["content_id"], r["relevance_score"], r["reason"]) for r in recommendations]
+
+    identical = (
+        key(result["recommendations"]) == key(legacy)
+        and key(categorical["recommendations"]) == key(legacy)
+    )
+
+    print(f"{'legacy':>12}: {legacy_time * 1000:8.1f}ms")
+    for name, elapsed in (("kernel", kernel_time), ("categorical", categorical_time)):
+        print(f"{name:>12}: {elapsed * 1000:8.1f}ms ({legacy_time / elapsed:.1f}x)")
+    print(f"결과 동일: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+성적 예측 계층별 정확도/지연 시간 벤치마크
+
+합성 성적 이력에서 마지막 점수를 가린 뒤 각 계층(weighted_average, ridge, xgboost)으로
+예측하여 MAE와 호출당 지연 시간을 비교합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_score_tiers --students 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.ml.score_predictor import (
+    TIER_RIDGE,
+    TIER_WEIGHTED_AVERAGE,
+    TIER_XGBOOST,
+    ScorePredictor,
+)
+
+
+def make_history(rng: np.random.Generator, length: int) -> np.ndarray:
+    """추세 + AR(1) 잡음으로 구성된 합성 성적 이력"""
+    base = rng.uniform(45, 85)
+    slope = rng.normal(0, 0.6)
+    noise = np.zeros(length)
+    for i in range(1, length):
+        noise[i] = 0.6 * noise[i - 1] + rng.normal(0, 4)
+    return np.clip(base + slope * np.arange(length) + noise, 0, 100)
+
+
+def run_tier(
+    predictor: ScorePredictor,
+    tier: str,
+    histories: list[np.ndarray],
+) -> tuple[float, float]:
+    """계층별 (MAE, 평균 지연 ms)"""
+    errors = []
+    elapsed = 0.0
+    for history in histories:
+        start = time.perf_counter()
+        predicted, _, _ = predictor.predict_history(history[:-1], tier=tier)
+        elapsed += time.perf_counter() - start
+        errors.append(abs(predicted - history[-1]))
+    return float(np.mean(errors)), elapsed / len(histories) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[12, 20, 40, 80])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    predictor = ScorePredictor()
+
+    print(f"{'length':>6} {'tier':>16} {'MAE':>8} {'latency_ms':>11}")
+    for length in args.lengths:
+        histories = [make_history(rng, length + 1) for _ in range(args.students)]
+        for tier in (TIER_WEIGHTED_AVERAGE, TIER_RIDGE, TIER_XGBOOST):
+            mae, latency = run_tier(predictor, tier, histories)
+            print(f"{length:>6} {tier:>16} {mae:>8.2f} {latency:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+유사 학생 탐색 벤치마크
+
+기존 방식(학생별 set + Python 루프 Jaccard)과
+CSR 상호작용 행렬 + 희소 행렬-벡터 곱 방식을 같은 데이터에서 비교하고,
+두 결과가 같은지 확인합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_similar_students --students 5000 --contents 3000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ml.content_recommender import CollaborativeRecommender
+from src.ml.interaction_matrix import InteractionMatrix
+
+
+def legacy_find_similar(
+    student_id: str, all_plans: pd.DataFrame, min_common_items: int
+) -> list[str]:
+    """기존 구현 (groupby(...).apply(set) + 학생별 루프)"""
+    student_contents = all_plans.groupby("student_id")["content_id"].apply(set)
+    if student_id not in student_contents.index:
+        return []
+    target_contents = student_contents[student_id]
+
+    similarities = []
+    for other_id, other_contents in student_contents.items():
+        if other_id == student_id:
+            continue
+        intersection = len(target_contents & other_contents)
+        if intersection < min_common_items:
+            continue
+        union = len(target_contents | other_contents)
+        similarities.append((other_id, intersection / union if union > 0 else 0))
+
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return [s[0] for s in similarities[:10]]
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    """최솟값 기준 실행 시간"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--contents", type=int, default=3000)
+    parser.add_argument("--per-student", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    # 인기 콘텐츠 쏠림 (Zipf 유사 분포)
+    popularity = 1.0 / np.arange(1, args.contents + 1)
+    popularity /= popularity.sum()
+    n_rows = args.students * args.per_student
+    all_plans = pd.DataFrame(
+        {
+            "student_id": np.repeat(
+                [f"student-{i:05d}" for i in range(args.students)], args.per_student
+            ),
+            "content_id": [
+                f"content-{i}" for i in rng.choice(args.contents, n_rows, p=popularity)
+            ],
+        }
+    )
+    queries = [f"student-{i:05d}" for i in rng.choice(args.students, args.queries)]
+    recommender = CollaborativeRecommender(min_common_items=3)
+    print(f"학생 {args.students:,}명, 플랜 {n_rows:,}행, 조회 {args.queries}회")
+
+    legacy_time, legacy = timed(
+        lambda: [legacy_find_similar(q, all_plans, 3) for q in queries], args.repeat
+    )
+    build_time, matrix = timed(lambda: InteractionMatrix.from_plans(all_plans), args.repeat)
+    sparse_time, result = timed(
+        lambda: [recommender.find_similar_students(q, matrix=matrix) for q in queries],
+        args.repeat,
+    )
+
+    print(f"{'legacy':>14}: {legacy_time / args.queries * 1000:8.2f}ms/조회")
+    print(f"{'matrix build':>14}: {build_time * 1000:8.2f}ms (테넌트당 1회)")
+    print(
+        f"{'sparse':>14}: {sparse_time / args.queries * 1000:8.2f}ms/조회 "
+        f"({legacy_time / sparse_time:.0f}x)"
+    )
+    print(f"결과 동일: {legacy == result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+테넌트 이력 세그먼트 커널 벤치마크
+
+(학생, 과목) 단위 루프(TrendAccumulator)와 TenantHistory 세그먼트 커널로
+테넌트 전체 시리즈 통계·취약 과목·가중 평균 예측을 계산하는 시간을 비교합니다.
+
+실행:
+    cd python
+    python -m benchmarks.bench_tenant_history --students 33000   # 약 100만 행
+"""
+
+import argparse
+import time
+
+from src.evaluation.data_sources import SyntheticDataSource
+from src.ml.tenant_history import TenantHistory
+from src.ml.trend_stats import TrendAccumulator
+
+
+def loop_baseline(scores_df) -> int:
+    """학생·과목별 DataFrame 루프"""
+    ordered = scores_df.sort_values(["student_id", "subject", "created_at"])
+    n = 0
+    for _, group in ordered.groupby(["student_id", "subject"], sort=False):
+        stats = TrendAccumulator.from_scores(group["score"].to_numpy())
+        _ = (stats.mean, stats.volatility, stats.weighted_average, stats.slope, stats.r_squared)
+        n += 1
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    scores_df = SyntheticDataSource(n_students=args.students, seed=args.seed).get_scores()
+    print(f"성적 {len(scores_df):,}행")
+
+    if not args.skip_baseline:
+        start = time.perf_counter()
+        n_groups = loop_baseline(scores_df)
+        print(f"{'loop':>18}: {time.perf_counter() - start:8.3f}s ({n_groups:,} 시리즈)")
+
+    start = time.perf_counter()
+    history = TenantHistory.from_frame(scores_df)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    history.summary()
+    summary = time.perf_counter() - start
+
+    start = time.perf_counter()
+    history.subject_percentiles()
+    history.percentile_rank()
+    history.weak_subjects()
+    history.predict_simple()
+    analytics = time.perf_counter() - start
+
+    print(f"{'build':>18}: {build:8.3f}s ({history.n_groups:,} 시리즈)")
+    print(f"{'summary':>18}: {summary:8.3f}s")
+    print(f"{'cohort analytics':>18}: {analytics:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
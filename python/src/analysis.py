@@ -4,7 +4,9 @@
 학습 패턴 분석, 성적 트렌드 분석 등의 함수를 제공합니다.
 """
 
+from collections.abc import Sequence
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import Any
 
 import numpy as np
@@ -12,88 +14,262 @@ import pandas as pd
 from scipy import stats
 
 
+class PreparedPlans:
+    """
+    파생 컬럼을 한 번만 계산한 학습 플랜
+
+    scheduled_date → date(datetime64), day_of_week, year_week(ISO 연도×100 + 주),
+    start_time → hour, subject/status → 범주형으로 변환합니다.
+    과목 동률 순서는 value_counts()와 같게 범주형 입력이면 범주 순, 아니면 처음 나온 순서입니다.
+    입력 DataFrame은 수정하지 않으며, 여러 분석 함수에 같은 객체를 넘기면 파싱은 한 번뿐입니다.
+    """
+
+    def __init__(self, plans_df: pd.DataFrame):
+        """
+        Args:
+            plans_df: 학습 플랜 DataFrame (student_plan 행)
+        """
+        self.source_columns = frozenset(plans_df.columns)
+        self.categorical_subject = "subject" in plans_df.columns and isinstance(
+            plans_df["subject"].dtype, pd.CategoricalDtype
+        )
+        derived: dict[str, Any] = {}
+
+        if "scheduled_date" in plans_df.columns:
+            date = pd.to_datetime(plans_df["scheduled_date"])
+            iso = date.dt.isocalendar()
+            derived["date"] = date
+            derived["day_of_week"] = date.dt.dayofweek
+            derived["year_week"] = iso["year"] * 100 + iso["week"]
+
+        if "start_time" in plans_df.columns:
+            # 시각 종류는 적으므로 고유값만 파싱
+            codes, uniques = pd.factorize(plans_df["start_time"])
+            hours = pd.to_datetime(
+                pd.Series(uniques, dtype=object), format="%H:%M", errors="coerce"
+            ).dt.hour.to_numpy(dtype=np.float64, na_value=np.nan)
+            derived["hour"] = pd.Series(
+                np.append(hours, np.nan)[codes], index=plans_df.index
+            )
+
+        for column in ("subject", "status"):
+            if column in plans_df.columns:
+                derived[column] = plans_df[column].astype("category")
+
+        self.frame = plans_df.assign(**derived)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def has(self, column: str) -> bool:
+        """원본 플랜에 컬럼이 있었는지 여부"""
+        return column in self.source_columns
+
+    @cached_property
+    def codes(self) -> dict[str, Any]:
+        """
+        집계용 정수 코드 (결측·컬럼 없음은 -1)
+
+        Returns:
+            day(0-6), hour(0-23), subject(범주 코드), subject_tiebreak(과목 동률 순서 키),
+            completed(bool), duration(float, 결측 NaN), subjects(범주 값) 딕셔너리
+        """
+        frame = self.frame
+        n = len(frame)
+
+        def integer_codes(column: str) -> np.ndarray:
+            if column not in frame.columns:
+                return np.full(n, -1, dtype=np.int64)
+            return frame[column].fillna(-1).to_numpy(dtype=np.int64)
+
+        if self.has("subject"):
+            subject = frame["subject"].cat.codes.to_numpy(dtype=np.int64)
+            subjects = frame["subject"].cat.categories
+        else:
+            subject, subjects = np.full(n, -1, dtype=np.int64), pd.Index([])
+
+        # 행별 동률 키: 범주형은 범주 순, 아니면 행 위치 (과목별 최솟값 = 처음 나온 위치)
+        tiebreak = subject if self.categorical_subject else np.arange(n, dtype=np.int64)
+
+        if self.has("status"):
+            status = frame["status"].cat
+            completed = (
+                status.codes.to_numpy() == status.categories.get_loc("completed")
+                if "completed" in status.categories
+                else np.zeros(n, dtype=bool)
+            )
+        else:
+            completed = np.zeros(n, dtype=bool)
+
+        if self.has("actual_duration"):
+            duration = pd.to_numeric(frame["actual_duration"], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+        else:
+            duration = np.full(n, np.nan)
+
+        return {
+            "day": integer_codes("day_of_week"),
+            "hour": integer_codes("hour"),
+            "subject": subject,
+            "subject_tiebreak": tiebreak,
+            "subjects": subjects,
+            "completed": completed,
+            "duration": duration,
+        }
+
+
+def prepare_plans(plans: pd.DataFrame | PreparedPlans) -> PreparedPlans:
+    """DataFrame이면 PreparedPlans로 변환 (이미 준비된 플랜은 그대로)"""
+    return plans if isinstance(plans, PreparedPlans) else PreparedPlans(plans)
+
+
 def analyze_learning_patterns(
-    plans_df: pd.DataFrame,
+    plans_df: pd.DataFrame | PreparedPlans,
     executions_df: pd.DataFrame | None = None,
 ) -> dict[str, Any]:
     """
     학습 패턴 분석
 
     Args:
-        plans_df: 학습 플랜 DataFrame
+        plans_df: 학습 플랜 DataFrame 또는 PreparedPlans
         executions_df: 플랜 실행 기록 DataFrame (optional)
 
     Returns:
         분석 결과 딕셔너리
     """
-    if plans_df.empty:
+    plans = prepare_plans(plans_df)
+    if plans.empty:
         return {"error": "플랜 데이터가 없습니다."}
 
+    counts = _plan_counts(plans)
+    return learning_patterns_from_counts(
+        day_counts=counts["day"],
+        hour_counts=counts["hour"],
+        subjects=plans.codes["subjects"] if plans.has("subject") else None,
+        subject_counts=counts["subject"],
+        subject_rank=counts["subject_rank"],
+        total=len(plans),
+        completed=counts["completed"] if plans.has("status") else None,
+        duration_mean=counts["duration_mean"] if plans.has("actual_duration") else None,
+    )
+
+
+def learning_patterns_from_counts(
+    day_counts: np.ndarray,
+    hour_counts: np.ndarray,
+    subjects: Sequence | None,
+    subject_counts: np.ndarray,
+    total: int,
+    completed: int | None,
+    duration_mean: float | None,
+    subject_rank: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """
+    빈도 배열로 학습 패턴 결과 구성 (일괄 집계와 누적 카운터가 같은 형식을 공유)
+
+    Args:
+        day_counts: 요일(월=0)별 플랜 수 (7)
+        hour_counts: 시간별 플랜 수 (24)
+        subjects: 과목 이름 (None이면 과목 분포 생략)
+        subject_counts: subjects 순서의 플랜 수
+        total: 전체 플랜 수
+        completed: 완료 플랜 수 (None이면 완료율 생략)
+        duration_mean: 평균 학습 시간(분) (None이면 생략, NaN이면 0)
+        subject_rank: subjects 순서의 동률 순서 키 (작을수록 앞, None이면 subjects 순)
+
+    Returns:
+        analyze_learning_patterns 결과 딕셔너리
+    """
     analysis = {}
 
     # 1. 요일별 학습량 분석
-    if "scheduled_date" in plans_df.columns:
-        plans_df["day_of_week"] = pd.to_datetime(plans_df["scheduled_date"]).dt.dayofweek
-        daily_counts = plans_df.groupby("day_of_week").size()
+    active_days = np.flatnonzero(day_counts)
+    if len(active_days):
         analysis["daily_distribution"] = {
-            "counts": {int(k): int(v) for k, v in daily_counts.to_dict().items()},
-            "most_active_day": int(daily_counts.idxmax()),
-            "least_active_day": int(daily_counts.idxmin()),
+            "counts": {int(d): int(day_counts[d]) for d in active_days},
+            "most_active_day": int(active_days[np.argmax(day_counts[active_days])]),
+            "least_active_day": int(active_days[np.argmin(day_counts[active_days])]),
         }
 
-    # 2. 시간대별 분석 (start_time이 있는 경우)
-    if "start_time" in plans_df.columns:
-        plans_df["hour"] = pd.to_datetime(
-            plans_df["start_time"], format="%H:%M", errors="coerce"
-        ).dt.hour
-        hourly_counts = plans_df.dropna(subset=["hour"]).groupby("hour").size()
-        if not hourly_counts.empty:
-            analysis["hourly_distribution"] = {
-                "peak_hours": [int(h) for h in hourly_counts.nlargest(3).index.tolist()],
-                "low_hours": [int(h) for h in hourly_counts.nsmallest(3).index.tolist()],
-            }
+    # 2. 시간대별 분석 (start_time 파싱 실패 제외)
+    active_hours = np.flatnonzero(hour_counts)
+    if len(active_hours):
+        # 동률은 이른 시간 우선 (nlargest/nsmallest keep="first"와 같은 순서)
+        by_count = active_hours[np.argsort(-hour_counts[active_hours], kind="stable")]
+        by_count_asc = active_hours[np.argsort(hour_counts[active_hours], kind="stable")]
+        analysis["hourly_distribution"] = {
+            "peak_hours": [int(h) for h in by_count[:3]],
+            "low_hours": [int(h) for h in by_count_asc[:3]],
+        }
 
-    # 3. 과목별 분석
-    if "subject" in plans_df.columns:
-        subject_counts = plans_df["subject"].value_counts()
+    # 3. 과목별 분석 (빈도 내림차순, 동률은 subject_rank 순)
+    if subjects is not None:
+        if subject_rank is None:
+            order = np.argsort(-subject_counts, kind="stable")
+        else:
+            order = np.lexsort((subject_rank, -subject_counts))
+        order = order[subject_counts[order] > 0]
         analysis["subject_distribution"] = {
-            "counts": {str(k): int(v) for k, v in subject_counts.to_dict().items()},
-            "most_studied": str(subject_counts.index[0]) if len(subject_counts) > 0 else None,
+            "counts": {str(subjects[i]): int(subject_counts[i]) for i in order},
+            "most_studied": str(subjects[order[0]]) if len(order) > 0 else None,
         }
 
     # 4. 완료율 분석
-    if "status" in plans_df.columns:
-        total = len(plans_df)
-        completed = len(plans_df[plans_df["status"] == "completed"])
+    if completed is not None:
         analysis["completion_rate"] = {
-            "total": total,
-            "completed": completed,
+            "total": int(total),
+            "completed": int(completed),
             "rate": round(completed / total * 100, 2) if total > 0 else 0,
         }
 
     # 5. 평균 학습 시간
-    if "actual_duration" in plans_df.columns:
-        avg_duration = plans_df["actual_duration"].mean()
+    if duration_mean is not None:
         analysis["average_duration"] = {
-            "minutes": round(avg_duration, 1) if pd.notna(avg_duration) else 0,
+            "minutes": round(duration_mean, 1) if pd.notna(duration_mean) else 0,
         }
 
     return analysis
 
 
-def _convert_numpy_types(obj: Any) -> Any:
-    """numpy 타입을 Python 네이티브 타입으로 변환"""
-    if isinstance(obj, dict):
-        return {k: _convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_numpy_types(v) for v in obj]
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    return obj
+def _plan_counts(plans: PreparedPlans) -> dict[str, Any]:
+    """
+    (요일, 시간, 과목, 완료 여부) 결합 키 bincount 한 번으로 모든 빈도 집계
+
+    결합 배열 크기는 8 × 25 × (과목 수 + 1) × 2로 행 수와 무관하며,
+    각 분포는 결합 배열의 축 합으로 구합니다. 학습 시간 평균만 별도로 계산합니다.
+    """
+    codes = plans.codes
+    n_subjects = len(codes["subjects"]) + 1
+    shape = (8, 25, n_subjects, 2)
+    key = (
+        ((codes["day"] + 1) * shape[1] + codes["hour"] + 1) * n_subjects + codes["subject"] + 1
+    ) * 2 + codes["completed"]
+    joint = np.bincount(key, minlength=int(np.prod(shape))).reshape(shape)
+
+    # 과목별 처음 나온 위치 (value_counts() 동률 순서)
+    subject_rank = np.full(len(codes["subjects"]), len(plans), dtype=np.int64)
+    has_subject = codes["subject"] >= 0
+    np.minimum.at(
+        subject_rank, codes["subject"][has_subject], codes["subject_tiebreak"][has_subject]
+    )
+
+    duration = codes["duration"]
+    valid = ~np.isnan(duration)
+    n_valid = int(valid.sum())
+    return {
+        # 첫 칸(결측) 제외
+        "day": joint.sum(axis=(1, 2, 3))[1:],
+        "hour": joint.sum(axis=(0, 2, 3))[1:],
+        "subject": joint.sum(axis=(0, 1, 3))[1:],
+        "subject_rank": subject_rank,
+        "completed": int(joint[..., 1].sum()),
+        "duration_mean": float(duration[valid].sum() / n_valid) if n_valid else np.nan,
+    }
 
 
 def analyze_score_trends(
@@ -103,9 +279,12 @@ def analyze_score_trends(
     """
     성적 트렌드 분석
 
+    과목 코드 bincount로 과목별 평균/표준편차/개수를 한 번 집계해
+    과목 평균과 취약 과목에 함께 사용합니다.
+
     Args:
         scores_df: 성적 DataFrame
-        window: 이동평균 윈도우 크기
+        window: 이동평균 윈도우 크기 (결과에 포함되지 않아 사용하지 않음, 호환용)
 
     Returns:
         분석 결과 딕셔너리
@@ -114,47 +293,100 @@ def analyze_score_trends(
         return {"error": "성적 데이터가 없습니다."}
 
     analysis = {}
+    has_scores = "score" in scores_df.columns
+    if has_scores:
+        score = pd.to_numeric(scores_df["score"], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
 
     # 1. 과목별 평균 성적
-    if "subject" in scores_df.columns and "score" in scores_df.columns:
-        subject_avg = scores_df.groupby("subject")["score"].agg(["mean", "std", "count"])
-        analysis["subject_averages"] = _convert_numpy_types(subject_avg.to_dict("index"))
-
-    # 2. 전체 성적 추이
-    if "created_at" in scores_df.columns and "score" in scores_df.columns:
-        scores_df = scores_df.sort_values("created_at")
-        scores_df["score_ma"] = scores_df["score"].rolling(window=window).mean()
-
-        if len(scores_df) >= 2:
-            first_score = float(scores_df["score"].iloc[0])
-            last_score = float(scores_df["score"].iloc[-1])
-            trend = "improving" if last_score > first_score else "declining"
-            analysis["overall_trend"] = {
-                "direction": trend,
-                "first_score": first_score,
-                "last_score": last_score,
-                "change": round(last_score - first_score, 2),
-            }
+    if "subject" in scores_df.columns and has_scores:
+        subjects, mean, std, count = _subject_moments(scores_df["subject"], score)
+        analysis["subject_averages"] = {
+            subject: {"mean": float(m), "std": float(sd), "count": int(c)}
+            for subject, m, sd, c in zip(subjects, mean, std, count)
+        }
+
+    # 2. 전체 성적 추이 (가장 이른/늦은 성적, 날짜 없는 행은 맨 뒤)
+    if "created_at" in scores_df.columns and has_scores and len(scores_df) >= 2:
+        created = pd.to_datetime(scores_df["created_at"]).to_numpy(dtype="datetime64[ns]")
+        key = created.view(np.int64).copy()
+        key[np.isnat(created)] = np.iinfo(np.int64).max
+        first_score = float(score[np.argmin(key)])
+        last_score = float(score[len(key) - 1 - np.argmax(key[::-1])])
+        trend = "improving" if last_score > first_score else "declining"
+        analysis["overall_trend"] = {
+            "direction": trend,
+            "first_score": first_score,
+            "last_score": last_score,
+            "change": round(last_score - first_score, 2),
+        }
 
     # 3. 등급별 분포
     if "grade" in scores_df.columns:
-        grade_dist = scores_df["grade"].value_counts().sort_index()
-        analysis["grade_distribution"] = _convert_numpy_types(grade_dist.to_dict())
-
-    # 4. 취약 과목 분석 (상위 3개)
-    if "subject" in scores_df.columns and "score" in scores_df.columns:
-        weak_subjects = (
-            scores_df.groupby("subject")["score"]
-            .mean()
-            .nsmallest(3)
+        codes, grades = pd.factorize(scores_df["grade"], sort=True)
+        grade_counts = np.bincount(codes[codes >= 0], minlength=len(grades))
+        analysis["grade_distribution"] = dict(
+            zip(grades.tolist(), grade_counts.tolist())
         )
-        analysis["weak_subjects"] = _convert_numpy_types(weak_subjects.to_dict())
+
+    # 4. 취약 과목 분석 (평균 하위 3개, 동률은 과목명 순, 평균이 NaN인 과목은 맨 뒤)
+    if "subject" in scores_df.columns and has_scores:
+        weakest = np.argsort(mean, kind="stable")[:3]
+        analysis["weak_subjects"] = {subjects[i]: float(mean[i]) for i in weakest}
 
     return analysis
 
 
+def _subject_moments(
+    subjects: pd.Series,
+    values: np.ndarray,
+) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    과목별 (과목 목록, 평균, 표본 표준편차, 개수) (groupby agg(["mean", "std", "count"])와 동일)
+
+    Args:
+        subjects: 과목 컬럼
+        values: 점수 배열 (NaN은 제외)
+
+    Returns:
+        과목명 정렬 순서의 집계 배열
+    """
+    codes, uniques = pd.factorize(subjects, sort=True)
+    mean, std, count = _grouped_moments(codes, values, len(uniques))
+    return uniques.tolist(), mean, std, count
+
+
+def _grouped_moments(
+    codes: np.ndarray,
+    values: np.ndarray,
+    n: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    그룹 코드별 (평균, 표본 표준편차, 개수) (코드 -1과 NaN 값은 제외)
+
+    Args:
+        codes: 0..n-1 그룹 코드
+        values: 값 배열
+        n: 그룹 수
+
+    Returns:
+        길이 n 집계 배열
+    """
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+
+    count = np.bincount(codes, minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(codes, weights=values, minlength=n) / count
+        # 평균을 뺀 제곱합 (한 번에 제곱합을 쓰는 방식보다 수치적으로 안정)
+        squared = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=n)
+        std = np.where(count > 1, np.sqrt(squared / (count - 1)), np.nan)
+    return mean, std, count
+
+
 def calculate_study_efficiency(
-    plans_df: pd.DataFrame,
+    plans_df: pd.DataFrame | PreparedPlans,
     scores_df: pd.DataFrame,
 ) -> dict[str, Any]:
     """
@@ -163,20 +395,24 @@ def calculate_study_efficiency(
     플랜 실행과 성적 변화의 상관관계를 분석합니다.
 
     Args:
-        plans_df: 학습 플랜 DataFrame
+        plans_df: 학습 플랜 DataFrame 또는 PreparedPlans
         scores_df: 성적 DataFrame
 
     Returns:
         효율성 분석 결과
     """
-    if plans_df.empty or scores_df.empty:
+    plans = prepare_plans(plans_df)
+    if plans.empty or scores_df.empty:
         return {"error": "데이터가 부족합니다."}
 
     analysis = {}
 
     # 과목별 학습 시간 vs 성적 상관관계
-    if "subject" in plans_df.columns and "actual_duration" in plans_df.columns:
-        study_time_by_subject = plans_df.groupby("subject")["actual_duration"].sum()
+    if plans.has("subject") and plans.has("actual_duration"):
+        # subject는 범주형이므로 observed=True로 플랜이 없는 과목(0분)을 제외
+        study_time_by_subject = plans.frame.groupby("subject", observed=True)[
+            "actual_duration"
+        ].sum()
 
         if "subject" in scores_df.columns and "score" in scores_df.columns:
             avg_score_by_subject = scores_df.groupby("subject")["score"].mean()
@@ -197,8 +433,15 @@ def calculate_study_efficiency(
     return analysis
 
 
+def default_target_week() -> datetime:
+    """학습량 예측 기본 대상 주 시작일 (다음 월요일, 오늘이 월요일이면 7일 뒤)"""
+    today = datetime.now()
+    days_until_monday = (7 - today.weekday()) % 7
+    return today + timedelta(days=days_until_monday or 7)
+
+
 def predict_weekly_workload(
-    plans_df: pd.DataFrame,
+    plans_df: pd.DataFrame | PreparedPlans,
     target_date: datetime | None = None,
 ) -> dict[str, Any]:
     """
@@ -207,38 +450,37 @@ def predict_weekly_workload(
     과거 패턴을 기반으로 다음 주 학습량을 예측합니다.
 
     Args:
-        plans_df: 학습 플랜 DataFrame
+        plans_df: 학습 플랜 DataFrame 또는 PreparedPlans
         target_date: 예측 대상 주의 시작일 (기본값: 다음 월요일)
 
     Returns:
         예측 결과
     """
-    if plans_df.empty:
+    plans = prepare_plans(plans_df)
+    if plans.empty:
         return {"error": "플랜 데이터가 없습니다."}
 
     if target_date is None:
-        today = datetime.now()
-        days_until_monday = (7 - today.weekday()) % 7
-        target_date = today + timedelta(days=days_until_monday or 7)
+        target_date = default_target_week()
 
     # 최근 4주간 평균 학습량
-    if "scheduled_date" in plans_df.columns:
-        plans_df["date"] = pd.to_datetime(plans_df["scheduled_date"])
+    if plans.has("scheduled_date"):
+        frame = plans.frame
         four_weeks_ago = target_date - timedelta(weeks=4)
 
-        recent_plans = plans_df[
-            (plans_df["date"] >= four_weeks_ago) & (plans_df["date"] < target_date)
-        ]
+        recent_plans = frame[(frame["date"] >= four_weeks_ago) & (frame["date"] < target_date)]
 
         if not recent_plans.empty:
-            recent_plans["week"] = recent_plans["date"].dt.isocalendar().week
-            weekly_counts = recent_plans.groupby("week").size()
+            # 연말연초 주가 섞이지 않도록 ISO 연도까지 포함한 주 키
+            weekly_counts = recent_plans.groupby("year_week").size()
+            # 한 주뿐이면 표준편차 0
+            std = weekly_counts.std() if len(weekly_counts) > 1 else 0.0
 
             return {
                 "predicted_plans": round(weekly_counts.mean()),
-                "std": round(weekly_counts.std(), 2),
-                "min_expected": max(0, round(weekly_counts.mean() - weekly_counts.std())),
-                "max_expected": round(weekly_counts.mean() + weekly_counts.std()),
+                "std": round(std, 2),
+                "min_expected": max(0, round(weekly_counts.mean() - std)),
+                "max_expected": round(weekly_counts.mean() + std),
                 "target_week_start": target_date.strftime("%Y-%m-%d"),
             }
 
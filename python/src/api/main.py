@@ -10,6 +10,8 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from ..metrics import get_metrics
+from ..thread_budget import get_thread_budget
 from .routes import predictions, recommendations, analysis
 
 
@@ -18,6 +20,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """애플리케이션 라이프사이클 관리"""
     # 시작 시 ML 모델 로드 등
     print("ML 서비스 시작...")
+
+    # 워커당 CPU 스레드 예산 적용 (XGBoost/BLAS 과다 구독 방지)
+    budget = get_thread_budget()
+    budget.apply()
+    metrics = get_metrics()
+    for name, value in budget.as_dict().items():
+        metrics.set_gauge(f"thread_budget.{name}", value)
+    print(f"스레드 예산: {budget.as_dict()}")
     yield
     # 종료 시 정리
     print("ML 서비스 종료...")
@@ -69,3 +79,12 @@ async def health_check():
             "ml_models": "loaded",
         },
     }
+
+
+@app.get("/metrics")
+async def metrics_snapshot():
+    """서비스 메트릭 (스레드 예산, 카운터, 히스토그램)"""
+    return {
+        "thread_budget": get_thread_budget().as_dict(),
+        **get_metrics().snapshot(),
+    }
@@ -4,17 +4,22 @@
 학습 패턴 분석, 성적 트렌드 분석 등의 엔드포인트를 제공합니다.
 """
 
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+import pandas as pd
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from pydantic import BaseModel, Field, model_validator
 
 from ...db_connector import get_connector
 from ...analysis import (
+    PreparedPlans,
     analyze_learning_patterns,
     analyze_score_trends,
     calculate_study_efficiency,
 )
+from ...config import ML_CONFIG
+from ...ml.feature_store import get_feature_store
+from ...ml.pattern_counters import get_pattern_counters, pattern_counters_path
 
 router = APIRouter()
 
@@ -35,6 +40,40 @@ class LearningPatternResponse(BaseModel):
     average_duration: dict[str, Any] | None = None
 
 
+class PlanEvent(BaseModel):
+    """플랜 생성/완료 이벤트"""
+
+    student_id: str
+    event: Literal["created", "completed"]
+    scheduled_date: str | None = None
+    start_time: str | None = None  # HH:MM
+    subject: str | None = None
+    content_id: str | None = None
+    content_type: str | None = None
+    status: str | None = None
+    previous_status: str | None = None  # 완료 이벤트 직전 상태 (completed면 중복으로 무시)
+    actual_duration: float | None = None
+
+    @model_validator(mode="after")
+    def _completed_needs_previous_status(self) -> "PlanEvent":
+        if self.event == "completed" and self.previous_status is None:
+            raise ValueError("completed 이벤트에는 previous_status가 필요합니다.")
+        return self
+
+
+class PlanEventsRequest(BaseModel):
+    """플랜 이벤트 일괄 반영 요청"""
+
+    events: list[PlanEvent] = Field(..., min_length=1, max_length=1000)
+
+
+class PlanEventsResponse(BaseModel):
+    """플랜 이벤트 반영 응답"""
+
+    applied: int
+    skipped: int = 0  # 초기화 전 학생 또는 이미 완료된 플랜의 이벤트
+
+
 class ScoreTrendResponse(BaseModel):
     """성적 트렌드 분석 응답"""
 
@@ -72,7 +111,11 @@ class ComprehensiveReportResponse(BaseModel):
 @router.get("/learning-patterns/{student_id}", response_model=LearningPatternResponse)
 async def get_learning_patterns(
     student_id: str,
+    background_tasks: BackgroundTasks,
     days: int = Query(default=90, ge=7, le=365, description="분석 기간 (일)"),
+    all_time: bool = Query(
+        default=False, description="전체 기간 누적 카운터로 응답 (days 무시, 플랜 조회 없음)"
+    ),
 ) -> LearningPatternResponse:
     """
     학생의 학습 패턴을 분석합니다.
@@ -80,30 +123,30 @@ async def get_learning_patterns(
     - 요일별/시간대별 학습량 분포
     - 과목별 학습 시간
     - 완료율 및 평균 학습 시간
+    - all_time=true면 전체 기간 누적 카운터로 응답 (처음 조회하는 학생은 플랜으로 초기화)
     """
     try:
         db = get_connector()
 
-        # 기간 계산
-        from datetime import datetime, timedelta
-
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-
-        # 플랜 데이터 조회
-        plans_df = db.get_student_plans(student_id, start_date=start_date)
+        if all_time:
+            counters = get_pattern_counters()
+            if student_id not in counters:
+                counters.reconcile(_all_student_plans(db, student_id), [student_id])
+            elif counters.is_stale(
+                student_id, ML_CONFIG["learning_patterns"]["reconcile_interval_seconds"]
+            ):
+                background_tasks.add_task(_reconcile_pattern_counters, student_id)
+            background_tasks.add_task(_sync_pattern_counters)
+            analysis = counters.patterns(student_id) or {}
+        else:
+            # 기간 계산
+            from datetime import datetime, timedelta
 
-        if plans_df.empty:
-            return LearningPatternResponse(
-                student_id=student_id,
-                daily_distribution=None,
-                hourly_distribution=None,
-                subject_distribution=None,
-                completion_rate=None,
-                average_duration=None,
-            )
+            start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-        # 분석 실행
-        analysis = analyze_learning_patterns(plans_df)
+            # 플랜 데이터 조회
+            plans_df = db.get_student_plans(student_id, start_date=start_date)
+            analysis = analyze_learning_patterns(plans_df) if not plans_df.empty else {}
 
         return LearningPatternResponse(
             student_id=student_id,
@@ -118,6 +161,54 @@ async def get_learning_patterns(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/plan-events", response_model=PlanEventsResponse)
+async def record_plan_events(
+    request: PlanEventsRequest,
+    background_tasks: BackgroundTasks,
+) -> PlanEventsResponse:
+    """
+    플랜 생성/완료 이벤트를 학습 패턴 카운터와 학생 특성 기록에 반영합니다.
+
+    - 이벤트당 O(1) 갱신 (플랜 조회 없음)
+    - 카운터를 아직 플랜으로 초기화하지 않은 학생의 이벤트는 건너뜀 (첫 조회 때 플랜으로 셈)
+    - 특성 기록이 없는 학생도 건너뜀 (예측/추천에서 처음 조회할 때 플랜으로 만듦)
+    - 완료 이벤트는 previous_status가 completed가 아닐 때만 반영
+    - 누락 이벤트는 주기적 대사에서 보정
+    """
+    counters = get_pattern_counters()
+    feature_store = get_feature_store()
+    applied = 0
+    for event in request.events:
+        if event.event == "created":
+            applied += counters.record_created(
+                event.student_id,
+                scheduled_date=event.scheduled_date,
+                start_time=event.start_time,
+                subject=event.subject,
+                completed=event.status == "completed",
+                actual_duration=event.actual_duration,
+            )
+            feature_store.record_plan(
+                event.student_id,
+                subject=event.subject,
+                content_id=event.content_id,
+                content_type=event.content_type,
+                actual_duration=event.actual_duration,
+                completed=event.status == "completed",
+            )
+        else:
+            assert event.previous_status is not None  # 스키마에서 검증
+            applied += counters.record_completed(
+                event.student_id, event.previous_status, actual_duration=event.actual_duration
+            )
+            if event.previous_status != "completed":
+                feature_store.mark_plan_completed(
+                    event.student_id, subject=event.subject, actual_duration=event.actual_duration
+                )
+    background_tasks.add_task(_sync_pattern_counters)
+    return PlanEventsResponse(applied=applied, skipped=len(request.events) - applied)
+
+
 @router.get("/score-trends/{student_id}", response_model=ScoreTrendResponse)
 async def get_score_trends(
     student_id: str,
@@ -206,10 +297,11 @@ async def get_comprehensive_report(student_id: str) -> ComprehensiveReportRespon
         plans_df = db.get_student_plans(student_id)
         scores_df = db.get_student_scores(student_id)
 
-        # 각 분석 실행
-        learning_patterns = analyze_learning_patterns(plans_df)
+        # 각 분석 실행 (플랜 날짜/시간 파싱은 한 번만)
+        plans = PreparedPlans(plans_df)
+        learning_patterns = analyze_learning_patterns(plans)
         score_trends = analyze_score_trends(scores_df)
-        efficiency = calculate_study_efficiency(plans_df, scores_df)
+        efficiency = calculate_study_efficiency(plans, scores_df)
 
         # 인사이트 생성
         insights = _generate_insights(learning_patterns, score_trends, efficiency)
@@ -302,6 +394,25 @@ async def compare_with_peers(
 # ============================================
 
 
+def _reconcile_pattern_counters(student_id: str) -> None:
+    """학생 전체 플랜으로 학습 패턴 카운터 대사 (백그라운드)"""
+    plans_df = _all_student_plans(get_connector(), student_id)
+    get_pattern_counters().reconcile(plans_df, [student_id])
+
+
+def _all_student_plans(db: Any, student_id: str) -> pd.DataFrame:
+    """학생 전체 플랜 (카운터 대사용으로 student_id 컬럼 보장)"""
+    plans_df = db.get_student_plans(student_id)
+    return plans_df.assign(student_id=student_id) if not plans_df.empty else plans_df
+
+
+def _sync_pattern_counters() -> None:
+    """학습 패턴 카운터를 공유 파일과 병합 (sync_interval_seconds마다 최대 한 번, 백그라운드)"""
+    get_pattern_counters().sync_if_due(
+        pattern_counters_path(), ML_CONFIG["learning_patterns"]["sync_interval_seconds"]
+    )
+
+
 def _generate_efficiency_recommendations(efficiency: dict[str, Any]) -> list[str]:
     """효율성 기반 추천사항 생성"""
     recommendations = []
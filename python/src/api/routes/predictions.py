@@ -4,17 +4,68 @@
 성적 예측, 학습량 예측 등의 엔드포인트를 제공합니다.
 """
 
+import asyncio
+from functools import lru_cache, partial
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
 from pydantic import BaseModel, Field
 
+from ...config import ML_CONFIG
 from ...db_connector import get_connector
+from ...deadline import (
+    LATENCY_BUDGET_HEADER,
+    TIER_CACHED,
+    Deadline,
+    ResultCache,
+    record_served_tier,
+)
+from ...ml.batching import MicroBatcher
+from ...ml.cohort_priors import get_cohort_priors
+from ...ml.feature_store import get_feature_store
 from ...ml.score_predictor import ScorePredictor
+from ...ml.trend_stats import get_trend_stats, trend_stats_path
+from ...thread_budget import get_model_executor
 
 router = APIRouter()
 
 
+@lru_cache()
+def get_score_predictor() -> ScorePredictor:
+    """
+    성적 예측기 (프로세스당 1개)
+
+    학생 테넌트의 코호트 사전 분포 파일이 있으면 성적 3개 미만 학생도 예측합니다.
+    """
+    return ScorePredictor(tenant_priors=get_cohort_priors)
+
+
+@lru_cache()
+def get_score_batcher() -> MicroBatcher:
+    """
+    성적 예측 마이크로 배처 (프로세스당 1개)
+
+    동시에 도착한 가중 평균/릿지/콜드 스타트 요청을 모아
+    ScorePredictor.predict_many_from_features로 일괄 처리합니다.
+    배치는 모델 전용 실행기에서 실행합니다.
+    """
+    batching = ML_CONFIG["score_prediction"]["batching"]
+    return MicroBatcher(
+        get_score_predictor().predict_many_from_features,
+        max_batch_size=batching["max_batch_size"],
+        max_wait_ms=batching["max_wait_ms"],
+        name="score_prediction",
+        executor=get_model_executor(),
+    )
+
+
+@lru_cache()
+def get_score_cache() -> ResultCache:
+    """예산 소진 시 돌려줄 최근 성적 예측 결과 (프로세스당 1개)"""
+    deadline = ML_CONFIG["score_prediction"]["deadline"]
+    return ResultCache(deadline["cache_size"], deadline["cache_ttl_seconds"])
+
+
 # ============================================
 # 요청/응답 스키마
 # ============================================
@@ -38,6 +89,30 @@ class ScorePredictionResponse(BaseModel):
     confidence: float
     trend: str  # "improving", "stable", "declining"
     factors: dict[str, Any]
+    model_tier: str | None = None  # "weighted_average", "ridge", "xgboost", "cohort_prior"
+    served_tier: str | None = None  # model_tier 또는 "cached"
+    degraded: bool = False  # 지연 예산 때문에 더 저렴한 계층으로 응답했는지 여부
+
+
+class ScoreEvent(BaseModel):
+    """성적 기록 이벤트"""
+
+    student_id: str
+    subject: str
+    score: float
+
+
+class ScoreEventsRequest(BaseModel):
+    """성적 이벤트 일괄 반영 요청"""
+
+    events: list[ScoreEvent] = Field(..., min_length=1, max_length=1000)
+
+
+class ScoreEventsResponse(BaseModel):
+    """성적 이벤트 반영 응답"""
+
+    applied: int
+    skipped: int = 0  # 누적기를 아직 초기화하지 않은 (학생, 과목)의 이벤트
 
 
 class WorkloadPredictionRequest(BaseModel):
@@ -62,45 +137,107 @@ class WorkloadPredictionResponse(BaseModel):
 
 
 @router.post("/score", response_model=ScorePredictionResponse)
-async def predict_score(request: ScorePredictionRequest) -> ScorePredictionResponse:
+async def predict_score(
+    request: ScorePredictionRequest,
+    background_tasks: BackgroundTasks,
+    latency_budget_ms: float | None = Header(default=None, alias=LATENCY_BUDGET_HEADER),
+) -> ScorePredictionResponse:
     """
     학생의 특정 과목 성적을 예측합니다.
 
     - 과거 성적 데이터 기반
     - 학습 패턴 분석 반영
     - 신뢰도와 함께 반환
+    - 성적 3개 미만이면 코호트 사전 분포로 예측 (사전 분포 파일이 있는 경우)
+    - 학생 특성 기록(성적, 특성 행렬, 트렌드 누적기, 학습량)을 한 번 조회해 예측
+      (처음 조회하거나 기록이 오래됐을 때만 성적/플랜 조회, 이후 성적 이벤트로 갱신)
+    - X-Latency-Budget-Ms 예산이 부족하면 캐시/가중 평균 계층으로 응답
     """
+    deadline = Deadline.from_budget(
+        latency_budget_ms, ML_CONFIG["score_prediction"]["deadline"]["default_budget_ms"]
+    )
+
     try:
         db = get_connector()
-        predictor = ScorePredictor()
-
-        # 학생 성적 데이터 조회
-        scores_df = db.get_student_scores(request.student_id)
-        plans_df = db.get_student_plans(request.student_id)
 
-        if scores_df.empty:
-            raise HTTPException(
-                status_code=404,
-                detail="학생의 성적 데이터가 없습니다.",
-            )
-
-        # 해당 과목 데이터 필터링
-        subject_scores = scores_df[scores_df["subject"] == request.subject]
-
-        if subject_scores.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"{request.subject} 과목의 성적 데이터가 없습니다.",
-            )
-
-        # 예측 실행
-        prediction = predictor.predict(
-            scores_df=scores_df,
-            plans_df=plans_df,
-            subject=request.subject,
-            days_ahead=request.days_ahead,
+        # 학생 특성 기록 조회 (없거나 오래됐으면 성적/플랜으로 생성)
+        student_features = get_feature_store().get_or_load(
+            request.student_id,
+            lambda: (
+                db.get_student_scores(request.student_id),
+                db.get_student_plans(request.student_id),
+            ),
+        )
+        subject_features = student_features.subject(request.subject)
+        subject_count = subject_features.count if subject_features is not None else 0
+        # 기록이 갱신되면 예산 소진 시에도 이전 결과를 돌려주지 않음
+        cache_key = (
+            request.student_id,
+            request.subject,
+            request.days_ahead,
+            student_features.version,
         )
 
+        # 콜드 스타트: 프로필(테넌트)을 조회해 테넌트 사전 분포가 있을 때만 사용 (추가 왕복 1회)
+        student_profile = None
+        if subject_count < 3:
+            student_profile = db.get_student_profile(request.student_id)
+            if student_profile is not None and (
+                get_score_predictor().priors_for(student_profile) is None
+            ):
+                student_profile = None
+
+        if student_profile is None:
+            if student_features.score_count == 0:
+                raise HTTPException(
+                    status_code=404,
+                    detail="학생의 성적 데이터가 없습니다.",
+                )
+            if subject_count == 0:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"{request.subject} 과목의 성적 데이터가 없습니다.",
+                )
+
+        # 조회만으로 예산을 소진했으면 최근 결과로 응답
+        cached = get_score_cache().get(cache_key) if deadline.expired else None
+        if cached is not None:
+            prediction, served_tier, degraded = cached, TIER_CACHED, True
+        else:
+            predictor = get_score_predictor()
+            if predictor.batchable(subject_count, deadline):
+                # 벡터화 가능한 계층은 동시 요청과 함께 배치 처리
+                prediction = await get_score_batcher().submit(
+                    (
+                        student_features,
+                        request.subject,
+                        request.days_ahead,
+                        student_profile,
+                        deadline,
+                    )
+                )
+            else:
+                # XGBoost 계층은 요청별 학습이므로 모델 전용 실행기에서 단건 처리
+                # (요청 스레드 풀에서 학습하면 동시 요청 수만큼 스레드 예산을 초과)
+                prediction = await asyncio.get_running_loop().run_in_executor(
+                    get_model_executor(),
+                    partial(
+                        predictor.predict_from_features,
+                        student_features,
+                        request.subject,
+                        request.days_ahead,
+                        student_profile=student_profile,
+                        deadline=deadline,
+                    ),
+                )
+            served_tier = prediction.get("model_tier")
+            degraded = prediction.get("degraded", False)
+            if served_tier is not None and not degraded:
+                get_score_cache().put(cache_key, prediction)
+
+        record_served_tier("predictions.score", str(served_tier), degraded)
+        background_tasks.add_task(_sync_trend_stats)
+
         return ScorePredictionResponse(
             student_id=request.student_id,
             subject=request.subject,
@@ -109,6 +246,9 @@ async def predict_score(request: ScorePredictionRequest) -> ScorePredictionRespo
             confidence=prediction["confidence"],
             trend=prediction["trend"],
             factors=prediction["factors"],
+            model_tier=prediction.get("model_tier"),
+            served_tier=served_tier,
+            degraded=degraded,
         )
 
     except HTTPException:
@@ -117,6 +257,29 @@ async def predict_score(request: ScorePredictionRequest) -> ScorePredictionRespo
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/score-events", response_model=ScoreEventsResponse)
+async def record_score_events(
+    request: ScoreEventsRequest,
+    background_tasks: BackgroundTasks,
+) -> ScoreEventsResponse:
+    """
+    성적 기록 이벤트를 트렌드 누적기와 학생 특성 기록에 반영합니다.
+
+    - 이벤트당 O(1) 갱신 (성적 조회 없음)
+    - 누적기를 아직 초기화하지 않은 (학생, 과목)의 이벤트는 건너뜀 (첫 예측 때 성적으로 초기화)
+    - 이벤트는 기록 순서대로 보내야 함 (누락·순서 어긋남은 기록을 다시 만들 때 최근 성적과
+      비교해 보정)
+    """
+    trend_stats = get_trend_stats()
+    feature_store = get_feature_store()
+    applied = 0
+    for event in request.events:
+        applied += trend_stats.update(event.student_id, event.subject, event.score)
+        feature_store.record_score(event.student_id, event.subject, event.score)
+    background_tasks.add_task(_sync_trend_stats)
+    return ScoreEventsResponse(applied=applied, skipped=len(request.events) - applied)
+
+
 @router.post("/workload", response_model=WorkloadPredictionResponse)
 async def predict_workload(
     request: WorkloadPredictionRequest,
@@ -194,3 +357,11 @@ async def get_predictable_subjects(student_id: str) -> dict[str, Any]:
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sync_trend_stats() -> None:
+    """트렌드 누적기를 공유 파일과 병합 (sync_interval_seconds마다 최대 한 번, 백그라운드)"""
+    get_trend_stats().sync_if_due(
+        trend_stats_path(),
+        ML_CONFIG["score_prediction"]["trend_stats"]["sync_interval_seconds"],
+    )
@@ -4,17 +4,92 @@
 콘텐츠 추천, 학습 플랜 추천 등의 엔드포인트를 제공합니다.
 """
 
+from collections.abc import Iterator
+from functools import lru_cache
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+import pandas as pd
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from ...db_connector import get_connector
-from ...ml.content_recommender import ContentRecommender
+from ...config import ML_CONFIG
+from ...db_connector import PAGE_SIZE, get_connector
+from ...deadline import (
+    LATENCY_BUDGET_HEADER,
+    TIER_CACHED,
+    Deadline,
+    ResultCache,
+    record_served_tier,
+)
+from ...ml.bandit_reranker import (
+    BanditReranker,
+    FeedbackTokenError,
+    FeedbackTokenReused,
+    bandit_state_path,
+    feedback_token_secret,
+)
+from ...ml.catalog_index import CatalogIndex, CatalogRegistry, StudentOverlay
+from ...ml.content_recommender import TIER_FULL, ContentRecommender
+from ...ml.cooccurrence import CooccurrenceRegistry
+from ...ml.feature_store import StudentFeatures, get_feature_store
+from ...ml.hybrid_recommender import CollaborativeModel, HybridRecommender
+from ...ml.implicit_als import get_implicit_factors
 
 router = APIRouter()
 
 
+@lru_cache()
+def get_recommendation_cache() -> ResultCache:
+    """예산 소진 시 돌려줄 최근 추천 결과 (프로세스당 1개)"""
+    deadline = ML_CONFIG["content_recommendation"]["deadline"]
+    return ResultCache(deadline["cache_size"], deadline["cache_ttl_seconds"])
+
+
+@lru_cache()
+def get_catalog_registry() -> CatalogRegistry:
+    """테넌트별 카탈로그 인덱스 (프로세스당 1개)"""
+    catalog = ML_CONFIG["content_recommendation"]["catalog"]
+    return CatalogRegistry(
+        lambda tenant_id, since: get_connector().get_tenant_catalog(tenant_id, since),
+        refresh_interval_seconds=catalog["refresh_interval_seconds"],
+        full_refresh_seconds=catalog["full_refresh_seconds"],
+    )
+
+
+@lru_cache()
+def get_cooccurrence_registry() -> CooccurrenceRegistry:
+    """테넌트별 콘텐츠 동시 학습 모델 (프로세스당 1개)"""
+    hybrid = ML_CONFIG["content_recommendation"]["hybrid"]
+    return CooccurrenceRegistry(
+        lambda tenant_id, after: get_connector().get_tenant_plan_contents_page(tenant_id, after),
+        refresh_interval_seconds=hybrid["refresh_interval_seconds"],
+        full_refresh_seconds=hybrid["full_refresh_seconds"],
+        page_size=PAGE_SIZE,
+    )
+
+
+@lru_cache()
+def get_hybrid_recommender() -> HybridRecommender:
+    """혼합 추천기 (협업 점수 → 카탈로그 위치 매핑 캐시 공유)"""
+    return HybridRecommender()
+
+
+@lru_cache()
+def get_bandit_reranker() -> BanditReranker:
+    """완료 피드백으로 학습하는 재정렬기 (프로세스당 1개, 사후분포는 SQLite 파일로 워커 간 공유)"""
+    bandit = ML_CONFIG["content_recommendation"]["bandit"]
+    return BanditReranker(
+        weight=bandit["weight"],
+        prior_alpha=bandit["prior_alpha"],
+        prior_beta=bandit["prior_beta"],
+        state_path=bandit_state_path(),
+        secret=feedback_token_secret(),
+        token_ttl_seconds=bandit["token_ttl_seconds"],
+    )
+
+
 # ============================================
 # 요청/응답 스키마
 # ============================================
@@ -24,6 +99,9 @@ class ContentRecommendationRequest(BaseModel):
     """콘텐츠 추천 요청"""
 
     student_id: str = Field(..., description="학생 ID")
+    tenant_id: str | None = Field(
+        default=None, description="테넌트 ID (있으면 테넌트 전체 카탈로그에서 추천)"
+    )
     subject: str | None = Field(default=None, description="특정 과목 (선택)")
     limit: int = Field(default=5, ge=1, le=20, description="추천 개수")
     include_reasons: bool = Field(default=True, description="추천 이유 포함")
@@ -39,6 +117,7 @@ class RecommendedContent(BaseModel):
     difficulty: str | None
     relevance_score: float
     reason: str | None = None
+    feedback_token: str | None = None  # 완료 피드백(/feedback) 전송용
 
 
 class ContentRecommendationResponse(BaseModel):
@@ -48,6 +127,54 @@ class ContentRecommendationResponse(BaseModel):
     recommendations: list[RecommendedContent]
     weak_subjects: list[str]
     strategy: str
+    served_tier: str = TIER_FULL  # "full", "no_reasons", "cached"
+    degraded: bool = False  # 지연 예산 때문에 더 저렴한 계층으로 응답했는지 여부
+
+
+class BatchContentRecommendationRequest(BaseModel):
+    """반(여러 학생) 콘텐츠 일괄 추천 요청"""
+
+    tenant_id: str = Field(..., description="테넌트 ID (테넌트 카탈로그에서 추천)")
+    student_ids: list[str] = Field(..., min_length=1, max_length=500, description="학생 ID 목록")
+    subject: str | None = Field(default=None, description="특정 과목 (선택)")
+    limit: int = Field(default=5, ge=1, le=20, description="학생당 추천 개수")
+    include_reasons: bool = Field(default=True, description="추천 이유 포함")
+
+
+class HybridRecommendationRequest(BaseModel):
+    """혼합(규칙 기반 + 협업) 콘텐츠 추천 요청"""
+
+    student_id: str = Field(..., description="학생 ID")
+    tenant_id: str = Field(..., description="테넌트 ID (테넌트 카탈로그와 협업 모델 사용)")
+    subject: str | None = Field(default=None, description="특정 과목 (선택)")
+    limit: int = Field(default=5, ge=1, le=20, description="추천 개수")
+    include_reasons: bool = Field(default=True, description="추천 이유 포함")
+    collaborative_weight: float | None = Field(
+        default=None, ge=0.0, le=1.0, description="협업 점수 비중 (없으면 설정값)"
+    )
+
+
+class HybridRecommendationResponse(ContentRecommendationResponse):
+    """혼합 콘텐츠 추천 응답"""
+
+    collaborative_source: str | None = None  # "cooccurrence", "factors" 또는 협업 신호 없음
+    collaborative_weight: float = 0.0  # 실제 적용된 협업 점수 비중
+
+
+class RecommendationFeedbackRequest(BaseModel):
+    """추천 콘텐츠 완료 피드백"""
+
+    student_id: str = Field(..., description="학생 ID")
+    content_id: str = Field(..., description="추천받은 콘텐츠 ID")
+    feedback_token: str = Field(..., description="추천 응답의 feedback_token")
+    completed: bool = Field(..., description="플랜 완료 여부")
+
+
+class RecommendationFeedbackResponse(BaseModel):
+    """피드백 반영 결과"""
+
+    feedback_token: str
+    completion_rate: float  # 갱신 후 사후 평균 완료율
 
 
 class StudyPlanRecommendationRequest(BaseModel):
@@ -86,6 +213,7 @@ class StudyPlanRecommendationResponse(BaseModel):
 @router.post("/content", response_model=ContentRecommendationResponse)
 async def recommend_content(
     request: ContentRecommendationRequest,
+    latency_budget_ms: float | None = Header(default=None, alias=LATENCY_BUDGET_HEADER),
 ) -> ContentRecommendationResponse:
     """
     학생에게 적합한 학습 콘텐츠를 추천합니다.
@@ -93,43 +221,82 @@ async def recommend_content(
     - 취약 과목 우선 추천
     - 학습 이력 기반 난이도 조절
     - 콘텐츠 유형 다양화
+    - tenant_id가 있으면 테넌트 카탈로그 전체, 없으면 학생 보유 콘텐츠
+      (연결 행 + 공유 카탈로그 조인)에서 추천
+    - 성적/플랜 집계는 성적 예측과 같은 학생 특성 기록을 한 번 조회해 사용
+    - X-Latency-Budget-Ms 예산이 부족하면 캐시 또는 추천 이유 생략으로 응답
     """
+    deadline = Deadline.from_budget(
+        latency_budget_ms,
+        ML_CONFIG["content_recommendation"]["deadline"]["default_budget_ms"],
+    )
+
     try:
         db = get_connector()
         recommender = ContentRecommender()
 
-        # 데이터 조회
-        scores_df = db.get_student_scores(request.student_id)
-        contents_df = db.get_student_contents(request.student_id)
-        plans_df = db.get_student_plans(request.student_id)
-
-        if contents_df.empty:
+        # 학생 특성 기록 조회 (없거나 오래됐으면 성적/플랜으로 생성)
+        student_features = get_feature_store().get_or_load(
+            request.student_id,
+            lambda: (
+                db.get_student_scores(request.student_id),
+                db.get_student_plans(request.student_id),
+            ),
+        )
+        cache_key = (
+            request.student_id,
+            request.tenant_id,
+            request.subject,
+            request.limit,
+            request.include_reasons,
+            student_features.version,
+        )
+        if request.tenant_id:
+            catalog, overlay = get_catalog_registry().get(request.tenant_id), None
+            has_contents = len(catalog) > 0
+        else:
+            # 학생 보유 콘텐츠: 얇은 연결 행만 조회하고 속성은 공유 카탈로그에서 조인
+            links_df = db.get_student_content_links(request.student_id)
+            catalog = overlay = None
+            if not links_df.empty:
+                catalog, overlay = _student_catalog(links_df)
+                student_features = _with_master_content_ids(student_features, links_df)
+            has_contents = overlay is not None and len(overlay) > 0
+
+        if not has_contents:
             raise HTTPException(
                 status_code=404,
                 detail="학생의 콘텐츠 데이터가 없습니다.",
             )
 
-        # 추천 실행
-        result = recommender.recommend(
-            scores_df=scores_df,
-            contents_df=contents_df,
-            plans_df=plans_df,
-            subject=request.subject,
-            limit=request.limit,
-            include_reasons=request.include_reasons,
-        )
+        # 조회만으로 예산을 소진했으면 최근 결과로 응답
+        cached = get_recommendation_cache().get(cache_key) if deadline.expired else None
+        if cached is not None:
+            result, served_tier = cached, TIER_CACHED
+        else:
+            # 추천 실행
+            result = recommender.recommend(
+                scores_df=pd.DataFrame(),
+                contents_df=catalog.frame,
+                plans_df=None,
+                subject=request.subject,
+                limit=_candidate_limit(request.limit),
+                include_reasons=request.include_reasons,
+                student_features=student_features,
+                deadline=deadline,
+                catalog=catalog,
+                overlay=overlay,
+            )
+            served_tier = result["served_tier"]
+            if served_tier == TIER_FULL:
+                get_recommendation_cache().put(cache_key, result)
+
+        degraded = served_tier != TIER_FULL
+        record_served_tier("recommendations.content", served_tier, degraded)
 
         recommendations = [
-            RecommendedContent(
-                content_id=r["content_id"],
-                title=r["title"],
-                subject=r["subject"],
-                content_type=r["content_type"],
-                difficulty=r.get("difficulty"),
-                relevance_score=r["relevance_score"],
-                reason=r.get("reason") if request.include_reasons else None,
-            )
-            for r in result["recommendations"]
+            _to_recommended_content(r, request.include_reasons)
+            for r in _rerank(result, request.limit, request.student_id)
         ]
 
         return ContentRecommendationResponse(
@@ -137,6 +304,125 @@ async def recommend_content(
             recommendations=recommendations,
             weak_subjects=result["weak_subjects"],
             strategy=result["strategy"],
+            served_tier=served_tier,
+            degraded=degraded,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/content/batch")
+async def recommend_content_batch(request: BatchContentRecommendationRequest) -> StreamingResponse:
+    """
+    여러 학생(반 단위)에게 테넌트 카탈로그 콘텐츠를 일괄 추천합니다.
+
+    - 학생 특성 기록을 조회하고, 기록이 없거나 오래된 학생의 성적/플랜만 한 번에 조회
+    - 학생 × 콘텐츠 조합 점수 행렬로 일괄 점수 계산
+    - 결과는 학생별 ContentRecommendationResponse를 한 줄씩 NDJSON으로 스트리밍
+    """
+    try:
+        db = get_connector()
+        catalog = get_catalog_registry().get(request.tenant_id)
+        if len(catalog) == 0:
+            raise HTTPException(
+                status_code=404,
+                detail="테넌트의 콘텐츠 카탈로그가 없습니다.",
+            )
+
+        student_ids = list(dict.fromkeys(request.student_ids))
+        students = get_feature_store().get_or_load_many(
+            student_ids,
+            lambda missing: (
+                db.get_scores_for_students(missing),
+                db.get_plans_for_students(missing),
+            ),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = ContentRecommender().recommend_many(
+        students,
+        catalog,
+        subject=request.subject,
+        limit=request.limit,
+        include_reasons=request.include_reasons,
+    )
+    return StreamingResponse(
+        _stream_batch_results(results, request.include_reasons),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/hybrid", response_model=HybridRecommendationResponse)
+async def recommend_hybrid(
+    request: HybridRecommendationRequest,
+    latency_budget_ms: float | None = Header(default=None, alias=LATENCY_BUDGET_HEADER),
+) -> HybridRecommendationResponse:
+    """
+    규칙 기반 적합도와 협업 필터링 점수를 혼합하여 추천합니다.
+
+    - 규칙 기반: 취약 과목, 난이도, 유형 다양성, 신규 콘텐츠 (0-100)
+    - 협업: 테넌트 동시 학습 행렬 또는 ALS 잠재 벡터 점수 (학생 최댓값 기준 0-100)
+    - 요청 시점에는 학생 성적/플랜과 미리 만든 테넌트 구조만 읽음
+    - 협업 신호가 없는 학생(플랜 없음)은 규칙 기반 점수만 사용
+    - 테넌트 동시 학습 행렬은 백그라운드에서 구성하며, 첫 구성 전에는 규칙 기반 점수만 사용
+    """
+    hybrid = ML_CONFIG["content_recommendation"]["hybrid"]
+    deadline = Deadline.from_budget(
+        latency_budget_ms,
+        ML_CONFIG["content_recommendation"]["deadline"]["default_budget_ms"],
+    )
+    weight = (
+        request.collaborative_weight
+        if request.collaborative_weight is not None
+        else hybrid["collaborative_weight"]
+    )
+
+    try:
+        db = get_connector()
+        catalog = get_catalog_registry().get(request.tenant_id)
+        if len(catalog) == 0:
+            raise HTTPException(
+                status_code=404,
+                detail="테넌트의 콘텐츠 카탈로그가 없습니다.",
+            )
+
+        model, source = _collaborative_model(request.tenant_id, hybrid["source"])
+        result = get_hybrid_recommender().recommend(
+            request.student_id,
+            scores_df=db.get_student_scores(request.student_id),
+            plans_df=db.get_student_plans(request.student_id),
+            catalog=catalog,
+            model=model,
+            collaborative_weight=weight,
+            subject=request.subject,
+            limit=_candidate_limit(request.limit),
+            include_reasons=request.include_reasons,
+            deadline=deadline,
+        )
+
+        served_tier = result["served_tier"]
+        degraded = served_tier != TIER_FULL
+        record_served_tier("recommendations.hybrid", served_tier, degraded)
+
+        return HybridRecommendationResponse(
+            student_id=request.student_id,
+            recommendations=[
+                _to_recommended_content(r, request.include_reasons)
+                for r in _rerank(result, request.limit, request.student_id)
+            ],
+            weak_subjects=result["weak_subjects"],
+            strategy=result["strategy"],
+            served_tier=served_tier,
+            degraded=degraded,
+            collaborative_source=source if result["collaborative_weight"] > 0 else None,
+            collaborative_weight=result["collaborative_weight"],
         )
 
     except HTTPException:
@@ -145,6 +431,37 @@ async def recommend_content(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/feedback", response_model=RecommendationFeedbackResponse)
+async def record_feedback(request: RecommendationFeedbackRequest) -> RecommendationFeedbackResponse:
+    """
+    추천 콘텐츠의 플랜 완료/미완료를 재정렬기에 반영합니다.
+
+    - feedback_token은 /content, /hybrid 응답의 추천 항목마다 포함
+    - 토큰을 발급받은 학생·콘텐츠로만, 토큰마다 한 번만 반영
+    - 해당 (학생 구간, 콘텐츠 팔)의 베타 분포 α/β만 1 증가 (재학습 없음)
+    """
+    if not ML_CONFIG["content_recommendation"]["bandit"]["enabled"]:
+        raise HTTPException(status_code=404, detail="추천 재정렬이 꺼져 있습니다.")
+
+    try:
+        alpha, beta = await run_in_threadpool(
+            get_bandit_reranker().update,
+            request.feedback_token,
+            request.student_id,
+            request.content_id,
+            request.completed,
+        )
+    except FeedbackTokenReused as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FeedbackTokenError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return RecommendationFeedbackResponse(
+        feedback_token=request.feedback_token,
+        completion_rate=round(alpha / (alpha + beta), 4),
+    )
+
+
 @router.post("/study-plan", response_model=StudyPlanRecommendationResponse)
 async def recommend_study_plan(
     request: StudyPlanRecommendationRequest,
@@ -243,6 +560,109 @@ async def get_weak_subjects(student_id: str) -> dict[str, Any]:
 # ============================================
 
 
+def _to_recommended_content(rec: dict[str, Any], include_reasons: bool) -> RecommendedContent:
+    """추천 결과 딕셔너리 → 응답 스키마 (카탈로그 결측값은 빈 문자열/None)"""
+
+    def text(value: Any) -> str:
+        return "" if value is None or pd.isna(value) else value
+
+    difficulty = rec.get("difficulty")
+    return RecommendedContent(
+        content_id=rec["content_id"],
+        title=text(rec["title"]),
+        subject=text(rec["subject"]),
+        content_type=text(rec["content_type"]),
+        difficulty=None if difficulty is None or pd.isna(difficulty) else difficulty,
+        relevance_score=rec["relevance_score"],
+        reason=rec.get("reason") if include_reasons else None,
+        feedback_token=rec.get("feedback_token"),
+    )
+
+
+def _candidate_limit(limit: int) -> int:
+    """재정렬 후보 수 (재정렬이 꺼져 있으면 요청 개수 그대로)"""
+    bandit = ML_CONFIG["content_recommendation"]["bandit"]
+    return limit * bandit["overfetch"] if bandit["enabled"] else limit
+
+
+def _rerank(result: dict[str, Any], limit: int, student_id: str) -> list[dict[str, Any]]:
+    """완료 피드백 기반 재정렬 (꺼져 있으면 상위 limit개 그대로)"""
+    if not ML_CONFIG["content_recommendation"]["bandit"]["enabled"]:
+        return result["recommendations"][:limit]
+    return get_bandit_reranker().rerank(
+        result["recommendations"],
+        result["strategy"],
+        result["weak_subjects"],
+        limit,
+        student_id,
+    )
+
+
+def _student_catalog(links_df: pd.DataFrame) -> tuple[CatalogIndex, StudentOverlay]:
+    """
+    학생 연결 행을 카탈로그 위치로 변환
+
+    마스터 연결이 없는 콘텐츠(is_custom)가 있으면 공유 카탈로그에는 없으므로,
+    보유한 카탈로그 행과 자체 속성 행만으로 작은 인덱스를 만들어 함께 추천합니다.
+    """
+    catalog = get_catalog_registry().get(links_df["tenant_id"].iloc[0])
+    is_custom = links_df["is_custom"].fillna(False).to_numpy(dtype=bool)
+    if is_custom.any():
+        linked = catalog.frame.iloc[catalog.overlay(links_df[~is_custom]).positions]
+        custom = links_df.loc[
+            is_custom, ["content_id", "title", "subject", "difficulty", "content_type"]
+        ].rename(columns={"content_id": "id"})
+        catalog = CatalogIndex.build(pd.concat([linked, custom], ignore_index=True))
+    return catalog, catalog.overlay(links_df)
+
+
+def _with_master_content_ids(
+    student_features: StudentFeatures, links_df: pd.DataFrame
+) -> StudentFeatures:
+    """학습 콘텐츠 ID(학생 사본 ID)를 연결 행의 추천 ID(마스터 ID)로 바꾼 사본"""
+    if not student_features.studied_content_ids:
+        return student_features
+    links = links_df.drop_duplicates("student_content_id")
+    mapping = {
+        student_content_id: content_id
+        for student_content_id, content_id in zip(links["student_content_id"], links["content_id"])
+        if pd.notna(content_id)
+    }
+    mapped = student_features.copy()
+    mapped.studied_content_ids = {
+        mapping.get(content_id, content_id) for content_id in student_features.studied_content_ids
+    }
+    return mapped
+
+
+def _collaborative_model(tenant_id: str, source: str) -> tuple[CollaborativeModel, str]:
+    """설정된 협업 모델 (ALS 잠재 벡터 파일이 없으면 동시 학습 행렬)"""
+    if source == "factors":
+        factors = get_implicit_factors(tenant_id)
+        if factors is not None:
+            return factors, "factors"
+    return get_cooccurrence_registry().get(tenant_id), "cooccurrence"
+
+
+def _stream_batch_results(
+    results: Iterator[dict[str, Any]],
+    include_reasons: bool,
+) -> Iterator[str]:
+    """학생별 추천 결과를 NDJSON 줄로 변환"""
+    for result in results:
+        record_served_tier("recommendations.content_batch", result["served_tier"], False)
+        response = ContentRecommendationResponse(
+            student_id=result["student_id"],
+            recommendations=[
+                _to_recommended_content(r, include_reasons) for r in result["recommendations"]
+            ],
+            weak_subjects=result["weak_subjects"],
+            strategy=result["strategy"],
+            served_tier=result["served_tier"],
+        )
+        yield response.model_dump_json() + "\n"
+
+
 def _generate_recommended_slots(
     patterns: dict[str, Any],
     contents: Any,
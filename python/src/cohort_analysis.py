@@ -0,0 +1,543 @@
+"""
+테넌트 단위 코호트 분석
+
+analysis.py의 학생 단위 분석 함수를 테넌트 전체 플랜/성적에 한 번에 적용합니다.
+(학생, 요일·시간·과목·주·등급) 결합 코드의 bincount로 모든 학생을 함께 집계해
+학생당 한 행의 열 지향 테이블을 만들고, 학생 단위 함수와 같은 형식의 딕셔너리는
+조회할 때만 만듭니다. 테넌트 리포트가 학생 수만큼 함수를 부르지 않아도 됩니다.
+"""
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .analysis import (
+    PreparedPlans,
+    _grouped_moments,
+    default_target_week,
+    learning_patterns_from_counts,
+    prepare_plans,
+)
+
+
+class CohortResult:
+    """
+    학생별 분석 결과 (학생 ID 인덱스 열 지향 테이블 + 지연 생성 딕셔너리)
+
+    table은 학생당 한 행이며, result[student_id]는 학생 단위 분석 함수와 같은 딕셔너리를
+    그때 만들어 반환합니다.
+    """
+
+    def __init__(self, table: pd.DataFrame, materialize: Callable[[int], dict[str, Any]]):
+        """
+        Args:
+            table: 학생 ID 인덱스 결과 테이블
+            materialize: 테이블 행 번호 → 학생 결과 딕셔너리
+        """
+        self.table = table
+        self._materialize = materialize
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, student_id: object) -> bool:
+        return student_id in self.table.index
+
+    def __iter__(self) -> Iterator:
+        return iter(self.table.index)
+
+    def __getitem__(self, student_id: object) -> dict[str, Any]:
+        """학생 결과 딕셔너리 (없는 학생은 KeyError)"""
+        return self._materialize(self.table.index.get_loc(student_id))
+
+    def items(self) -> Iterator[tuple[Any, dict[str, Any]]]:
+        """(학생 ID, 결과 딕셔너리) 순회"""
+        for row, student_id in enumerate(self.table.index):
+            yield student_id, self._materialize(row)
+
+
+def _student_codes(
+    frame: pd.DataFrame,
+    student_ids: pd.Index | None = None,
+) -> tuple[np.ndarray, pd.Index]:
+    """student_id 정수 코드 (결측·목록에 없는 학생은 -1)와 정렬된 학생 ID"""
+    if student_ids is None:
+        codes, student_ids = pd.factorize(frame["student_id"], sort=True)
+        return codes, pd.Index(student_ids, name="student_id")
+    return student_ids.get_indexer(frame["student_id"]), student_ids
+
+
+def _sorted_union(*columns: pd.Series) -> pd.Index:
+    """여러 컬럼 값의 정렬된 고유값 (결측 제외)"""
+    values = pd.concat([column.astype(object) for column in columns], ignore_index=True)
+    return pd.Index(values.dropna().unique()).sort_values()
+
+
+def _grouped_counts(
+    rows: np.ndarray,
+    columns: np.ndarray,
+    n_rows: int,
+    n_columns: int,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """(행, 열) 결합 코드 bincount → n_rows × n_columns 행렬 (음수 코드는 제외)"""
+    keep = (rows >= 0) & (columns >= 0)
+    return np.bincount(
+        rows[keep] * n_columns + columns[keep],
+        weights=None if weights is None else weights[keep],
+        minlength=n_rows * n_columns,
+    ).reshape(n_rows, n_columns)
+
+
+def _index_columns(prefix: str, labels: Any, matrix: np.ndarray) -> dict[str, np.ndarray]:
+    """행렬 열을 "prefix_라벨" 테이블 컬럼으로"""
+    return {f"{prefix}_{label}": matrix[:, j] for j, label in enumerate(labels)}
+
+
+# ============================================
+# 학습 패턴
+# ============================================
+
+
+def cohort_plan_counts(plans: PreparedPlans) -> dict[str, Any]:
+    """
+    학생별 학습 패턴 빈도 집계 (학생 루프 없음)
+
+    Args:
+        plans: student_id 컬럼이 있는 테넌트 플랜
+
+    Returns:
+        student_ids, day(학생 × 7), hour(학생 × 24), subject(학생 × 과목),
+        subject_rank(학생 × 과목 동률 순서 키, 처음 나온 위치), subjects,
+        total, completed, duration_sum, duration_count 딕셔너리
+    """
+    students, student_ids = _student_codes(plans.frame)
+    codes = plans.codes
+    n = len(student_ids)
+    subjects = codes["subjects"]
+    duration = codes["duration"]
+    has_duration = ~np.isnan(duration)
+    everything = np.zeros(len(students), dtype=np.int64)
+
+    # 학생 × 과목별 동률 키 최솟값 (value_counts() 동률 순서, 없는 칸은 len(plans))
+    subject_rank = np.full(n * len(subjects), len(students), dtype=np.int64)
+    keep = (students >= 0) & (codes["subject"] >= 0)
+    np.minimum.at(
+        subject_rank,
+        students[keep] * len(subjects) + codes["subject"][keep],
+        codes["subject_tiebreak"][keep],
+    )
+
+    return {
+        "student_ids": student_ids,
+        "day": _grouped_counts(students, codes["day"], n, 7),
+        "hour": _grouped_counts(students, codes["hour"], n, 24),
+        "subject": _grouped_counts(students, codes["subject"], n, len(subjects)),
+        "subject_rank": subject_rank.reshape(n, len(subjects)),
+        "subjects": subjects,
+        "total": _grouped_counts(students, everything, n, 1)[:, 0],
+        "completed": _grouped_counts(students, np.where(codes["completed"], 0, -1), n, 1)[:, 0],
+        "duration_sum": _grouped_counts(
+            students, everything, n, 1, weights=np.where(has_duration, duration, 0.0)
+        )[:, 0],
+        "duration_count": _grouped_counts(
+            students, np.where(has_duration, 0, -1), n, 1
+        )[:, 0],
+    }
+
+
+def analyze_cohort_learning_patterns(plans_df: pd.DataFrame | PreparedPlans) -> CohortResult:
+    """
+    테넌트 전체 학생의 학습 패턴 분석
+
+    Args:
+        plans_df: student_id 컬럼이 있는 테넌트 플랜 DataFrame 또는 PreparedPlans
+
+    Returns:
+        CohortResult (테이블: total, completed, completion_rate(%), duration_mean,
+        most_active_day, least_active_day, peak_hour, most_studied, day_*, hour_*, subject_*;
+        학생 딕셔너리는 analyze_learning_patterns와 같은 형식)
+    """
+    plans = prepare_plans(plans_df)
+    counts = cohort_plan_counts(plans)
+    day, hour, subject = counts["day"], counts["hour"], counts["subject"]
+    total, completed = counts["total"], counts["completed"]
+    subjects, subject_rank = counts["subjects"], counts["subject_rank"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        duration_mean = counts["duration_sum"] / counts["duration_count"]
+
+    def first_extreme(matrix: np.ndarray, largest: bool) -> pd.arrays.IntegerArray:
+        """0이 아닌 칸 중 최대/최소 빈도의 첫 열 (모두 0이면 NA)"""
+        active = matrix > 0
+        masked = np.where(active, matrix, -1 if largest else np.iinfo(np.int64).max)
+        best = masked.argmax(axis=1) if largest else masked.argmin(axis=1)
+        return pd.arrays.IntegerArray(best, mask=~active.any(axis=1))
+
+    most_studied = np.full(len(total), None, dtype=object)
+    if len(subjects):
+        # 최다 빈도 과목 중 가장 먼저 나온 과목 (value_counts() 동률 순서)
+        top = subject.max(axis=1, keepdims=True)
+        studied = top[:, 0] > 0
+        first_top = np.where(subject == top, subject_rank, np.iinfo(np.int64).max).argmin(axis=1)
+        most_studied[studied] = np.asarray(subjects, dtype=object)[first_top[studied]]
+
+    table = pd.DataFrame(
+        {
+            "total": total,
+            "completed": completed,
+            "completion_rate": completed / np.maximum(total, 1) * 100,
+            "duration_mean": duration_mean,
+            "most_active_day": first_extreme(day, largest=True),
+            "least_active_day": first_extreme(day, largest=False),
+            "peak_hour": first_extreme(hour, largest=True),
+            "most_studied": most_studied,
+            **_index_columns("day", range(7), day),
+            **_index_columns("hour", range(24), hour),
+            **_index_columns("subject", subjects, subject),
+        },
+        index=counts["student_ids"],
+    )
+
+    def materialize(row: int) -> dict[str, Any]:
+        return learning_patterns_from_counts(
+            day_counts=day[row],
+            hour_counts=hour[row],
+            subjects=subjects if plans.has("subject") else None,
+            subject_counts=subject[row],
+            subject_rank=subject_rank[row],
+            total=int(total[row]),
+            completed=int(completed[row]) if plans.has("status") else None,
+            duration_mean=float(duration_mean[row]) if plans.has("actual_duration") else None,
+        )
+
+    return CohortResult(table, materialize)
+
+
+# ============================================
+# 성적 트렌드
+# ============================================
+
+
+def analyze_cohort_score_trends(scores_df: pd.DataFrame) -> CohortResult:
+    """
+    테넌트 전체 학생의 성적 트렌드 분석
+
+    Args:
+        scores_df: student_id 컬럼이 있는 테넌트 성적 DataFrame
+
+    Returns:
+        CohortResult (테이블: n_scores, first_score, last_score, change, direction,
+        mean_*(과목 평균), grade_*(등급 수); 학생 딕셔너리는 analyze_score_trends와 같은 형식)
+    """
+    students, student_ids = _student_codes(scores_df)
+    n = len(student_ids)
+    n_scores = _grouped_counts(students, np.zeros(len(students), dtype=np.int64), n, 1)[:, 0]
+    columns: dict[str, Any] = {"n_scores": n_scores}
+
+    has_scores = "score" in scores_df.columns
+    has_subjects = has_scores and "subject" in scores_df.columns
+    if has_scores:
+        score = pd.to_numeric(scores_df["score"], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+    # 1. 과목별 평균 (학생 × 과목 결합 코드)
+    if has_subjects:
+        subject_codes, subjects = pd.factorize(scores_df["subject"], sort=True)
+        subjects = subjects.tolist()
+        n_subjects = len(subjects)
+        present = _grouped_counts(students, subject_codes, n, n_subjects) > 0
+        key = np.where(
+            (students >= 0) & (subject_codes >= 0), students * n_subjects + subject_codes, -1
+        )
+        mean, std, count = (
+            m.reshape(n, n_subjects) for m in _grouped_moments(key, score, n * n_subjects)
+        )
+        columns.update(_index_columns("mean", subjects, mean))
+
+    # 2. 전체 성적 추이 (학생별 가장 이른/늦은 성적, 날짜 없는 행은 맨 뒤)
+    has_trend = has_scores and "created_at" in scores_df.columns
+    if has_trend:
+        created = pd.to_datetime(scores_df["created_at"]).to_numpy(dtype="datetime64[ns]")
+        created_key = created.view(np.int64).copy()
+        created_key[np.isnat(created)] = np.iinfo(np.int64).max
+        # 학생 → 날짜 → 행 순서 (lexsort는 안정 정렬)
+        order = np.lexsort((created_key, students))
+        order = order[students[order] >= 0]
+        ends = np.cumsum(n_scores)
+        starts = ends - n_scores
+        trend_ok = n_scores >= 2
+        first_score = np.where(trend_ok, score[order[np.minimum(starts, len(order) - 1)]], np.nan)
+        last_score = np.where(trend_ok, score[order[np.maximum(ends - 1, 0)]], np.nan)
+        direction = np.where(last_score > first_score, "improving", "declining").astype(object)
+        direction[~trend_ok] = None
+        columns.update(
+            first_score=first_score,
+            last_score=last_score,
+            change=last_score - first_score,
+            direction=direction,
+        )
+
+    # 3. 등급별 분포
+    has_grades = "grade" in scores_df.columns
+    if has_grades:
+        grade_codes, grades = pd.factorize(scores_df["grade"], sort=True)
+        grades = grades.tolist()
+        grade_counts = _grouped_counts(students, grade_codes, n, len(grades))
+        columns.update(_index_columns("grade", grades, grade_counts))
+
+    table = pd.DataFrame(columns, index=student_ids)
+
+    def materialize(row: int) -> dict[str, Any]:
+        analysis = {}
+        if has_subjects:
+            own = np.flatnonzero(present[row])
+            analysis["subject_averages"] = {
+                subjects[j]: {
+                    "mean": float(mean[row, j]),
+                    "std": float(std[row, j]),
+                    "count": int(count[row, j]),
+                }
+                for j in own
+            }
+
+        if has_trend and trend_ok[row]:
+            first, last = float(first_score[row]), float(last_score[row])
+            analysis["overall_trend"] = {
+                "direction": direction[row],
+                "first_score": first,
+                "last_score": last,
+                "change": round(last - first, 2),
+            }
+
+        if has_grades:
+            own_grades = np.flatnonzero(grade_counts[row])
+            analysis["grade_distribution"] = {
+                grades[g]: int(grade_counts[row, g]) for g in own_grades
+            }
+
+        # 4. 취약 과목 (평균 하위 3개, 동률은 과목명 순, 평균이 NaN인 과목은 맨 뒤)
+        if has_subjects:
+            own = np.flatnonzero(present[row])
+            weakest = own[np.argsort(mean[row, own], kind="stable")[:3]]
+            analysis["weak_subjects"] = {subjects[j]: float(mean[row, j]) for j in weakest}
+
+        return analysis
+
+    return CohortResult(table, materialize)
+
+
+# ============================================
+# 학습 효율성
+# ============================================
+
+
+def analyze_cohort_study_efficiency(
+    plans_df: pd.DataFrame | PreparedPlans,
+    scores_df: pd.DataFrame,
+) -> CohortResult:
+    """
+    테넌트 전체 학생의 학습 효율성 (과목별 학습 시간 합 vs 과목 평균 성적 상관관계)
+
+    학생 × 과목 행렬에서 공통 과목만 마스킹해 학생별 피어슨 상관계수와
+    t 분포 양측 p값을 한 번에 계산합니다.
+
+    Args:
+        plans_df: student_id 컬럼이 있는 테넌트 플랜 DataFrame 또는 PreparedPlans
+        scores_df: student_id 컬럼이 있는 테넌트 성적 DataFrame
+
+    Returns:
+        CohortResult (테이블: n_plans, n_scores, common_subjects, correlation, p_value,
+        significant; 학생 딕셔너리는 calculate_study_efficiency와 같은 형식)
+    """
+    plans = prepare_plans(plans_df)
+    frame = plans.frame
+    student_ids = _sorted_union(frame["student_id"], scores_df["student_id"]).rename("student_id")
+    n = len(student_ids)
+    plan_students, _ = _student_codes(frame, student_ids)
+    score_students, _ = _student_codes(scores_df, student_ids)
+    n_plans = np.bincount(plan_students[plan_students >= 0], minlength=n)
+    n_scores = np.bincount(score_students[score_students >= 0], minlength=n)
+
+    correlation = np.full(n, np.nan)
+    p_value = np.full(n, np.nan)
+    n_common = np.zeros(n, dtype=np.int64)
+    if (
+        plans.has("subject")
+        and plans.has("actual_duration")
+        and {"subject", "score"} <= set(scores_df.columns)
+    ):
+        subjects = _sorted_union(frame["subject"], scores_df["subject"])
+        plan_subjects = subjects.get_indexer(frame["subject"].astype(object))
+        score_subjects = subjects.get_indexer(scores_df["subject"])
+        n_subjects = len(subjects)
+
+        # 과목별 학습 시간 합 (결측은 0) / 과목별 평균 성적
+        duration = plans.codes["duration"]
+        study = _grouped_counts(
+            plan_students, plan_subjects, n, n_subjects, weights=np.nan_to_num(duration)
+        )
+        studied = _grouped_counts(plan_students, plan_subjects, n, n_subjects) > 0
+        key = np.where(
+            (score_students >= 0) & (score_subjects >= 0),
+            score_students * n_subjects + score_subjects,
+            -1,
+        )
+        score = pd.to_numeric(scores_df["score"], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        score_mean = _grouped_moments(key, score, n * n_subjects)[0].reshape(n, n_subjects)
+        scored = _grouped_counts(score_students, score_subjects, n, n_subjects) > 0
+
+        common = studied & scored
+        n_common = common.sum(axis=1)
+        eligible = (n_common >= 3) & (n_plans > 0) & (n_scores > 0)
+        correlation[eligible], p_value[eligible] = _masked_pearson(
+            study[eligible], score_mean[eligible], common[eligible]
+        )
+
+    table = pd.DataFrame(
+        {
+            "n_plans": n_plans,
+            "n_scores": n_scores,
+            "common_subjects": n_common,
+            "correlation": correlation,
+            "p_value": p_value,
+            "significant": p_value < 0.05,
+        },
+        index=student_ids,
+    )
+
+    def materialize(row: int) -> dict[str, Any]:
+        if n_plans[row] == 0 or n_scores[row] == 0:
+            return {"error": "데이터가 부족합니다."}
+        if n_common[row] < 3:
+            return {}
+        return {
+            "study_score_correlation": {
+                "correlation": round(float(correlation[row]), 3),
+                "p_value": round(float(p_value[row]), 4),
+                "significant": bool(p_value[row] < 0.05),
+            }
+        }
+
+    return CohortResult(table, materialize)
+
+
+def _masked_pearson(
+    x: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    행별 마스크 칸만 사용한 피어슨 상관계수와 양측 p값 (scipy.stats.pearsonr와 같은 정의)
+
+    Args:
+        x, y: 학생 × 과목 행렬
+        mask: 사용할 칸 (행마다 3칸 이상)
+
+    Returns:
+        (상관계수, p값) 벡터 (상수 입력이면 NaN)
+    """
+    count = mask.sum(axis=1)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    dx = np.where(mask, x - (x.sum(axis=1) / count)[:, None], 0.0)
+    dy = np.where(mask, y - (y.sum(axis=1) / count)[:, None], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (dx * dy).sum(axis=1) / np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+        r = np.clip(r, -1.0, 1.0)
+        df = count - 2
+        t = np.abs(r) * np.sqrt(df / (1.0 - r * r))
+        p = np.where(np.abs(r) == 1.0, 0.0, 2 * stats.t.sf(t, df))
+    return r, np.where(np.isnan(r), np.nan, p)
+
+
+# ============================================
+# 주간 학습량 예측
+# ============================================
+
+
+def predict_cohort_weekly_workload(
+    plans_df: pd.DataFrame | PreparedPlans,
+    target_date: datetime | None = None,
+) -> CohortResult:
+    """
+    테넌트 전체 학생의 다음 주 학습량 예측 (최근 4주 (학생, ISO 주)별 플랜 수)
+
+    Args:
+        plans_df: student_id 컬럼이 있는 테넌트 플랜 DataFrame 또는 PreparedPlans
+        target_date: 예측 대상 주의 시작일 (기본값: 다음 월요일)
+
+    Returns:
+        CohortResult (테이블: weeks, mean, std; 학생 딕셔너리는 predict_weekly_workload와 같은 형식)
+    """
+    plans = prepare_plans(plans_df)
+    frame = plans.frame
+    students, student_ids = _student_codes(frame)
+    n = len(student_ids)
+    if target_date is None:
+        target_date = default_target_week()
+
+    weekly = np.zeros((n, 0), dtype=np.int64)
+    if plans.has("scheduled_date"):
+        recent = (
+            (frame["date"] >= target_date - timedelta(weeks=4)) & (frame["date"] < target_date)
+        ).to_numpy()
+        weeks, _ = pd.factorize(frame["year_week"].where(recent))
+        weekly = _grouped_counts(students, weeks, n, int(weeks.max()) + 1 if len(weeks) else 0)
+
+    active = weekly > 0
+    n_weeks = active.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = weekly.sum(axis=1) / n_weeks
+        squared = np.where(active, weekly - mean[:, None], 0.0) ** 2
+        std = np.where(n_weeks > 1, np.sqrt(squared.sum(axis=1) / (n_weeks - 1)), 0.0)
+    std[n_weeks == 0] = np.nan
+
+    table = pd.DataFrame({"weeks": n_weeks, "mean": mean, "std": std}, index=student_ids)
+    target_week_start = target_date.strftime("%Y-%m-%d")
+
+    def materialize(row: int) -> dict[str, Any]:
+        if n_weeks[row] == 0:
+            return {"error": "날짜 데이터가 없습니다."}
+        m, s = float(mean[row]), float(std[row])
+        return {
+            "predicted_plans": round(m),
+            "std": round(s, 2),
+            "min_expected": max(0, round(m - s)),
+            "max_expected": round(m + s),
+            "target_week_start": target_week_start,
+        }
+
+    return CohortResult(table, materialize)
+
+
+def analyze_cohort(
+    plans_df: pd.DataFrame | PreparedPlans,
+    scores_df: pd.DataFrame,
+    target_date: datetime | None = None,
+) -> dict[str, CohortResult]:
+    """
+    테넌트 코호트 분석 일괄 실행 (플랜 파싱은 한 번)
+
+    Args:
+        plans_df: 테넌트 플랜 DataFrame 또는 PreparedPlans
+        scores_df: 테넌트 성적 DataFrame
+        target_date: 학습량 예측 대상 주의 시작일
+
+    Returns:
+        learning_patterns, score_trends, efficiency, workload → CohortResult
+    """
+    plans = prepare_plans(plans_df)
+    return {
+        "learning_patterns": analyze_cohort_learning_patterns(plans),
+        "score_trends": analyze_cohort_score_trends(scores_df),
+        "efficiency": analyze_cohort_study_efficiency(plans, scores_df),
+        "workload": predict_cohort_weekly_workload(plans, target_date),
+    }
@@ -57,9 +57,85 @@ ML_CONFIG = {
             "subject_distribution",
         ],
         "target": "next_score",
+        # 이력 길이/지연 예산에 따른 모델 계층 선택
+        "tiers": {
+            "ridge_min_samples": 10,
+            "xgboost_min_samples": 30,
+            "ridge_alpha": 1.0,
+            # 계층별 예상 지연 시간 (ms)
+            "expected_latency_ms": {
+                "weighted_average": 0.05,
+                "ridge": 0.3,
+                "xgboost": 25.0,
+            },
+        },
+        # 추론 마이크로 배칭 (최대 N건 또는 T밀리초)
+        "batching": {
+            "max_batch_size": 32,
+            "max_wait_ms": 2.0,
+        },
+        # 요청 지연 예산 (X-Latency-Budget-Ms 헤더가 없을 때)
+        "deadline": {
+            "default_budget_ms": 500.0,
+            "cache_size": 10000,
+            "cache_ttl_seconds": 600.0,
+        },
+        # (학생, 과목)별 트렌드 누적기 (성적 이벤트로 갱신, 워커 간 공유 파일 병합 주기)
+        "trend_stats": {
+            "sync_interval_seconds": 60.0,
+        },
     },
     "content_recommendation": {
         "model": "collaborative_filtering",
         "features": ["content_type", "subject", "difficulty", "user_history"],
+        "deadline": {
+            "default_budget_ms": 500.0,
+            # 추천 1건당 이유 생성 예상 비용 (ms)
+            "reason_cost_ms": 0.05,
+            "cache_size": 10000,
+            "cache_ttl_seconds": 600.0,
+        },
+        # 테넌트 카탈로그 인덱스 (tenant_id 요청)
+        "catalog": {
+            "refresh_interval_seconds": 60.0,
+            # 증분 조회로 알 수 없는 삭제를 반영하기 위한 전체 재구성 주기
+            "full_refresh_seconds": 3600.0,
+        },
+        # 혼합 추천 (/recommendations/hybrid)
+        "hybrid": {
+            # 협업 모델: "cooccurrence" (테넌트 동시 학습 행렬) 또는 "factors" (ALS 잠재 벡터)
+            "source": "cooccurrence",
+            # 협업 점수 비중 (나머지는 규칙 기반 적합도)
+            "collaborative_weight": 0.3,
+            "refresh_interval_seconds": 300.0,
+            "full_refresh_seconds": 21600.0,
+        },
+        # 완료 피드백 기반 톰슨 샘플링 재정렬 (/content, /hybrid)
+        "bandit": {
+            # 기본 꺼짐: 켜려면 워커가 함께 쓰는 ML_BANDIT_STATE_PATH와 ML_FEEDBACK_TOKEN_SECRET 설정
+            "enabled": False,
+            # 샘플링한 완료율의 점수 비중 (나머지는 규칙/혼합 점수)
+            "weight": 0.2,
+            # 재정렬 후보 수 = limit × overfetch
+            "overfetch": 3,
+            "prior_alpha": 1.0,
+            "prior_beta": 1.0,
+            # feedback_token 유효 기간 (초)
+            "token_ttl_seconds": 14 * 86400.0,
+        },
+    },
+    # 학생별 학습 패턴 누적 카운터 (/api/analysis/learning-patterns, /plan-events)
+    "learning_patterns": {
+        # 조회 시 이 시간보다 오래 대사하지 않은 학생은 백그라운드에서 플랜으로 다시 셈
+        "reconcile_interval_seconds": 86400.0,
+        # 공유 카운터 파일과 병합하는 최소 간격 (다른 워커의 이벤트가 보이기까지의 지연)
+        "sync_interval_seconds": 60.0,
+    },
+    # 학생별 특성 기록 (/api/predictions/score, /api/recommendations/content 공유)
+    "feature_store": {
+        # 워커당 유지할 최대 학생 수 (넘으면 가장 오래 조회하지 않은 학생부터 내보냄)
+        "max_students": 50000,
+        # 이벤트 누락을 보정하기 위해 기록을 성적/플랜으로 다시 만드는 주기
+        "max_age_seconds": 3600.0,
     },
 }
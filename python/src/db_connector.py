@@ -6,13 +6,16 @@ Supabase API를 통해 TimeLevelUp 데이터베이스에 접근합니다.
 
 import os
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 from supabase import create_client, Client
 
+# 한 번에 조회할 행 수 (PostgREST max-rows 기본값 이하여야 응답이 잘리지 않음)
+PAGE_SIZE = 1000
+
 
 class Settings(BaseSettings):
     """환경 설정"""
@@ -86,16 +89,50 @@ class SupabaseConnector:
         response = query.execute()
         return pd.DataFrame(response.data)
 
+    def _fetch_pages(
+        self, build_query: Callable[[], Any], page_size: int = PAGE_SIZE
+    ) -> list[Any]:
+        """
+        정렬된 쿼리를 range로 페이지마다 조회 (max-rows 제한으로 결과가 잘리지 않도록)
+
+        Args:
+            build_query: 정렬까지 적용한 새 쿼리를 만드는 함수 (range는 쿼리에 누적되므로
+                페이지마다 새로 생성)
+            page_size: 페이지 크기
+
+        Returns:
+            전체 행 목록
+        """
+        rows: list[Any] = []
+        while True:
+            page = build_query().range(len(rows), len(rows) + page_size - 1).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+
     def get_students(self, tenant_id: str | None = None) -> pd.DataFrame:
-        """학생 목록 조회"""
-        filters = {}
-        if tenant_id:
-            filters["tenant_id__eq"] = tenant_id
-        return self.query(
-            "students",
-            "id, name, grade, school_name, target_university, target_major, created_at",
-            **filters,
+        """학생 목록 조회 (페이지 단위)"""
+
+        def build_query() -> Any:
+            query = self.client.table("students").select(
+                "id, name, grade, school_name, target_university, target_major, created_at"
+            )
+            if tenant_id:
+                query = query.eq("tenant_id", tenant_id)
+            return query.order("id", desc=False)
+
+        return pd.DataFrame(self._fetch_pages(build_query))
+
+    def get_student_profile(self, student_id: str) -> dict[str, Any] | None:
+        """학생 프로필 (테넌트, 학년, 목표 전공) 조회"""
+        response = (
+            self.client.table("students")
+            .select("id, tenant_id, grade, target_major")
+            .eq("id", student_id)
+            .limit(1)
+            .execute()
         )
+        return response.data[0] if response.data else None
 
     def get_student_scores(
         self, student_id: str, limit: int = 100
@@ -111,24 +148,105 @@ class SupabaseConnector:
         )
         return pd.DataFrame(response.data)
 
+    def get_scores_for_students(
+        self, student_ids: list[str], limit_per_student: int = 100
+    ) -> pd.DataFrame:
+        """
+        여러 학생 성적 일괄 조회 (학생별 최근 limit_per_student개)
+
+        max-rows 제한에 잘리지 않도록 (created_at, id) 역순으로 페이지마다 조회합니다.
+        """
+        scores_df = pd.DataFrame(
+            self._fetch_pages(
+                lambda: self.client.table("scores")
+                .select("*")
+                .in_("student_id", student_ids)
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+            )
+        )
+        if scores_df.empty:
+            return scores_df
+        return scores_df.groupby("student_id", sort=False).head(limit_per_student)
+
+    def get_plans_for_students(self, student_ids: list[str]) -> pd.DataFrame:
+        """여러 학생 학습 플랜 일괄 조회 (페이지 단위)"""
+        return pd.DataFrame(
+            self._fetch_pages(
+                lambda: self.client.table("student_plan")
+                .select("*")
+                .in_("student_id", student_ids)
+                .order("scheduled_date", desc=False)
+                .order("id", desc=False)
+            )
+        )
+
     def get_student_plans(
         self, student_id: str, start_date: str | None = None, end_date: str | None = None
     ) -> pd.DataFrame:
-        """학생 학습 플랜 조회"""
+        """학생 학습 플랜 조회 (페이지 단위)"""
+
+        def build_query() -> Any:
+            query = self.client.table("student_plan").select("*").eq("student_id", student_id)
+            if start_date:
+                query = query.gte("scheduled_date", start_date)
+            if end_date:
+                query = query.lte("scheduled_date", end_date)
+            return query.order("scheduled_date", desc=False).order("id", desc=False)
+
+        return pd.DataFrame(self._fetch_pages(build_query))
+
+    def get_tenant_plan_contents_page(
+        self,
+        tenant_id: str,
+        after: tuple[Any, Any] | None = None,
+        limit: int = PAGE_SIZE,
+    ) -> pd.DataFrame:
+        """
+        테넌트 플랜의 (학생, 콘텐츠) 쌍 한 페이지 조회 (콘텐츠 없는 플랜 제외)
+
+        (created_at, id) 순으로 after 다음 행부터 최대 limit행을 돌려줍니다.
+        마지막 행의 (created_at, id)를 다음 after로 넘기면 생성 시각이 같은 플랜도
+        빠짐없이 이어서 읽습니다 (키셋 페이지).
+
+        Args:
+            tenant_id: 테넌트 ID
+            after: 마지막으로 읽은 (created_at, id) (None이면 처음부터)
+            limit: 페이지 크기 (PostgREST max-rows 이하)
+
+        Returns:
+            id, student_id, content_id, status, actual_duration, created_at 컬럼 DataFrame
+        """
         query = (
             self.client.table("student_plan")
-            .select("*")
-            .eq("student_id", student_id)
+            .select("id, student_id, content_id, status, actual_duration, created_at")
+            .eq("tenant_id", tenant_id)
+            .not_.is_("content_id", "null")
+        )
+        if after is not None:
+            created_at, plan_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt."{plan_id}")'
+            )
+        response = (
+            query.order("created_at", desc=False).order("id", desc=False).limit(limit).execute()
         )
-
-        if start_date:
-            query = query.gte("scheduled_date", start_date)
-        if end_date:
-            query = query.lte("scheduled_date", end_date)
-
-        response = query.order("scheduled_date", desc=False).execute()
         return pd.DataFrame(response.data)
 
+    def get_tenant_plan_contents(self, tenant_id: str) -> pd.DataFrame:
+        """테넌트 전체 플랜의 (학생, 콘텐츠) 쌍 조회 (키셋 페이지를 끝까지 이어 읽음)"""
+        pages = []
+        after = None
+        while True:
+            page = self.get_tenant_plan_contents_page(tenant_id, after)
+            if not page.empty:
+                pages.append(page)
+            if len(page) < PAGE_SIZE:
+                break
+            after = (page["created_at"].iloc[-1], page["id"].iloc[-1])
+        return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+
     def get_plan_executions(
         self, student_id: str, limit: int = 500
     ) -> pd.DataFrame:
@@ -155,6 +273,103 @@ class SupabaseConnector:
         )
         return pd.DataFrame(response.data)
 
+    def get_student_content_links(self, student_id: str) -> pd.DataFrame:
+        """
+        학생 콘텐츠 연결 행 조회 (학생 사본 ID → 마스터 콘텐츠 ID)
+
+        books/lectures의 학생 사본은 master_content_id로 공유 카탈로그와 연결됩니다.
+        마스터 연결이 없는 사본과 student_custom_contents는 카탈로그에 없으므로
+        자체 속성(title, subject, difficulty)으로 추천 후보에 포함합니다.
+
+        Returns:
+            student_content_id(플랜의 content_id), content_id(마스터 ID, 없으면 사본 ID),
+            tenant_id, content_type, is_custom, title, subject, difficulty 컬럼 DataFrame
+        """
+        frames = []
+        for table, content_type in (("books", "book"), ("lectures", "lecture")):
+            response = (
+                self.client.table(table)
+                .select("id, master_content_id, tenant_id, title, subject, difficulty_level")
+                .eq("student_id", student_id)
+                .execute()
+            )
+            frame = pd.DataFrame(response.data)
+            if frame.empty:
+                continue
+            is_custom = frame["master_content_id"].isna()
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "student_content_id": frame["id"],
+                        "content_id": frame["master_content_id"].where(~is_custom, frame["id"]),
+                        "tenant_id": frame["tenant_id"],
+                        "content_type": content_type,
+                        "is_custom": is_custom,
+                        "title": frame["title"],
+                        "subject": frame["subject"],
+                        "difficulty": frame["difficulty_level"],
+                    }
+                )
+            )
+
+        response = (
+            self.client.table("student_custom_contents")
+            .select("id, tenant_id, content_type, title, subject, difficulty_level")
+            .eq("student_id", student_id)
+            .execute()
+        )
+        custom = pd.DataFrame(response.data)
+        if not custom.empty:
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "student_content_id": custom["id"],
+                        "content_id": custom["id"],
+                        "tenant_id": custom["tenant_id"],
+                        "content_type": custom["content_type"],
+                        "is_custom": True,
+                        "title": custom["title"],
+                        "subject": custom["subject"],
+                        "difficulty": custom["difficulty_level"],
+                    }
+                )
+            )
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def get_tenant_catalog(
+        self, tenant_id: str, updated_since: Any | None = None
+    ) -> pd.DataFrame:
+        """
+        테넌트 콘텐츠 카탈로그 조회 (마스터 교재 + 강의, 전체 기관 공통 포함)
+
+        Args:
+            tenant_id: 테넌트 ID
+            updated_since: 이 시각 이후 수정된 콘텐츠만 조회 (None이면 전체)
+
+        Returns:
+            id, title, subject, difficulty, content_type, updated_at 컬럼 DataFrame
+        """
+        def build_query(table: str) -> Any:
+            query = (
+                self.client.table(table)
+                .select("id, title, subject, difficulty_level, updated_at")
+                .or_(f"tenant_id.eq.{tenant_id},tenant_id.is.null")
+            )
+            if updated_since is not None:
+                query = query.gt("updated_at", str(updated_since))
+            return query.order("id", desc=False)
+
+        frames = []
+        for table, content_type in (("master_books", "book"), ("master_lectures", "lecture")):
+            frame = pd.DataFrame(self._fetch_pages(lambda: build_query(table)))
+            if not frame.empty:
+                frames.append(
+                    frame.rename(columns={"difficulty_level": "difficulty"}).assign(
+                        content_type=content_type
+                    )
+                )
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
     def get_plan_groups(self, student_id: str) -> pd.DataFrame:
         """학생 플랜 그룹 조회"""
         response = (
@@ -166,14 +381,15 @@ class SupabaseConnector:
         return pd.DataFrame(response.data)
 
     def get_all_scores_by_tenant(self, tenant_id: str) -> pd.DataFrame:
-        """테넌트 전체 성적 조회 (벤치마크용)"""
-        response = (
-            self.client.table("scores")
-            .select("*, students!inner(tenant_id)")
-            .eq("students.tenant_id", tenant_id)
-            .execute()
+        """테넌트 전체 성적 조회 (벤치마크용, 페이지 단위)"""
+        return pd.DataFrame(
+            self._fetch_pages(
+                lambda: self.client.table("scores")
+                .select("*, students!inner(tenant_id)")
+                .eq("students.tenant_id", tenant_id)
+                .order("id", desc=False)
+            )
         )
-        return pd.DataFrame(response.data)
 
     def execute_sql(self, query: str) -> pd.DataFrame:
         """
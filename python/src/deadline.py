@@ -0,0 +1,143 @@
+"""
+요청 지연 예산 (데드라인)
+
+엔드포인트별 지연 예산을 헤더(X-Latency-Budget-Ms) 또는 설정값으로 받아,
+남은 시간에 따라 ScorePredictor/ContentRecommender가 더 저렴한 계층
+(캐시된 결과, 가중 평균, 추천 이유 생략)으로 단계적으로 내려가도록 합니다.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .metrics import MetricsRegistry, get_metrics
+
+LATENCY_BUDGET_HEADER = "X-Latency-Budget-Ms"
+
+# 캐시된 결과로 응답한 경우의 계층 이름
+TIER_CACHED = "cached"
+
+
+class Deadline:
+    """
+    요청 단위 데드라인
+
+    생성 시점부터 시간을 재며, 예산이 없으면 남은 시간은 무한대입니다.
+    """
+
+    __slots__ = ("budget_ms", "_started", "_clock")
+
+    def __init__(
+        self,
+        budget_ms: float | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args:
+            budget_ms: 지연 예산 (None이면 제한 없음)
+            clock: 초 단위 단조 시계 (테스트용)
+        """
+        self.budget_ms = budget_ms
+        self._clock = clock
+        self._started = clock()
+
+    @classmethod
+    def from_budget(
+        cls,
+        requested_ms: float | None,
+        default_ms: float | None = None,
+    ) -> "Deadline":
+        """요청 헤더 값(없거나 0 이하이면 설정 기본값)으로 데드라인 생성"""
+        if requested_ms is None or not requested_ms > 0:
+            requested_ms = default_ms
+        return cls(requested_ms)
+
+    def elapsed_ms(self) -> float:
+        """경과 시간 (ms)"""
+        return (self._clock() - self._started) * 1000
+
+    def remaining_ms(self) -> float:
+        """남은 시간 (ms, 예산이 없으면 inf)"""
+        if self.budget_ms is None:
+            return math.inf
+        return self.budget_ms - self.elapsed_ms()
+
+    @property
+    def expired(self) -> bool:
+        """예산 소진 여부"""
+        return self.remaining_ms() <= 0
+
+    def allows(self, cost_ms: float) -> bool:
+        """예상 비용이 남은 시간 안에 들어가는지 여부"""
+        return self.remaining_ms() >= cost_ms
+
+
+class ResultCache:
+    """
+    최근 응답 캐시 (LRU + TTL, 스레드 안전)
+
+    예산이 소진된 요청에 마지막으로 계산된 전체 결과를 돌려주는 용도입니다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: 최대 항목 수
+            ttl_seconds: 항목 유효 시간 (초)
+            clock: 초 단위 단조 시계 (테스트용)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Any | None:
+        """유효한 항목 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if self._clock() - stored_at > self.ttl_seconds:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """항목 저장 (가장 오래 쓰지 않은 항목부터 제거)"""
+        with self._lock:
+            self._items[key] = (self._clock(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+def record_served_tier(
+    endpoint: str,
+    tier: str,
+    degraded: bool,
+    metrics: MetricsRegistry | None = None,
+) -> None:
+    """
+    응답 계층과 저하 여부 카운터 기록
+
+    {endpoint}.requests, {endpoint}.served_tier.{tier}, {endpoint}.degraded
+    카운터로 엔드포인트별 저하율을 계산할 수 있습니다.
+    """
+    metrics = metrics or get_metrics()
+    metrics.inc(f"{endpoint}.requests")
+    metrics.inc(f"{endpoint}.served_tier.{tier}")
+    if degraded:
+        metrics.inc(f"{endpoint}.degraded")
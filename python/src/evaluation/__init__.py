@@ -0,0 +1,11 @@
+"""
+오프라인 평가 모듈
+
+합성/스냅샷 데이터 소스와 예측기 백테스트, 추천기 리플레이 평가를 제공합니다.
+백테스트 CLI: python -m src.evaluation.backtest
+추천 리플레이 CLI: python -m src.evaluation.recommender_replay
+"""
+
+from .data_sources import DataSource, SnapshotDataSource, SyntheticDataSource
+
+__all__ = ["DataSource", "SnapshotDataSource", "SyntheticDataSource"]
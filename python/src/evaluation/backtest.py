@@ -0,0 +1,305 @@
+"""
+ScorePredictor 워크포워드 백테스트
+
+모든 (학생, 과목) 성적 이력을 시간순으로 재생하며 각 시점에서 그때까지의
+데이터만으로 다음 성적을 예측하고, 계층별 오차·신뢰도 보정·지연 시간을 기록합니다.
+학생 단위로 샤딩하여 프로세스 풀에서 병렬 실행합니다.
+
+실행:
+    cd python
+    python -m src.evaluation.backtest --source synthetic --students 20000
+    python -m src.evaluation.backtest --source snapshot --snapshot-dir ./snapshot --tiers all
+"""
+
+import argparse
+import json
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..ml.score_predictor import (
+    TIER_RIDGE,
+    TIER_WEIGHTED_AVERAGE,
+    TIER_XGBOOST,
+    ScorePredictor,
+)
+from ..ml.trend_stats import TrendAccumulator
+from ..thread_budget import ThreadBudget, detect_cpu_count
+from .data_sources import load_data_source
+
+ALL_TIERS = [TIER_WEIGHTED_AVERAGE, TIER_RIDGE, TIER_XGBOOST]
+
+RECORD_COLUMNS = [
+    "history_length",
+    "tier",
+    "actual",
+    "predicted",
+    "confidence",
+    "error",
+    "latency_ms",
+]
+
+
+def backtest_series(
+    predictor: ScorePredictor,
+    scores: np.ndarray,
+    gap_days: np.ndarray | None = None,
+    tiers: list[str] | None = None,
+    min_history: int = 3,
+) -> list[dict[str, Any]]:
+    """
+    단일 성적 시리즈 워크포워드 백테스트
+
+    특성은 전체 이력에서 한 번만 추출하고(각 행은 해당 시점까지의 성적만 사용),
+    트렌드 누적기는 시점마다 한 건씩 갱신합니다.
+
+    Args:
+        predictor: 평가할 예측기
+        scores: 시간순 성적 배열
+        gap_days: 직전 성적과의 간격(일) 배열 (None이면 30일)
+        tiers: 강제 평가할 계층 목록 (None이면 예측기의 자동 선택)
+        min_history: 예측을 시작할 최소 이력 길이
+
+    Returns:
+        시점·계층별 기록 목록
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if len(scores) <= min_history:
+        return []
+
+    features = predictor._features_from_scores(scores)
+    stats = TrendAccumulator.from_scores(scores[:min_history])
+    records = []
+
+    for t in range(min_history, len(scores)):
+        history = scores[:t]
+        days_ahead = int(gap_days[t]) if gap_days is not None else 30
+
+        for tier in tiers or [None]:
+            start = time.perf_counter()
+            predicted, confidence, used_tier = predictor.predict_history(
+                history,
+                days_ahead=days_ahead,
+                features=features[:t] if features is not None else None,
+                trend_stats=stats,
+                tier=tier,
+            )
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            predicted = max(0.0, min(100.0, predicted))
+            records.append(
+                {
+                    "history_length": t,
+                    "tier": used_tier,
+                    "actual": scores[t],
+                    "predicted": predicted,
+                    "confidence": confidence,
+                    "error": predicted - scores[t],
+                    "latency_ms": latency_ms,
+                }
+            )
+
+        stats.update(scores[t])
+
+    return records
+
+
+def _init_worker() -> None:
+    """워커 프로세스 초기화 (프로세스당 1스레드로 과다 구독 방지)"""
+    ThreadBudget(threads_per_worker=1).apply()
+
+
+def _run_shard(
+    shard: pd.DataFrame,
+    predictor_kwargs: dict[str, Any],
+    tiers: list[str] | None,
+    min_history: int,
+) -> pd.DataFrame:
+    """샤드(학생 묶음) 단위 백테스트"""
+    predictor = ScorePredictor(**predictor_kwargs)
+    shard = shard.sort_values(["student_id", "subject", "created_at"], kind="stable")
+
+    student_ids = shard["student_id"].to_numpy()
+    subjects = shard["subject"].to_numpy()
+    scores = shard["score"].to_numpy(dtype=np.float64)
+    created = shard["created_at"].to_numpy()
+
+    # (학생, 과목) 경계 (정렬된 배열에서 값이 바뀌는 위치)
+    changed = (student_ids[1:] != student_ids[:-1]) | (subjects[1:] != subjects[:-1])
+    bounds = np.concatenate([[0], np.flatnonzero(changed) + 1, [len(shard)]])
+
+    records = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        gap_days = np.diff(created[start:end]).astype("timedelta64[D]").astype(np.int64)
+        gap_days = np.concatenate([[30], np.maximum(gap_days, 1)])
+
+        series_records = backtest_series(
+            predictor,
+            scores[start:end],
+            gap_days=gap_days,
+            tiers=tiers,
+            min_history=min_history,
+        )
+        for record in series_records:
+            record["student_id"] = student_ids[start]
+            record["subject"] = subjects[start]
+        records.extend(series_records)
+
+    columns = ["student_id", "subject", *RECORD_COLUMNS]
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def shard_scores(scores_df: pd.DataFrame, n_shards: int) -> list[pd.DataFrame]:
+    """학생 ID 해시로 성적을 샤드 분할 (같은 학생은 같은 샤드)"""
+    shard_ids = np.array(
+        [zlib.crc32(str(s).encode()) % n_shards for s in scores_df["student_id"]]
+    )
+    return [
+        scores_df[shard_ids == i] for i in range(n_shards) if (shard_ids == i).any()
+    ]
+
+
+def run_backtest(
+    scores_df: pd.DataFrame,
+    predictor_kwargs: dict[str, Any] | None = None,
+    tiers: list[str] | None = None,
+    workers: int = 1,
+    n_shards: int | None = None,
+    min_history: int = 3,
+) -> pd.DataFrame:
+    """
+    테넌트 전체 백테스트
+
+    Args:
+        scores_df: student_id, subject, score, created_at 컬럼을 가진 성적 DataFrame
+        predictor_kwargs: ScorePredictor 생성 인자
+        tiers: 강제 평가할 계층 목록 (None이면 자동 선택)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        n_shards: 샤드 수 (기본값: workers * 4)
+        min_history: 예측을 시작할 최소 이력 길이
+
+    Returns:
+        시점·계층별 기록 DataFrame
+    """
+    if scores_df.empty:
+        return pd.DataFrame(columns=["student_id", "subject", *RECORD_COLUMNS])
+
+    scores_df = scores_df[["student_id", "subject", "score", "created_at"]].copy()
+    scores_df["created_at"] = pd.to_datetime(scores_df["created_at"])
+    predictor_kwargs = predictor_kwargs or {}
+
+    if workers <= 1:
+        return _run_shard(scores_df, predictor_kwargs, tiers, min_history)
+
+    shards = shard_scores(scores_df, n_shards or workers * 4)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_run_shard, shard, predictor_kwargs, tiers, min_history)
+            for shard in shards
+        ]
+        frames = [f.result() for f in futures]
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize(
+    records: pd.DataFrame,
+    tolerance: float = 5.0,
+    n_bins: int = 10,
+) -> dict[str, dict[str, Any]]:
+    """
+    계층별 오차·보정·지연 시간 요약
+
+    신뢰도 보정은 "|오차| <= tolerance"를 적중으로 보고, 신뢰도 구간별
+    평균 신뢰도와 적중률의 차이를 가중 평균한 ECE로 나타냅니다.
+    """
+    summary: dict[str, dict[str, Any]] = {}
+    if records.empty:
+        return summary
+
+    for tier, group in records.groupby("tier"):
+        error = group["error"].to_numpy()
+        confidence = group["confidence"].to_numpy()
+        hit = np.abs(error) <= tolerance
+        latency = group["latency_ms"].to_numpy()
+
+        bins = np.minimum((np.clip(confidence, 0, 1) * n_bins).astype(int), n_bins - 1)
+        counts = np.bincount(bins, minlength=n_bins)
+        conf_sum = np.bincount(bins, weights=confidence, minlength=n_bins)
+        hit_sum = np.bincount(bins, weights=hit, minlength=n_bins)
+        nonzero = counts > 0
+        ece = float(
+            np.sum(np.abs(conf_sum[nonzero] - hit_sum[nonzero])) / len(group)
+        )
+
+        summary[str(tier)] = {
+            "predictions": int(len(group)),
+            "mae": round(float(np.mean(np.abs(error))), 3),
+            "rmse": round(float(np.sqrt(np.mean(error**2))), 3),
+            "bias": round(float(np.mean(error)), 3),
+            "hit_rate": round(float(np.mean(hit)), 3),
+            "mean_confidence": round(float(np.mean(confidence)), 3),
+            "ece": round(ece, 3),
+            "latency_ms_mean": round(float(np.mean(latency)), 4),
+            "latency_ms_p50": round(float(np.percentile(latency, 50)), 4),
+            "latency_ms_p95": round(float(np.percentile(latency, 95)), 4),
+        }
+
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="ScorePredictor 워크포워드 백테스트")
+    parser.add_argument("--source", choices=["synthetic", "snapshot"], default="synthetic")
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--students", type=int, default=2000, help="합성 데이터 학생 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--tiers",
+        default="auto",
+        help="auto(자동 선택), all, 또는 쉼표로 구분한 계층 목록",
+    )
+    parser.add_argument("--workers", type=int, default=detect_cpu_count())
+    parser.add_argument("--shards", type=int, default=None)
+    parser.add_argument("--min-history", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=5.0)
+    parser.add_argument("--output", default=None, help="시점별 기록 CSV 저장 경로")
+    args = parser.parse_args(argv)
+
+    source = load_data_source(
+        args.source,
+        snapshot_dir=args.snapshot_dir,
+        n_students=args.students,
+        seed=args.seed,
+    )
+    if args.tiers == "auto":
+        tiers = None
+    elif args.tiers == "all":
+        tiers = ALL_TIERS
+    else:
+        tiers = [t.strip() for t in args.tiers.split(",") if t.strip()]
+
+    scores_df = source.get_scores()
+    start = time.perf_counter()
+    records = run_backtest(
+        scores_df,
+        tiers=tiers,
+        workers=args.workers,
+        n_shards=args.shards,
+        min_history=args.min_history,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"성적 {len(scores_df):,}행, 예측 {len(records):,}건, {elapsed:.1f}초")
+    print(json.dumps(summarize(records, args.tolerance), ensure_ascii=False, indent=2))
+
+    if args.output:
+        records.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+콘텐츠 추천 리플레이 평가
+
+기준 시점(cutoff)마다 그 이전의 플랜·성적만 남기고 추천기를 호출한 뒤,
+이후 horizon_days 동안 학생이 실제로 새로 학습한 콘텐츠와 비교해
+precision@k / recall@k와 호출별 지연 시간을 기록합니다.
+협업 모델(동시 학습 행렬, ALS)은 기준 시점마다 그 이전 테넌트 플랜으로 한 번 만들고,
+학생 루프만 (기준 시점, 학생 샤드) 단위로 프로세스 풀에서 병렬 실행합니다.
+
+실행:
+    cd python
+    python -m src.evaluation.recommender_replay --source synthetic --students 2000
+    python -m src.evaluation.recommender_replay --source snapshot --snapshot-dir ./snapshot \\
+        --variants all --cutoffs 6
+"""
+
+import argparse
+import json
+import time
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..config import ML_CONFIG
+from ..ml.catalog_index import CatalogIndex
+from ..ml.content_recommender import ContentRecommender
+from ..ml.cooccurrence import ItemCooccurrence
+from ..ml.hybrid_recommender import HybridRecommender
+from ..ml.implicit_als import ImplicitFactors
+from ..thread_budget import detect_cpu_count
+from .backtest import _init_worker
+from .data_sources import load_data_source
+
+VARIANT_RULE = "rule"
+VARIANT_POPULARITY = "popularity"
+VARIANT_COOCCURRENCE = "cooccurrence"
+VARIANT_HYBRID = "hybrid"
+VARIANT_ALS = "als"
+
+# ALS는 기준 시점마다 학습하므로 기본 목록에서 제외
+DEFAULT_VARIANTS = [VARIANT_RULE, VARIANT_POPULARITY, VARIANT_COOCCURRENCE, VARIANT_HYBRID]
+ALL_VARIANTS = [*DEFAULT_VARIANTS, VARIANT_ALS]
+
+RECORD_COLUMNS = [
+    "cutoff",
+    "student_id",
+    "variant",
+    "history_length",
+    "relevant",
+    "recommended",
+    "hits",
+    "precision",
+    "recall",
+    "latency_ms",
+]
+
+
+def cutoff_dates(
+    plans_df: pd.DataFrame,
+    n_cutoffs: int,
+    horizon_days: int,
+    time_column: str = "scheduled_date",
+) -> list[pd.Timestamp]:
+    """
+    기준 시점 목록 (플랜 기간 후반부에 균등 배치, 마지막 시점 뒤에도 horizon_days 확보)
+
+    Args:
+        plans_df: 학습 플랜 DataFrame
+        n_cutoffs: 기준 시점 수
+        horizon_days: 정답 구간 길이 (일)
+        time_column: 플랜 시각 컬럼
+
+    Returns:
+        날짜 오름차순 기준 시점
+    """
+    if plans_df.empty or n_cutoffs <= 0:
+        return []
+    times = pd.to_datetime(plans_df[time_column]).dropna()
+    first, last = times.min(), times.max() - pd.Timedelta(days=horizon_days)
+    start = first + (last - first) / 2
+    if last <= start:
+        return []
+    return list(pd.date_range(start, last, periods=n_cutoffs).normalize().unique())
+
+
+def shard_students(student_ids: np.ndarray, n_shards: int) -> list[np.ndarray]:
+    """학생 ID 해시로 샤드 분할"""
+    shard_ids = np.array([zlib.crc32(str(s).encode()) % n_shards for s in student_ids])
+    return [student_ids[shard_ids == i] for i in range(n_shards) if (shard_ids == i).any()]
+
+
+def precision_recall(recommended: list, relevant: set) -> tuple[int, float, float]:
+    """
+    (적중 수, precision@k, recall@k)
+
+    precision의 분모는 요청한 k가 아니라 실제 추천 수입니다 (추천이 없으면 0).
+    """
+    hits = sum(1 for content_id in recommended if content_id in relevant)
+    precision = hits / len(recommended) if recommended else 0.0
+    recall = hits / len(relevant) if relevant else 0.0
+    return hits, precision, recall
+
+
+def _cutoff_context(
+    cutoff: pd.Timestamp,
+    plans_df: pd.DataFrame,
+    scores_df: pd.DataFrame,
+    variants: list[str],
+    horizon_days: int,
+) -> dict[str, Any]:
+    """기준 시점 1개의 데이터 분할과 협업 모델 (학생 샤드와 무관하므로 기준 시점마다 한 번 구성)"""
+    history = plans_df[plans_df["scheduled_date"] < cutoff]
+    future = plans_df[
+        (plans_df["scheduled_date"] >= cutoff)
+        & (plans_df["scheduled_date"] < cutoff + pd.Timedelta(days=horizon_days))
+    ]
+    past_scores = scores_df[scores_df["created_at"] < cutoff]
+
+    return {
+        "cutoff": cutoff,
+        "history": history,
+        "past_scores": past_scores,
+        "history_rows": history.groupby("student_id").indices,
+        "future_rows": future.groupby("student_id").indices,
+        "score_rows": past_scores.groupby("student_id").indices,
+        "future_contents": future["content_id"].to_numpy(),
+        "cooccurrence": (
+            ItemCooccurrence.from_plans(history)
+            if {VARIANT_COOCCURRENCE, VARIANT_HYBRID} & set(variants)
+            else None
+        ),
+        "factors": ImplicitFactors.train(history) if VARIANT_ALS in variants else None,
+        "popular": history["content_id"].value_counts().index.tolist(),
+    }
+
+
+def _replay_students(
+    context: dict[str, Any],
+    student_ids: np.ndarray,
+    catalog: CatalogIndex,
+    variants: list[str],
+    k: int,
+    min_history: int,
+    collaborative_weight: float,
+) -> pd.DataFrame:
+    """기준 시점 1개 × 학생 샤드 리플레이 (모델은 context에서 재사용)"""
+    cutoff = context["cutoff"]
+    history, past_scores = context["history"], context["past_scores"]
+    history_rows, future_rows = context["history_rows"], context["future_rows"]
+    score_rows = context["score_rows"]
+    cooccurrence, factors = context["cooccurrence"], context["factors"]
+    popular = context["popular"]
+    history_contents = history["content_id"].to_numpy()
+    future_contents = context["future_contents"]
+    recommender = ContentRecommender()
+    hybrid = HybridRecommender(recommender)
+
+    records = []
+    for student_id in student_ids:
+        rows = history_rows.get(student_id)
+        if rows is None or len(rows) < min_history or student_id not in future_rows:
+            continue
+        studied = set(history_contents[rows])
+        relevant = set(future_contents[future_rows[student_id]]) - studied
+        if not relevant:
+            continue
+
+        student_plans = history.iloc[rows]
+        student_scores = past_scores.iloc[score_rows.get(student_id, [])]
+
+        calls: dict[str, Callable[[], list]] = {
+            VARIANT_RULE: lambda: _content_ids(
+                recommender.recommend(
+                    scores_df=student_scores,
+                    contents_df=catalog.frame,
+                    plans_df=student_plans,
+                    limit=k,
+                    include_reasons=False,
+                    catalog=catalog,
+                )
+            ),
+            VARIANT_POPULARITY: lambda: _unseen(popular, studied, k),
+            VARIANT_COOCCURRENCE: lambda: [c for c, _ in cooccurrence.recommend(student_id, k)],
+            VARIANT_HYBRID: lambda: _content_ids(
+                hybrid.recommend(
+                    student_id,
+                    student_scores,
+                    student_plans,
+                    catalog,
+                    cooccurrence,
+                    collaborative_weight,
+                    limit=k,
+                    include_reasons=False,
+                )
+            ),
+            VARIANT_ALS: lambda: [c for c, _ in factors.recommend(student_id, limit=k)],
+        }
+        for variant in variants:
+            start = time.perf_counter()
+            recommended = calls[variant]()
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            hits, precision, recall = precision_recall(recommended, relevant)
+            records.append(
+                {
+                    "cutoff": cutoff,
+                    "student_id": student_id,
+                    "variant": variant,
+                    "history_length": len(rows),
+                    "relevant": len(relevant),
+                    "recommended": len(recommended),
+                    "hits": hits,
+                    "precision": precision,
+                    "recall": recall,
+                    "latency_ms": latency_ms,
+                }
+            )
+
+    return pd.DataFrame.from_records(records, columns=RECORD_COLUMNS)
+
+
+# 워커 프로세스의 기준 시점별 context와 공통 인자 (풀 초기화 때 워커마다 한 번 전달)
+_worker_state: dict[str, Any] = {}
+
+
+def _init_replay_worker(contexts: list[dict[str, Any]], *args: Any) -> None:
+    """워커 초기화 (스레드 예산 + 기준 시점 context 보관)"""
+    _init_worker()
+    _worker_state["contexts"] = contexts
+    _worker_state["args"] = args
+
+
+def _replay_shard(index: int, student_ids: np.ndarray) -> pd.DataFrame:
+    """워커에서 기준 시점 index의 학생 샤드 리플레이"""
+    return _replay_students(
+        _worker_state["contexts"][index], student_ids, *_worker_state["args"]
+    )
+
+
+def _unseen(ranked: list, studied: set, k: int) -> list:
+    """순위 목록에서 학습하지 않은 상위 k개"""
+    return [c for c in ranked[: k + len(studied)] if c not in studied][:k]
+
+
+def _content_ids(result: dict[str, Any]) -> list:
+    """추천 결과의 content_id 목록"""
+    return [rec["content_id"] for rec in result["recommendations"]]
+
+
+def run_replay(
+    plans_df: pd.DataFrame,
+    scores_df: pd.DataFrame,
+    contents_df: pd.DataFrame,
+    variants: list[str] | None = None,
+    k: int = 10,
+    n_cutoffs: int = 4,
+    horizon_days: int = 30,
+    min_history: int = 5,
+    collaborative_weight: float | None = None,
+    workers: int = 1,
+    n_shards: int | None = None,
+) -> pd.DataFrame:
+    """
+    테넌트 전체 추천 리플레이
+
+    Args:
+        plans_df: student_id, content_id, scheduled_date (+ content_type, status,
+            actual_duration) 컬럼을 가진 플랜 DataFrame
+        scores_df: student_id, subject, score, created_at 컬럼을 가진 성적 DataFrame
+        contents_df: 콘텐츠 카탈로그 (id, subject, content_type, difficulty)
+        variants: 평가할 추천기 목록 (기본값: DEFAULT_VARIANTS)
+        k: 추천 개수
+        n_cutoffs: 기준 시점 수
+        horizon_days: 정답 구간 길이 (일)
+        min_history: 평가할 학생의 기준 시점 이전 최소 플랜 수
+        collaborative_weight: 혼합 추천 협업 비중 (기본값: 설정값)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        n_shards: 기준 시점당 학생 샤드 수 (기본값: 작업 수가 workers * 2 이상이 되도록)
+
+    Returns:
+        (기준 시점, 학생, 추천기)별 기록 DataFrame
+    """
+    variants = variants or DEFAULT_VARIANTS
+    unknown = set(variants) - set(ALL_VARIANTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 추천기: {sorted(unknown)}")
+    if collaborative_weight is None:
+        collaborative_weight = ML_CONFIG["content_recommendation"]["hybrid"][
+            "collaborative_weight"
+        ]
+
+    if plans_df.empty or contents_df.empty:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+    plans_df = plans_df.dropna(subset=["student_id", "content_id"]).copy()
+    plans_df["scheduled_date"] = pd.to_datetime(plans_df["scheduled_date"])
+    scores_df = scores_df.copy()
+    if not scores_df.empty:
+        scores_df["created_at"] = pd.to_datetime(scores_df["created_at"])
+    else:
+        scores_df = pd.DataFrame(columns=["student_id", "subject", "score", "created_at"])
+
+    cutoffs = cutoff_dates(plans_df, n_cutoffs, horizon_days)
+    student_ids = plans_df["student_id"].unique()
+    shards_per_cutoff = n_shards or max(1, -(-workers * 2 // max(len(cutoffs), 1)))
+    shards = shard_students(student_ids, shards_per_cutoff)
+    tasks = [(index, shard) for index in range(len(cutoffs)) for shard in shards]
+    if not tasks:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+
+    # 협업 모델은 현재 프로세스에서 기준 시점마다 한 번만 만들고, 워커에는 풀 초기화 때
+    # 한 번 넘겨 작업마다 전체 프레임을 직렬화하지 않음 (학생 루프만 샤드로 병렬화)
+    contexts = [
+        _cutoff_context(cutoff, plans_df, scores_df, variants, horizon_days) for cutoff in cutoffs
+    ]
+    args = (CatalogIndex.build(contents_df), variants, k, min_history, collaborative_weight)
+    if workers <= 1:
+        frames = [_replay_students(contexts[index], shard, *args) for index, shard in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_replay_worker, initargs=(contexts, *args)
+        ) as pool:
+            futures = [pool.submit(_replay_shard, index, shard) for index, shard in tasks]
+            frames = [f.result() for f in futures]
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_replay(records: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    """추천기별 precision@k / recall@k / 적중률 / 지연 시간 요약"""
+    summary: dict[str, dict[str, Any]] = {}
+    if records.empty:
+        return summary
+
+    for variant, group in records.groupby("variant", sort=False):
+        latency = group["latency_ms"].to_numpy(dtype=np.float64)
+        summary[str(variant)] = {
+            "evaluations": int(len(group)),
+            "precision_at_k": round(float(group["precision"].mean()), 4),
+            "recall_at_k": round(float(group["recall"].mean()), 4),
+            "hit_rate": round(float((group["hits"] > 0).mean()), 4),
+            "latency_ms_mean": round(float(np.mean(latency)), 4),
+            "latency_ms_p50": round(float(np.percentile(latency, 50)), 4),
+            "latency_ms_p95": round(float(np.percentile(latency, 95)), 4),
+        }
+
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="콘텐츠 추천 리플레이 평가")
+    parser.add_argument("--source", choices=["synthetic", "snapshot"], default="synthetic")
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--students", type=int, default=2000, help="합성 데이터 학생 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--variants",
+        default=",".join(DEFAULT_VARIANTS),
+        help="all 또는 쉼표로 구분한 추천기 목록 (rule, popularity, cooccurrence, hybrid, als)",
+    )
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--cutoffs", type=int, default=4)
+    parser.add_argument("--horizon-days", type=int, default=30)
+    parser.add_argument("--min-history", type=int, default=5)
+    parser.add_argument("--collaborative-weight", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=detect_cpu_count())
+    parser.add_argument("--shards", type=int, default=None)
+    parser.add_argument("--output", default=None, help="호출별 기록 CSV 저장 경로")
+    args = parser.parse_args(argv)
+
+    source = load_data_source(
+        args.source,
+        snapshot_dir=args.snapshot_dir,
+        n_students=args.students,
+        seed=args.seed,
+    )
+    if args.variants == "all":
+        variants = ALL_VARIANTS
+    else:
+        variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+
+    plans_df = source.get_plans()
+    start = time.perf_counter()
+    records = run_replay(
+        plans_df,
+        source.get_scores(),
+        source.get_contents(),
+        variants=variants,
+        k=args.k,
+        n_cutoffs=args.cutoffs,
+        horizon_days=args.horizon_days,
+        min_history=args.min_history,
+        collaborative_weight=args.collaborative_weight,
+        workers=args.workers,
+        n_shards=args.shards,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"플랜 {len(plans_df):,}행, 평가 {len(records):,}건, {elapsed:.1f}초")
+    print(json.dumps(summarize_replay(records), ensure_ascii=False, indent=2))
+
+    if args.output:
+        records.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
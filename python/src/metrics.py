@@ -0,0 +1,108 @@
+"""
+서비스 메트릭 레지스트리
+
+게이지, 카운터, 히스토그램을 프로세스 메모리에 유지하고
+/metrics 엔드포인트에서 JSON 스냅샷으로 노출합니다.
+"""
+
+import bisect
+import threading
+from functools import lru_cache
+from typing import Any
+
+# 기본 히스토그램 버킷 (ms 단위 지연 시간 기준)
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """고정 버킷 히스토그램"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """값 기록"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """현재 상태 (버킷별 누적 개수 포함)"""
+        cumulative = []
+        running = 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+
+        labels = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "buckets": dict(zip(labels, cumulative)),
+        }
+
+
+class MetricsRegistry:
+    """프로세스 단위 메트릭 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gauges: dict[str, float] = {}
+        self._counters: dict[str, float] = {}
+        self._histograms: dict[str, Histogram] = {}
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """게이지 값 설정"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """히스토그램에 값 기록 (첫 기록 시 버킷 확정)"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """전체 메트릭 스냅샷"""
+        with self._lock:
+            return {
+                "gauges": dict(self._gauges),
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: h.snapshot() for name, h in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """모든 메트릭 초기화 (테스트용)"""
+        with self._lock:
+            self._gauges.clear()
+            self._counters.clear()
+            self._histograms.clear()
+
+
+@lru_cache()
+def get_metrics() -> MetricsRegistry:
+    """
+    싱글톤 패턴으로 MetricsRegistry 인스턴스 반환
+
+    Returns:
+        MetricsRegistry 인스턴스
+    """
+    return MetricsRegistry()
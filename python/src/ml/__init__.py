@@ -3,6 +3,35 @@ ML 모델 모듈
 """
 
 from .score_predictor import ScorePredictor
+from .bandit_reranker import BanditReranker
+from .catalog_index import CatalogIndex, CatalogRegistry
 from .content_recommender import ContentRecommender
+from .cooccurrence import CooccurrenceRegistry, ItemCooccurrence
+from .feature_store import FeatureStore, StudentFeatures
+from .hybrid_recommender import HybridRecommender
+from .implicit_als import ImplicitFactors
+from .interaction_matrix import InteractionMatrix
+from .minhash_lsh import MinHashLSH
+from .pattern_counters import PatternCounterStore
+from .tenant_history import TenantHistory
+from .trend_stats import TrendAccumulator, TrendStatsStore
 
-__all__ = ["ScorePredictor", "ContentRecommender"]
+__all__ = [
+    "ScorePredictor",
+    "ContentRecommender",
+    "CatalogIndex",
+    "CatalogRegistry",
+    "FeatureStore",
+    "StudentFeatures",
+    "InteractionMatrix",
+    "ItemCooccurrence",
+    "CooccurrenceRegistry",
+    "HybridRecommender",
+    "BanditReranker",
+    "ImplicitFactors",
+    "MinHashLSH",
+    "PatternCounterStore",
+    "TenantHistory",
+    "TrendAccumulator",
+    "TrendStatsStore",
+]
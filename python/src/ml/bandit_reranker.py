@@ -0,0 +1,278 @@
+"""
+온라인 밴딧 재정렬 (톰슨 샘플링)
+
+규칙 기반 점수 상위 후보를 (학생 전략 구간, 콘텐츠 팔)별 완료율 베타 사후분포에서
+뽑은 값과 섞어 재정렬합니다. 팔은 (취약 과목 여부, 난이도, 유형)이며,
+추천마다 붙는 feedback_token으로 완료/미완료 피드백을 받아 α/β를 1씩 더합니다 (O(1), 재학습 없음).
+
+feedback_token은 (구간:팔, 학생, 콘텐츠, 발급 시각, nonce)를 서명한 값이라 어느 워커에서나
+검증할 수 있습니다. 사후분포(팔마다 한 행)와 사용한 nonce(만료 시각 색인)는 워커가 함께 쓰는
+SQLite 파일에 두어 재시작 후에도 유지되며, 피드백마다 해당 팔 한 행과 nonce 한 행만 씁니다.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..config import DATA_DIR
+
+TOKEN_SEPARATOR = ":"
+DEFAULT_STATE_PATH = DATA_DIR / "bandit_state.sqlite3"
+
+# 피드백마다 지울 만료 nonce 최대 수 (만료 시각 색인으로 찾으므로 사용 기록 크기와 무관)
+_PRUNE_BATCH = 16
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS posteriors "
+    "(key TEXT PRIMARY KEY, alpha REAL NOT NULL, beta REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS spent (nonce TEXT PRIMARY KEY, expires_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS spent_expires_at ON spent (expires_at)",
+)
+
+
+class FeedbackTokenError(ValueError):
+    """검증할 수 없는 피드백 토큰 (위조, 만료, 다른 학생/콘텐츠)"""
+
+
+class FeedbackTokenReused(FeedbackTokenError):
+    """이미 반영한 피드백 토큰"""
+
+
+def arm_of(recommendation: dict[str, Any], weak_subjects: list[str] | set[str]) -> str:
+    """추천 항목의 팔 키 (취약 과목 여부|난이도|유형)"""
+
+    def text(value: Any) -> str:
+        return "-" if value is None or value != value or value == "" else str(value)
+
+    weak = "weak" if recommendation.get("subject") in weak_subjects else "other"
+    return "|".join(
+        (weak, text(recommendation.get("difficulty")), text(recommendation.get("content_type")))
+    )
+
+
+class BanditReranker:
+    """
+    구간별 베타-베르누이 톰슨 샘플링 재정렬기 (프로세스당 1개, 상태는 워커 간 공유)
+
+    최종 점수 = (1 - weight) × 규칙 점수 + weight × 100 × θ, θ ~ Beta(α, β)
+    """
+
+    def __init__(
+        self,
+        weight: float = 0.2,
+        prior_alpha: float = 1.0,
+        prior_beta: float = 1.0,
+        seed: int | None = None,
+        state_path: str | Path | None = None,
+        secret: bytes | None = None,
+        token_ttl_seconds: float = 14 * 86400.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            weight: 샘플링한 완료율의 점수 비중 (0-1)
+            prior_alpha: 사전 완료 수
+            prior_beta: 사전 미완료 수
+            seed: 난수 시드 (테스트용)
+            state_path: 사후분포·사용한 토큰 SQLite 파일 (None이면 프로세스 메모리에만 유지)
+            secret: 토큰 서명 키 (None이면 프로세스마다 임의 생성 → 발급한 워커에서만 검증)
+            token_ttl_seconds: 토큰 유효 기간 (초)
+            clock: 초 단위 벽시계 (테스트용)
+        """
+        self.weight = weight
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.token_ttl_seconds = token_ttl_seconds
+        self._secret = secret or secrets.token_bytes(32)
+        self._clock = clock
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._db = self._connect()
+
+    def rerank(
+        self,
+        recommendations: list[dict[str, Any]],
+        segment: str,
+        weak_subjects: list[str],
+        limit: int,
+        student_id: str,
+    ) -> list[dict[str, Any]]:
+        """
+        후보 재정렬 후 상위 limit개 (각 항목에 feedback_token 추가, relevance_score는 혼합 점수)
+
+        Args:
+            recommendations: 규칙 기반 상위 후보 (relevance_score 내림차순)
+            segment: 학생 구간 (추천 전략)
+            weak_subjects: 학생 취약 과목
+            limit: 반환 개수
+            student_id: 토큰을 발급할 학생 ID
+
+        Returns:
+            재정렬된 추천 목록
+        """
+        if not recommendations:
+            return []
+
+        keys = [
+            f"{segment}{TOKEN_SEPARATOR}{arm_of(rec, weak_subjects)}" for rec in recommendations
+        ]
+        with self._lock:
+            known = self._posteriors(set(keys))
+            prior = (self.prior_alpha, self.prior_beta)
+            posteriors = np.array([known.get(key, prior) for key in keys])
+            sampled = self._rng.beta(posteriors[:, 0], posteriors[:, 1])
+
+        relevance = np.array([rec["relevance_score"] for rec in recommendations])
+        blended = (1 - self.weight) * relevance + self.weight * 100 * sampled
+        order = np.argsort(-blended, kind="stable")[:limit]
+        return [
+            {
+                **recommendations[i],
+                "relevance_score": round(float(blended[i]), 2),
+                "feedback_token": self.issue_token(
+                    keys[i], student_id, str(recommendations[i]["content_id"])
+                ),
+            }
+            for i in order
+        ]
+
+    def issue_token(self, key: str, student_id: str, content_id: str) -> str:
+        """(구간:팔, 학생, 콘텐츠, 발급 시각, nonce) 서명 토큰"""
+        payload = json.dumps(
+            [key, student_id, content_id, int(self._clock()), secrets.token_hex(8)],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        body = base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+        return f"{body}.{self._sign(body)}"
+
+    def update(
+        self, token: str, student_id: str, content_id: str, completed: bool
+    ) -> tuple[float, float]:
+        """
+        완료 피드백 반영 (O(1), 토큰마다 한 번)
+
+        Args:
+            token: 추천 응답의 feedback_token
+            student_id: 피드백을 보낸 학생 ID (토큰 발급 학생과 같아야 함)
+            content_id: 추천 콘텐츠 ID (토큰 발급 콘텐츠와 같아야 함)
+            completed: 추천 콘텐츠를 완료했는지 여부
+
+        Returns:
+            갱신된 (α, β)
+
+        Raises:
+            FeedbackTokenError: 위조·만료 토큰이거나 학생/콘텐츠가 다른 경우
+            FeedbackTokenReused: 이미 반영한 토큰
+        """
+        key, issued_at, nonce = self._verify(token, student_id, content_id)
+        completed_step, missed_step = (1.0, 0.0) if completed else (0.0, 1.0)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # 만료된 nonce는 만료 시각 색인으로 조금씩 지움 (전체 순회 없음)
+                self._db.execute(
+                    "DELETE FROM spent WHERE nonce IN "
+                    "(SELECT nonce FROM spent WHERE expires_at < ? LIMIT ?)",
+                    (self._clock(), _PRUNE_BATCH),
+                )
+                try:
+                    self._db.execute(
+                        "INSERT INTO spent (nonce, expires_at) VALUES (?, ?)",
+                        (nonce, issued_at + self.token_ttl_seconds),
+                    )
+                except sqlite3.IntegrityError:
+                    raise FeedbackTokenReused("이미 반영한 피드백 토큰입니다.") from None
+                self._db.execute(
+                    "INSERT INTO posteriors (key, alpha, beta) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET alpha = alpha + ?, beta = beta + ?",
+                    (
+                        key,
+                        self.prior_alpha + completed_step,
+                        self.prior_beta + missed_step,
+                        completed_step,
+                        missed_step,
+                    ),
+                )
+                alpha, beta = self._db.execute(
+                    "SELECT alpha, beta FROM posteriors WHERE key = ?", (key,)
+                ).fetchone()
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return alpha, beta
+
+    def posterior_mean(self, key: str) -> float | None:
+        """팔의 사후 평균 완료율 (피드백이 없으면 None)"""
+        with self._lock:
+            posterior = self._posteriors({key}).get(key)
+        if posterior is None:
+            return None
+        return posterior[0] / (posterior[0] + posterior[1])
+
+    def _sign(self, body: str) -> str:
+        return hmac.new(self._secret, body.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def _verify(self, token: str, student_id: str, content_id: str) -> tuple[str, int, str]:
+        """서명·유효 기간·학생/콘텐츠 확인 후 (구간:팔, 발급 시각, nonce)"""
+        body, _, signature = token.rpartition(".")
+        if not body or not hmac.compare_digest(signature, self._sign(body)):
+            raise FeedbackTokenError("알 수 없는 피드백 토큰입니다.")
+        key, token_student, token_content, issued_at, nonce = json.loads(
+            base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        )
+        if token_student != student_id or token_content != content_id:
+            raise FeedbackTokenError("다른 학생 또는 콘텐츠의 피드백 토큰입니다.")
+        if self._clock() - issued_at > self.token_ttl_seconds:
+            raise FeedbackTokenError("만료된 피드백 토큰입니다.")
+        return key, issued_at, nonce
+
+    def _connect(self) -> sqlite3.Connection:
+        """상태 DB 연결 (트랜잭션은 직접 관리, 워커 간 동시 읽기를 위해 WAL)"""
+        if self.state_path is None:
+            database = ":memory:"
+        else:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            database = str(self.state_path)
+        db = sqlite3.connect(database, timeout=5.0, isolation_level=None, check_same_thread=False)
+        if self.state_path is not None:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            db.execute(statement)
+        return db
+
+    def _posteriors(self, keys: set[str]) -> dict[str, tuple[float, float]]:
+        """주어진 팔들의 저장된 (α, β) (잠금 안에서 호출, 피드백이 없는 팔은 빠짐)"""
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._db.execute(
+            f"SELECT key, alpha, beta FROM posteriors WHERE key IN ({placeholders})",
+            tuple(keys),
+        )
+        return {key: (alpha, beta) for key, alpha, beta in rows}
+
+
+def bandit_state_path() -> Path:
+    """상태 DB 경로 (ML_BANDIT_STATE_PATH 또는 data/bandit_state.sqlite3)"""
+    return Path(os.getenv("ML_BANDIT_STATE_PATH", str(DEFAULT_STATE_PATH)))
+
+
+def feedback_token_secret() -> bytes | None:
+    """워커가 함께 쓰는 토큰 서명 키 (ML_FEEDBACK_TOKEN_SECRET, 없으면 None)"""
+    secret = os.getenv("ML_FEEDBACK_TOKEN_SECRET")
+    return secret.encode() if secret else None
@@ -0,0 +1,139 @@
+"""
+추론 마이크로 배처
+
+짧은 시간 안에 몰린 추론 요청을 최대 N건 또는 T밀리초 동안 모아
+한 번의 벡터화된 배치 함수로 처리한 뒤, 대기 중인 코루틴에 결과를 돌려줍니다.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Generic, TypeVar
+
+from ..metrics import MetricsRegistry, get_metrics
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 배치 크기 히스토그램 버킷
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    asyncio 기반 마이크로 배처
+
+    batch_fn은 입력 목록을 받아 같은 순서의 결과 목록을 반환하는 동기 함수입니다.
+    이벤트 루프를 막지 않도록 executor(없으면 기본 스레드 풀)에서 실행하며, 배치는 한 번에
+    하나씩 처리합니다. 배치로 묶어 이득을 보는 벡터화 가능한 연산만 제출해야 합니다.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], list[R]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        name: str = "batch",
+        metrics: MetricsRegistry | None = None,
+        executor: Executor | None = None,
+    ):
+        """
+        Args:
+            batch_fn: 배치 처리 함수
+            max_batch_size: 배치 최대 크기 (N)
+            max_wait_ms: 첫 요청 이후 최대 대기 시간 (T)
+            name: 메트릭 이름 접두사
+            metrics: 메트릭 레지스트리 (기본값: 전역 레지스트리)
+            executor: batch_fn을 실행할 실행기 (기본값: 이벤트 루프 기본 스레드 풀)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self.metrics = metrics or get_metrics()
+        self.executor = executor
+
+        self._queue: asyncio.Queue[tuple[T, asyncio.Future[R], float]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, item: T) -> R:
+        """요청 제출 후 배치 처리 결과 대기"""
+        self._ensure_worker()
+        assert self._queue is not None and self._loop is not None
+
+        future: asyncio.Future[R] = self._loop.create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        """현재 이벤트 루프에 배치 워커가 없으면 시작"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def close(self) -> None:
+        """배치 워커 종료"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+
+            # N건 또는 T밀리초까지 수집
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._process(batch)
+
+    async def _process(self, batch: list[tuple[T, "asyncio.Future[R]", float]]) -> None:
+        assert self._loop is not None
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+
+        try:
+            results: list[Any] = await self._loop.run_in_executor(
+                self.executor, self.batch_fn, items
+            )
+            if len(results) != len(items):
+                raise RuntimeError("배치 함수 결과 개수가 입력과 다릅니다.")
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            finished = time.perf_counter()
+            self.metrics.observe(
+                f"{self.name}.batch_size", len(batch), buckets=BATCH_SIZE_BUCKETS
+            )
+            self.metrics.observe(f"{self.name}.compute_ms", (finished - started) * 1000)
+            for _, _, enqueued in batch:
+                self.metrics.observe(f"{self.name}.wait_ms", (started - enqueued) * 1000)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,542 @@
+"""
+테넌트 콘텐츠 카탈로그 인덱스
+
+테넌트 전체 카탈로그(교재/강의)를 열 지향 배열로 메모리에 유지하고, 과목·난이도·
+콘텐츠 유형 값마다 비트셋(행 위치별 1비트, np.uint8로 압축)을 미리 만들어 둡니다.
+필터는 비트셋 AND/OR로, 학습 여부는 ID 비트셋으로 계산하므로 요청마다 카탈로그를
+다시 내려받거나 복사하지 않습니다. 변경분은 upsert/remove로 점진 반영합니다.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# 비트셋을 만드는 속성
+INDEXED_ATTRIBUTES = ("subject", "difficulty", "content_type")
+
+# 증분 조회 기준 컬럼
+UPDATED_AT_COLUMN = "updated_at"
+
+_INITIAL_CAPACITY = 1024
+
+# np.bitwise_count는 numpy 2.0부터 제공 (1.26에서는 바이트별 비트 수 테이블 사용)
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# ============================================
+# 비트셋 연산 (np.uint8, little bit order)
+# ============================================
+
+
+def empty_bitset(n_bits: int) -> np.ndarray:
+    """모든 비트가 0인 비트셋"""
+    return np.zeros((n_bits + 7) // 8, dtype=np.uint8)
+
+
+def set_bits(bits: np.ndarray, positions: np.ndarray, on: bool = True) -> None:
+    """positions 위치의 비트를 켜거나 끄기 (제자리 갱신)"""
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(positions) == 0:
+        return
+    masks = np.left_shift(1, positions & 7).astype(np.uint8)
+    if on:
+        np.bitwise_or.at(bits, positions >> 3, masks)
+    else:
+        np.bitwise_and.at(bits, positions >> 3, ~masks)
+
+
+def bitset_positions(bits: np.ndarray, n_bits: int) -> np.ndarray:
+    """켜진 비트의 위치 (오름차순)"""
+    return np.flatnonzero(np.unpackbits(bits, count=n_bits, bitorder="little"))
+
+
+def bitset_count(bits: np.ndarray) -> int:
+    """켜진 비트 수"""
+    if _HAS_BITWISE_COUNT:
+        return int(np.bitwise_count(bits).sum())
+    return _table_bitset_count(bits)
+
+
+def _table_bitset_count(bits: np.ndarray) -> int:
+    """바이트별 비트 수 테이블로 센 켜진 비트 수 (numpy < 2.0)"""
+    return int(_POPCOUNT_TABLE[bits].sum(dtype=np.int64))
+
+
+def bitset_test(bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """positions 위치의 비트 값 (bool 배열)"""
+    positions = np.asarray(positions, dtype=np.int64)
+    return ((bits[positions >> 3] >> (positions & 7)) & 1).astype(bool)
+
+
+class StudentOverlay:
+    """
+    학생별 콘텐츠 연결 (공유 카탈로그 위에 얹는 얇은 행)
+
+    콘텐츠 속성은 카탈로그에만 두고, 학생 쪽에는 카탈로그 행 위치(정수)와
+    진도/학습 여부만 둡니다. 순서는 연결 행 순서를 따릅니다.
+    """
+
+    __slots__ = ("positions", "progress", "studied", "n_unresolved")
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        progress: np.ndarray,
+        studied: np.ndarray,
+        n_unresolved: int = 0,
+    ):
+        """
+        Args:
+            positions: 카탈로그 행 위치 (int64)
+            progress: 진도 (0-1, 모르면 NaN)
+            studied: 학습 완료 여부
+            n_unresolved: 카탈로그에서 찾지 못한 연결 수
+        """
+        self.positions = positions
+        self.progress = progress
+        self.studied = studied
+        self.n_unresolved = n_unresolved
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+class CatalogIndex:
+    """
+    콘텐츠 카탈로그 인덱스
+
+    행 위치는 추가 순서대로 고정되며, 삭제된 행은 생존 비트만 끕니다.
+    frame은 변경이 있을 때만 다시 만들며 인덱스 속성은 범주형 컬럼이므로
+    ContentRecommender 점수 커널이 factorize 없이 코드를 바로 사용합니다.
+    """
+
+    def __init__(self, attributes: tuple[str, ...] = INDEXED_ATTRIBUTES):
+        """
+        Args:
+            attributes: 비트셋을 만들 속성 컬럼
+        """
+        self.attributes = attributes
+        self.version = 0
+        self.watermark: Any = None  # 반영한 updated_at 최댓값
+
+        self._n_rows = 0
+        self._capacity = 0
+        self._positions: dict[Any, int] = {}
+        self._ids = np.empty(0, dtype=object)
+        self._alive = empty_bitset(0)
+        self._payload: dict[str, np.ndarray] = {}
+
+        # 속성별 값 사전, 행별 코드(-1은 결측), 값별 비트셋
+        self._values: dict[str, list[Any]] = {a: [] for a in attributes}
+        self._value_codes: dict[str, dict[Any, int]] = {a: {} for a in attributes}
+        self._codes: dict[str, np.ndarray] = {a: np.empty(0, dtype=np.int32) for a in attributes}
+        self._bitsets: dict[str, list[np.ndarray]] = {a: [] for a in attributes}
+
+        self._frame: pd.DataFrame | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """살아 있는 콘텐츠 수"""
+        return bitset_count(self._alive)
+
+    def __contains__(self, content_id: Any) -> bool:
+        position = self._positions.get(content_id)
+        return position is not None and bool(bitset_test(self._alive, [position])[0])
+
+    @property
+    def n_rows(self) -> int:
+        """삭제된 행을 포함한 전체 행 수 (frame 길이)"""
+        return self._n_rows
+
+    @classmethod
+    def build(
+        cls,
+        contents_df: pd.DataFrame,
+        attributes: tuple[str, ...] = INDEXED_ATTRIBUTES,
+    ) -> "CatalogIndex":
+        """콘텐츠 DataFrame으로 인덱스 생성"""
+        index = cls(attributes)
+        index.upsert(contents_df)
+        return index
+
+    def copy(self) -> "CatalogIndex":
+        """
+        독립 사본 (배열·비트셋을 복사하므로 사본을 갱신해도 원본을 읽는 요청에 영향 없음)
+        """
+        clone = CatalogIndex(self.attributes)
+        with self._lock:
+            clone.version = self.version
+            clone.watermark = self.watermark
+            clone._n_rows = self._n_rows
+            clone._capacity = self._capacity
+            clone._positions = dict(self._positions)
+            clone._ids = self._ids.copy()
+            clone._alive = self._alive.copy()
+            clone._payload = {c: p.copy() for c, p in self._payload.items()}
+            for attribute in self.attributes:
+                clone._values[attribute] = list(self._values[attribute])
+                clone._value_codes[attribute] = dict(self._value_codes[attribute])
+                clone._codes[attribute] = self._codes[attribute].copy()
+                clone._bitsets[attribute] = [b.copy() for b in self._bitsets[attribute]]
+            clone._frame = self._frame
+        return clone
+
+    # ============================================
+    # 갱신
+    # ============================================
+
+    def upsert(self, contents_df: pd.DataFrame) -> int:
+        """
+        콘텐츠 추가/수정 (id 기준)
+
+        수정된 행은 기존 위치를 유지하고 바뀐 속성의 비트만 옮깁니다.
+
+        Args:
+            contents_df: id 컬럼과 속성/부가 컬럼 (같은 id가 여러 번 나오면 마지막 행 사용)
+
+        Returns:
+            반영한 행 수
+        """
+        if contents_df.empty:
+            return 0
+        contents_df = contents_df.drop_duplicates("id", keep="last")
+        ids = contents_df["id"].to_numpy()
+
+        with self._lock:
+            positions = np.fromiter(
+                (self._positions.get(i, -1) for i in ids), dtype=np.int64, count=len(ids)
+            )
+            new = positions < 0
+            n_new = int(new.sum())
+            self._reserve(self._n_rows + n_new)
+            positions[new] = np.arange(self._n_rows, self._n_rows + n_new)
+            self._positions.update(zip(ids[new], positions[new].tolist()))
+            self._ids[positions] = ids
+            self._n_rows += n_new
+
+            for attribute in self.attributes:
+                if attribute in contents_df.columns:
+                    self._update_attribute(attribute, positions, contents_df[attribute])
+
+            for column in contents_df.columns:
+                if column == "id" or column in self.attributes:
+                    continue
+                payload = self._payload.get(column)
+                if payload is None:
+                    payload = self._payload[column] = np.full(self._capacity, None, dtype=object)
+                payload[positions] = contents_df[column].to_numpy(dtype=object)
+
+            set_bits(self._alive, positions)
+
+            if UPDATED_AT_COLUMN in contents_df.columns:
+                latest = contents_df[UPDATED_AT_COLUMN].dropna().max()
+                if pd.notna(latest) and (self.watermark is None or latest > self.watermark):
+                    self.watermark = latest
+
+            self._changed()
+        return len(ids)
+
+    def remove(self, content_ids: Iterable[Any]) -> int:
+        """
+        콘텐츠 삭제 (생존 비트와 속성 비트만 끄고 행 위치는 유지)
+
+        Returns:
+            삭제한 콘텐츠 수
+        """
+        with self._lock:
+            positions = np.array(
+                [p for p in (self._positions.get(i) for i in content_ids) if p is not None],
+                dtype=np.int64,
+            )
+            if len(positions) == 0:
+                return 0
+            positions = positions[bitset_test(self._alive, positions)]
+            if len(positions) == 0:
+                return 0
+
+            set_bits(self._alive, positions, on=False)
+            for attribute in self.attributes:
+                self._move_bits(attribute, positions, np.full(len(positions), -1, dtype=np.int32))
+
+            self._changed()
+            return len(positions)
+
+    def _reserve(self, n_rows: int) -> None:
+        """용량을 두 배씩 늘림"""
+        if n_rows <= self._capacity:
+            return
+        capacity = max(_INITIAL_CAPACITY, self._capacity)
+        while capacity < n_rows:
+            capacity *= 2
+
+        def grow(array: np.ndarray, fill: Any) -> np.ndarray:
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[: len(array)] = array
+            return grown
+
+        def grow_bits(bits: np.ndarray) -> np.ndarray:
+            grown = empty_bitset(capacity)
+            grown[: len(bits)] = bits
+            return grown
+
+        self._ids = grow(self._ids, None)
+        self._alive = grow_bits(self._alive)
+        self._payload = {c: grow(p, None) for c, p in self._payload.items()}
+        for attribute in self.attributes:
+            self._codes[attribute] = grow(self._codes[attribute], -1)
+            self._bitsets[attribute] = [grow_bits(b) for b in self._bitsets[attribute]]
+        self._capacity = capacity
+
+    def _update_attribute(self, attribute: str, positions: np.ndarray, values: pd.Series) -> None:
+        """속성 값을 코드로 바꾸고 바뀐 행의 비트 이동"""
+        value_codes = self._value_codes[attribute]
+        local_codes, uniques = pd.factorize(values)
+        # 마지막 칸은 결측(-1)
+        lookup = np.full(len(uniques) + 1, -1, dtype=np.int32)
+        for i, value in enumerate(uniques):
+            code = value_codes.get(value)
+            if code is None:
+                code = value_codes[value] = len(self._values[attribute])
+                self._values[attribute].append(value)
+                self._bitsets[attribute].append(empty_bitset(self._capacity))
+            lookup[i] = code
+        self._move_bits(attribute, positions, lookup[local_codes])
+
+    def _move_bits(self, attribute: str, positions: np.ndarray, new_codes: np.ndarray) -> None:
+        """행별 코드 변경을 값 비트셋에 반영"""
+        codes = self._codes[attribute]
+        bitsets = self._bitsets[attribute]
+        old_codes = codes[positions]
+        changed = old_codes != new_codes
+
+        for code in np.unique(old_codes[changed]):
+            if code >= 0:
+                set_bits(bitsets[code], positions[changed & (old_codes == code)], on=False)
+        for code in np.unique(new_codes[changed]):
+            if code >= 0:
+                set_bits(bitsets[code], positions[changed & (new_codes == code)])
+
+        codes[positions] = new_codes
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._frame = None
+
+    # ============================================
+    # 조회
+    # ============================================
+
+    def mask(self, **filters: Any) -> np.ndarray:
+        """
+        필터 비트셋 (살아 있는 행 ∩ 속성별 조건)
+
+        Args:
+            **filters: 속성명=값 또는 값 목록 (목록은 OR, 속성 간은 AND, None은 무시)
+
+        Raises:
+            KeyError: 인덱스에 없는 속성
+        """
+        result = self._alive[: (self._n_rows + 7) // 8].copy()
+        for attribute, wanted in filters.items():
+            if wanted is None:
+                continue
+            if attribute not in self._value_codes:
+                raise KeyError(f"인덱스에 없는 속성입니다: {attribute}")
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            union = np.zeros_like(result)
+            for value in wanted:
+                code = self._value_codes[attribute].get(value)
+                if code is not None:
+                    union |= self._bitsets[attribute][code][: len(result)]
+            result &= union
+        return result
+
+    def select(self, **filters: Any) -> np.ndarray:
+        """필터를 통과한 행 위치 (frame 기준, 오름차순)"""
+        return bitset_positions(self.mask(**filters), self._n_rows)
+
+    def count(self, **filters: Any) -> int:
+        """필터를 통과한 콘텐츠 수"""
+        return bitset_count(self.mask(**filters))
+
+    def positions_of(self, content_ids: Iterable[Any]) -> np.ndarray:
+        """주어진 ID들의 행 위치 (카탈로그에 없는 ID는 무시)"""
+        positions = [p for p in (self._positions.get(i) for i in content_ids) if p is not None]
+        return np.asarray(positions, dtype=np.int64)
+
+    def align(self, content_ids: Sequence[Any]) -> np.ndarray:
+        """ID 순서 그대로의 행 위치 (카탈로그에 없는 ID는 -1)"""
+        return np.fromiter(
+            (self._positions.get(i, -1) for i in content_ids),
+            dtype=np.int64,
+            count=len(content_ids),
+        )
+
+    def overlay(self, links_df: pd.DataFrame) -> StudentOverlay:
+        """
+        학생 연결 행을 카탈로그 행 위치로 변환 (정수 조인)
+
+        Args:
+            links_df: content_id (선택: progress, is_studied) 컬럼.
+                같은 콘텐츠가 여러 번 나오면 첫 행을 사용하고, 카탈로그에 없거나
+                삭제된 콘텐츠는 제외합니다.
+        """
+        if links_df.empty or "content_id" not in links_df.columns:
+            return StudentOverlay(
+                np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=bool)
+            )
+
+        content_ids = links_df["content_id"].to_numpy()
+        positions = self.align(content_ids)
+        # 카탈로그에 있고 살아 있는 콘텐츠의 첫 연결만 사용
+        resolved = positions >= 0
+        resolved[resolved] = bitset_test(self._alive, positions[resolved])
+        n_unresolved = int((~resolved).sum())
+        resolved &= ~pd.Series(positions).duplicated().to_numpy()
+
+        n = len(content_ids)
+        progress = (
+            links_df["progress"].to_numpy(dtype=np.float64, na_value=np.nan)
+            if "progress" in links_df.columns
+            else np.full(n, np.nan)
+        )
+        studied = (
+            links_df["is_studied"].fillna(False).to_numpy(dtype=bool)
+            if "is_studied" in links_df.columns
+            else np.zeros(n, dtype=bool)
+        )
+        return StudentOverlay(
+            positions[resolved],
+            progress[resolved],
+            studied[resolved],
+            n_unresolved=n_unresolved,
+        )
+
+    def ids_mask(self, content_ids: Iterable[Any]) -> np.ndarray:
+        """주어진 ID들의 비트셋 (카탈로그에 없는 ID는 무시)"""
+        bits = empty_bitset(self._n_rows)
+        set_bits(bits, self.positions_of(content_ids))
+        return bits
+
+    def facets(self, attribute: str, **filters: Any) -> dict[Any, int]:
+        """필터 결과 안의 속성 값별 콘텐츠 수"""
+        base = self.mask(**filters)
+        counts = {}
+        for value, bits in zip(self._values[attribute], self._bitsets[attribute]):
+            n = bitset_count(base & bits[: len(base)])
+            if n:
+                counts[value] = n
+        return counts
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        전체 행 DataFrame (삭제된 행 포함, 위치는 select 결과와 대응)
+
+        인덱스 속성은 범주형 컬럼입니다.
+        """
+        frame = self._frame
+        if frame is None:
+            with self._lock:
+                n = self._n_rows
+                columns: dict[str, Any] = {"id": self._ids[:n]}
+                for attribute in self.attributes:
+                    columns[attribute] = pd.Categorical.from_codes(
+                        self._codes[attribute][:n],
+                        categories=pd.Index(self._values[attribute], dtype=object),
+                    )
+                for column, payload in self._payload.items():
+                    columns[column] = payload[:n]
+                frame = self._frame = pd.DataFrame(columns)
+        return frame
+
+
+class CatalogRegistry:
+    """
+    테넌트별 카탈로그 인덱스 (프로세스당 1개)
+
+    처음 조회할 때 전체 카탈로그를 읽고, 이후에는 refresh_interval_seconds마다
+    watermark 이후 변경분(updated_at > watermark)만 읽어 반영합니다.
+    증분 조회로는 삭제를 알 수 없으므로 full_refresh_seconds마다 전체를 다시 읽습니다.
+
+    조회(fetch)는 잠금 밖에서 실행하며, 테넌트마다 한 요청만 갱신합니다.
+    증분 변경은 기존 인덱스의 사본에 반영한 뒤 교체하므로, 기존 인덱스의 frame과 select 결과를
+    함께 쓰는 요청은 갱신 중에도 같은 버전을 봅니다.
+    갱신 중인 테넌트의 다른 요청은 기존 인덱스로 바로 응답하고, 첫 구성이면 완료를 기다립니다.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Any], pd.DataFrame],
+        refresh_interval_seconds: float = 60.0,
+        full_refresh_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            fetch: (tenant_id, updated_since) → 콘텐츠 DataFrame (updated_since가 None이면 전체)
+            refresh_interval_seconds: 증분 갱신 주기 (초)
+            full_refresh_seconds: 전체 재구성 주기 (초)
+            clock: 초 단위 단조 시계 (테스트용)
+        """
+        self.fetch = fetch
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # tenant_id → (인덱스, 마지막 증분 갱신 시각, 마지막 전체 재구성 시각)
+        self._tenants: dict[str, tuple[CatalogIndex, float, float]] = {}
+        # tenant_id → 진행 중인 갱신 완료 이벤트
+        self._refreshing: dict[str, threading.Event] = {}
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def get(self, tenant_id: str) -> CatalogIndex:
+        """테넌트 인덱스 조회 (주기가 지났으면 갱신)"""
+        while True:
+            with self._lock:
+                now = self._clock()
+                entry = self._tenants.get(tenant_id)
+                full = entry is None or now - entry[2] >= self.full_refresh_seconds
+                if entry is not None and not full:
+                    if now - entry[1] < self.refresh_interval_seconds:
+                        return entry[0]
+
+                pending = self._refreshing.get(tenant_id)
+                if pending is None:
+                    self._refreshing[tenant_id] = threading.Event()
+                    break
+
+            # 다른 요청이 갱신 중: 기존 인덱스로 응답하거나 첫 구성을 기다림
+            if entry is not None:
+                return entry[0]
+            pending.wait()
+
+        try:
+            if full:
+                index = CatalogIndex.build(self.fetch(tenant_id, None))
+                rebuilt_at = now
+            else:
+                assert entry is not None
+                index, _, rebuilt_at = entry
+                changes = self.fetch(tenant_id, index.watermark)
+                if not changes.empty:
+                    index = index.copy()
+                    index.upsert(changes)
+            with self._lock:
+                self._tenants[tenant_id] = (index, now, rebuilt_at)
+            return index
+        finally:
+            with self._lock:
+                self._refreshing.pop(tenant_id).set()
+
+    def invalidate(self, tenant_id: str) -> None:
+        """다음 조회 때 전체 재구성"""
+        with self._lock:
+            self._tenants.pop(tenant_id, None)
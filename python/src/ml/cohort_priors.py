@@ -0,0 +1,373 @@
+"""
+코호트 사전 분포 (콜드 스타트 예측)
+
+(학년, 목표 전공, 과목, 최근 점수 구간)별로 "다음 성적"의 기댓값과 산포를
+야간 배치로 집계하여 밀집 배열로 보관합니다. 성적이 3개 미만인 신규 학생도
+O(1) 조회로 예측할 수 있습니다.
+
+빌드:
+    cd python
+    python -m src.ml.cohort_priors --tenant-id <tenant>   # data/cohort_priors/<tenant>.npz
+    python -m src.ml.cohort_priors --source synthetic --output /tmp/cohort_priors.npz
+"""
+
+import argparse
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..config import DATA_DIR
+
+# 최근 점수 구간 (0-9: 10점 단위, 10: 성적 없음)
+N_SCORE_BUCKETS = 10
+NO_SCORE_BUCKET = N_SCORE_BUCKETS
+
+# 코드 0은 "전체" (해당 차원 무시)
+ALL_CODE = 0
+
+DEFAULT_PRIORS_DIR = DATA_DIR / "cohort_priors"
+
+
+def score_bucket(score: float | None) -> int:
+    """점수를 구간 인덱스로 변환 (None이면 NO_SCORE_BUCKET)"""
+    if score is None or pd.isna(score):
+        return NO_SCORE_BUCKET
+    return int(min(max(score, 0) // 10, N_SCORE_BUCKETS - 1))
+
+
+class CohortPriorTable:
+    """
+    코호트 사전 분포 테이블
+
+    expected/spread/counts는 (학년, 전공, 과목, 점수 구간) 4차원 밀집 배열이며,
+    표본이 부족한 칸은 빌드 시 상위 코호트(전공 → 학년 → 과목 전체) 값으로 채웁니다.
+    """
+
+    def __init__(
+        self,
+        grades: list[Any],
+        majors: list[str],
+        subjects: list[str],
+        expected: np.ndarray,
+        spread: np.ndarray,
+        counts: np.ndarray,
+    ):
+        """
+        Args:
+            grades: 학년 목록 (코드 1부터)
+            majors: 목표 전공 목록 (코드 1부터)
+            subjects: 과목 목록 (코드 0부터)
+            expected: 다음 성적 기댓값 (float32)
+            spread: 다음 성적 표준편차 (float32)
+            counts: 원래 칸의 표본 수 (int32, 채워진 칸은 상위 코호트 표본 수)
+        """
+        self.grades = list(grades)
+        self.majors = list(majors)
+        self.subjects = list(subjects)
+        self._grade_codes = {g: i + 1 for i, g in enumerate(self.grades)}
+        self._major_codes = {m: i + 1 for i, m in enumerate(self.majors)}
+        self._subject_codes = {s: i for i, s in enumerate(self.subjects)}
+        self.expected = expected
+        self.spread = spread
+        self.counts = counts
+
+    def lookup(
+        self,
+        grade: Any,
+        target_major: str | None,
+        subject: str,
+        latest_score: float | None = None,
+    ) -> tuple[float, float, int] | None:
+        """
+        사전 분포 조회 (O(1))
+
+        모르는 학년/전공은 "전체" 코호트로 대체합니다.
+
+        Returns:
+            (기댓값, 표준편차, 표본 수) 또는 과목/표본이 없으면 None
+        """
+        subject_code = self._subject_codes.get(subject)
+        if subject_code is None:
+            return None
+
+        index = (
+            self._grade_codes.get(_normalize_grade(grade), ALL_CODE),
+            self._major_codes.get(target_major, ALL_CODE),
+            subject_code,
+            score_bucket(latest_score),
+        )
+        count = int(self.counts[index])
+        if count == 0:
+            return None
+        return float(self.expected[index]), float(self.spread[index]), count
+
+    @classmethod
+    def build(
+        cls,
+        students_df: pd.DataFrame,
+        scores_df: pd.DataFrame,
+        min_count: int = 20,
+    ) -> "CohortPriorTable":
+        """
+        학생/성적 테이블로 사전 분포 빌드
+
+        각 (학생, 과목) 시리즈의 연속 성적 쌍 (직전, 다음)을 직전 점수 구간별로,
+        첫 성적은 "성적 없음" 구간으로 집계합니다.
+
+        Args:
+            students_df: id, grade, target_major 컬럼
+            scores_df: student_id, subject, score, created_at 컬럼
+            min_count: 이보다 표본이 적은 칸은 상위 코호트 값으로 채움
+        """
+        grades = sorted(
+            {g for g in students_df["grade"].map(_normalize_grade) if g is not None}
+        )
+        majors = sorted(students_df["target_major"].dropna().astype(str).unique())
+        subjects = sorted(scores_df["subject"].dropna().unique())
+
+        grade_codes = {g: i + 1 for i, g in enumerate(grades)}
+        major_codes = {m: i + 1 for i, m in enumerate(majors)}
+        subject_codes = {s: i for i, s in enumerate(subjects)}
+
+        profile = students_df.set_index("id")
+        ordered = scores_df.dropna(subset=["subject", "score"]).sort_values(
+            ["student_id", "subject", "created_at"], kind="stable"
+        )
+        student_ids = ordered["student_id"]
+        previous = ordered.groupby(["student_id", "subject"], sort=False)["score"].shift(1)
+
+        g = student_ids.map(profile["grade"].map(_normalize_grade)).map(grade_codes)
+        m = student_ids.map(profile["target_major"]).map(major_codes)
+        g = g.fillna(ALL_CODE).astype(np.int64).to_numpy()
+        m = m.fillna(ALL_CODE).astype(np.int64).to_numpy()
+        s = ordered["subject"].map(subject_codes).to_numpy(dtype=np.int64)
+        prev = previous.to_numpy(dtype=np.float64)
+        b = np.where(
+            np.isnan(prev),
+            NO_SCORE_BUCKET,
+            np.clip(prev // 10, 0, N_SCORE_BUCKETS - 1),
+        ).astype(np.int64)
+        y = ordered["score"].to_numpy(dtype=np.float64)
+
+        shape = (len(grades) + 1, len(majors) + 1, len(subjects), N_SCORE_BUCKETS + 1)
+        n = np.zeros(shape)
+        total = np.zeros(shape)
+        total_sq = np.zeros(shape)
+
+        # 학년×전공/학년/전공/전체 코호트에 동시에 누적 (모르는 값은 해당 칸 제외)
+        known_g = g != ALL_CODE
+        known_m = m != ALL_CODE
+        everyone = np.zeros_like(g)
+        for gg, mm, mask in (
+            (g, m, known_g & known_m),
+            (g, everyone, known_g),
+            (everyone, m, known_m),
+            (everyone, everyone, np.ones_like(known_g)),
+        ):
+            index = (gg[mask], mm[mask], s[mask], b[mask])
+            np.add.at(n, index, 1)
+            np.add.at(total, index, y[mask])
+            np.add.at(total_sq, index, y[mask] ** 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = total / n
+            variance = np.maximum(total_sq / n - expected**2, 0) * n / np.maximum(n - 1, 1)
+        spread = np.sqrt(variance)
+
+        # 과목 전체(구간 무시) 값: 최후 대체값
+        subject_n = n[ALL_CODE, ALL_CODE].sum(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            subject_mean = total[ALL_CODE, ALL_CODE].sum(axis=-1) / subject_n
+            subject_var = (
+                total_sq[ALL_CODE, ALL_CODE].sum(axis=-1) / subject_n - subject_mean**2
+            )
+        subject_spread = np.sqrt(np.maximum(subject_var, 0))
+
+        counts = n.astype(np.int32)
+        _fill_sparse_cells(
+            expected, spread, counts, subject_mean, subject_spread, subject_n, min_count
+        )
+
+        return cls(
+            grades,
+            majors,
+            subjects,
+            np.nan_to_num(expected).astype(np.float32),
+            np.nan_to_num(spread).astype(np.float32),
+            counts,
+        )
+
+    def save(self, path: str | Path) -> None:
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 서비스가 쓰는 중인 파일을 읽지 않음)"""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as file:
+            self._write(file)
+        os.replace(tmp, path)
+
+    def _write(self, file: Any) -> None:
+        np.savez_compressed(
+            file,
+            grades=np.array([str(g) for g in self.grades]),
+            majors=np.array(self.majors, dtype=str),
+            subjects=np.array(self.subjects, dtype=str),
+            expected=self.expected,
+            spread=self.spread,
+            counts=self.counts,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CohortPriorTable":
+        """npz 파일에서 복원"""
+        with np.load(path) as data:
+            return cls(
+                [_normalize_grade(g) for g in data["grades"]],
+                [str(m) for m in data["majors"]],
+                [str(s) for s in data["subjects"]],
+                data["expected"],
+                data["spread"],
+                data["counts"],
+            )
+
+
+def _normalize_grade(grade: Any) -> int | None:
+    """학년 값을 정수로 정규화 (알 수 없으면 None)"""
+    if grade is None:
+        return None
+    try:
+        if pd.isna(grade):
+            return None
+        return int(grade)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fill_sparse_cells(
+    expected: np.ndarray,
+    spread: np.ndarray,
+    counts: np.ndarray,
+    subject_mean: np.ndarray,
+    subject_spread: np.ndarray,
+    subject_n: np.ndarray,
+    min_count: int,
+) -> None:
+    """표본이 부족한 칸을 상위 코호트 값으로 채움 (제자리 수정)"""
+    # 과목 전체 코호트 (학년/전공 무시): 구간 표본 부족 시 과목 평균
+    base = (ALL_CODE, ALL_CODE)
+    sparse = counts[base] < min_count
+    expected[base][sparse] = np.broadcast_to(subject_mean[:, None], sparse.shape)[sparse]
+    spread[base][sparse] = np.broadcast_to(subject_spread[:, None], sparse.shape)[sparse]
+    counts[base][sparse] = np.broadcast_to(subject_n[:, None], sparse.shape)[sparse]
+
+    # 학년 전체/전공 전체 코호트 → 과목 전체 코호트
+    for grade_code in range(1, expected.shape[0]):
+        _fill_from(expected, spread, counts, (grade_code, ALL_CODE), base, min_count)
+    for major_code in range(1, expected.shape[1]):
+        _fill_from(expected, spread, counts, (ALL_CODE, major_code), base, min_count)
+
+    # 학년×전공 코호트 → 학년 코호트
+    for grade_code in range(1, expected.shape[0]):
+        for major_code in range(1, expected.shape[1]):
+            _fill_from(
+                expected,
+                spread,
+                counts,
+                (grade_code, major_code),
+                (grade_code, ALL_CODE),
+                min_count,
+            )
+
+
+def _fill_from(
+    expected: np.ndarray,
+    spread: np.ndarray,
+    counts: np.ndarray,
+    target: tuple[int, int],
+    parent: tuple[int, int],
+    min_count: int,
+) -> None:
+    sparse = counts[target] < min_count
+    expected[target][sparse] = expected[parent][sparse]
+    spread[target][sparse] = spread[parent][sparse]
+    counts[target][sparse] = counts[parent][sparse]
+
+
+def priors_path(tenant_id: str) -> Path:
+    """테넌트 사전 분포 파일 경로 (ML_COHORT_PRIORS_DIR/<tenant_id>.npz)"""
+    if not tenant_id or Path(tenant_id).name != tenant_id or tenant_id in (".", ".."):
+        raise ValueError(f"잘못된 테넌트 ID: {tenant_id!r}")
+    directory = Path(os.getenv("ML_COHORT_PRIORS_DIR", str(DEFAULT_PRIORS_DIR)))
+    return directory / f"{tenant_id}.npz"
+
+
+@lru_cache(maxsize=64)
+def _load_priors(path: Path, mtime_ns: int) -> CohortPriorTable:
+    """(경로, 수정 시각)별 사전 분포 캐시 (야간 배치가 파일을 바꾸면 새 키)"""
+    return CohortPriorTable.load(path)
+
+
+def get_cohort_priors(tenant_id: str) -> CohortPriorTable | None:
+    """
+    서비스용 테넌트 사전 분포 테이블 (테넌트별 캐시, 파일이 바뀌면 다시 읽음)
+
+    학년·전공별 성적 분포는 기관마다 다르므로 테넌트마다 따로 빌드합니다.
+
+    Args:
+        tenant_id: 테넌트 ID
+
+    Returns:
+        CohortPriorTable 또는 테넌트 파일이 없으면 None
+    """
+    path = priors_path(tenant_id)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_priors(path, mtime_ns)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="코호트 사전 분포 빌드 (야간 배치)")
+    parser.add_argument("--tenant-id", default=None, help="Supabase 테넌트 ID")
+    parser.add_argument(
+        "--source", choices=["synthetic", "snapshot"], default=None, help="평가용 데이터 소스"
+    )
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--min-count", type=int, default=20)
+    parser.add_argument(
+        "--output", default=None, help="저장 경로 (기본값: --tenant-id의 서비스 경로)"
+    )
+    args = parser.parse_args(argv)
+    if args.output is None:
+        if not args.tenant_id:
+            parser.error("--tenant-id 없이 빌드하면 --output이 필요합니다")
+        args.output = str(priors_path(args.tenant_id))
+
+    if args.tenant_id:
+        from ..db_connector import get_connector
+
+        db = get_connector()
+        students_df = db.get_students(args.tenant_id)
+        scores_df = db.get_all_scores_by_tenant(args.tenant_id)
+    else:
+        from ..evaluation.data_sources import load_data_source
+
+        source = load_data_source(args.source or "synthetic", snapshot_dir=args.snapshot_dir)
+        students_df = source.get_students()
+        scores_df = source.get_scores()
+
+    table = CohortPriorTable.build(students_df, scores_df, min_count=args.min_count)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    table.save(args.output)
+    print(
+        f"사전 분포 저장: {args.output} "
+        f"(학년 {len(table.grades)}, 전공 {len(table.majors)}, 과목 {len(table.subjects)})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+XGBoost 트리 컴파일 (순수 numpy 배치 추론)
+
+학습된 부스터를 노드 배열(특성, 임계값, 왼쪽/오른쪽 자식, 결측 방향, 리프 값)로
+평탄화하고, 모든 행·트리를 깊이 단위로 함께 내려가는 벡터화 평가기로 추론합니다.
+DMatrix 생성 없이 XGBoost predict와 비트 단위로 같은 float32 결과를 냅니다.
+
+내보내기:
+    cd python
+    python -m src.ml.compiled_trees model.json --output model_trees.npz
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# 출력 변환이 항등인 회귀 목적 함수
+_IDENTITY_OBJECTIVES = {
+    "reg:squarederror",
+    "reg:squaredlogerror",
+    "reg:absoluteerror",
+    "reg:pseudohubererror",
+    "reg:quantileerror",
+}
+
+# 평가 시 한 번에 처리할 행 수 (행 × 트리 인덱스 배열 크기 제한)
+DEFAULT_CHUNK_ROWS = 8192
+
+
+class CompiledForest:
+    """
+    평탄화된 회귀 트리 앙상블
+
+    모든 트리의 노드를 하나의 배열에 이어 붙이고, 자식 인덱스는 전역 인덱스로
+    저장합니다. 리프는 left == -1이며 value에 리프 값을 가집니다.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        base_score: float,
+        n_features: int,
+        max_depth: int,
+    ):
+        """
+        Args:
+            feature: 노드별 분기 특성 인덱스 (int32)
+            threshold: 노드별 분기 임계값 (float32, x < threshold이면 왼쪽)
+            left: 왼쪽 자식 전역 인덱스 (리프는 -1)
+            right: 오른쪽 자식 전역 인덱스 (리프는 -1)
+            default_left: 결측값이 왼쪽으로 가는지 여부
+            value: 리프 값 (float32)
+            roots: 트리별 루트 전역 인덱스
+            base_score: 초기 예측값
+            n_features: 입력 특성 수
+            max_depth: 가장 깊은 트리의 깊이
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_score = np.float32(base_score)
+        self.n_features = n_features
+        self.max_depth = max_depth
+
+        # 탐색용 배열: 리프는 임계값 +inf(항상 왼쪽)와 자기 자신을 가리키는 왼쪽 자식,
+        # 오른쪽 자식은 항상 왼쪽 자식 + 1 (XGBoost는 자식을 쌍으로 할당)
+        leaf = left < 0
+        node_ids = np.arange(len(left), dtype=np.int32)
+        if not np.array_equal(right[~leaf], left[~leaf] + 1):
+            raise ValueError("오른쪽 자식이 왼쪽 자식 바로 다음이 아닌 트리는 지원하지 않습니다.")
+        self._next_left = np.where(leaf, node_ids, left).astype(np.int32)
+        self._feature = np.where(leaf, 0, feature).astype(np.int32)
+        self._threshold = np.where(leaf, np.float32(np.inf), threshold).astype(np.float32)
+        self._default_left = default_left | leaf
+
+    @property
+    def n_trees(self) -> int:
+        """트리 수"""
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        """전체 노드 수"""
+        return len(self.left)
+
+    @classmethod
+    def from_model(cls, model: Any) -> "CompiledForest":
+        """XGBRegressor 또는 Booster로 생성"""
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        return cls.from_json(json.loads(bytes(booster.save_raw("json"))))
+
+    @classmethod
+    def from_json(cls, model_json: dict[str, Any]) -> "CompiledForest":
+        """
+        XGBoost JSON 모델로 생성
+
+        Raises:
+            ValueError: 지원하지 않는 모델 (다중 출력, 범주형 분기, 비항등 목적 함수 등)
+        """
+        learner = model_json["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in _IDENTITY_OBJECTIVES:
+            raise ValueError(f"지원하지 않는 목적 함수입니다: {objective}")
+
+        params = learner["learner_model_param"]
+        if int(params.get("num_class", 0)) > 1 or int(params.get("num_target", 1)) > 1:
+            raise ValueError("다중 출력 모델은 지원하지 않습니다.")
+
+        booster = learner["gradient_booster"]
+        if booster.get("name", "gbtree") not in ("gbtree", "dart"):
+            raise ValueError(f"지원하지 않는 부스터입니다: {booster.get('name')}")
+        if booster.get("name") == "dart":
+            raise ValueError("dart 부스터는 트리 가중치가 있어 지원하지 않습니다.")
+
+        trees = booster["model"]["trees"]
+        features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for tree in trees:
+            if any(int(t) != 0 for t in tree.get("split_type", [])):
+                raise ValueError("범주형 분기는 지원하지 않습니다.")
+
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            leaf = left < 0
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+
+            features.append(np.asarray(tree["split_indices"], dtype=np.int32))
+            thresholds.append(conditions)
+            lefts.append(np.where(leaf, -1, left + offset).astype(np.int32))
+            rights.append(np.where(leaf, -1, right + offset).astype(np.int32))
+            defaults.append(np.asarray(tree["default_left"], dtype=bool))
+            # 리프 노드의 split_conditions가 리프 값
+            values.append(np.where(leaf, conditions, np.float32(0)))
+            roots.append(offset)
+
+            max_depth = max(max_depth, _tree_depth(left, right))
+            offset += len(left)
+
+        return cls(
+            feature=_concat(features, np.int32),
+            threshold=_concat(thresholds, np.float32),
+            left=_concat(lefts, np.int32),
+            right=_concat(rights, np.int32),
+            default_left=_concat(defaults, bool),
+            value=_concat(values, np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            base_score=_parse_base_score(params["base_score"]),
+            n_features=int(params["num_feature"]),
+            max_depth=max_depth,
+        )
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """
+        행·트리별 도착 리프의 전역 인덱스
+
+        Args:
+            X: (n_rows, n_features) 입력 (float32로 변환, NaN은 결측)
+
+        Returns:
+            (n_rows, n_trees) int32 배열
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"입력 특성 수가 다릅니다: {X.shape} (기대값: (n, {self.n_features}))"
+            )
+
+        flat = X.ravel()
+        row_base = (np.arange(len(X), dtype=np.int64) * self.n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        has_missing = bool(np.isnan(flat).any())
+
+        # 모든 (행, 트리)를 한 깊이씩 동시에 이동 (리프는 제자리)
+        for _ in range(self.max_depth):
+            x = np.take(flat, row_base + np.take(self._feature, nodes))
+            go_right = ~(x < np.take(self._threshold, nodes))
+            if has_missing:
+                missing = np.isnan(x)
+                go_right[missing] = ~np.take(self._default_left, nodes[missing])
+            nodes = np.take(self._next_left, nodes) + go_right
+
+        return nodes
+
+    def predict(self, X: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+        """
+        배치 예측 (float32)
+
+        base_score에서 시작하여 트리 순서대로 float32로 누적하므로
+        XGBoost predict와 같은 값을 냅니다.
+
+        Args:
+            X: (n_rows, n_features) 입력
+            chunk_rows: 한 번에 평가할 행 수
+
+        Returns:
+            (n_rows,) float32 예측값
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        out = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), chunk_rows):
+            leaves = self.value[self.leaf_indices(X[start : start + chunk_rows])]
+            margin = np.full(len(leaves), self.base_score, dtype=np.float32)
+            for t in range(self.n_trees):
+                margin += leaves[:, t]
+            out[start : start + chunk_rows] = margin
+        return out
+
+    def save(self, path: str | Path) -> None:
+        """npz 파일로 저장"""
+        np.savez_compressed(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            value=self.value,
+            roots=self.roots,
+            meta=np.array([self.base_score, self.n_features, self.max_depth], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompiledForest":
+        """npz 파일에서 복원"""
+        with np.load(path) as data:
+            base_score, n_features, max_depth = data["meta"]
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                default_left=data["default_left"],
+                value=data["value"],
+                roots=data["roots"],
+                base_score=float(np.float32(base_score)),
+                n_features=int(n_features),
+                max_depth=int(max_depth),
+            )
+
+
+def _parse_base_score(raw: str) -> float:
+    """'[6.7891365E1]' 또는 '6.7891365E1' 형식의 base_score 파싱"""
+    return float(str(raw).strip("[]").split(",")[0])
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """트리 깊이 (루트만 있으면 0)"""
+    depth = np.zeros(len(left), dtype=np.int32)
+    # 자식 인덱스는 부모보다 크므로 순서대로 한 번 훑으면 충분
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max()) if len(depth) else 0
+
+
+def _concat(parts: list[np.ndarray], dtype: Any) -> np.ndarray:
+    return np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype=dtype)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="XGBoost 모델을 numpy 노드 배열로 내보내기")
+    parser.add_argument("model", help="XGBoost 모델 파일 (json/ubj)")
+    parser.add_argument("--output", required=True, help="저장할 npz 경로")
+    args = parser.parse_args(argv)
+
+    from xgboost import Booster
+
+    forest = CompiledForest.from_model(Booster(model_file=args.model))
+    forest.save(args.output)
+    print(
+        f"트리 {forest.n_trees}개, 노드 {forest.n_nodes:,}개, "
+        f"최대 깊이 {forest.max_depth} → {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,202 @@
 학습 이력, 성적, 취약 과목 등을 기반으로 적합한 학습 콘텐츠를 추천합니다.
 """
 
-from typing import Any
+from collections.abc import Iterator, Sequence
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
 
+from ..config import ML_CONFIG
+from ..deadline import Deadline
+from .catalog_index import CatalogIndex, StudentOverlay, bitset_test, set_bits
+from .cooccurrence import ItemCooccurrence
+from .feature_store import StudentFeatures
+from .implicit_als import ImplicitFactors
+from .interaction_matrix import InteractionMatrix
+from .minhash_lsh import MinHashLSH
+
+_DEADLINE_CONFIG = ML_CONFIG["content_recommendation"]["deadline"]
+
+# 응답 계층 (전체 → 추천 이유 생략)
+TIER_FULL = "full"
+TIER_NO_REASONS = "no_reasons"
+
+# 선호 난이도별 콘텐츠 난이도 매칭 점수 (0-30점)
+DIFFICULTY_MATCH = {
+    "easy": {"easy": 30, "medium": 20, "hard": 10},
+    "medium": {"easy": 15, "medium": 30, "hard": 20},
+    "hard": {"easy": 10, "medium": 20, "hard": 30},
+}
+
+
+def _preferred_difficulty(avg_score: float | None) -> str:
+    """평균 점수로 추정한 선호 난이도"""
+    if avg_score is None:
+        return "medium"
+    if avg_score >= 80:
+        return "hard"
+    if avg_score >= 60:
+        return "medium"
+    return "easy"
+
+
+def _lookup_column(
+    contents: pd.DataFrame,
+    column: str,
+    positions: np.ndarray,
+    score_fn: Callable[[Any], float],
+    missing_column_score: float,
+) -> np.ndarray:
+    """
+    범주 코드 → 점수 테이블 조회
+
+    고유값마다 score_fn을 한 번만 호출합니다. 결측값(코드 -1)은 테이블 마지막
+    칸에서 score_fn(NaN) 값을 읽습니다.
+    """
+    if column not in contents.columns:
+        return np.full(len(positions), missing_column_score)
+
+    codes, uniques = _column_codes(contents, column, positions)
+    table = np.array([score_fn(u) for u in uniques] + [score_fn(np.nan)], dtype=np.float64)
+    return table[codes]
+
+
+def _column_codes(
+    contents: pd.DataFrame,
+    column: str,
+    positions: np.ndarray,
+) -> tuple[np.ndarray, pd.Index]:
+    """후보 행의 범주 코드(-1은 결측)와 고유값 (범주형 컬럼은 기존 코드 사용)"""
+    values = contents[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    return codes[positions], uniques
+
+
+def _top_k_stable(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    상위 k개 인덱스 (값 내림차순, 동점은 앞선 위치 우선 - nlargest와 동일)
+
+    k번째 값을 부분 정렬로 찾은 뒤 그보다 큰 항목과 앞선 동점 항목만 정렬합니다.
+    """
+    n = len(values)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        kth = np.partition(values, n - k)[n - k]
+        greater = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[: k - len(greater)]
+        candidates = np.concatenate([greater, ties])
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+class _CandidateGroups:
+    """
+    후보 콘텐츠를 (과목, 난이도, 유형) 조합별로 묶은 구조
+
+    같은 조합의 콘텐츠는 학생과 무관하게 학습 여부를 뺀 점수가 같으므로,
+    학생 × 조합 점수 행렬만 계산하고 조합 안에서는 위치 순으로 상위 N개를 고릅니다.
+    """
+
+    COLUMNS = ("subject", "difficulty", "content_type")
+
+    def __init__(self, contents_df: pd.DataFrame, positions: np.ndarray):
+        n = len(positions)
+        keys = np.zeros(n, dtype=np.int64)
+        columns = []
+        for column in self.COLUMNS:
+            if column in contents_df.columns:
+                codes, uniques = _column_codes(contents_df, column, positions)
+            else:
+                codes, uniques = np.full(n, -1, dtype=np.int64), None
+            radix = (0 if uniques is None else len(uniques)) + 1
+            keys = keys * radix + (codes + 1)
+            columns.append((codes, uniques))
+
+        _, self.group_of = np.unique(keys, return_inverse=True)
+        self.group_of = self.group_of.ravel()
+        self.n_groups = int(self.group_of.max()) + 1 if n else 0
+        # 조합별 후보 순번 (조합 안에서는 위치 오름차순)
+        self.members = np.argsort(self.group_of, kind="stable")
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.group_of, minlength=self.n_groups))]
+        )
+        first = self.members[self.offsets[:-1]]
+        self.uniques = {c: uniques for c, (_, uniques) in zip(self.COLUMNS, columns)}
+        self.group_codes = {c: codes[first] for c, (codes, _) in zip(self.COLUMNS, columns)}
+
+    def scores(
+        self,
+        column: str,
+        score_fns: list[Callable[[Any], float]],
+        missing_column_score: float,
+    ) -> np.ndarray:
+        """학생별 점수 테이블을 조합 코드로 펼친 (학생 × 조합) 행렬"""
+        uniques = self.uniques[column]
+        if uniques is None:
+            return np.full((len(score_fns), self.n_groups), missing_column_score)
+        tables = np.array(
+            [[fn(u) for u in uniques] + [fn(np.nan)] for fn in score_fns], dtype=np.float64
+        )
+        return tables[:, self.group_codes[column]]
+
+    def top_k(
+        self,
+        group_scores: np.ndarray,
+        studied: np.ndarray,
+        k: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        한 학생의 상위 k개 후보 (_top_k_stable과 같은 순서)
+
+        점수 수준을 높은 순으로 내려가며, 각 수준에서 해당 조합들의 앞쪽 후보만
+        위치 순으로 합칩니다.
+
+        Args:
+            group_scores: 조합별 점수 (학습 여부 가중치 제외)
+            studied: 학습한 후보 순번 (오름차순, 중복 없음)
+            k: 추천 개수
+
+        Returns:
+            (후보 순번, 점수, 학습 여부)
+        """
+        studied_groups = np.bincount(self.group_of[studied], minlength=self.n_groups)
+        unstudied_scores = group_scores + 10.0
+        levels = np.unique(
+            np.concatenate([unstudied_scores, group_scores[studied_groups > 0]])
+        )[::-1]
+
+        picked, values, flags = [], [], []
+        remaining = k
+        for level in levels:
+            if remaining <= 0:
+                break
+            parts = []
+            for group in np.flatnonzero(unstudied_scores == level):
+                members = self.members[
+                    self.offsets[group] : self.offsets[group + 1]
+                ][: remaining + studied_groups[group]]
+                if studied_groups[group]:
+                    members = members[~np.isin(members, studied, assume_unique=True)]
+                parts.append(members[:remaining])
+            for group in np.flatnonzero((group_scores == level) & (studied_groups > 0)):
+                parts.append(studied[self.group_of[studied] == group][:remaining])
+
+            chosen = np.sort(np.concatenate(parts))[:remaining]
+            picked.append(chosen)
+            values.append(np.full(len(chosen), level))
+            flags.append(np.isin(chosen, studied, assume_unique=True))
+            remaining -= len(chosen)
+
+        if not picked:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=bool)
+        return np.concatenate(picked), np.concatenate(values), np.concatenate(flags)
+
 
 class ContentRecommender:
     """
@@ -17,12 +208,18 @@ class ContentRecommender:
     협업 필터링과 콘텐츠 기반 필터링을 조합하여 추천합니다.
     """
 
-    def __init__(self, weak_subject_threshold: float = 60.0):
+    def __init__(
+        self,
+        weak_subject_threshold: float = 60.0,
+        reason_cost_ms: float = _DEADLINE_CONFIG["reason_cost_ms"],
+    ):
         """
         Args:
             weak_subject_threshold: 취약 과목 판정 기준 점수
+            reason_cost_ms: 추천 1건당 이유 생성 예상 비용 (데드라인 판단용)
         """
         self.weak_subject_threshold = weak_subject_threshold
+        self.reason_cost_ms = reason_cost_ms
 
     def recommend(
         self,
@@ -32,6 +229,12 @@ class ContentRecommender:
         subject: str | None = None,
         limit: int = 5,
         include_reasons: bool = True,
+        student_features: StudentFeatures | None = None,
+        deadline: Deadline | None = None,
+        catalog: CatalogIndex | None = None,
+        overlay: StudentOverlay | None = None,
+        collaborative_scores: np.ndarray | None = None,
+        collaborative_weight: float = 0.0,
     ) -> dict[str, Any]:
         """
         학습 콘텐츠 추천
@@ -43,66 +246,247 @@ class ContentRecommender:
             subject: 특정 과목 필터 (선택)
             limit: 추천 개수
             include_reasons: 추천 이유 포함 여부
+            student_features: 특성 저장소 조회 결과 (있으면 성적/플랜 재집계 생략)
+            deadline: 요청 데드라인 (남은 시간이 부족하면 추천 이유 생략)
+            catalog: 테넌트 카탈로그 인덱스 (있으면 contents_df 대신 사용, 필터는 비트셋 연산)
+            overlay: 학생 콘텐츠 연결 (catalog와 함께 사용, 후보를 학생 보유 콘텐츠로 제한)
+            collaborative_scores: contents_df 행 순서의 협업 점수 (0-1, 혼합 추천용)
+            collaborative_weight: 협업 점수 비중 (0이면 규칙 기반 점수만 사용)
 
         Returns:
-            추천 결과 딕셔너리
+            추천 결과 딕셔너리 (served_tier: "full" 또는 "no_reasons")
         """
-        # 취약 과목 분석
-        weak_subjects = self._identify_weak_subjects(scores_df)
+        if catalog is not None:
+            contents_df = catalog.frame
+
+        if student_features is not None:
+            # 특성 저장소 1회 조회로 취약 과목/학습 이력/평균 점수 확보
+            avg_score = student_features.overall_mean
+            weak_subjects = self._weak_subjects_from_averages(
+                student_features.subject_averages(), avg_score
+            )
+            studied_content_ids = student_features.studied_content_ids
+            recent_types = student_features.studied_content_types
+            has_scores = student_features.score_count > 0
+        else:
+            # 취약 과목 분석
+            weak_subjects = self._identify_weak_subjects(scores_df)
 
-        # 학습 이력 분석
-        studied_content_ids = self._get_studied_content_ids(plans_df)
+            # 학습 이력 분석
+            studied_content_ids = self._get_studied_content_ids(plans_df)
+            recent_types = self._get_studied_content_types(plans_df)
+            has_scores = not scores_df.empty
+            avg_score = scores_df["score"].mean() if has_scores else None
 
         # 추천 전략 결정
-        strategy = self._determine_strategy(weak_subjects, scores_df)
+        strategy = self._determine_strategy(weak_subjects, scores_df, has_scores=has_scores)
 
-        # 콘텐츠 필터링
-        filtered_contents = self._filter_contents(
-            contents_df=contents_df,
-            subject=subject,
-            studied_ids=studied_content_ids,
-        )
+        # 후보 위치 (과목 필터, 복사 없음)
+        positions = self._candidate_positions(contents_df, subject, catalog, overlay)
 
-        if filtered_contents.empty:
+        if len(positions) == 0:
             return {
                 "recommendations": [],
                 "weak_subjects": weak_subjects,
                 "strategy": "no_content",
+                "served_tier": TIER_FULL,
             }
 
-        # 콘텐츠 점수 계산
-        scored_contents = self._score_contents(
-            contents=filtered_contents,
+        # 콘텐츠 점수 계산 (범주 코드 + 조회 테이블)
+        if avg_score is None and not scores_df.empty:
+            avg_score = scores_df["score"].mean()
+        is_studied = self._studied_mask(
+            contents_df, positions, studied_content_ids, catalog, overlay
+        )
+        relevance = self._relevance_kernel(
+            contents_df,
+            positions,
             weak_subjects=weak_subjects,
-            scores_df=scores_df,
-            plans_df=plans_df,
+            avg_score=avg_score,
+            recent_types=recent_types,
+            is_studied=is_studied,
         )
 
-        # 상위 N개 선택
-        top_contents = scored_contents.nlargest(limit, "relevance_score")
+        # 협업 점수 혼합 (0-1 점수를 규칙 점수와 같은 0-100 척도로)
+        collaborative = None
+        if collaborative_scores is not None and collaborative_weight > 0:
+            collaborative = collaborative_scores[positions]
+            rule_weight = 1 - collaborative_weight
+            relevance = rule_weight * relevance + collaborative_weight * 100 * collaborative
+
+        # 상위 N개 선택 (nlargest와 같은 순서)
+        top = _top_k_stable(relevance, limit)
+
+        # 남은 예산으로 이유 생성이 어려우면 생략
+        served_tier = TIER_FULL
+        if (
+            include_reasons
+            and deadline is not None
+            and not deadline.allows(self.reason_cost_ms * len(top))
+        ):
+            include_reasons = False
+            served_tier = TIER_NO_REASONS
+
+        rows = contents_df.iloc[positions[top]].to_dict("records")
+        if collaborative is not None:
+            for row, score in zip(rows, collaborative[top]):
+                row["collaborative_score"] = float(score)
+        recommendations = self._build_recommendations(
+            rows,
+            relevance[top],
+            is_studied[top],
+            weak_subjects,
+            include_reasons,
+        )
 
-        # 추천 결과 구성
+        return {
+            "recommendations": recommendations,
+            "weak_subjects": weak_subjects,
+            "strategy": strategy,
+            "served_tier": served_tier,
+        }
+
+    def recommend_many(
+        self,
+        students: Sequence[StudentFeatures],
+        catalog: CatalogIndex,
+        subject: str | None = None,
+        limit: int = 5,
+        include_reasons: bool = True,
+        chunk_size: int = 256,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        여러 학생 일괄 추천
+
+        후보를 (과목, 난이도, 유형) 조합으로 묶고 학생별 점수 테이블(취약 과목 마스크,
+        선호 난이도, 학습 유형 마스크)로 학생 × 조합 점수 행렬을 한 번에 계산합니다.
+        학습한 콘텐츠는 희소 좌표(후보 순번)로만 다루므로 학생 × 카탈로그 행렬을
+        만들지 않습니다. 학생별 결과는 recommend(student_features=...)와 같습니다.
+
+        Args:
+            students: 학생별 특성 (특성 저장소 조회 결과)
+            catalog: 테넌트 카탈로그 인덱스
+            subject: 특정 과목 필터 (선택)
+            limit: 학생당 추천 개수
+            include_reasons: 추천 이유 포함 여부
+            chunk_size: 추천 콘텐츠 행을 한 번에 조회하는 학생 수 (스트리밍 단위)
+
+        Yields:
+            학생별 추천 결과 딕셔너리 (student_id 포함, 입력 순서)
+        """
+        contents_df = catalog.frame
+        positions = catalog.select(subject=subject or None)
+        contexts = [self._student_context(features) for features in students]
+
+        if len(positions) == 0:
+            for features, (weak_subjects, _, _, _, _) in zip(students, contexts):
+                yield {
+                    "student_id": features.student_id,
+                    "recommendations": [],
+                    "weak_subjects": weak_subjects,
+                    "strategy": "no_content",
+                    "served_tier": TIER_FULL,
+                }
+            return
+
+        groups = _CandidateGroups(contents_df, positions)
+
+        # 1~3. 학생 × 조합 점수 (취약 과목 + 난이도 + 유형 다양성)
+        group_scores = groups.scores(
+            "subject",
+            [lambda x, w=set(c[0]): 40.0 if x in w else 10.0 for c in contexts],
+            10.0,
+        )
+        group_scores += groups.scores(
+            "difficulty",
+            [
+                lambda x, m=DIFFICULTY_MATCH[_preferred_difficulty(c[2])]: m.get(x, 15)
+                for c in contexts
+            ],
+            15.0,
+        )
+        group_scores += groups.scores(
+            "content_type",
+            [lambda x, r=c[4]: 20.0 if x not in r else 10.0 for c in contexts],
+            10.0,
+        )
+
+        # 카탈로그 위치 → 후보 순번 (학습 콘텐츠 희소 좌표 변환용)
+        candidate_index = np.full(catalog.n_rows, -1, dtype=np.int64)
+        candidate_index[positions] = np.arange(len(positions))
+
+        for start in range(0, len(students), chunk_size):
+            # 4. 신규 콘텐츠 가중치는 상위 N개 선택 안에서 반영
+            selections = []
+            for row in range(start, min(start + chunk_size, len(students))):
+                studied_ids = contexts[row][3]
+                studied = np.unique(candidate_index[catalog.positions_of(studied_ids)])
+                selections.append(groups.top_k(group_scores[row], studied[studied >= 0], limit))
+
+            # 청크의 추천 콘텐츠 행을 한 번에 조회
+            tops = [top for top, _, _ in selections]
+            rows = contents_df.iloc[positions[np.concatenate(tops)]].to_dict("records")
+            offsets = np.cumsum([0] + [len(top) for top in tops])
+
+            for i, (_, relevance, is_studied) in enumerate(selections):
+                weak_subjects, strategy = contexts[start + i][:2]
+                yield {
+                    "student_id": students[start + i].student_id,
+                    "recommendations": self._build_recommendations(
+                        rows[offsets[i] : offsets[i + 1]],
+                        relevance,
+                        is_studied,
+                        weak_subjects,
+                        include_reasons,
+                    ),
+                    "weak_subjects": weak_subjects,
+                    "strategy": strategy,
+                    "served_tier": TIER_FULL,
+                }
+
+    def _student_context(
+        self, features: StudentFeatures
+    ) -> tuple[list[str], str, float | None, set[str], set[str]]:
+        """특성 저장소 조회 결과로 (취약 과목, 전략, 평균 점수, 학습 ID, 학습 유형)"""
+        avg_score = features.overall_mean
+        weak_subjects = self._weak_subjects_from_averages(features.subject_averages(), avg_score)
+        strategy = self._determine_strategy(
+            weak_subjects, pd.DataFrame(), has_scores=features.score_count > 0
+        )
+        return (
+            weak_subjects,
+            strategy,
+            avg_score,
+            features.studied_content_ids,
+            features.studied_content_types,
+        )
+
+    def _build_recommendations(
+        self,
+        rows: list[dict[str, Any]],
+        relevance: np.ndarray,
+        is_studied: np.ndarray,
+        weak_subjects: list[str],
+        include_reasons: bool,
+    ) -> list[dict[str, Any]]:
+        """선택된 콘텐츠 행으로 추천 결과 구성"""
         recommendations = []
-        for _, row in top_contents.iterrows():
+        for row, score, studied in zip(rows, relevance, is_studied):
+            row["is_studied"] = bool(studied)
             rec = {
                 "content_id": row["id"],
                 "title": row.get("title", ""),
                 "subject": row.get("subject", ""),
                 "content_type": row.get("content_type", ""),
                 "difficulty": row.get("difficulty"),
-                "relevance_score": round(row["relevance_score"], 2),
+                "relevance_score": round(float(score), 2),
             }
 
             if include_reasons:
                 rec["reason"] = self._generate_reason(row, weak_subjects)
 
             recommendations.append(rec)
-
-        return {
-            "recommendations": recommendations,
-            "weak_subjects": weak_subjects,
-            "strategy": strategy,
-        }
+        return recommendations
 
     def _identify_weak_subjects(self, scores_df: pd.DataFrame) -> list[str]:
         """취약 과목 식별"""
@@ -112,11 +496,22 @@ class ContentRecommender:
         subject_avg = scores_df.groupby("subject")["score"].mean()
         overall_avg = scores_df["score"].mean()
 
+        return self._weak_subjects_from_averages(subject_avg.to_dict(), overall_avg)
+
+    def _weak_subjects_from_averages(
+        self,
+        subject_averages: dict[str, float],
+        overall_avg: float | None,
+    ) -> list[str]:
+        """과목별 평균으로 취약 과목 식별 (낮은 순)"""
+        if not subject_averages or overall_avg is None:
+            return []
+
         # 전체 평균 또는 기준 점수보다 낮은 과목
         threshold = min(overall_avg, self.weak_subject_threshold)
-        weak = subject_avg[subject_avg < threshold].sort_values()
+        weak = [subject for subject, avg in subject_averages.items() if avg < threshold]
 
-        return weak.index.tolist()
+        return sorted(weak, key=subject_averages.__getitem__)
 
     def _get_studied_content_ids(self, plans_df: pd.DataFrame | None) -> set[str]:
         """학습한 콘텐츠 ID 수집"""
@@ -128,14 +523,28 @@ class ContentRecommender:
 
         return set(plans_df["content_id"].dropna().unique())
 
+    def _get_studied_content_types(self, plans_df: pd.DataFrame | None) -> set[str]:
+        """최근 학습한 콘텐츠 유형 수집"""
+        if plans_df is None or plans_df.empty:
+            return set()
+
+        if "content_type" not in plans_df.columns:
+            return set()
+
+        return set(plans_df["content_type"].dropna().unique())
+
     def _determine_strategy(
         self,
         weak_subjects: list[str],
         scores_df: pd.DataFrame,
+        has_scores: bool | None = None,
     ) -> str:
         """추천 전략 결정"""
+        if has_scores is None:
+            has_scores = not scores_df.empty
+
         if not weak_subjects:
-            if scores_df.empty:
+            if not has_scores:
                 return "exploration"  # 데이터 없음, 탐색 모드
             return "balanced"  # 균형 잡힌 학습
 
@@ -144,124 +553,84 @@ class ContentRecommender:
 
         return "weak_priority"  # 취약 과목 우선
 
-    def _filter_contents(
+    def _candidate_positions(
         self,
         contents_df: pd.DataFrame,
         subject: str | None,
+        catalog: CatalogIndex | None = None,
+        overlay: StudentOverlay | None = None,
+    ) -> np.ndarray:
+        """과목 필터를 통과한 콘텐츠의 행 위치 (overlay가 있으면 연결 행 순서)"""
+        if overlay is not None:
+            if not subject:
+                return overlay.positions
+            return overlay.positions[bitset_test(catalog.mask(subject=subject), overlay.positions)]
+        if catalog is not None:
+            return catalog.select(subject=subject or None)
+        if subject and "subject" in contents_df.columns:
+            return np.flatnonzero((contents_df["subject"] == subject).to_numpy())
+        return np.arange(len(contents_df))
+
+    def _studied_mask(
+        self,
+        contents_df: pd.DataFrame,
+        positions: np.ndarray,
         studied_ids: set[str],
-    ) -> pd.DataFrame:
-        """콘텐츠 필터링"""
-        filtered = contents_df.copy()
-
-        # 특정 과목 필터
-        if subject and "subject" in filtered.columns:
-            filtered = filtered[filtered["subject"] == subject]
-
-        # 이미 학습한 콘텐츠 제외 (선택적)
-        # 복습을 위해 완전히 제외하지 않고 가중치만 낮춤
-        if "id" in filtered.columns:
-            filtered["is_studied"] = filtered["id"].isin(studied_ids)
-        else:
-            filtered["is_studied"] = False
-
-        return filtered
-
-    def _score_contents(
+        catalog: CatalogIndex | None = None,
+        overlay: StudentOverlay | None = None,
+    ) -> np.ndarray:
+        """후보별 학습 여부 (플랜 이력 또는 연결 행의 학습 완료 표시)"""
+        if catalog is not None:
+            studied = catalog.ids_mask(studied_ids)
+            if overlay is not None:
+                set_bits(studied, overlay.positions[overlay.studied])
+            return bitset_test(studied, positions)
+        if "id" not in contents_df.columns or not studied_ids:
+            return np.zeros(len(positions), dtype=bool)
+        return contents_df["id"].isin(studied_ids).to_numpy()[positions]
+
+    def _relevance_kernel(
         self,
-        contents: pd.DataFrame,
+        contents_df: pd.DataFrame,
+        positions: np.ndarray,
         weak_subjects: list[str],
-        scores_df: pd.DataFrame,
-        plans_df: pd.DataFrame | None,
-    ) -> pd.DataFrame:
-        """콘텐츠 점수 계산"""
-        scored = contents.copy()
-        scored["relevance_score"] = 0.0
+        avg_score: float | None,
+        recent_types: set[str],
+        is_studied: np.ndarray,
+    ) -> np.ndarray:
+        """
+        후보 콘텐츠 적합도 (0-100)
 
-        # 1. 취약 과목 가중치 (0-40점)
-        if weak_subjects and "subject" in scored.columns:
-            weak_set = set(weak_subjects)
-            scored["weak_subject_score"] = scored["subject"].apply(
-                lambda x: 40.0 if x in weak_set else 10.0
-            )
-        else:
-            scored["weak_subject_score"] = 10.0
+        과목/난이도/유형 컬럼을 범주 코드로 바꾸고 고유값별 점수 테이블을 조회하므로
+        행 단위 함수 호출이 없습니다.
+        """
+        weak_set = set(weak_subjects)
+        preferred = _preferred_difficulty(avg_score)
 
+        # 1. 취약 과목 가중치 (0-40점)
+        relevance = _lookup_column(
+            contents_df, "subject", positions, lambda x: 40.0 if x in weak_set else 10.0, 10.0
+        )
         # 2. 난이도 적합성 (0-30점)
-        scored["difficulty_score"] = self._calculate_difficulty_score(
-            scored, scores_df
+        relevance += _lookup_column(
+            contents_df,
+            "difficulty",
+            positions,
+            lambda x: DIFFICULTY_MATCH[preferred].get(x, 15),
+            15.0,
         )
-
         # 3. 콘텐츠 유형 다양성 (0-20점)
-        scored["diversity_score"] = self._calculate_diversity_score(
-            scored, plans_df
+        relevance += _lookup_column(
+            contents_df,
+            "content_type",
+            positions,
+            lambda x: 20.0 if x not in recent_types else 10.0,
+            10.0,
         )
-
         # 4. 신규 콘텐츠 가중치 (0-10점)
-        scored["novelty_score"] = scored["is_studied"].apply(
-            lambda x: 0.0 if x else 10.0
-        )
-
-        # 총점 계산
-        scored["relevance_score"] = (
-            scored["weak_subject_score"]
-            + scored["difficulty_score"]
-            + scored["diversity_score"]
-            + scored["novelty_score"]
-        )
-
-        return scored
+        relevance += np.where(is_studied, 0.0, 10.0)
 
-    def _calculate_difficulty_score(
-        self,
-        contents: pd.DataFrame,
-        scores_df: pd.DataFrame,
-    ) -> pd.Series:
-        """난이도 적합성 점수 계산"""
-        if "difficulty" not in contents.columns:
-            return pd.Series([15.0] * len(contents), index=contents.index)
-
-        # 학생 수준 추정 (평균 점수 기반)
-        if not scores_df.empty:
-            avg_score = scores_df["score"].mean()
-            if avg_score >= 80:
-                preferred_difficulty = "hard"
-            elif avg_score >= 60:
-                preferred_difficulty = "medium"
-            else:
-                preferred_difficulty = "easy"
-        else:
-            preferred_difficulty = "medium"
-
-        # 난이도 매칭 점수
-        difficulty_map = {
-            "easy": {"easy": 30, "medium": 20, "hard": 10},
-            "medium": {"easy": 15, "medium": 30, "hard": 20},
-            "hard": {"easy": 10, "medium": 20, "hard": 30},
-        }
-
-        return contents["difficulty"].apply(
-            lambda x: difficulty_map.get(preferred_difficulty, {}).get(x, 15)
-        )
-
-    def _calculate_diversity_score(
-        self,
-        contents: pd.DataFrame,
-        plans_df: pd.DataFrame | None,
-    ) -> pd.Series:
-        """콘텐츠 유형 다양성 점수"""
-        if "content_type" not in contents.columns:
-            return pd.Series([10.0] * len(contents), index=contents.index)
-
-        # 최근 학습한 콘텐츠 유형 분석
-        recent_types = set()
-        if plans_df is not None and not plans_df.empty:
-            if "content_type" in plans_df.columns:
-                recent_types = set(plans_df["content_type"].dropna().unique())
-
-        # 최근 학습하지 않은 유형에 가중치
-        return contents["content_type"].apply(
-            lambda x: 20.0 if x not in recent_types else 10.0
-        )
+        return relevance
 
     def _generate_reason(
         self,
@@ -275,13 +644,14 @@ class ContentRecommender:
         if subject in weak_subjects:
             reasons.append(f"취약 과목({subject}) 보완")
 
+        # 범주형 결측(NaN)은 참으로 평가되므로 notna로 먼저 거름
         difficulty = content_row.get("difficulty")
-        if difficulty:
+        if pd.notna(difficulty) and difficulty:
             difficulty_kr = {"easy": "쉬움", "medium": "보통", "hard": "어려움"}
             reasons.append(f"난이도: {difficulty_kr.get(difficulty, difficulty)}")
 
         content_type = content_row.get("content_type")
-        if content_type:
+        if pd.notna(content_type) and content_type:
             type_kr = {
                 "book": "교재",
                 "lecture": "강의",
@@ -290,18 +660,46 @@ class ContentRecommender:
             }
             reasons.append(f"유형: {type_kr.get(content_type, content_type)}")
 
+        if content_row.get("collaborative_score", 0) > 0:
+            reasons.append("비슷한 학생들이 함께 학습")
+
         if not content_row.get("is_studied", False):
             reasons.append("신규 콘텐츠")
 
         return " | ".join(reasons) if reasons else "맞춤 추천"
 
 
+def _collaborative_items(
+    contents_df: pd.DataFrame, content_ids: list, reason: str
+) -> list[dict[str, Any]]:
+    """
+    콘텐츠 ID 목록 → 메타데이터가 붙은 협업 추천 항목 (카탈로그에 없는 ID는 제외)
+
+    id → 행 위치 인덱스로 한 번에 찾으며, 같은 id가 여러 행이면 첫 행을 사용합니다.
+    """
+    if not content_ids or contents_df.empty:
+        return []
+
+    ids = pd.Index(contents_df["id"])
+    first = np.flatnonzero(~ids.duplicated())
+    found = ids[first].get_indexer(content_ids)
+    rows = contents_df.iloc[first[found[found >= 0]]].to_dict("records")
+    return [
+        {
+            "content_id": content_id,
+            "title": row.get("title", ""),
+            "subject": row.get("subject", ""),
+            "reason": reason,
+        }
+        for content_id, row in zip(np.asarray(content_ids, dtype=object)[found >= 0], rows)
+    ]
+
+
 class CollaborativeRecommender:
     """
     협업 필터링 기반 추천
 
     유사한 학습 패턴을 가진 학생들의 데이터를 활용합니다.
-    (향후 확장용)
     """
 
     def __init__(self, min_common_items: int = 3):
@@ -310,38 +708,43 @@ class CollaborativeRecommender:
     def find_similar_students(
         self,
         student_id: str,
-        all_plans: pd.DataFrame,
+        all_plans: pd.DataFrame | None = None,
+        matrix: InteractionMatrix | None = None,
+        limit: int = 10,
+        lsh: MinHashLSH | None = None,
     ) -> list[str]:
-        """유사 학생 찾기"""
-        if all_plans.empty:
-            return []
-
-        # 학생별 학습한 콘텐츠 집합
-        student_contents = all_plans.groupby("student_id")["content_id"].apply(set)
-
-        if student_id not in student_contents.index:
-            return []
+        """
+        유사 학생 찾기 (Jaccard 유사도 상위 limit명)
 
-        target_contents = student_contents[student_id]
+        Args:
+            student_id: 대상 학생 ID
+            all_plans: 전체 학생 플랜 (matrix가 없을 때 행렬 생성에 사용)
+            matrix: 테넌트 단위로 미리 만든 상호작용 행렬
+            limit: 반환할 학생 수
+            lsh: 대형 테넌트용 MinHash-LSH 인덱스 (주면 후보만 정확히 재정렬하는 근사 탐색)
 
-        # Jaccard 유사도 계산
-        similarities = []
-        for other_id, other_contents in student_contents.items():
-            if other_id == student_id:
-                continue
+        Returns:
+            유사도 내림차순 학생 ID 목록 (동점은 학생 ID 순)
+        """
+        if lsh is not None:
+            return lsh.query(student_id, limit=limit, min_common_items=self.min_common_items)
 
-            intersection = len(target_contents & other_contents)
-            if intersection < self.min_common_items:
-                continue
+        if matrix is None:
+            if all_plans is None or all_plans.empty:
+                return []
+            matrix = InteractionMatrix.from_plans(all_plans)
 
-            union = len(target_contents | other_contents)
-            similarity = intersection / union if union > 0 else 0
+        row = matrix.row_of(student_id)
+        if row is None:
+            return []
 
-            similarities.append((other_id, similarity))
+        intersection, similarity = matrix.jaccard(row)
+        eligible = intersection >= self.min_common_items
+        eligible[row] = False
+        candidates = np.flatnonzero(eligible)
 
-        # 상위 유사 학생 반환
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return [s[0] for s in similarities[:10]]
+        top = candidates[_top_k_stable(similarity[candidates], limit)]
+        return matrix.student_ids[top].tolist()
 
     def get_collaborative_recommendations(
         self,
@@ -368,20 +771,58 @@ class CollaborativeRecommender:
         new_contents = content_counts[~content_counts.index.isin(target_contents)]
 
         top_content_ids = new_contents.head(limit).index.tolist()
+        return _collaborative_items(
+            contents_df, top_content_ids, "유사 학생들이 학습한 콘텐츠"
+        )
 
-        # 콘텐츠 정보 조회
-        recommendations = []
-        for content_id in top_content_ids:
-            content_info = contents_df[contents_df["id"] == content_id]
-            if not content_info.empty:
-                row = content_info.iloc[0]
-                recommendations.append(
-                    {
-                        "content_id": content_id,
-                        "title": row.get("title", ""),
-                        "subject": row.get("subject", ""),
-                        "reason": "유사 학생들이 학습한 콘텐츠",
-                    }
-                )
+    def get_item_based_recommendations(
+        self,
+        student_id: str,
+        cooccurrence: ItemCooccurrence,
+        contents_df: pd.DataFrame,
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """
+        아이템 기반 협업 필터링 추천 (함께 학습된 콘텐츠)
 
-        return recommendations
+        Args:
+            student_id: 대상 학생 ID
+            cooccurrence: 테넌트 동시 학습 모델
+            contents_df: 콘텐츠 메타데이터 (id, title, subject)
+            limit: 추천 개수
+
+        Returns:
+            추천 콘텐츠 목록 (동시 학습 수 합 내림차순)
+        """
+        ranked = cooccurrence.recommend(student_id, limit=limit)
+        return _collaborative_items(
+            contents_df,
+            [content_id for content_id, _ in ranked],
+            "이 콘텐츠를 학습한 학생들이 함께 학습한 콘텐츠",
+        )
+
+    def get_factor_recommendations(
+        self,
+        student_id: str,
+        factors: ImplicitFactors,
+        contents_df: pd.DataFrame,
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """
+        잠재 요인(ALS) 기반 협업 필터링 추천
+
+        Args:
+            student_id: 대상 학생 ID
+            factors: 오프라인 학습된 잠재 벡터
+            contents_df: 콘텐츠 메타데이터 (id, title, subject)
+            limit: 추천 개수
+
+        Returns:
+            추천 콘텐츠 목록 (예측 선호도 내림차순, 학습한 콘텐츠 제외)
+        """
+        ranked = factors.recommend(student_id, limit=limit)
+        return _collaborative_items(
+            contents_df,
+            [content_id for content_id, _ in ranked],
+            "학습 패턴이 비슷한 학생들이 선호한 콘텐츠",
+        )
@@ -0,0 +1,395 @@
+"""
+콘텐츠 × 콘텐츠 동시 학습 행렬 (아이템 기반 협업 필터링)
+
+"X를 학습한 학생들이 함께 학습한 콘텐츠"를 학생 × 콘텐츠 행렬 X에서
+C = XᵀX (대각 제외)로 한 번 만들어 두고, 질의는 학생이 학습한 콘텐츠 행 몇 개의 합으로 답합니다.
+
+플랜이 추가되면 새 (학생, 콘텐츠) 쌍마다 그 학생의 기존 콘텐츠와의 동시 학습 수를
+변경분 dict에 더하고, 변경분이 커지면 CSR 기본 행렬에 합칩니다.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..metrics import get_metrics
+from .interaction_matrix import InteractionMatrix
+
+# 변경분 항목 수가 이보다 많아지면 기본 행렬에 합침
+DEFAULT_COMPACT_THRESHOLD = 200_000
+
+
+class ItemCooccurrence:
+    """
+    테넌트 단위 콘텐츠 동시 학습 수 모델
+
+    기본 CSR 행렬 + 제자리 갱신용 변경분 dict로 구성되며, 행 합은 두 부분을 더해 계산합니다.
+    백그라운드 갱신의 add()와 요청의 조회가 겹칠 수 있으므로 모델마다 잠금으로 보호합니다.
+    """
+
+    def __init__(
+        self,
+        interactions: InteractionMatrix | None = None,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ):
+        """
+        Args:
+            interactions: 초기 학생 × 콘텐츠 행렬 (None이면 빈 모델)
+            compact_threshold: 변경분을 기본 행렬에 합치는 항목 수
+        """
+        if interactions is None:
+            interactions = InteractionMatrix.from_plans(pd.DataFrame())
+        self.compact_threshold = compact_threshold
+
+        x = interactions.matrix.astype(np.int32)
+        base = sparse.csr_array(x.T @ x)
+        self.item_counts = base.diagonal().astype(np.int64)
+        base.setdiag(0)
+        base.eliminate_zeros()
+        self._base = base
+
+        self._content_ids: list = list(interactions.content_ids)
+        self._items = {cid: i for i, cid in enumerate(self._content_ids)}
+        self._interactions = interactions
+        self._added: dict[Any, set[int]] = {}
+        self._delta: dict[int, dict[int, int]] = {}
+        self._delta_size = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_plans(cls, plans_df: pd.DataFrame, **kwargs) -> "ItemCooccurrence":
+        """학습 플랜(student_id, content_id)에서 모델 생성"""
+        return cls(InteractionMatrix.from_plans(plans_df), **kwargs)
+
+    @property
+    def n_items(self) -> int:
+        """콘텐츠 수"""
+        return len(self._content_ids)
+
+    @property
+    def content_ids(self) -> list:
+        """행 순서의 콘텐츠 ID"""
+        return self._content_ids
+
+    def __contains__(self, content_id: object) -> bool:
+        return content_id in self._items
+
+    def add(self, student_id: object, content_ids: Iterable) -> int:
+        """
+        학생 플랜 추가 반영 (이미 학습한 콘텐츠는 무시)
+
+        Args:
+            student_id: 학생 ID
+            content_ids: 새 플랜의 콘텐츠 ID
+
+        Returns:
+            새로 반영된 (학생, 콘텐츠) 쌍 수
+        """
+        with self._lock:
+            return self._add(student_id, content_ids)
+
+    def _add(self, student_id: object, content_ids: Iterable) -> int:
+        known = self.student_items(student_id)
+        studied = set(known.tolist())
+        added = self._added.setdefault(student_id, set())
+        new_items = []
+        for content_id in content_ids:
+            if pd.isna(content_id):
+                continue
+            item = self._items.get(content_id)
+            if item is None:
+                item = self._register(content_id)
+            if item in studied:
+                continue
+            for other in studied:
+                self._increment(item, other)
+                self._increment(other, item)
+            studied.add(item)
+            added.add(item)
+            new_items.append(item)
+
+        if new_items:
+            np.add.at(self.item_counts, new_items, 1)
+        if self._delta_size > self.compact_threshold:
+            self._compact()
+        return len(new_items)
+
+    def student_items(self, student_id: object) -> np.ndarray:
+        """학생이 학습한 콘텐츠 행 번호"""
+        row = self._interactions.row_of(student_id)
+        base = self._interactions.row_contents(row) if row is not None else np.empty(0, np.int32)
+        added = self._added.get(student_id)
+        if not added:
+            return base.astype(np.int64)
+        return np.union1d(base, np.fromiter(added, dtype=np.int64))
+
+    def scores(self, items: np.ndarray) -> np.ndarray:
+        """
+        주어진 콘텐츠들과의 동시 학습 수 합 (전체 콘텐츠 길이 벡터)
+
+        Args:
+            items: 기준 콘텐츠 행 번호
+
+        Returns:
+            콘텐츠별 동시 학습 수 합
+        """
+        totals = np.zeros(self.n_items, dtype=np.float64)
+        base_items = items[items < self._base.shape[0]]
+        if len(base_items):
+            indptr = self._base.indptr
+            starts, stops = indptr[base_items], indptr[base_items + 1]
+            lengths = stops - starts
+            gather = np.repeat(stops - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+            totals[: self._base.shape[1]] += np.bincount(
+                self._base.indices[gather],
+                weights=self._base.data[gather],
+                minlength=self._base.shape[1],
+            )
+        for item in items.tolist():
+            for other, count in self._delta.get(item, {}).items():
+                totals[other] += count
+        return totals
+
+    def student_scores(self, student_id: object) -> np.ndarray | None:
+        """
+        학생이 학습한 콘텐츠와의 동시 학습 수 합 (학습한 콘텐츠는 0)
+
+        Returns:
+            content_ids 순서 점수 벡터, 학습 이력이 없으면 None
+        """
+        with self._lock:
+            items = self.student_items(student_id)
+            if not len(items):
+                return None
+            totals = self.scores(items)
+        totals[items] = 0.0
+        return totals
+
+    def recommend(
+        self,
+        student_id: object,
+        limit: int = 5,
+    ) -> list[tuple[Any, float]]:
+        """
+        학생이 학습한 콘텐츠와 함께 많이 학습된 미학습 콘텐츠
+
+        Args:
+            student_id: 학생 ID
+            limit: 반환할 콘텐츠 수
+
+        Returns:
+            (content_id, 동시 학습 수 합) 목록 (점수 내림차순, 동점은 콘텐츠 ID 순)
+        """
+        totals = self.student_scores(student_id)
+        if totals is None:
+            return []
+        candidates = np.flatnonzero(totals > 0)
+        if not len(candidates):
+            return []
+        ids = np.asarray([self._content_ids[c] for c in candidates], dtype=object)
+        order = np.lexsort((ids, -totals[candidates]))[:limit]
+        return [(ids[o], float(totals[candidates[o]])) for o in order]
+
+    def compact(self) -> None:
+        """변경분을 기본 CSR 행렬에 합침"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        n = self.n_items
+        base = self._base
+        if base.shape != (n, n):
+            base = sparse.csr_array(
+                (base.data, base.indices, np.pad(base.indptr, (0, n - base.shape[0]), "edge")),
+                shape=(n, n),
+            )
+        if self._delta_size:
+            rows, cols, counts = [], [], []
+            for item, others in self._delta.items():
+                rows.extend([item] * len(others))
+                cols.extend(others.keys())
+                counts.extend(others.values())
+            base = base + sparse.csr_array(
+                (np.asarray(counts, dtype=base.dtype), (rows, cols)), shape=(n, n)
+            )
+        self._base = sparse.csr_array(base)
+        self._delta = {}
+        self._delta_size = 0
+
+    def _register(self, content_id: object) -> int:
+        """새 콘텐츠 행 추가"""
+        item = len(self._content_ids)
+        self._content_ids.append(content_id)
+        self._items[content_id] = item
+        self.item_counts = np.append(self.item_counts, 0)
+        return item
+
+    def _increment(self, item: int, other: int) -> None:
+        """변경분 동시 학습 수 +1"""
+        row = self._delta.setdefault(item, {})
+        if other not in row:
+            self._delta_size += 1
+        row[other] = row.get(other, 0) + 1
+
+
+class CooccurrenceRegistry:
+    """
+    테넌트별 동시 학습 모델 (프로세스당 1개)
+
+    처음 조회할 때 테넌트 전체 플랜으로 만들고, 이후에는 refresh_interval_seconds마다
+    watermark 이후 생성된 플랜만 읽어 add()로 반영합니다.
+    플랜은 (created_at, id) 순서의 키셋 페이지로 읽고 페이지마다 watermark를 옮기므로
+    PostgREST max-rows 제한이나 생성 시각이 같은 플랜 때문에 빠지는 행이 없습니다.
+    플랜 삭제는 증분으로 알 수 없으므로 full_refresh_seconds마다 다시 만듭니다.
+
+    구성과 갱신은 요청 밖 백그라운드 작업에서 테넌트마다 하나씩만 실행하며, 조회는
+    기다리지 않고 현재 모델(첫 구성 전이면 None)을 바로 돌려줍니다.
+    잠금은 상태 dict를 읽고 쓰는 동안만 잡고, 플랜 조회 중에는 잡지 않습니다.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Any], pd.DataFrame],
+        refresh_interval_seconds: float = 300.0,
+        full_refresh_seconds: float = 21600.0,
+        page_size: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+        spawn: Callable[[Callable[[], None]], None] | None = None,
+    ):
+        """
+        Args:
+            fetch: (tenant_id, after) → (created_at, id) 순으로 after 다음부터 최대 page_size행의
+                id, student_id, content_id, created_at DataFrame (after가 None이면 처음부터)
+            refresh_interval_seconds: 증분 갱신 주기 (초)
+            full_refresh_seconds: 전체 재구성 주기 (초)
+            page_size: fetch 한 번에 돌려주는 최대 행 수 (이보다 적으면 마지막 페이지)
+            clock: 초 단위 단조 시계 (테스트용)
+            spawn: 갱신 작업 실행기 (기본값: 데몬 스레드, 테스트에서는 즉시 실행)
+        """
+        self.fetch = fetch
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.page_size = page_size
+        self._clock = clock
+        self._spawn = spawn or _start_daemon
+        self._lock = threading.Lock()
+        # tenant_id → (모델, watermark, 마지막 증분 갱신 시각, 마지막 전체 재구성 시각)
+        self._tenants: dict[str, tuple[ItemCooccurrence, Any, float, float]] = {}
+        # 갱신 작업이 진행 중인 테넌트
+        self._refreshing: set[str] = set()
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def get(self, tenant_id: str) -> ItemCooccurrence | None:
+        """
+        테넌트 모델 조회 (주기가 지났으면 백그라운드 갱신 시작)
+
+        Returns:
+            현재 모델, 첫 구성이 끝나지 않았으면 None
+        """
+        with self._lock:
+            now = self._clock()
+            entry = self._tenants.get(tenant_id)
+            due = (
+                entry is None
+                or now - entry[2] >= self.refresh_interval_seconds
+                or now - entry[3] >= self.full_refresh_seconds
+            )
+            start = due and tenant_id not in self._refreshing
+            if start:
+                self._refreshing.add(tenant_id)
+
+        if start:
+            self._spawn(lambda: self._refresh(tenant_id, now))
+        with self._lock:
+            entry = self._tenants.get(tenant_id)
+        return entry[0] if entry is not None else None
+
+    def refresh(self, tenant_id: str) -> ItemCooccurrence | None:
+        """
+        호출 스레드에서 바로 갱신 (오프라인 작업·워밍업용)
+
+        Returns:
+            갱신 후 모델, 다른 갱신이 진행 중이면 현재 모델
+        """
+        with self._lock:
+            start = tenant_id not in self._refreshing
+            if start:
+                self._refreshing.add(tenant_id)
+        if start:
+            self._refresh(tenant_id, self._clock())
+        with self._lock:
+            entry = self._tenants.get(tenant_id)
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, tenant_id: str) -> None:
+        """다음 조회 때 전체 재구성"""
+        with self._lock:
+            entry = self._tenants.get(tenant_id)
+            if entry is not None:
+                self._tenants[tenant_id] = (entry[0], entry[1], entry[2], -float("inf"))
+
+    def _refresh(self, tenant_id: str, now: float) -> None:
+        """전체 재구성 또는 증분 갱신 (_refreshing에 등록한 작업만 호출)"""
+        try:
+            with self._lock:
+                entry = self._tenants.get(tenant_id)
+            if entry is None or now - entry[3] >= self.full_refresh_seconds:
+                pages = []
+                watermark = None
+                for page, watermark in self._pages(tenant_id, None):
+                    pages.append(page)
+                model = ItemCooccurrence.from_plans(
+                    pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+                )
+                with self._lock:
+                    self._tenants[tenant_id] = (model, watermark, now, now)
+                return
+
+            model, watermark, refreshed_at, _ = entry
+            for page, watermark in self._pages(tenant_id, watermark):
+                for student_id, group in page.groupby("student_id", sort=False):
+                    model.add(student_id, group["content_id"])
+                # 중간 페이지에서 실패해도 이미 더한 플랜을 다시 더하지 않도록 페이지마다 기록
+                self._advance(tenant_id, watermark, refreshed_at)
+            self._advance(tenant_id, watermark, now)
+        except Exception:
+            # 기존 모델을 유지하고 다음 조회 때 다시 시도
+            get_metrics().inc("cooccurrence.refresh_errors")
+            raise
+        finally:
+            with self._lock:
+                self._refreshing.discard(tenant_id)
+
+    def _advance(self, tenant_id: str, watermark: Any, refreshed_at: float) -> None:
+        """증분 갱신 진행 기록 (그 사이 invalidate된 재구성 시각은 유지)"""
+        with self._lock:
+            model, _, _, rebuilt_at = self._tenants[tenant_id]
+            self._tenants[tenant_id] = (model, watermark, refreshed_at, rebuilt_at)
+
+    def _pages(self, tenant_id: str, watermark: Any) -> Iterator[tuple[pd.DataFrame, Any]]:
+        """watermark 다음 플랜을 페이지마다 (페이지, 페이지 마지막 행의 watermark)로 반환"""
+        while True:
+            page = self.fetch(tenant_id, watermark)
+            if page.empty:
+                return
+            watermark = _watermark(page)
+            yield page, watermark
+            if len(page) < self.page_size:
+                return
+
+
+def _watermark(page: pd.DataFrame) -> tuple[Any, Any]:
+    """(created_at, id) 순으로 정렬된 페이지의 마지막 행 키"""
+    return page["created_at"].iloc[-1], page["id"].iloc[-1]
+
+
+def _start_daemon(task: Callable[[], None]) -> None:
+    """요청과 무관하게 끝나는 데몬 스레드에서 실행"""
+    threading.Thread(target=task, daemon=True).start()
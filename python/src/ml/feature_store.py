@@ -0,0 +1,570 @@
+"""
+학생별 특성 저장소
+
+성적 예측과 콘텐츠 추천에 쓰는 특성(이전 점수, 이동 평균/표준편차, 과목 평균,
+완료율, 과목별 학습 시간, 학습 이력)을 (학생, 과목) 단위의 압축 배열로 유지합니다.
+서비스는 프로세스당 저장소 하나에 학생마다 기록 하나를 두고, 처음 조회할 때 성적/플랜으로
+만든 뒤 성적/플랜 이벤트로 점진 갱신합니다. 성적 예측과 콘텐츠 추천은 같은 기록을 한 번
+조회해 사용하며, 갱신할 때마다 학생 단위 버전이 증가합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..config import ML_CONFIG
+from .trend_stats import TrendAccumulator, TrendStatsStore, get_trend_stats
+
+# 특성 벡터 차원 (이전 점수 3개 + 이동 평균 + 표준편차)
+N_SCORE_FEATURES = 5
+
+# 이동 평균/표준편차 윈도우
+FEATURE_WINDOW = 5
+
+
+def compute_feature_row(scores: np.ndarray, i: int) -> list[float]:
+    """
+    i번째 성적 시점의 특성 행 (scores[:i + 1]만 사용)
+
+    ScorePredictor의 일괄 추출과 저장소의 점진 갱신이 같은 정의를 공유합니다.
+    """
+    feat = []
+
+    # 이전 점수들 (최대 3개)
+    for j in range(1, 4):
+        if i >= j:
+            feat.append(scores[i - j])
+        else:
+            feat.append(scores[0])  # 패딩
+
+    # 이동 평균
+    window = min(i + 1, FEATURE_WINDOW)
+    feat.append(np.mean(scores[max(0, i - window + 1) : i + 1]))
+
+    # 표준편차
+    if i >= 2:
+        feat.append(np.std(scores[max(0, i - FEATURE_WINDOW + 1) : i + 1]))
+    else:
+        feat.append(0)
+
+    return feat
+
+
+class SubjectFeatures:
+    """
+    (학생, 과목) 특성: 성적 배열, 특성 행렬, 트렌드 누적기, 학습량
+
+    trend는 저장된 성적보다 긴 이력(TrendStatsStore)으로 초기화될 수 있으므로
+    성적 수는 따로 셉니다.
+    """
+
+    __slots__ = (
+        "_scores",
+        "_features",
+        "_count",
+        "trend",
+        "study_sessions",
+        "study_minutes",
+        "completed_sessions",
+    )
+
+    def __init__(self, capacity: int = 8):
+        self._scores = np.empty(capacity, dtype=np.float64)
+        self._features = np.empty((capacity, N_SCORE_FEATURES), dtype=np.float64)
+        self._count = 0
+        self.trend = TrendAccumulator()
+        self.study_sessions = 0
+        self.study_minutes = 0.0
+        self.completed_sessions = 0
+
+    @property
+    def count(self) -> int:
+        """저장된 성적 수"""
+        return self._count
+
+    @property
+    def scores(self) -> np.ndarray:
+        """시간순 성적 (읽기 전용 뷰)"""
+        return self._scores[: self.count]
+
+    @property
+    def features(self) -> np.ndarray | None:
+        """특성 행렬 (성적 3개 미만이면 None, ScorePredictor와 동일 규칙)"""
+        if self.count < 3:
+            return None
+        return self._features[: self.count]
+
+    def add_score(self, score: float) -> None:
+        """성적 추가 (O(1) 분할 상환, 기존 사본이 읽는 앞부분은 바꾸지 않음)"""
+        i = self._count
+        if i == len(self._scores):
+            self._scores = np.resize(self._scores, 2 * i)
+            self._features = np.resize(self._features, (2 * i, N_SCORE_FEATURES))
+
+        self._scores[i] = score
+        self._features[i] = compute_feature_row(self._scores, i)
+        self.trend.update(score)
+        self._count = i + 1
+
+    def add_plan(self, actual_duration: float | None, completed: bool = False) -> None:
+        """플랜 반영"""
+        self.study_sessions += 1
+        if actual_duration is not None and not pd.isna(actual_duration):
+            self.study_minutes += float(actual_duration)
+        if completed:
+            self.completed_sessions += 1
+
+    def copy(self) -> "SubjectFeatures":
+        """
+        갱신용 사본
+
+        성적/특성 버퍼는 공유합니다. 사본은 자기 성적 수 뒤에만 쓰고 기존 기록은 자기 성적 수까지만
+        읽으므로, 사본을 갱신해도 기존 기록을 읽는 요청에는 영향이 없습니다.
+        """
+        copied = SubjectFeatures.__new__(SubjectFeatures)
+        copied._scores = self._scores
+        copied._features = self._features
+        copied._count = self._count
+        copied.trend = self.trend.copy()
+        copied.study_sessions = self.study_sessions
+        copied.study_minutes = self.study_minutes
+        copied.completed_sessions = self.completed_sessions
+        return copied
+
+
+class StudentFeatures:
+    """학생 단위 특성 묶음 (저장소 조회 1회로 예측/추천에 필요한 값을 모두 제공)"""
+
+    def __init__(self, student_id: str):
+        self.student_id = student_id
+        self.subjects: dict[str, SubjectFeatures] = {}
+        self.studied_content_ids: set[str] = set()
+        self.studied_content_types: set[str] = set()
+        self.total_plans = 0
+        self.completed_plans = 0
+        self.version = 0
+        self.loaded_at = time.monotonic()
+
+    def subject(self, subject: str) -> SubjectFeatures | None:
+        """과목 특성 조회"""
+        return self.subjects.get(subject)
+
+    def copy(self) -> "StudentFeatures":
+        """갱신용 사본 (과목 특성은 갱신할 과목만 _subject_for_update에서 복사)"""
+        copied = StudentFeatures(self.student_id)
+        copied.subjects = dict(self.subjects)
+        copied.studied_content_ids = set(self.studied_content_ids)
+        copied.studied_content_types = set(self.studied_content_types)
+        copied.total_plans = self.total_plans
+        copied.completed_plans = self.completed_plans
+        copied.version = self.version
+        copied.loaded_at = self.loaded_at
+        return copied
+
+    def _subject_or_create(self, subject: str) -> SubjectFeatures:
+        features = self.subjects.get(subject)
+        if features is None:
+            features = self.subjects[subject] = SubjectFeatures()
+        return features
+
+    def _subject_for_update(self, subject: str) -> SubjectFeatures:
+        """사본에서 갱신할 과목 특성 (기존 기록과 공유하지 않도록 복사)"""
+        features = self.subjects.get(subject)
+        features = features.copy() if features is not None else SubjectFeatures()
+        self.subjects[subject] = features
+        return features
+
+    @property
+    def score_count(self) -> int:
+        """전체 성적 수"""
+        return sum(f.count for f in self.subjects.values())
+
+    @property
+    def overall_mean(self) -> float | None:
+        """전체 성적 평균 (성적이 없으면 None)"""
+        count = sum(f.trend.count for f in self.subjects.values())
+        if count == 0:
+            return None
+        return sum(f.trend.sum_y for f in self.subjects.values()) / count
+
+    def subject_averages(self) -> dict[str, float]:
+        """성적이 있는 과목별 평균"""
+        return {s: f.trend.mean for s, f in self.subjects.items() if f.trend.count}
+
+    @property
+    def completion_rate(self) -> float:
+        """플랜 완료율 (0-1)"""
+        return self.completed_plans / self.total_plans if self.total_plans else 0.0
+
+
+class FeatureStore:
+    """
+    학생별 특성 저장소
+
+    성적은 시간순으로 반영된다고 가정하며, 갱신할 때마다 해당 학생의 버전과
+    저장소 전체 버전이 증가합니다.
+
+    서비스용 저장소(get_feature_store)의 기록은 한 번 공개하면 바꾸지 않습니다.
+    이벤트(record_score, record_plan, mark_plan_completed)는 기록 사본을 갱신한 뒤
+    교체하므로, 예측/추천 요청은 조회한 기록을 잠금 없이 읽습니다. 처음 조회하는 학생과
+    max_age_seconds가 지난 기록은 fetch로 다시 만들고, max_students를 넘으면 가장 오래
+    조회하지 않은 학생부터 내보냅니다.
+    """
+
+    def __init__(
+        self,
+        max_students: int | None = None,
+        max_age_seconds: float | None = None,
+        trend_stats: TrendStatsStore | None = None,
+    ):
+        """
+        Args:
+            max_students: 유지할 최대 학생 수 (None이면 제한 없음)
+            max_age_seconds: 기록을 성적/플랜으로 다시 만드는 주기 (None이면 다시 만들지 않음)
+            trend_stats: 기록을 만들 때 과목 트렌드를 가져올 누적기 저장소 (선택)
+        """
+        self._students: OrderedDict[str, StudentFeatures] = OrderedDict()
+        self.version = 0
+        self.max_students = max_students
+        self.max_age_seconds = max_age_seconds
+        self.trend_stats = trend_stats
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._students
+
+    def get(self, student_id: str) -> StudentFeatures | None:
+        """학생 특성 조회"""
+        return self._students.get(student_id)
+
+    def get_version(self, student_id: str) -> int:
+        """학생 특성 버전 (없으면 0)"""
+        features = self._students.get(student_id)
+        return features.version if features else 0
+
+    def _student(self, student_id: str) -> StudentFeatures:
+        features = self._students.get(student_id)
+        if features is None:
+            features = self._students[student_id] = StudentFeatures(student_id)
+        return features
+
+    def _touch(self, features: StudentFeatures) -> None:
+        self.version += 1
+        features.version = self.version
+
+    def add_score(self, student_id: str, subject: str, score: float) -> None:
+        """새 성적 반영 (저장소를 만드는 동안 사용, 공개한 기록은 record_score로 갱신)"""
+        features = self._student(student_id)
+        features._subject_or_create(subject).add_score(float(score))
+        self._touch(features)
+
+    def add_plan(
+        self,
+        student_id: str,
+        subject: str | None = None,
+        content_id: str | None = None,
+        content_type: str | None = None,
+        actual_duration: float | None = None,
+        completed: bool = False,
+    ) -> None:
+        """새 플랜 반영 (저장소를 만드는 동안 사용, 공개한 기록은 record_plan으로 갱신)"""
+        features = self._student(student_id)
+        _apply_plan(
+            features,
+            features._subject_or_create(subject) if _present(subject) else None,
+            content_id,
+            content_type,
+            actual_duration,
+            completed,
+        )
+        self._touch(features)
+
+    def ingest_scores(self, scores_df: pd.DataFrame) -> None:
+        """
+        성적 DataFrame 일괄 반영
+
+        Args:
+            scores_df: student_id, subject, score (선택: created_at) 컬럼
+        """
+        if scores_df.empty:
+            return
+        if "created_at" in scores_df.columns:
+            scores_df = scores_df.sort_values("created_at", kind="stable")
+        for student_id, subject, score in zip(
+            scores_df["student_id"], scores_df["subject"], scores_df["score"]
+        ):
+            self.add_score(student_id, subject, score)
+
+    def ingest_plans(self, plans_df: pd.DataFrame) -> None:
+        """
+        플랜 DataFrame 일괄 반영
+
+        Args:
+            plans_df: student_id 및 선택 컬럼(subject, content_id, content_type,
+                actual_duration, status)
+        """
+        if plans_df.empty:
+            return
+        n = len(plans_df)
+        columns = {
+            name: plans_df[name].to_numpy() if name in plans_df.columns else [None] * n
+            for name in ("subject", "content_id", "content_type", "actual_duration")
+        }
+        completed = (
+            (plans_df["status"] == "completed").to_numpy()
+            if "status" in plans_df.columns
+            else np.zeros(n, dtype=bool)
+        )
+        for i, student_id in enumerate(plans_df["student_id"].to_numpy()):
+            self.add_plan(
+                student_id,
+                subject=columns["subject"][i],
+                content_id=columns["content_id"][i],
+                content_type=columns["content_type"][i],
+                actual_duration=columns["actual_duration"][i],
+                completed=bool(completed[i]),
+            )
+
+    @classmethod
+    def build(
+        cls,
+        scores_df: pd.DataFrame,
+        plans_df: pd.DataFrame | None = None,
+    ) -> "FeatureStore":
+        """성적/플랜 DataFrame으로 저장소 생성"""
+        store = cls()
+        store.ingest_scores(scores_df)
+        if plans_df is not None:
+            store.ingest_plans(plans_df)
+        return store
+
+    @classmethod
+    def for_student(
+        cls,
+        student_id: str,
+        scores_df: pd.DataFrame,
+        plans_df: pd.DataFrame | None = None,
+    ) -> "FeatureStore":
+        """student_id 컬럼이 없는 단일 학생 DataFrame으로 저장소 생성"""
+        scores_df = scores_df.assign(student_id=student_id) if not scores_df.empty else scores_df
+        if plans_df is not None and not plans_df.empty:
+            plans_df = plans_df.assign(student_id=student_id)
+        return cls.build(scores_df, plans_df)
+
+    # ============================================
+    # 서비스용 기록 조회 / 이벤트 반영
+    # ============================================
+
+    def get_or_load(
+        self,
+        student_id: str,
+        fetch: Callable[[], tuple[pd.DataFrame, pd.DataFrame | None]],
+    ) -> StudentFeatures:
+        """
+        학생 기록 조회 (없거나 오래됐으면 fetch로 조회한 성적/플랜으로 만들어 저장)
+
+        Args:
+            student_id: 학생 ID
+            fetch: 학생의 (성적, 플랜) DataFrame 조회 함수 (student_id 컬럼 불필요)
+
+        Returns:
+            학생 특성 기록 (읽기 전용)
+        """
+        features = self._lookup(student_id)
+        if features is None:
+            scores_df, plans_df = fetch()
+            [features] = self._publish(
+                FeatureStore.for_student(student_id, scores_df, plans_df), [student_id]
+            )
+        return features
+
+    def get_or_load_many(
+        self,
+        student_ids: Sequence[str],
+        fetch: Callable[[list[str]], tuple[pd.DataFrame, pd.DataFrame | None]],
+    ) -> list[StudentFeatures]:
+        """
+        여러 학생 기록 조회 (없거나 오래된 학생만 한 번에 조회해 저장)
+
+        Args:
+            student_ids: 학생 ID 목록
+            fetch: 학생 목록의 (성적, 플랜) DataFrame 조회 함수 (student_id 컬럼 포함)
+
+        Returns:
+            입력 순서대로의 학생 특성 기록 (읽기 전용)
+        """
+        found = {student_id: self._lookup(student_id) for student_id in student_ids}
+        missing = [student_id for student_id, features in found.items() if features is None]
+        if missing:
+            scores_df, plans_df = fetch(missing)
+            found.update(
+                zip(missing, self._publish(FeatureStore.build(scores_df, plans_df), missing))
+            )
+        return [found[student_id] for student_id in student_ids]
+
+    def record_score(self, student_id: str, subject: str, score: float) -> bool:
+        """
+        성적 이벤트 반영 (O(1) 분할 상환)
+
+        Returns:
+            반영 여부 (기록이 없는 학생이면 False, 처음 조회할 때 성적으로 만듦)
+        """
+        with self._update(student_id) as features:
+            if features is not None:
+                features._subject_for_update(subject).add_score(float(score))
+        return features is not None
+
+    def record_plan(
+        self,
+        student_id: str,
+        subject: str | None = None,
+        content_id: str | None = None,
+        content_type: str | None = None,
+        actual_duration: float | None = None,
+        completed: bool = False,
+    ) -> bool:
+        """
+        플랜 생성 이벤트 반영
+
+        Returns:
+            반영 여부 (기록이 없는 학생이면 False)
+        """
+        with self._update(student_id) as features:
+            if features is not None:
+                _apply_plan(
+                    features,
+                    features._subject_for_update(subject) if _present(subject) else None,
+                    content_id,
+                    content_type,
+                    actual_duration,
+                    completed,
+                )
+        return features is not None
+
+    def mark_plan_completed(
+        self,
+        student_id: str,
+        subject: str | None = None,
+        actual_duration: float | None = None,
+    ) -> bool:
+        """
+        기존 플랜 완료 처리
+
+        Returns:
+            반영 여부 (기록이 없는 학생이면 False)
+        """
+        with self._update(student_id) as features:
+            if features is not None:
+                features.completed_plans += 1
+                if _present(subject):
+                    subject_features = features._subject_for_update(subject)
+                    subject_features.completed_sessions += 1
+                    if _present(actual_duration):
+                        subject_features.study_minutes += float(actual_duration)
+        return features is not None
+
+    def stats(self) -> dict[str, Any]:
+        """저장소 규모"""
+        return {
+            "students": len(self._students),
+            "series": sum(len(f.subjects) for f in self._students.values()),
+            "version": self.version,
+        }
+
+    def _lookup(self, student_id: str) -> StudentFeatures | None:
+        """max_age_seconds 안에 만든 기록 (최근 조회 순서 갱신)"""
+        with self._lock:
+            features = self._students.get(student_id)
+            if features is None:
+                return None
+            if (
+                self.max_age_seconds is not None
+                and time.monotonic() - features.loaded_at > self.max_age_seconds
+            ):
+                return None
+            self._students.move_to_end(student_id)
+            return features
+
+    def _publish(self, source: "FeatureStore", student_ids: list[str]) -> list[StudentFeatures]:
+        """source에서 만든 학생 기록을 저장 (과목 트렌드는 누적기 저장소 값으로 교체)"""
+        records = []
+        for student_id in student_ids:
+            features = source.get(student_id) or StudentFeatures(student_id)
+            if self.trend_stats is not None:
+                for subject, subject_features in features.subjects.items():
+                    if subject_features.count:
+                        subject_features.trend = self.trend_stats.current(
+                            student_id, subject, subject_features.scores
+                        )
+            records.append(features)
+
+        with self._lock:
+            loaded_at = time.monotonic()
+            for features in records:
+                features.loaded_at = loaded_at
+                self._touch(features)
+                self._students[features.student_id] = features
+                self._students.move_to_end(features.student_id)
+            if self.max_students is not None:
+                while len(self._students) > self.max_students:
+                    self._students.popitem(last=False)
+        return records
+
+    @contextmanager
+    def _update(self, student_id: str) -> Iterator[StudentFeatures | None]:
+        """기록 사본을 갱신한 뒤 교체 (기록이 없으면 None, 예외가 나면 교체하지 않음)"""
+        with self._lock:
+            current = self._students.get(student_id)
+            if current is None:
+                yield None
+                return
+            features = current.copy()
+            yield features
+            self._touch(features)
+            self._students[student_id] = features
+
+
+def _present(value: Any) -> bool:
+    """None/NaN이 아닌 값인지 여부"""
+    return value is not None and not pd.isna(value)
+
+
+def _apply_plan(
+    features: StudentFeatures,
+    subject_features: SubjectFeatures | None,
+    content_id: str | None,
+    content_type: str | None,
+    actual_duration: float | None,
+    completed: bool,
+) -> None:
+    """플랜 1건을 학생/과목 특성에 반영"""
+    features.total_plans += 1
+    if completed:
+        features.completed_plans += 1
+    if _present(content_id):
+        features.studied_content_ids.add(content_id)
+    if _present(content_type):
+        features.studied_content_types.add(content_type)
+    if subject_features is not None:
+        subject_features.add_plan(actual_duration, completed)
+
+
+@lru_cache()
+def get_feature_store() -> FeatureStore:
+    """서비스용 학생 특성 저장소 (프로세스당 1개, 과목 트렌드는 누적기 저장소와 공유)"""
+    config = ML_CONFIG["feature_store"]
+    return FeatureStore(
+        max_students=config["max_students"],
+        max_age_seconds=config["max_age_seconds"],
+        trend_stats=get_trend_stats(),
+    )
@@ -0,0 +1,135 @@
+"""
+혼합 콘텐츠 추천 (규칙 기반 + 협업 필터링)
+
+규칙 기반 적합도(ContentRecommender)와 미리 계산된 테넌트 협업 모델
+(동시 학습 행렬 또는 ALS 잠재 벡터)의 학생 점수를 가중 합산합니다.
+요청 시점에는 테넌트 플랜을 조회하지 않고 미리 만든 구조만 읽으므로,
+지연 시간이 테넌트 규모에 따라 늘지 않습니다.
+"""
+
+import weakref
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..deadline import Deadline
+from .catalog_index import CatalogIndex
+from .content_recommender import ContentRecommender
+from .cooccurrence import ItemCooccurrence
+from .implicit_als import ImplicitFactors
+
+# 학생별 콘텐츠 점수(student_scores)와 콘텐츠 순서(content_ids)를 주는 협업 모델
+CollaborativeModel = ItemCooccurrence | ImplicitFactors
+
+
+class HybridRecommender:
+    """
+    규칙 기반 + 협업 점수 혼합 추천기
+
+    협업 모델의 콘텐츠 순서 → 카탈로그 행 위치 매핑은 (모델, 카탈로그 행 수, 모델 콘텐츠 수)가
+    바뀔 때만 다시 계산합니다. 카탈로그 위치는 ID별로 고정이므로 행 추가 때만 바뀝니다.
+    """
+
+    def __init__(self, recommender: ContentRecommender | None = None):
+        """
+        Args:
+            recommender: 규칙 기반 추천기 (None이면 기본 설정)
+        """
+        self.recommender = recommender or ContentRecommender()
+        self._alignments: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def catalog_scores(
+        self,
+        model: CollaborativeModel,
+        student_id: str,
+        catalog: CatalogIndex,
+    ) -> np.ndarray | None:
+        """
+        협업 점수를 카탈로그 행 순서 0-1 점수로 변환 (최댓값 기준 정규화)
+
+        Args:
+            model: 협업 모델
+            student_id: 학생 ID
+            catalog: 테넌트 카탈로그 인덱스
+
+        Returns:
+            catalog.n_rows 길이 점수 벡터, 협업 신호가 없으면 None
+        """
+        scores = model.student_scores(student_id)
+        if scores is None:
+            return None
+
+        # 백그라운드 갱신으로 콘텐츠가 늘어날 수 있으므로 짧은 쪽 길이에 맞춤
+        positions = self._alignment(model, catalog)
+        n = min(len(scores), len(positions))
+        found = positions[:n] >= 0
+        result = np.zeros(catalog.n_rows)
+        result[positions[:n][found]] = scores[:n][found]
+        peak = result.max(initial=0.0)
+        if peak <= 0:
+            return None
+        return result / peak
+
+    def recommend(
+        self,
+        student_id: str,
+        scores_df: pd.DataFrame,
+        plans_df: pd.DataFrame | None,
+        catalog: CatalogIndex,
+        model: CollaborativeModel | None,
+        collaborative_weight: float,
+        subject: str | None = None,
+        limit: int = 5,
+        include_reasons: bool = True,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """
+        혼합 추천
+
+        Args:
+            student_id: 학생 ID
+            scores_df: 학생 성적 DataFrame
+            plans_df: 학생 플랜 DataFrame
+            catalog: 테넌트 카탈로그 인덱스
+            model: 테넌트 협업 모델 (None이면 규칙 기반만)
+            collaborative_weight: 협업 점수 비중 (0-1)
+            subject: 특정 과목 필터 (선택)
+            limit: 추천 개수
+            include_reasons: 추천 이유 포함 여부
+            deadline: 요청 데드라인
+
+        Returns:
+            ContentRecommender.recommend 결과 + collaborative_weight (실제 적용 비중,
+            협업 신호가 없는 학생은 0)
+        """
+        collaborative = None
+        if model is not None and collaborative_weight > 0:
+            collaborative = self.catalog_scores(model, student_id, catalog)
+        applied_weight = collaborative_weight if collaborative is not None else 0.0
+
+        result = self.recommender.recommend(
+            scores_df=scores_df,
+            contents_df=catalog.frame,
+            plans_df=plans_df,
+            subject=subject,
+            limit=limit,
+            include_reasons=include_reasons,
+            deadline=deadline,
+            catalog=catalog,
+            collaborative_scores=collaborative,
+            collaborative_weight=applied_weight,
+        )
+        result["collaborative_weight"] = applied_weight
+        return result
+
+    def _alignment(self, model: CollaborativeModel, catalog: CatalogIndex) -> np.ndarray:
+        """모델 콘텐츠 순서의 카탈로그 행 위치 (없으면 -1)"""
+        content_ids = model.content_ids
+        key = (id(catalog), catalog.n_rows, len(content_ids))
+        cached = self._alignments.get(model)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        positions = catalog.align(content_ids)
+        self._alignments[model] = (key, positions)
+        return positions
@@ -0,0 +1,385 @@
+"""
+암묵적 피드백 행렬 분해 (ALS, 오프라인 학습 + 내적 서빙)
+
+학생 × 콘텐츠 플랜을 선호 p=1, 신뢰도 c = 1 + alpha·r로 보고
+(r = 플랜 수 + 완료 수 + log1p(실제 학습 시간 / 30분)) Hu-Koren-Volinsky 방식의 ALS로
+학생/콘텐츠 잠재 벡터를 학습합니다. 학습은 float64, 저장과 서빙은 float32이며,
+서빙은 콘텐츠 잠재 행렬 × 학생 벡터 한 번과 부분 정렬로 상위 N개를 고릅니다.
+
+빌드:
+    cd python
+    python -m src.ml.implicit_als --tenant-id <tenant>   # data/implicit_factors/<tenant>.npz
+    python -m src.ml.implicit_als --source synthetic --output /tmp/implicit_factors.npz
+"""
+
+import argparse
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..config import DATA_DIR
+
+DEFAULT_FACTORS_DIR = DATA_DIR / "implicit_factors"
+
+# 한 번에 (상호작용 수 × k) 잠재 벡터를 모을 최대 원소 수
+_CHUNK_ELEMENTS = 1 << 23
+
+
+def plan_confidence(plans_df: pd.DataFrame, alpha: float = 1.0) -> pd.DataFrame:
+    """
+    플랜 → (학생, 콘텐츠)별 신뢰도
+
+    Args:
+        plans_df: student_id, content_id (+ status, actual_duration) 컬럼 DataFrame
+        alpha: 신뢰도 배율
+
+    Returns:
+        student_id, content_id, confidence 컬럼 DataFrame
+    """
+    columns = ["student_id", "content_id", "confidence"]
+    if plans_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    plans = plans_df.dropna(subset=["student_id", "content_id"])
+    completed = (
+        (plans["status"] == "completed").astype(np.float64)
+        if "status" in plans.columns
+        else pd.Series(0.0, index=plans.index)
+    )
+    minutes = (
+        pd.to_numeric(plans["actual_duration"], errors="coerce").fillna(0).clip(lower=0)
+        if "actual_duration" in plans.columns
+        else pd.Series(0.0, index=plans.index)
+    )
+    grouped = (
+        pd.DataFrame(
+            {
+                "student_id": plans["student_id"],
+                "content_id": plans["content_id"],
+                "plans": 1.0,
+                "completed": completed,
+                "minutes": minutes,
+            }
+        )
+        .groupby(["student_id", "content_id"], sort=False)
+        .sum()
+    )
+    strength = grouped["plans"] + grouped["completed"] + np.log1p(grouped["minutes"] / 30.0)
+    return (1.0 + alpha * strength).rename("confidence").reset_index()
+
+
+def _solve_side(
+    confidence: sparse.csr_array,
+    fixed: np.ndarray,
+    regularization: float,
+    current: np.ndarray,
+    cg_steps: int = 3,
+) -> np.ndarray:
+    """
+    한쪽 잠재 벡터 일괄 갱신 (켤레 기울기법, 이전 값에서 시작)
+
+    (YᵀY + Yᵀ(C_u - I)Y + λI) x_u = Yᵀ C_u p_u 를 모든 행에 대해 동시에 cg_steps번 풉니다.
+    A·x는 YᵀY·x와 희소 행렬 곱 Yᵀ(C_u - I)(Y x_u)로 계산하므로
+    (상호작용 수 × k × k) 외적 없이 반복당 O(상호작용 수 × k)입니다.
+    """
+    n_rows, k = confidence.shape[0], fixed.shape[1]
+    gram = fixed.T @ fixed + regularization * np.eye(k)
+    indptr = confidence.indptr
+    result = np.zeros((n_rows, k))
+
+    budget = max(_CHUNK_ELEMENTS // k, 1)
+    start = 0
+    while start < n_rows:
+        stop = int(np.searchsorted(indptr, indptr[start] + budget, side="right")) - 1
+        stop = min(max(stop, start + 1), n_rows)
+        block = confidence[start:stop]
+        owner = np.repeat(np.arange(stop - start), np.diff(block.indptr))
+        y = fixed[block.indices]
+        weight = block.data - 1.0
+
+        def apply(x: np.ndarray) -> np.ndarray:
+            dots = np.einsum("nk,nk->n", y, x[owner])
+            scattered = sparse.csr_array((weight * dots, block.indices, block.indptr), block.shape)
+            return x @ gram + scattered @ fixed
+
+        x = current[start:stop].copy()
+        residual = block @ fixed - apply(x)
+        direction = residual.copy()
+        rs_old = np.einsum("nk,nk->n", residual, residual)
+        for _ in range(cg_steps):
+            product = apply(direction)
+            curvature = np.einsum("nk,nk->n", direction, product)
+            step = np.divide(rs_old, curvature, out=np.zeros_like(rs_old), where=curvature > 0)
+            x += step[:, None] * direction
+            residual -= step[:, None] * product
+            rs_new = np.einsum("nk,nk->n", residual, residual)
+            ratio = np.divide(rs_new, rs_old, out=np.zeros_like(rs_new), where=rs_old > 0)
+            direction = residual + ratio[:, None] * direction
+            rs_old = rs_new
+        result[start:stop] = x
+        start = stop
+    return result
+
+
+class ImplicitFactors:
+    """
+    학습된 학생/콘텐츠 잠재 벡터 (float32) + 학생별 학습 콘텐츠 (추천 제외용 CSR)
+    """
+
+    def __init__(
+        self,
+        student_ids: list[Any],
+        content_ids: list[Any],
+        student_factors: np.ndarray,
+        item_factors: np.ndarray,
+        studied_indptr: np.ndarray,
+        studied_indices: np.ndarray,
+    ):
+        """
+        Args:
+            student_ids: 학생 ID (student_factors 행 순서)
+            content_ids: 콘텐츠 ID (item_factors 행 순서)
+            student_factors: (학생 수, k) float32
+            item_factors: (콘텐츠 수, k) float32
+            studied_indptr: 학생별 학습 콘텐츠 CSR 오프셋
+            studied_indices: 학생별 학습 콘텐츠 행 번호
+        """
+        self.student_ids = list(student_ids)
+        self.content_ids = np.asarray(content_ids, dtype=object)
+        self.student_factors = np.ascontiguousarray(student_factors, dtype=np.float32)
+        self.item_factors = np.ascontiguousarray(item_factors, dtype=np.float32)
+        self.studied_indptr = studied_indptr
+        self.studied_indices = studied_indices
+        self._rows = {sid: i for i, sid in enumerate(self.student_ids)}
+
+    @classmethod
+    def train(
+        cls,
+        plans_df: pd.DataFrame,
+        factors: int = 16,
+        regularization: float = 10.0,
+        alpha: float = 1.0,
+        iterations: int = 15,
+        cg_steps: int = 3,
+        seed: int = 42,
+    ) -> "ImplicitFactors":
+        """
+        플랜에서 ALS 학습
+
+        Args:
+            plans_df: student_id, content_id, status, actual_duration 컬럼 DataFrame
+            factors: 잠재 차원 수
+            regularization: L2 정규화 계수
+            alpha: 신뢰도 배율
+            iterations: 교대 갱신 반복 수
+            cg_steps: 갱신마다 켤레 기울기 반복 수
+            seed: 초기값 시드
+
+        Returns:
+            ImplicitFactors
+        """
+        confidence = plan_confidence(plans_df, alpha)
+        rows, student_ids = pd.factorize(confidence["student_id"], sort=True)
+        cols, content_ids = pd.factorize(confidence["content_id"], sort=True)
+        shape = (len(student_ids), len(content_ids))
+        by_student = sparse.csr_array(
+            (confidence["confidence"].to_numpy(dtype=np.float64), (rows, cols)), shape=shape
+        )
+        by_student.sort_indices()
+        by_content = sparse.csr_array(by_student.T)
+
+        rng = np.random.default_rng(seed)
+        item_factors = rng.normal(0, 0.01, (shape[1], factors))
+        student_factors = np.zeros((shape[0], factors))
+        for _ in range(iterations):
+            student_factors = _solve_side(
+                by_student, item_factors, regularization, student_factors, cg_steps
+            )
+            item_factors = _solve_side(
+                by_content, student_factors, regularization, item_factors, cg_steps
+            )
+
+        return cls(
+            list(student_ids),
+            list(content_ids),
+            student_factors,
+            item_factors,
+            by_student.indptr.astype(np.int64),
+            by_student.indices.astype(np.int32),
+        )
+
+    def __contains__(self, student_id: object) -> bool:
+        return student_id in self._rows
+
+    def scores(self, student_id: object) -> np.ndarray | None:
+        """학생의 전체 콘텐츠 점수 (콘텐츠 잠재 행렬 × 학생 벡터), 학생이 없으면 None"""
+        row = self._rows.get(student_id)
+        if row is None:
+            return None
+        return self.item_factors @ self.student_factors[row]
+
+    def student_scores(self, student_id: object) -> np.ndarray | None:
+        """
+        혼합 추천용 점수 (음수는 0, 학습한 콘텐츠는 0)
+
+        Returns:
+            content_ids 순서 점수 벡터, 학생이 없으면 None
+        """
+        scores = self.scores(student_id)
+        if scores is None:
+            return None
+        row = self._rows[student_id]
+        scores[self.studied_indices[self.studied_indptr[row] : self.studied_indptr[row + 1]]] = 0
+        return np.maximum(scores, 0, out=scores)
+
+    def recommend(
+        self,
+        student_id: object,
+        limit: int = 5,
+        exclude_studied: bool = True,
+    ) -> list[tuple[Any, float]]:
+        """
+        점수 상위 콘텐츠
+
+        Args:
+            student_id: 학생 ID
+            limit: 반환할 콘텐츠 수
+            exclude_studied: 이미 학습한 콘텐츠 제외 여부
+
+        Returns:
+            (content_id, 점수) 목록 (점수 내림차순)
+        """
+        scores = self.scores(student_id)
+        if scores is None or limit <= 0:
+            return []
+        if exclude_studied:
+            row = self._rows[student_id]
+            studied = self.studied_indices[self.studied_indptr[row] : self.studied_indptr[row + 1]]
+            scores[studied] = -np.inf
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(k)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[np.isfinite(scores[top])]
+        return [(self.content_ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: str | Path) -> None:
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 서비스가 쓰는 중인 파일을 읽지 않음)"""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as file:
+            self._write(file)
+        os.replace(tmp, path)
+
+    def _write(self, file: Any) -> None:
+        np.savez_compressed(
+            file,
+            student_ids=np.array(self.student_ids, dtype=str),
+            content_ids=np.array(self.content_ids.tolist(), dtype=str),
+            student_factors=self.student_factors,
+            item_factors=self.item_factors,
+            studied_indptr=self.studied_indptr,
+            studied_indices=self.studied_indices,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ImplicitFactors":
+        """npz 파일에서 복원"""
+        with np.load(path) as data:
+            return cls(
+                [str(s) for s in data["student_ids"]],
+                [str(c) for c in data["content_ids"]],
+                data["student_factors"],
+                data["item_factors"],
+                data["studied_indptr"],
+                data["studied_indices"],
+            )
+
+
+def factors_path(tenant_id: str) -> Path:
+    """테넌트 잠재 벡터 파일 경로 (ML_IMPLICIT_FACTORS_DIR/<tenant_id>.npz)"""
+    if not tenant_id or Path(tenant_id).name != tenant_id or tenant_id in (".", ".."):
+        raise ValueError(f"잘못된 테넌트 ID: {tenant_id!r}")
+    directory = Path(os.getenv("ML_IMPLICIT_FACTORS_DIR", str(DEFAULT_FACTORS_DIR)))
+    return directory / f"{tenant_id}.npz"
+
+
+@lru_cache(maxsize=64)
+def _load_factors(path: Path, mtime_ns: int) -> ImplicitFactors:
+    """(경로, 수정 시각)별 잠재 벡터 캐시 (재학습으로 파일이 바뀌면 새 키)"""
+    return ImplicitFactors.load(path)
+
+
+def get_implicit_factors(tenant_id: str) -> ImplicitFactors | None:
+    """
+    서비스용 테넌트 잠재 벡터 (테넌트별 캐시, 파일이 바뀌면 다시 읽음)
+
+    학생·콘텐츠 ID는 테넌트 안에서만 의미가 있으므로 파일도 테넌트마다 따로 학습합니다.
+    요청마다 파일 수정 시각만 확인하므로 재학습 결과가 재시작 없이 반영됩니다.
+
+    Args:
+        tenant_id: 테넌트 ID
+
+    Returns:
+        ImplicitFactors 또는 테넌트 파일이 없으면 None
+    """
+    path = factors_path(tenant_id)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_factors(path, mtime_ns)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="암묵적 피드백 ALS 학습 (오프라인 배치)")
+    parser.add_argument("--tenant-id", default=None, help="Supabase 테넌트 ID")
+    parser.add_argument(
+        "--source", choices=["synthetic", "snapshot"], default=None, help="평가용 데이터 소스"
+    )
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--factors", type=int, default=16)
+    parser.add_argument("--regularization", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument(
+        "--output", default=None, help="저장 경로 (기본값: --tenant-id의 서비스 경로)"
+    )
+    args = parser.parse_args(argv)
+    if args.output is None:
+        if not args.tenant_id:
+            parser.error("--tenant-id 없이 학습하면 --output이 필요합니다")
+        args.output = str(factors_path(args.tenant_id))
+
+    if args.tenant_id:
+        from ..db_connector import get_connector
+
+        plans_df = get_connector().get_tenant_plan_contents(args.tenant_id)
+    else:
+        from ..evaluation.data_sources import load_data_source
+
+        source = load_data_source(args.source or "synthetic", snapshot_dir=args.snapshot_dir)
+        plans_df = source.get_plans()
+
+    model = ImplicitFactors.train(
+        plans_df,
+        factors=args.factors,
+        regularization=args.regularization,
+        alpha=args.alpha,
+        iterations=args.iterations,
+    )
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    model.save(args.output)
+    print(
+        f"잠재 벡터 저장: {args.output} "
+        f"(학생 {len(model.student_ids)}, 콘텐츠 {len(model.content_ids)}, k={args.factors})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+학생 × 콘텐츠 상호작용 행렬 (CSR 희소 행렬)
+
+테넌트 전체 학습 플랜에서 (학생, 콘텐츠) 쌍을 한 번만 모아 이진 CSR 행렬로 보관합니다.
+유사 학생 탐색은 대상 학생 행과의 희소 행렬-벡터 곱 한 번으로 모든 학생의
+공통 콘텐츠 수를 구하고, 행별 콘텐츠 수로 Jaccard 유사도를 계산합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class InteractionMatrix:
+    """
+    학생 × 콘텐츠 이진 상호작용 행렬
+
+    행은 학생 ID 정렬 순, 열은 콘텐츠 ID 정렬 순입니다.
+    같은 (학생, 콘텐츠) 쌍이 여러 번 나와도 값은 1입니다.
+    """
+
+    def __init__(
+        self,
+        matrix: sparse.csr_array,
+        student_ids: np.ndarray,
+        content_ids: np.ndarray,
+    ):
+        """
+        Args:
+            matrix: 학생 × 콘텐츠 이진 CSR 행렬
+            student_ids: 행 순서의 학생 ID
+            content_ids: 열 순서의 콘텐츠 ID
+        """
+        self.matrix = matrix
+        self.student_ids = student_ids
+        self.content_ids = content_ids
+        self.row_counts = np.diff(matrix.indptr)
+        self._rows = {sid: i for i, sid in enumerate(student_ids)}
+
+    @classmethod
+    def from_plans(
+        cls,
+        plans_df: pd.DataFrame,
+        student_column: str = "student_id",
+        content_column: str = "content_id",
+    ) -> "InteractionMatrix":
+        """
+        학습 플랜(또는 연결 행)에서 행렬 생성
+
+        Args:
+            plans_df: student_id, content_id 컬럼을 가진 DataFrame
+            student_column: 학생 ID 컬럼명
+            content_column: 콘텐츠 ID 컬럼명
+
+        Returns:
+            InteractionMatrix
+        """
+        if plans_df.empty or not {student_column, content_column} <= set(plans_df.columns):
+            return cls(
+                sparse.csr_array((0, 0), dtype=np.float64),
+                np.empty(0, dtype=object),
+                np.empty(0, dtype=object),
+            )
+
+        pairs = plans_df[[student_column, content_column]].dropna()
+        rows, student_ids = pd.factorize(pairs[student_column], sort=True)
+        cols, content_ids = pd.factorize(pairs[content_column], sort=True)
+
+        matrix = sparse.csr_array(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(student_ids), len(content_ids)),
+        )
+        # 중복 쌍은 합쳐진 뒤 1로 고정
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return cls(matrix, np.asarray(student_ids), np.asarray(content_ids))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(학생 수, 콘텐츠 수)"""
+        return self.matrix.shape
+
+    def __contains__(self, student_id: object) -> bool:
+        return student_id in self._rows
+
+    def row_of(self, student_id: object) -> int | None:
+        """학생 행 번호 (없으면 None)"""
+        return self._rows.get(student_id)
+
+    def row_contents(self, row: int) -> np.ndarray:
+        """학생 행의 콘텐츠 열 번호"""
+        return self.matrix.indices[self.matrix.indptr[row] : self.matrix.indptr[row + 1]]
+
+    def intersections(self, row: int) -> np.ndarray:
+        """대상 학생과 모든 학생의 공통 콘텐츠 수 (희소 행렬-벡터 곱 한 번)"""
+        target = np.zeros(self.shape[1])
+        target[self.row_contents(row)] = 1.0
+        return (self.matrix @ target).astype(np.int64)
+
+    def jaccard(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        대상 학생과 모든 학생의 Jaccard 유사도
+
+        Args:
+            row: 대상 학생 행 번호
+
+        Returns:
+            (공통 콘텐츠 수, 유사도) 배열 쌍 (학생 행 순서)
+        """
+        intersection = self.intersections(row)
+        union = self.row_counts[row] + self.row_counts - intersection
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = np.where(union > 0, intersection / union, 0.0)
+        return intersection, similarity
@@ -0,0 +1,260 @@
+"""
+MinHash-LSH 유사 학생 근사 탐색 인덱스
+
+학생마다 학습한 content_id 집합의 MinHash 서명(num_perm개 최솟값)을 만들고,
+서명을 bands개 구간으로 나눈 구간 해시가 같은 학생만 후보로 가져옵니다.
+후보는 실제 콘텐츠 집합으로 Jaccard를 다시 계산해 정확히 재정렬하므로,
+근사는 "후보에 포함되는가"에만 적용됩니다.
+
+학생이 콘텐츠를 추가하면 서명은 기존 서명과 새 콘텐츠 서명의 원소별 최솟값으로 갱신되고,
+바뀐 구간만 새 버킷에 추가됩니다. 이전 버킷에 남은 항목은 조회 시
+현재 구간 해시와 비교해 걸러냅니다.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .interaction_matrix import InteractionMatrix
+
+_INITIAL_CAPACITY = 1024
+# 한 번에 (콘텐츠 수 × num_perm) 해시 행렬을 만들 최대 원소 수
+_CHUNK_ELEMENTS = 1 << 22
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def hash_content_ids(content_ids: Iterable) -> np.ndarray:
+    """콘텐츠 ID → 프로세스와 무관하게 고정된 64비트 해시"""
+    return pd.util.hash_array(np.asarray(list(content_ids), dtype=object))
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 최종 단계 (uint64 곱셈은 2^64 모듈로 순환)"""
+    z = values ^ (values >> np.uint64(30))
+    z = z * np.uint64(0xBF58476D1CE4E5B9)
+    z = z ^ (z >> np.uint64(27))
+    z = z * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class MinHashLSH:
+    """
+    학생 콘텐츠 집합 MinHash-LSH 인덱스
+
+    rows_per_band = num_perm / bands이며, Jaccard가 s인 두 학생이 후보가 될 확률은
+    1 - (1 - s^rows_per_band)^bands입니다. (기본 128/32 → s=0.3에서 약 0.23, s=0.5에서 약 0.87)
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1):
+        """
+        Args:
+            num_perm: 서명 길이 (해시 함수 수)
+            bands: LSH 구간 수 (num_perm의 약수)
+            seed: 해시 함수 시드
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self._seeds = np.random.default_rng(seed).integers(
+            0, _EMPTY, size=num_perm, dtype=np.uint64, endpoint=True
+        )
+
+        self._ids: list = []
+        self._rows: dict = {}
+        self._contents: list[np.ndarray] = []
+        self._capacity = 0
+        self._signatures = np.empty((0, num_perm), dtype=np.uint64)
+        self._band_keys = np.empty((0, bands), dtype=np.uint64)
+        # 생성 시점 버킷 (구간별 정렬 배열) + 이후 추가분 버킷 (구간별 dict)
+        self._sorted_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._sorted_rows = np.empty((bands, 0), dtype=np.int64)
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(bands)]
+
+    @classmethod
+    def from_matrix(cls, matrix: InteractionMatrix, **kwargs) -> "MinHashLSH":
+        """
+        상호작용 행렬에서 전체 학생 인덱스 생성
+
+        Args:
+            matrix: 학생 × 콘텐츠 CSR 행렬
+            **kwargs: num_perm, bands, seed
+
+        Returns:
+            MinHashLSH
+        """
+        index = cls(**kwargs)
+        n_students = matrix.shape[0]
+        if n_students == 0:
+            return index
+
+        column_hashes = hash_content_ids(matrix.content_ids)
+        indptr, indices = matrix.matrix.indptr, matrix.matrix.indices
+        index._reserve(n_students)
+        index._ids = list(matrix.student_ids)
+        index._rows = {sid: i for i, sid in enumerate(index._ids)}
+        index._contents = np.split(column_hashes[indices], indptr[1:-1])
+
+        # 콘텐츠별 해시 값을 한 번만 계산한 뒤 행 묶음 단위로 모아 학생별 최솟값 축약
+        permuted = index._permute(column_hashes)
+        signatures = index._signatures
+        signatures[:n_students] = _EMPTY
+        budget = _CHUNK_ELEMENTS // index.num_perm
+        start = 0
+        while start < n_students:
+            stop = int(np.searchsorted(indptr, indptr[start] + budget, side="right")) - 1
+            stop = min(max(stop, start + 1), n_students)
+            nonempty = np.flatnonzero(np.diff(indptr[start : stop + 1]) > 0)
+            if len(nonempty):
+                hashed = permuted[indices[indptr[start] : indptr[stop]]]
+                offsets = (indptr[start:stop] - indptr[start])[nonempty]
+                signatures[start + nonempty] = np.minimum.reduceat(hashed, offsets, axis=0)
+            start = stop
+
+        # 초기 버킷은 구간별 (구간 해시, 행) 정렬 배열
+        index._band_keys[:n_students] = index._fold_bands(signatures[:n_students])
+        rows = np.flatnonzero(matrix.row_counts > 0)
+        keys = index._band_keys[rows].T
+        order = np.argsort(keys, axis=1, kind="stable")
+        index._sorted_keys = np.take_along_axis(keys, order, axis=1)
+        index._sorted_rows = rows[order]
+        return index
+
+    @classmethod
+    def from_plans(cls, plans_df: pd.DataFrame, **kwargs) -> "MinHashLSH":
+        """학습 플랜(student_id, content_id)에서 인덱스 생성"""
+        return cls.from_matrix(InteractionMatrix.from_plans(plans_df), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, student_id: object) -> bool:
+        return student_id in self._rows
+
+    def add(self, student_id: object, content_ids: Iterable) -> None:
+        """
+        학생 콘텐츠 추가 (신규 학생이면 등록)
+
+        Args:
+            student_id: 학생 ID
+            content_ids: 새로 학습한 콘텐츠 ID
+        """
+        hashes = np.unique(hash_content_ids(content_ids))
+        if not len(hashes):
+            return
+
+        row = self._rows.get(student_id)
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(student_id)
+            self._rows[student_id] = row
+            self._contents.append(hashes)
+            self._signatures[row] = _EMPTY
+            old_keys = None
+        else:
+            self._contents[row] = np.union1d(self._contents[row], hashes)
+            old_keys = self._band_keys[row].copy()
+
+        self._signatures[row] = np.minimum(
+            self._signatures[row], self._permute(hashes).min(axis=0)
+        )
+        self._band_keys[row] = self._fold_bands(self._signatures[row : row + 1])[0]
+        for band, key in enumerate(self._band_keys[row].tolist()):
+            if old_keys is None or old_keys[band] != key:
+                self._buckets[band].setdefault(key, []).append(row)
+
+    def candidates(self, student_id: object) -> np.ndarray:
+        """
+        구간 해시가 하나 이상 같은 학생 행 번호 (자기 자신 제외)
+
+        Args:
+            student_id: 대상 학생 ID
+
+        Returns:
+            후보 학생 행 번호 (중복 없음)
+        """
+        row = self._rows.get(student_id)
+        if row is None or not len(self._contents[row]):
+            return np.empty(0, dtype=np.int64)
+
+        keys = self._band_keys[row]
+        found = []
+        for band, key in enumerate(keys.tolist()):
+            sorted_keys = self._sorted_keys[band]
+            lo = np.searchsorted(sorted_keys, keys[band], side="left")
+            hi = np.searchsorted(sorted_keys, keys[band], side="right")
+            members = self._sorted_rows[band, lo:hi]
+            added = self._buckets[band].get(key)
+            if added:
+                members = np.concatenate([members, added])
+            # 서명 갱신으로 버킷을 떠난 항목 제외
+            found.append(members[self._band_keys[members, band] == keys[band]])
+        candidates = np.unique(np.concatenate(found))
+        return candidates[candidates != row]
+
+    def query(
+        self,
+        student_id: object,
+        limit: int = 10,
+        min_common_items: int = 0,
+    ) -> list:
+        """
+        유사 학생 조회 (후보를 실제 Jaccard로 재정렬)
+
+        Args:
+            student_id: 대상 학생 ID
+            limit: 반환할 학생 수
+            min_common_items: 최소 공통 콘텐츠 수
+
+        Returns:
+            유사도 내림차순 학생 ID 목록 (동점은 학생 ID 순)
+        """
+        candidates = self.candidates(student_id)
+        if not len(candidates):
+            return []
+
+        target = self._contents[self._rows[student_id]]
+        sizes = np.fromiter(
+            (len(self._contents[c]) for c in candidates), dtype=np.int64, count=len(candidates)
+        )
+        pooled = np.concatenate([self._contents[c] for c in candidates])
+        owner = np.repeat(np.arange(len(candidates)), sizes)
+        intersection = np.bincount(
+            owner, weights=np.isin(pooled, target, assume_unique=True), minlength=len(candidates)
+        ).astype(np.int64)
+        similarity = intersection / (len(target) + sizes - intersection)
+
+        eligible = intersection >= min_common_items
+        candidates, similarity = candidates[eligible], similarity[eligible]
+        ids = np.asarray([self._ids[c] for c in candidates], dtype=object)
+        order = np.lexsort((ids, -similarity))[:limit]
+        return ids[order].tolist()
+
+    def _permute(self, hashes: np.ndarray) -> np.ndarray:
+        """콘텐츠 해시 × num_perm개 해시 함수 값"""
+        return _mix(hashes[:, None] ^ self._seeds[None, :])
+
+    def _fold_bands(self, signatures: np.ndarray) -> np.ndarray:
+        """서명 (n, num_perm) → 구간 해시 (n, bands)"""
+        banded = signatures.reshape(len(signatures), self.bands, self.rows_per_band)
+        keys = np.zeros(banded.shape[:2], dtype=np.uint64)
+        for r in range(self.rows_per_band):
+            keys = _mix(keys ^ banded[:, :, r])
+        return keys
+
+    def _reserve(self, n_rows: int) -> None:
+        """배열 용량 확보 (2배씩 증가)"""
+        if n_rows <= self._capacity:
+            return
+        capacity = max(_INITIAL_CAPACITY, self._capacity)
+        while capacity < n_rows:
+            capacity *= 2
+        for name in ("_signatures", "_band_keys"):
+            array = getattr(self, name)
+            grown = np.empty((capacity, array.shape[1]), dtype=np.uint64)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+        self._capacity = capacity
@@ -0,0 +1,573 @@
+"""
+학생별 학습 패턴 누적 카운터 (플랜 이벤트 스트리밍 + 주기적 대사)
+
+요일 7칸, 시간 24칸, 과목별 플랜 수, 전체/완료 수, 학습 시간 합/개수를 학생 행마다 유지하고
+플랜 생성·완료 이벤트마다 O(1)로 갱신합니다. analyze_learning_patterns와 같은 형식의 결과를
+카운터만으로 만들 수 있어 조회 때 플랜 전체를 읽지 않습니다.
+이벤트는 플랜으로 초기화(reconcile)한 학생에만 반영하며, 완료 이벤트는 이전 상태가 완료가 아닐 때만
+셉니다. 누락 이벤트나 플랜 수정/삭제로 생기는 차이는 reconcile()이 플랜에서 다시 세어 바로잡습니다.
+
+워커마다 마지막 병합 이후의 변경(이벤트, 대사)을 기록해 두었다가, sync()가 파일 잠금 안에서
+공유 npz의 최신 상태에 다시 적용해 저장하므로 여러 워커가 같은 파일을 써도 서로 덮어쓰지 않습니다.
+
+대사 (배치):
+    cd python
+    python -m src.ml.pattern_counters --tenant-id <tenant> --output data/pattern_counters.npz
+    python -m src.ml.pattern_counters --source synthetic --output /tmp/pattern_counters.npz
+"""
+
+import argparse
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..analysis import PreparedPlans, learning_patterns_from_counts
+from ..cohort_analysis import cohort_plan_counts
+from ..config import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 워커 간 잠금 없이 병합
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_COUNTERS_PATH = DATA_DIR / "pattern_counters.npz"
+
+# 카운터 행 레이아웃: 요일 0-6, 시간 7-30, 전체, 완료, 학습 시간 개수
+DAY_OFFSET = 0
+HOUR_OFFSET = 7
+TOTAL = 31
+COMPLETED = 32
+DURATION_COUNT = 33
+WIDTH = 34
+
+
+def _day_of_week(scheduled_date: Any) -> int | None:
+    """예정일 요일 (월=0, 파싱 실패 None)"""
+    if isinstance(scheduled_date, str):
+        try:
+            return date.fromisoformat(scheduled_date[:10]).weekday()
+        except ValueError:
+            pass
+    elif isinstance(scheduled_date, date):
+        return scheduled_date.weekday()
+    parsed = pd.to_datetime(scheduled_date, errors="coerce")
+    return None if pd.isna(parsed) else int(parsed.dayofweek)
+
+
+def _hour(start_time: Any) -> int | None:
+    """시작 시각(HH:MM)의 시 (파싱 실패 None, PreparedPlans와 같은 형식)"""
+    if not isinstance(start_time, str):
+        return None
+    try:
+        return datetime.strptime(start_time, "%H:%M").hour
+    except ValueError:
+        return None
+
+
+def _duration(actual_duration: Any) -> float | None:
+    """실제 학습 시간 (결측·숫자 아님은 None)"""
+    try:
+        value = float(actual_duration)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class PatternCounterStore:
+    """
+    학생별 학습 패턴 카운터 저장소 (프로세스당 1개)
+
+    정수 카운터는 (학생 × WIDTH), 과목별 수와 과목이 처음 나온 순위(1부터, 0은 없음)는
+    (학생 × 과목) 배열에 두고 학습 시간 합은 float 벡터로 따로 둡니다. npz 파일로 저장/복원하고 sync()로 워커 간 병합합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._student_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._subjects: list[str] = []
+        self._subject_index: dict[str, int] = {}
+        self._counts = np.zeros((0, WIDTH), dtype=np.int64)
+        self._subject_counts = np.zeros((0, 0), dtype=np.int64)
+        self._subject_rank = np.zeros((0, 0), dtype=np.int64)
+        self._duration_sum = np.zeros(0, dtype=np.float64)
+        # 마지막 대사 시각 (epoch 초, 대사한 적 없으면 0)
+        self._reconciled_at = np.zeros(0, dtype=np.float64)
+        # 마지막 sync 이후 반영한 변경 (sync 때 공유 파일의 최신 상태에 다시 적용)
+        self._pending: list[tuple] = []
+        self._synced_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._student_ids)
+
+    def __contains__(self, student_id: object) -> bool:
+        return student_id in self._rows
+
+    @property
+    def student_ids(self) -> list[str]:
+        """행 순서의 학생 ID"""
+        return self._student_ids
+
+    @property
+    def subjects(self) -> list[str]:
+        """열 순서의 과목"""
+        return self._subjects
+
+    # ============================================
+    # 이벤트 반영
+    # ============================================
+
+    def record_created(
+        self,
+        student_id: str,
+        scheduled_date: Any = None,
+        start_time: Any = None,
+        subject: Any = None,
+        completed: bool = False,
+        actual_duration: Any = None,
+    ) -> bool:
+        """
+        플랜 생성 반영 (O(1))
+
+        Args:
+            student_id: 학생 ID
+            scheduled_date: 예정일
+            start_time: 시작 시각 (HH:MM)
+            subject: 과목
+            completed: 생성 시점에 이미 완료 상태인지 여부
+            actual_duration: 실제 학습 시간 (분)
+
+        Returns:
+            반영 여부 (아직 플랜으로 초기화하지 않은 학생이면 False)
+        """
+        op = (
+            "created",
+            student_id,
+            _day_of_week(scheduled_date),
+            _hour(start_time),
+            str(subject) if subject is not None and not pd.isna(subject) else None,
+            completed,
+            _duration(actual_duration),
+        )
+        with self._lock:
+            return self._apply(op)
+
+    def record_completed(
+        self, student_id: str, previous_status: str, actual_duration: Any = None
+    ) -> bool:
+        """
+        플랜 완료 반영 (O(1), 생성 때 학습 시간이 없던 플랜의 실제 학습 시간 포함)
+
+        Args:
+            student_id: 학생 ID
+            previous_status: 완료 직전 플랜 상태 (이미 completed면 중복으로 보고 무시)
+            actual_duration: 실제 학습 시간 (분)
+
+        Returns:
+            반영 여부 (이미 완료된 플랜이거나 초기화하지 않은 학생이면 False)
+        """
+        if previous_status == "completed":
+            return False
+        op = ("completed", student_id, _duration(actual_duration))
+        with self._lock:
+            return self._apply(op)
+
+    # ============================================
+    # 조회
+    # ============================================
+
+    def patterns(self, student_id: str) -> dict[str, Any] | None:
+        """
+        analyze_learning_patterns와 같은 형식의 학습 패턴 (O(1))
+
+        Returns:
+            분석 결과 딕셔너리, 카운터가 없는 학생이면 None
+        """
+        with self._lock:
+            row = self._rows.get(student_id)
+            if row is None:
+                return None
+            counts = self._counts[row].copy()
+            subject_counts = self._subject_counts[row].copy()
+            subject_rank = self._subject_rank[row].copy()
+            duration_sum = float(self._duration_sum[row])
+            subjects = list(self._subjects)
+
+        total = int(counts[TOTAL])
+        if total == 0:
+            return {"error": "플랜 데이터가 없습니다."}
+        n_durations = int(counts[DURATION_COUNT])
+        return learning_patterns_from_counts(
+            day_counts=counts[DAY_OFFSET:HOUR_OFFSET],
+            hour_counts=counts[HOUR_OFFSET:TOTAL],
+            subjects=subjects,
+            subject_counts=subject_counts,
+            # 일괄 분석과 같은 동률 순서 (처음 나온 과목 우선)
+            subject_rank=subject_rank,
+            total=total,
+            completed=int(counts[COMPLETED]),
+            duration_mean=duration_sum / n_durations if n_durations else float("nan"),
+        )
+
+    def is_stale(self, student_id: str, max_age_seconds: float, now: float | None = None) -> bool:
+        """마지막 대사 후 max_age_seconds가 지났는지 여부 (없는 학생은 True)"""
+        row = self._rows.get(student_id)
+        if row is None:
+            return True
+        now = time.time() if now is None else now
+        return now - float(self._reconciled_at[row]) >= max_age_seconds
+
+    # ============================================
+    # 일괄 생성 / 대사
+    # ============================================
+
+    @classmethod
+    def from_plans(cls, plans_df: pd.DataFrame) -> "PatternCounterStore":
+        """
+        플랜 DataFrame에서 카운터 일괄 생성 (cohort_plan_counts, 학생 루프 없음)
+
+        Args:
+            plans_df: student_id (+ scheduled_date, start_time, subject, status,
+                actual_duration) 컬럼 DataFrame
+        """
+        store = cls()
+        if plans_df.empty or "student_id" not in plans_df.columns:
+            return store
+
+        counts = cohort_plan_counts(PreparedPlans(plans_df))
+        student_ids = counts["student_ids"]
+        n = len(student_ids)
+        store._counts = np.hstack(
+            [
+                counts["day"],
+                counts["hour"],
+                np.column_stack(
+                    [counts["total"], counts["completed"], counts["duration_count"]]
+                ),
+            ]
+        ).astype(np.int64)
+        store._duration_sum = counts["duration_sum"].astype(np.float64)
+        store._subject_counts = counts["subject"].astype(np.int64)
+        # 처음 나온 위치 → 학생별 1부터의 순위 (없는 과목은 0)
+        seen = store._subject_counts > 0
+        first = np.where(seen, counts["subject_rank"], np.iinfo(np.int64).max)
+        store._subject_rank = np.where(seen, first.argsort(axis=1).argsort(axis=1) + 1, 0)
+        subjects = [str(s) for s in counts["subjects"]]
+
+        store._student_ids = [str(s) for s in student_ids]
+        store._rows = {s: i for i, s in enumerate(store._student_ids)}
+        store._subjects = subjects
+        store._subject_index = {s: i for i, s in enumerate(subjects)}
+        store._reconciled_at = np.full(n, time.time())
+        return store
+
+    def reconcile(
+        self,
+        plans_df: pd.DataFrame,
+        student_ids: list[str] | None = None,
+        now: float | None = None,
+    ) -> dict[str, int]:
+        """
+        플랜에서 다시 센 값으로 학생 카운터 교체 (이벤트 누락·중복·수정으로 생긴 차이 보정)
+
+        Args:
+            plans_df: 대상 학생들의 전체 플랜
+            student_ids: 대상 학생 (None이면 plans_df의 학생, 플랜이 없는 학생은 0으로 초기화)
+            now: 대사 시각 (epoch 초, 테스트용)
+
+        Returns:
+            students(대상 수), drifted(값이 달랐던 학생 수), abs_diff(정수 카운터 차이 합) 딕셔너리
+        """
+        fresh = PatternCounterStore.from_plans(plans_df)
+        if student_ids is None:
+            student_ids = fresh.student_ids
+        now = time.time() if now is None else now
+
+        drifted = abs_diff = 0
+        with self._lock:
+            for student_id in student_ids:
+                fresh_row = fresh._rows.get(student_id)
+                counts = np.zeros(WIDTH, dtype=np.int64)
+                # 처음 나온 순서의 과목별 수 (적용할 때 순위로 기록)
+                subject_counts: dict[str, int] = {}
+                duration_sum = 0.0
+                if fresh_row is not None:
+                    counts = fresh._counts[fresh_row].copy()
+                    ranks = fresh._subject_rank[fresh_row]
+                    subject_counts = {
+                        fresh.subjects[j]: int(fresh._subject_counts[fresh_row, j])
+                        for j in np.argsort(ranks, kind="stable")
+                        if ranks[j]
+                    }
+                    duration_sum = float(fresh._duration_sum[fresh_row])
+
+                row = self._rows.get(student_id)
+                if row is None:
+                    diff = int(counts.sum()) + sum(subject_counts.values())
+                    changed = bool(diff) or duration_sum != 0.0
+                else:
+                    previous = {
+                        subject: int(count)
+                        for subject, count in zip(self._subjects, self._subject_counts[row])
+                        if count
+                    }
+                    diff = int(np.abs(self._counts[row] - counts).sum()) + sum(
+                        abs(previous.get(s, 0) - subject_counts.get(s, 0))
+                        for s in previous.keys() | subject_counts.keys()
+                    )
+                    changed = bool(diff) or not np.isclose(self._duration_sum[row], duration_sum)
+                drifted += changed
+                abs_diff += diff
+                self._apply(
+                    ("reconciled", student_id, counts, subject_counts, duration_sum, now)
+                )
+
+        return {"students": len(student_ids), "drifted": drifted, "abs_diff": abs_diff}
+
+    # ============================================
+    # 직렬화
+    # ============================================
+
+    def save(self, path: str | Path) -> None:
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체, 카운터는 int32)"""
+        path = Path(path)
+        with self._lock:
+            n = len(self._student_ids)
+            arrays = {
+                "student_ids": np.array(self._student_ids, dtype=str),
+                "subjects": np.array(self._subjects, dtype=str),
+                "counts": self._counts[:n].astype(np.int32),
+                "subject_counts": self._subject_counts[:n].astype(np.int32),
+                "subject_rank": self._subject_rank[:n].astype(np.int32),
+                "duration_sum": self._duration_sum[:n].copy(),
+                "reconciled_at": self._reconciled_at[:n].copy(),
+            }
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+
+    def sync(self, path: str | Path) -> None:
+        """
+        공유 카운터 파일과 병합
+
+        파일 잠금 안에서 최신 파일을 읽고 이 저장소의 마지막 sync 이후 변경을 다시 적용해 저장한 뒤,
+        병합 결과(다른 워커의 변경 포함)를 이 저장소의 상태로 삼습니다.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            pending, self._pending = self._pending, []
+        try:
+            with _file_lock(path):
+                shared = PatternCounterStore.load(path) if path.exists() else PatternCounterStore()
+                for op in pending:
+                    shared._apply(op, log=False)
+                if pending:
+                    shared.save(path)
+        except BaseException:
+            with self._lock:
+                self._pending = pending + self._pending
+            raise
+
+        with self._lock:
+            # 병합하는 동안 들어온 변경은 새 상태에도 적용하고 다음 sync까지 보관
+            for op in self._pending:
+                shared._apply(op, log=False)
+            self._student_ids, self._rows = shared._student_ids, shared._rows
+            self._subjects, self._subject_index = shared._subjects, shared._subject_index
+            self._counts, self._subject_counts = shared._counts, shared._subject_counts
+            self._subject_rank = shared._subject_rank
+            self._duration_sum, self._reconciled_at = shared._duration_sum, shared._reconciled_at
+            self._synced_at = time.monotonic()
+
+    def sync_if_due(self, path: str | Path, min_interval_seconds: float) -> bool:
+        """마지막 sync 후 min_interval_seconds가 지났으면 병합 (변경이 없어도 다른 워커 변경을 읽음)"""
+        if time.monotonic() - self._synced_at < min_interval_seconds:
+            return False
+        self.sync(path)
+        return True
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PatternCounterStore":
+        """npz 파일에서 복원"""
+        store = cls()
+        with np.load(path) as data:
+            store._student_ids = [str(s) for s in data["student_ids"]]
+            store._subjects = [str(s) for s in data["subjects"]]
+            store._counts = data["counts"].astype(np.int64)
+            store._subject_counts = data["subject_counts"].astype(np.int64)
+            # 순위가 없는 이전 파일은 열 순서 (다음 대사 때 처음 나온 순서로 교체)
+            if "subject_rank" in data:
+                store._subject_rank = data["subject_rank"].astype(np.int64)
+            else:
+                store._subject_rank = np.where(
+                    store._subject_counts > 0,
+                    np.cumsum(store._subject_counts > 0, axis=1),
+                    0,
+                )
+            store._duration_sum = data["duration_sum"].astype(np.float64)
+            store._reconciled_at = data["reconciled_at"].astype(np.float64)
+        store._rows = {s: i for i, s in enumerate(store._student_ids)}
+        store._subject_index = {s: i for i, s in enumerate(store._subjects)}
+        return store
+
+    # ============================================
+    # 내부 (잠금 안에서 호출)
+    # ============================================
+
+    def _apply(self, op: tuple, log: bool = True) -> bool:
+        """변경 1건 적용 (반영했고 log이면 다음 sync를 위해 기록)"""
+        kind, student_id = op[0], op[1]
+        if kind == "reconciled":
+            _, _, counts, subject_counts, duration_sum, reconciled_at = op
+            row = self._row(student_id)
+            self._counts[row] = counts
+            self._subject_counts[row] = 0
+            self._subject_rank[row] = 0
+            for rank, (subject, count) in enumerate(subject_counts.items(), start=1):
+                column = self._column(subject)
+                self._subject_counts[row, column] = count
+                self._subject_rank[row, column] = rank
+            self._duration_sum[row] = duration_sum
+            self._reconciled_at[row] = reconciled_at
+        else:
+            # 이벤트는 플랜으로 초기화한 학생에만 반영 (빈 행을 만들면 초기화가 생략됨)
+            row = self._rows.get(student_id)
+            if row is None:
+                return False
+            counts = self._counts[row]
+            if kind == "created":
+                _, _, day, hour, subject, completed, duration = op
+                counts[TOTAL] += 1
+                if day is not None:
+                    counts[DAY_OFFSET + day] += 1
+                if hour is not None:
+                    counts[HOUR_OFFSET + hour] += 1
+                if completed:
+                    counts[COMPLETED] += 1
+                if subject is not None:
+                    column = self._column(subject)
+                    self._subject_counts[row, column] += 1
+                    if not self._subject_rank[row, column]:
+                        self._subject_rank[row, column] = self._subject_rank[row].max() + 1
+            else:
+                _, _, duration = op
+                counts[COMPLETED] += 1
+            if duration is not None:
+                counts[DURATION_COUNT] += 1
+                self._duration_sum[row] += duration
+        if log:
+            self._pending.append(op)
+        return True
+
+    def _row(self, student_id: str) -> int:
+        """학생 행 번호 (처음 보면 0 행 추가, 용량은 2배씩 증가)"""
+        row = self._rows.get(student_id)
+        if row is not None:
+            return row
+        row = len(self._student_ids)
+        if row == len(self._counts):
+            capacity = max(16, 2 * row)
+            grow = capacity - row
+            self._counts = np.vstack([self._counts, np.zeros((grow, WIDTH), np.int64)])
+            self._subject_counts = np.vstack(
+                [self._subject_counts, np.zeros((grow, len(self._subjects)), np.int64)]
+            )
+            self._subject_rank = np.vstack(
+                [self._subject_rank, np.zeros((grow, len(self._subjects)), np.int64)]
+            )
+            self._duration_sum = np.append(self._duration_sum, np.zeros(grow))
+            self._reconciled_at = np.append(self._reconciled_at, np.zeros(grow))
+        self._student_ids.append(student_id)
+        self._rows[student_id] = row
+        return row
+
+    def _column(self, subject: str) -> int:
+        """과목 열 번호 (처음 보면 열 추가)"""
+        column = self._subject_index.get(subject)
+        if column is None:
+            column = len(self._subjects)
+            self._subjects.append(subject)
+            self._subject_index[subject] = column
+            self._subject_counts = np.pad(self._subject_counts, ((0, 0), (0, 1)))
+            self._subject_rank = np.pad(self._subject_rank, ((0, 0), (0, 1)))
+        return column
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """워커 간 카운터 파일 잠금 (path 옆 .lock 파일)"""
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+@lru_cache()
+def get_pattern_counters() -> PatternCounterStore:
+    """
+    서비스용 카운터 저장소 (ML_PATTERN_COUNTERS_PATH 또는 data/pattern_counters.npz)
+
+    Returns:
+        파일이 있으면 복원한 저장소, 없으면 빈 저장소
+    """
+    path = pattern_counters_path()
+    if not path.exists():
+        return PatternCounterStore()
+    return PatternCounterStore.load(path)
+
+
+def pattern_counters_path() -> Path:
+    """카운터 파일 경로"""
+    return Path(os.getenv("ML_PATTERN_COUNTERS_PATH", str(DEFAULT_COUNTERS_PATH)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="학습 패턴 카운터 대사 (오프라인 배치)")
+    parser.add_argument("--tenant-id", default=None, help="Supabase 테넌트 ID")
+    parser.add_argument(
+        "--source", choices=["synthetic", "snapshot"], default=None, help="평가용 데이터 소스"
+    )
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--output", default=str(DEFAULT_COUNTERS_PATH))
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    store = PatternCounterStore.load(output) if output.exists() else PatternCounterStore()
+
+    if args.tenant_id:
+        from ..db_connector import get_connector
+
+        db = get_connector()
+        student_ids = [str(s) for s in db.get_students(args.tenant_id).get("id", [])]
+        plans_df = db.get_plans_for_students(student_ids) if student_ids else pd.DataFrame()
+    else:
+        from ..evaluation.data_sources import load_data_source
+
+        source = load_data_source(args.source or "synthetic", snapshot_dir=args.snapshot_dir)
+        plans_df = source.get_plans()
+        student_ids = None
+
+    # 서비스 워커가 같은 파일에 병합 중일 수 있으므로 덮어쓰지 않고 sync로 병합
+    report = store.reconcile(plans_df, student_ids)
+    store.sync(output)
+    print(
+        f"카운터 저장: {output} (학생 {report['students']}, "
+        f"차이 {report['drifted']}명, 카운터 차이 합 {report['abs_diff']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,70 @@
 과거 성적과 학습 패턴을 기반으로 미래 성적을 예측합니다.
 """
 
+from collections.abc import Callable
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
+from ..config import ML_CONFIG
+from ..deadline import Deadline
+from ..thread_budget import get_thread_budget
+from .cohort_priors import CohortPriorTable
+from .feature_store import StudentFeatures, SubjectFeatures, compute_feature_row
+from .trend_stats import TrendAccumulator
+
+_TIER_CONFIG = ML_CONFIG["score_prediction"]["tiers"]
+
+# 예측 계층 (저비용 → 고비용)
+TIER_WEIGHTED_AVERAGE = "weighted_average"
+TIER_RIDGE = "ridge"
+TIER_XGBOOST = "xgboost"
+
+# 성적이 3개 미만인 콜드 스타트 학생용 코호트 사전 분포 계층
+TIER_COHORT_PRIOR = "cohort_prior"
+
 
 class ScorePredictor:
     """
     성적 예측 모델
 
-    선형 회귀와 이동 평균을 조합하여 성적을 예측합니다.
-    데이터가 충분할 경우 XGBoost 모델을 사용합니다.
+    이력 길이와 지연 예산에 따라 계층별 모델을 선택합니다.
+    - weighted_average: 가중 이동 평균 + 선형 트렌드
+    - ridge: 동일 특성에 대한 닫힌 형태 릿지 회귀
+    - xgboost: 긴 이력에서만 사용하는 XGBoost 모델
+    - cohort_prior: 성적 3개 미만일 때 코호트 사전 분포와 관측값을 혼합
     """
 
-    def __init__(self, min_samples_for_ml: int = 10):
+    def __init__(
+        self,
+        min_samples_for_ml: int = _TIER_CONFIG["ridge_min_samples"],
+        min_samples_for_xgboost: int = _TIER_CONFIG["xgboost_min_samples"],
+        ridge_alpha: float = _TIER_CONFIG["ridge_alpha"],
+        latency_budget_ms: float | None = None,
+        cohort_priors: CohortPriorTable | None = None,
+        prior_strength: float = 3.0,
+        tenant_priors: Callable[[str], CohortPriorTable | None] | None = None,
+    ):
         """
         Args:
-            min_samples_for_ml: ML 모델 사용을 위한 최소 샘플 수
+            min_samples_for_ml: ML 모델(릿지 이상) 사용을 위한 최소 샘플 수
+            min_samples_for_xgboost: XGBoost 사용을 위한 최소 샘플 수
+            ridge_alpha: 릿지 정규화 계수
+            latency_budget_ms: 예측 1회의 지연 예산 (None이면 제한 없음)
+            cohort_priors: 콜드 스타트용 코호트 사전 분포 (None이면 사용 안 함)
+            prior_strength: 사전 분포의 가상 표본 수 k (관측 가중치 n / (n + k))
+            tenant_priors: tenant_id → 테넌트 사전 분포 (cohort_priors가 없을 때
+                student_profile의 tenant_id로 조회)
         """
         self.min_samples_for_ml = min_samples_for_ml
+        self.min_samples_for_xgboost = max(min_samples_for_xgboost, min_samples_for_ml)
+        self.ridge_alpha = ridge_alpha
+        self.latency_budget_ms = latency_budget_ms
+        self.tier_latency_ms: dict[str, float] = dict(_TIER_CONFIG["expected_latency_ms"])
+        self.cohort_priors = cohort_priors
+        self.prior_strength = prior_strength
+        self.tenant_priors = tenant_priors
         self._model = None
 
     def predict(
@@ -32,6 +76,9 @@ class ScorePredictor:
         plans_df: pd.DataFrame | None,
         subject: str,
         days_ahead: int = 30,
+        trend_stats: TrendAccumulator | None = None,
+        student_profile: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
     ) -> dict[str, Any]:
         """
         성적 예측
@@ -41,47 +88,356 @@ class ScorePredictor:
             plans_df: 학습 플랜 DataFrame (선택)
             subject: 예측할 과목
             days_ahead: 예측 기간 (일)
+            trend_stats: 저장된 트렌드 누적기 (TrendStatsStore, 없으면 성적 이력으로 생성)
+            student_profile: 학생 프로필 (grade, target_major) - 콜드 스타트용
+            deadline: 요청 데드라인 (남은 시간에 따라 저렴한 계층으로 전환)
 
         Returns:
             예측 결과 딕셔너리
         """
-        # 해당 과목 데이터 필터링
-        subject_scores = scores_df[scores_df["subject"] == subject].copy()
+        subject_scores = self._prepare_subject_scores(scores_df, subject)
 
-        if len(subject_scores) < 3:
-            return self._insufficient_data_response(subject)
+        if subject_scores is None:
+            return self._cold_start_or_insufficient(
+                _subject_score_values(scores_df, subject), subject, student_profile
+            )
 
-        # 시간순 정렬
-        subject_scores = subject_scores.sort_values("created_at")
-        current_score = subject_scores["score"].iloc[-1]
+        # 누적 통계 (캐시가 없으면 한 번만 계산)
+        if trend_stats is None:
+            trend_stats = TrendAccumulator.from_scores(subject_scores["score"].values)
+
+        # 예측 계층 선택 및 예측 (폴백하면 실제 사용 계층이 돌아옴)
+        selected_tier = self._select_tier(len(subject_scores), deadline)
+        predicted_score, confidence, tier = self.predict_history(
+            subject_scores["score"].values,
+            days_ahead=days_ahead,
+            trend_stats=trend_stats,
+            tier=selected_tier,
+        )
+
+        return self._build_result(
+            subject_scores,
+            plans_df,
+            subject,
+            trend_stats,
+            predicted_score,
+            confidence,
+            tier,
+            selected_tier=selected_tier,
+            deadline=deadline,
+        )
+
+    def predict_many(
+        self,
+        requests: list[tuple[Any, ...]],
+    ) -> list[dict[str, Any]]:
+        """
+        여러 예측 요청을 한 번에 처리
+
+        릿지 계층 요청은 (B, 5, 5) 연립방정식 하나로 묶어 벡터화하여 풀고,
+        나머지 계층은 요청별로 처리합니다. 결과는 predict()와 동일합니다.
 
-        # 트렌드 분석
-        trend_info = self._analyze_trend(subject_scores)
+        Args:
+            requests: (scores_df, plans_df, subject, days_ahead
+                [, student_profile[, deadline[, trend_stats]]]) 목록
 
-        # 예측 방법 선택
-        if len(subject_scores) >= self.min_samples_for_ml:
-            predicted_score, confidence = self._ml_predict(
-                subject_scores, plans_df, days_ahead
+        Returns:
+            요청 순서대로의 예측 결과 목록
+        """
+        results: dict[int, dict[str, Any]] = {}
+        prepared = {}
+        ridge_indices = []
+
+        for i, (scores_df, _, subject, _, *rest) in enumerate(requests):
+            student_profile = rest[0] if len(rest) > 0 else None
+            deadline = rest[1] if len(rest) > 1 else None
+            trend_stats = rest[2] if len(rest) > 2 else None
+
+            subject_scores = self._prepare_subject_scores(scores_df, subject)
+            if subject_scores is None:
+                results[i] = self._cold_start_or_insufficient(
+                    _subject_score_values(scores_df, subject), subject, student_profile
+                )
+                continue
+
+            scores = subject_scores["score"].values.astype(np.float64)
+            stats = trend_stats if trend_stats is not None else TrendAccumulator.from_scores(scores)
+            tier = self._select_tier(len(scores), deadline)
+            prepared[i] = (subject_scores, scores, stats, tier, deadline)
+            if tier == TIER_RIDGE:
+                ridge_indices.append(i)
+
+        # 릿지 계층 일괄 풀이
+        batch_predictions = self._ridge_predict_batch(
+            {i: (prepared[i][1], None) for i in ridge_indices}
+        )
+
+        for i, (subject_scores, scores, stats, selected_tier, deadline) in prepared.items():
+            _, plans_df, subject, days_ahead, *_ = requests[i]
+            if i in batch_predictions:
+                predicted_score, confidence = batch_predictions[i]
+                tier = TIER_RIDGE
+            else:
+                predicted_score, confidence, tier = self.predict_history(
+                    scores, days_ahead=days_ahead, trend_stats=stats, tier=selected_tier
+                )
+            results[i] = self._build_result(
+                subject_scores,
+                plans_df,
+                subject,
+                stats,
+                predicted_score,
+                confidence,
+                tier,
+                selected_tier=selected_tier,
+                deadline=deadline,
             )
-        else:
-            predicted_score, confidence = self._simple_predict(
-                subject_scores, trend_info, days_ahead
+
+        return [results[i] for i in range(len(requests))]
+
+    def predict_from_features(
+        self,
+        student_features: StudentFeatures,
+        subject: str,
+        days_ahead: int = 30,
+        student_profile: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """
+        특성 저장소 조회 결과로 성적 예측 (원본 DataFrame 재계산 없음)
+
+        Args:
+            student_features: FeatureStore에서 조회한 학생 특성
+            subject: 예측할 과목
+            days_ahead: 예측 기간 (일)
+            student_profile: 학생 프로필 (grade, target_major) - 콜드 스타트용
+            deadline: 요청 데드라인 (남은 시간에 따라 저렴한 계층으로 전환)
+
+        Returns:
+            predict()와 동일한 형태의 예측 결과
+        """
+        return self.predict_many_from_features(
+            [(student_features, subject, days_ahead, student_profile, deadline)]
+        )[0]
+
+    def predict_many_from_features(
+        self,
+        requests: list[tuple[Any, ...]],
+    ) -> list[dict[str, Any]]:
+        """
+        특성 저장소 조회 결과로 여러 예측 요청을 한 번에 처리
+
+        저장된 성적 배열, 특성 행렬, 트렌드 누적기를 그대로 사용하며,
+        릿지 계층 요청은 predict_many()와 같이 묶어서 풉니다.
+
+        Args:
+            requests: (student_features, subject, days_ahead[, student_profile[, deadline]]) 목록
+
+        Returns:
+            요청 순서대로의 예측 결과 목록
+        """
+        results: dict[int, dict[str, Any]] = {}
+        prepared = {}
+
+        for i, (student_features, subject, _, *rest) in enumerate(requests):
+            student_profile = rest[0] if len(rest) > 0 else None
+            deadline = rest[1] if len(rest) > 1 else None
+
+            subject_features = student_features.subject(subject)
+            if subject_features is None or subject_features.count < 3:
+                scores = subject_features.scores if subject_features else np.empty(0)
+                results[i] = self._cold_start_or_insufficient(scores, subject, student_profile)
+                continue
+
+            tier = self._select_tier(subject_features.count, deadline)
+            prepared[i] = (subject_features, tier, deadline)
+
+        batch_predictions = self._ridge_predict_batch(
+            {
+                i: (subject_features.scores, subject_features.features)
+                for i, (subject_features, tier, _) in prepared.items()
+                if tier == TIER_RIDGE
+            }
+        )
+
+        for i, (subject_features, selected_tier, deadline) in prepared.items():
+            days_ahead = requests[i][2]
+            if i in batch_predictions:
+                predicted_score, confidence = batch_predictions[i]
+                tier = TIER_RIDGE
+            else:
+                predicted_score, confidence, tier = self.predict_history(
+                    subject_features.scores,
+                    days_ahead=days_ahead,
+                    features=subject_features.features,
+                    trend_stats=subject_features.trend,
+                    tier=selected_tier,
+                )
+            results[i] = self._build_result_from_features(
+                subject_features,
+                predicted_score,
+                confidence,
+                tier,
+                selected_tier=selected_tier,
+                deadline=deadline,
             )
 
+        return [results[i] for i in range(len(requests))]
+
+    def batchable(self, n_samples: int, deadline: Deadline | None = None) -> bool:
+        """
+        predict_many로 묶어 처리할 요청인지 여부
+
+        XGBoost 계층은 요청마다 모델을 학습하므로 배치로 묶어도 이득이 없어 제외합니다.
+        """
+        return self._select_tier(n_samples, deadline) != TIER_XGBOOST
+
+    def _prepare_subject_scores(
+        self,
+        scores_df: pd.DataFrame,
+        subject: str,
+    ) -> pd.DataFrame | None:
+        """과목 성적 필터링 및 시간순 정렬 (3개 미만이면 None)"""
+        if scores_df.empty:
+            return None
+
+        subject_scores = scores_df[scores_df["subject"] == subject]
+
+        if len(subject_scores) < 3:
+            return None
+
+        return subject_scores.sort_values("created_at")
+
+    def _build_result(
+        self,
+        subject_scores: pd.DataFrame,
+        plans_df: pd.DataFrame | None,
+        subject: str,
+        stats: TrendAccumulator,
+        predicted_score: float,
+        confidence: float,
+        tier: str,
+        selected_tier: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """
+        예측 결과 딕셔너리 구성 (예산 소진 시 플랜 기반 요인 분석 생략)
+
+        tier는 실제 사용 계층, selected_tier는 지연 예산으로 고른 계층입니다.
+        데이터 부족/학습 실패로 인한 폴백은 degraded로 보지 않습니다.
+        """
         # 점수 범위 제한 (0-100)
         predicted_score = max(0, min(100, predicted_score))
+        degraded = (selected_tier or tier) != self._select_tier(stats.count)
 
-        # 영향 요인 분석
-        factors = self._analyze_factors(subject_scores, plans_df, subject)
+        # 트렌드 및 영향 요인 분석
+        trend_info = self._analyze_trend(subject_scores, stats=stats)
+        if deadline is not None and deadline.expired:
+            factors = self._factors_from_stats(stats)
+            degraded = True
+        else:
+            factors = self._analyze_factors(subject_scores, plans_df, subject, stats=stats)
 
         return {
-            "current_score": float(current_score),
+            "current_score": float(subject_scores["score"].iloc[-1]),
             "predicted_score": round(predicted_score, 1),
             "confidence": round(confidence, 2),
             "trend": trend_info["direction"],
             "factors": factors,
+            "model_tier": tier,
+            "degraded": degraded,
+        }
+
+    def _build_result_from_features(
+        self,
+        subject_features: SubjectFeatures,
+        predicted_score: float,
+        confidence: float,
+        tier: str,
+        selected_tier: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """_build_result와 같은 결과를 저장된 과목 특성으로 구성 (학습량은 플랜 집계값 사용)"""
+        predicted_score = max(0, min(100, predicted_score))
+        stats = subject_features.trend
+        degraded = (selected_tier or tier) != self._select_tier(stats.count)
+
+        factors = self._factors_from_stats(stats)
+        if deadline is not None and deadline.expired:
+            degraded = True
+        elif subject_features.study_sessions:
+            factors["study_sessions"] = subject_features.study_sessions
+            factors["total_study_minutes"] = int(subject_features.study_minutes)
+
+        return {
+            "current_score": float(subject_features.scores[-1]),
+            "predicted_score": round(predicted_score, 1),
+            "confidence": round(confidence, 2),
+            "trend": self._analyze_trend(None, stats=stats)["direction"],
+            "factors": factors,
+            "model_tier": tier,
+            "degraded": degraded,
         }
 
+    def predict_history(
+        self,
+        scores: np.ndarray,
+        days_ahead: int = 30,
+        features: np.ndarray | None = None,
+        trend_stats: TrendAccumulator | None = None,
+        tier: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> tuple[float, float, str]:
+        """
+        시간순 성적 배열로 다음 성적 예측 (DataFrame 변환 없음)
+
+        각 특성 행은 해당 시점까지의 성적만 사용하므로, 전체 이력에서 한 번
+        추출한 특성의 앞부분(features[:n])을 그대로 넘길 수 있습니다.
+
+        Args:
+            scores: 시간순 성적 배열
+            days_ahead: 예측 기간 (일)
+            features: 미리 추출한 특성 (없으면 추출)
+            trend_stats: 미리 계산한 트렌드 누적기 (없으면 생성)
+            tier: 강제할 계층 (없으면 이력 길이/지연 예산으로 선택)
+            deadline: 요청 데드라인 (남은 시간도 지연 예산으로 반영)
+
+        Returns:
+            (예측 점수(0-100 제한 전), 신뢰도, 실제 사용 계층 - 폴백 시 가중 평균)
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if trend_stats is None:
+            trend_stats = TrendAccumulator.from_scores(scores)
+        if tier is None:
+            tier = self._select_tier(len(scores), deadline)
+
+        if tier == TIER_XGBOOST:
+            return self._ml_predict(scores, days_ahead, features=features, stats=trend_stats)
+        if tier == TIER_RIDGE:
+            return self._ridge_predict(scores, days_ahead, features=features, stats=trend_stats)
+
+        predicted, confidence = self._fallback_predict(trend_stats, days_ahead)
+        return predicted, confidence, TIER_WEIGHTED_AVERAGE
+
+    def _select_tier(self, n_samples: int, deadline: Deadline | None = None) -> str:
+        """이력 길이와 지연 예산(고정 예산과 요청의 남은 시간 중 작은 값)으로 계층 선택"""
+        if n_samples < self.min_samples_for_ml:
+            return TIER_WEIGHTED_AVERAGE
+
+        budget = self.latency_budget_ms
+        if deadline is not None:
+            remaining = deadline.remaining_ms()
+            budget = remaining if budget is None else min(budget, remaining)
+        if n_samples >= self.min_samples_for_xgboost and (
+            budget is None or budget >= self.tier_latency_ms[TIER_XGBOOST]
+        ):
+            return TIER_XGBOOST
+
+        if budget is None or budget >= self.tier_latency_ms[TIER_RIDGE]:
+            return TIER_RIDGE
+
+        return TIER_WEIGHTED_AVERAGE
+
     def _insufficient_data_response(self, subject: str) -> dict[str, Any]:
         """데이터 부족 시 응답"""
         return {
@@ -92,25 +448,110 @@ class ScorePredictor:
             "factors": {
                 "message": f"{subject} 과목의 데이터가 부족합니다 (최소 3개 필요).",
             },
+            "model_tier": None,
+            "degraded": False,
         }
 
-    def _analyze_trend(self, scores_df: pd.DataFrame) -> dict[str, Any]:
-        """트렌드 분석"""
-        scores = scores_df["score"].values
+    def _cold_start_or_insufficient(
+        self,
+        scores: np.ndarray,
+        subject: str,
+        student_profile: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """코호트 사전 분포로 예측 가능하면 콜드 스타트 예측, 아니면 데이터 부족 응답"""
+        if student_profile is None:
+            return self._insufficient_data_response(subject)
 
-        if len(scores) < 2:
-            return {"direction": "stable", "slope": 0, "r_squared": 0}
+        result = self._cold_start_predict(scores, subject, student_profile)
+        return result if result is not None else self._insufficient_data_response(subject)
 
-        # 선형 회귀로 트렌드 계산
-        x = np.arange(len(scores))
-        coeffs = np.polyfit(x, scores, 1)
-        slope = coeffs[0]
+    def priors_for(self, student_profile: dict[str, Any]) -> CohortPriorTable | None:
+        """학생에게 적용할 사전 분포 (고정 테이블, 없으면 프로필 테넌트의 테이블)"""
+        if self.cohort_priors is not None:
+            return self.cohort_priors
+        tenant_id = student_profile.get("tenant_id")
+        if self.tenant_priors is None or not tenant_id:
+            return None
+        return self.tenant_priors(str(tenant_id))
 
-        # R² 계산
-        y_pred = np.polyval(coeffs, x)
-        ss_res = np.sum((scores - y_pred) ** 2)
-        ss_tot = np.sum((scores - np.mean(scores)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
+    def _cold_start_predict(
+        self,
+        scores: np.ndarray,
+        subject: str,
+        student_profile: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """
+        코호트 사전 분포 기반 예측 (성적 0-2개)
+
+        관측 성적의 평균과 사전 기댓값을 w = n / (n + k)로 혼합합니다.
+        사전 분포는 (학년, 목표 전공, 과목, 최근 점수 구간)으로 O(1) 조회합니다.
+
+        Returns:
+            예측 결과 딕셔너리 (사전 분포가 없거나 해당 과목의 사전 분포가 없으면 None)
+        """
+        priors = self.priors_for(student_profile)
+        if priors is None:
+            return None
+        scores = np.asarray(scores, dtype=np.float64)
+        latest = float(scores[-1]) if len(scores) else None
+
+        prior = priors.lookup(
+            student_profile.get("grade"),
+            student_profile.get("target_major"),
+            subject,
+            latest,
+        )
+        if prior is None:
+            return None
+        prior_mean, prior_spread, cohort_size = prior
+
+        n = len(scores)
+        weight = n / (n + self.prior_strength)
+        observed = float(scores.mean()) if n else prior_mean
+        predicted_score = weight * observed + (1 - weight) * prior_mean
+
+        # 코호트 산포가 좁고 표본이 많을수록 높은 신뢰도 (최대 0.5)
+        prior_confidence = 0.5 * min(cohort_size / 50, 1.0) / (1 + prior_spread / 10)
+        confidence = (1 - weight) * prior_confidence + weight * 0.3
+
+        trend = "unknown"
+        if n == 2:
+            trend = self._analyze_trend(
+                None, stats=TrendAccumulator.from_scores(scores)
+            )["direction"]
+
+        return {
+            "current_score": latest,
+            "predicted_score": round(max(0, min(100, predicted_score)), 1),
+            "confidence": round(confidence, 2),
+            "trend": trend,
+            "factors": {
+                "cohort_expected_score": round(prior_mean, 1),
+                "cohort_spread": round(prior_spread, 1),
+                "cohort_size": cohort_size,
+                "observed_scores": n,
+                "message": (
+                    f"{subject} 과목 성적이 {n}개뿐이어서 "
+                    "비슷한 학생 집단의 성적 추이를 반영했습니다."
+                ),
+            },
+            "model_tier": TIER_COHORT_PRIOR,
+            "degraded": False,
+        }
+
+    def _analyze_trend(
+        self,
+        scores_df: pd.DataFrame | None,
+        stats: TrendAccumulator | None = None,
+    ) -> dict[str, Any]:
+        """트렌드 분석 (누적 통계 기반 O(1))"""
+        if stats is None:
+            stats = TrendAccumulator.from_scores(scores_df["score"].values)
+
+        if stats.count < 2:
+            return {"direction": "stable", "slope": 0, "r_squared": 0}
+
+        slope = stats.slope
 
         # 방향 결정
         if slope > 0.5:
@@ -123,21 +564,22 @@ class ScorePredictor:
         return {
             "direction": direction,
             "slope": float(slope),
-            "r_squared": float(r_squared),
+            "r_squared": float(stats.r_squared),
         }
 
     def _simple_predict(
         self,
-        scores_df: pd.DataFrame,
+        scores_df: pd.DataFrame | None,
         trend_info: dict[str, Any],
         days_ahead: int,
+        stats: TrendAccumulator | None = None,
     ) -> tuple[float, float]:
         """단순 예측 (데이터 부족 시)"""
-        scores = scores_df["score"].values
+        if stats is None:
+            stats = TrendAccumulator.from_scores(scores_df["score"].values)
 
-        # 가중 이동 평균 (최근 데이터에 더 높은 가중치)
-        weights = np.exp(np.linspace(0, 1, len(scores)))
-        weighted_avg = np.average(scores, weights=weights)
+        # 지수 가중 평균 (최근 데이터에 더 높은 가중치)
+        weighted_avg = stats.weighted_average
 
         # 트렌드 반영
         slope = trend_info["slope"]
@@ -146,48 +588,181 @@ class ScorePredictor:
         predicted = weighted_avg + slope * prediction_periods
 
         # 신뢰도 (데이터 양과 트렌드 일관성 기반)
-        data_confidence = min(len(scores) / 10, 1.0) * 0.5
+        data_confidence = min(stats.count / 10, 1.0) * 0.5
         trend_confidence = min(abs(trend_info["r_squared"]), 1.0) * 0.5
         confidence = data_confidence + trend_confidence
 
         return float(predicted), float(confidence)
 
-    def _ml_predict(
+    def _ridge_predict(
         self,
-        scores_df: pd.DataFrame,
-        plans_df: pd.DataFrame | None,
+        scores: np.ndarray,
         days_ahead: int,
+        features: np.ndarray | None = None,
+        stats: TrendAccumulator | None = None,
+    ) -> tuple[float, float, str]:
+        """닫힌 형태 릿지 회귀 예측 (중간 길이 이력, 특성이 부족하면 가중 평균으로 폴백)"""
+        if features is None:
+            features = self._features_from_scores(scores)
+
+        if features is None or len(features) < 4:
+            return self._weighted_average_predict(
+                stats or TrendAccumulator.from_scores(scores), days_ahead
+            )
+
+        predicted, r_squared = self._ridge_fit_predict(
+            features[:-1], scores[1:], features[-1], self.ridge_alpha
+        )
+
+        # 신뢰도 (학습 R² 기반, XGBoost 계층과 동일한 척도)
+        confidence = min(max(r_squared, 0.0), 1.0) * 0.8 + 0.2
+
+        return float(predicted), float(confidence), TIER_RIDGE
+
+    @staticmethod
+    def _ridge_fit_predict(
+        X: np.ndarray,
+        y: np.ndarray,
+        x_next: np.ndarray,
+        alpha: float,
     ) -> tuple[float, float]:
-        """ML 기반 예측 (데이터 충분 시)"""
+        """
+        중심화된 특성에 대해 (XᵀX + αI)w = Xᵀy를 풀고 다음 점수를 예측
+
+        Returns:
+            (예측 점수, 학습 R²)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        x_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        Xc = X - x_mean
+        yc = y - y_mean
+
+        gram = Xc.T @ Xc
+        gram[np.diag_indices_from(gram)] += alpha
+        weights = np.linalg.solve(gram, Xc.T @ yc)
+
+        residual = yc - Xc @ weights
+        ss_tot = float(yc @ yc)
+        r_squared = 1 - float(residual @ residual) / ss_tot if ss_tot > 0 else 0.0
+
+        predicted = y_mean + (np.asarray(x_next, dtype=np.float64) - x_mean) @ weights
+        return float(predicted), r_squared
+
+    def _ridge_predict_batch(
+        self,
+        histories: dict[int, tuple[np.ndarray, np.ndarray | None]],
+    ) -> dict[int, tuple[float, float]]:
+        """
+        릿지 계층 요청을 (B, 5, 5) 연립방정식 하나로 풀이
+
+        Args:
+            histories: 요청 번호 → (시간순 성적, 미리 추출한 특성 또는 None)
+
+        Returns:
+            요청 번호 → (예측 점수, 신뢰도) (특성 행이 4개 미만인 요청은 빠짐)
+        """
+        eligible = []
+        for i, (scores, features) in histories.items():
+            if features is None:
+                features = self._features_from_scores(scores)
+            if features is not None and len(features) >= 4:
+                eligible.append((i, scores, features))
+        if not eligible:
+            return {}
+
+        predictions, r_squared = self._ridge_fit_predict_batch(
+            [features[:-1] for _, _, features in eligible],
+            [scores[1:] for _, scores, _ in eligible],
+            [features[-1] for _, _, features in eligible],
+            self.ridge_alpha,
+        )
+        return {
+            i: (float(predicted), float(min(max(r2, 0.0), 1.0) * 0.8 + 0.2))
+            for (i, _, _), predicted, r2 in zip(eligible, predictions, r_squared)
+        }
+
+    @staticmethod
+    def _ridge_fit_predict_batch(
+        X_list: list[np.ndarray],
+        y_list: list[np.ndarray],
+        x_next_list: list[np.ndarray],
+        alpha: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        길이가 다른 여러 이력의 릿지 회귀를 패딩 + 마스크로 한 번에 풀이
+
+        Returns:
+            (예측 점수 배열, 학습 R² 배열)
+        """
+        batch = len(X_list)
+        lengths = np.array([len(y) for y in y_list])
+        max_len = int(lengths.max())
+        n_features = X_list[0].shape[1]
+
+        X = np.zeros((batch, max_len, n_features))
+        y = np.zeros((batch, max_len))
+        for b, (Xb, yb) in enumerate(zip(X_list, y_list)):
+            X[b, : len(yb)] = Xb
+            y[b, : len(yb)] = yb
+        mask = np.arange(max_len)[None, :] < lengths[:, None]
+
+        x_mean = X.sum(axis=1) / lengths[:, None]
+        y_mean = y.sum(axis=1) / lengths
+        Xc = (X - x_mean[:, None, :]) * mask[:, :, None]
+        yc = (y - y_mean[:, None]) * mask
+
+        gram = np.einsum("bmi,bmj->bij", Xc, Xc)
+        gram += alpha * np.eye(n_features)
+        rhs = np.einsum("bmi,bm->bi", Xc, yc)
+        weights = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+
+        residual = yc - np.einsum("bmi,bi->bm", Xc, weights)
+        ss_res = np.einsum("bm,bm->b", residual, residual)
+        ss_tot = np.einsum("bm,bm->b", yc, yc)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 0.0)
+
+        x_next = np.asarray(x_next_list, dtype=np.float64)
+        predicted = y_mean + np.einsum("bi,bi->b", x_next - x_mean, weights)
+        return predicted, r_squared
+
+    def _ml_predict(
+        self,
+        scores: np.ndarray,
+        days_ahead: int,
+        features: np.ndarray | None = None,
+        stats: TrendAccumulator | None = None,
+    ) -> tuple[float, float, str]:
+        """ML 기반 예측 (데이터 충분 시, 실패하면 가중 평균으로 폴백)"""
+        if stats is None:
+            stats = TrendAccumulator.from_scores(scores)
+
         try:
             # 특성 엔지니어링
-            features = self._extract_features(scores_df, plans_df)
+            if features is None:
+                features = self._features_from_scores(scores)
 
             if features is None:
-                return self._simple_predict(
-                    scores_df,
-                    self._analyze_trend(scores_df),
-                    days_ahead,
-                )
+                return self._weighted_average_predict(stats, days_ahead)
 
             # XGBoost 모델 학습 및 예측
             from xgboost import XGBRegressor
 
             X = features[:-1]  # 마지막 제외 (예측용)
-            y = scores_df["score"].values[1:]  # 다음 점수
+            y = scores[1:]  # 다음 점수
 
             if len(X) < 3:
-                return self._simple_predict(
-                    scores_df,
-                    self._analyze_trend(scores_df),
-                    days_ahead,
-                )
+                return self._weighted_average_predict(stats, days_ahead)
 
             model = XGBRegressor(
                 n_estimators=50,
                 max_depth=3,
                 learning_rate=0.1,
                 random_state=42,
+                **get_thread_budget().xgboost_params(),
             )
             model.fit(X, y)
 
@@ -198,49 +773,50 @@ class ScorePredictor:
             # 신뢰도 (모델 점수 기반)
             confidence = min(model.score(X, y), 1.0) * 0.8 + 0.2
 
-            return float(predicted), float(confidence)
+            return float(predicted), float(confidence), TIER_XGBOOST
 
         except Exception:
             # ML 실패 시 단순 예측으로 폴백
-            return self._simple_predict(
-                scores_df,
-                self._analyze_trend(scores_df),
-                days_ahead,
-            )
+            return self._weighted_average_predict(stats, days_ahead)
 
-    def _extract_features(
+    def _fallback_predict(
         self,
-        scores_df: pd.DataFrame,
-        plans_df: pd.DataFrame | None,
-    ) -> np.ndarray | None:
+        stats: TrendAccumulator,
+        days_ahead: int,
+    ) -> tuple[float, float]:
+        """누적 통계만으로 단순 예측 (가중 평균 계층 및 ML 폴백)"""
+        return self._simple_predict(
+            None,
+            self._analyze_trend(None, stats=stats),
+            days_ahead,
+            stats=stats,
+        )
+
+    def _weighted_average_predict(
+        self,
+        stats: TrendAccumulator,
+        days_ahead: int,
+    ) -> tuple[float, float, str]:
+        """폴백 예측 결과에 가중 평균 계층을 붙여 반환"""
+        predicted, confidence = self._fallback_predict(stats, days_ahead)
+        return predicted, confidence, TIER_WEIGHTED_AVERAGE
+
+    def _extract_features(self, scores_df: pd.DataFrame) -> np.ndarray | None:
         """특성 추출"""
-        scores = scores_df["score"].values
+        return self._features_from_scores(scores_df["score"].values)
+
+    @staticmethod
+    def _features_from_scores(scores: np.ndarray) -> np.ndarray | None:
+        """
+        성적 배열에서 특성 추출
 
+        i번째 행은 scores[:i + 1]만 사용합니다
+        (이전 점수 3개 + 이동 평균 + 표준편차).
+        """
         if len(scores) < 3:
             return None
 
-        features_list = []
-        for i in range(len(scores)):
-            feat = []
-
-            # 이전 점수들 (최대 3개)
-            for j in range(1, 4):
-                if i >= j:
-                    feat.append(scores[i - j])
-                else:
-                    feat.append(scores[0])  # 패딩
-
-            # 이동 평균
-            window = min(i + 1, 5)
-            feat.append(np.mean(scores[max(0, i - window + 1) : i + 1]))
-
-            # 표준편차
-            if i >= 2:
-                feat.append(np.std(scores[max(0, i - 4) : i + 1]))
-            else:
-                feat.append(0)
-
-            features_list.append(feat)
+        features_list = [compute_feature_row(scores, i) for i in range(len(scores))]
 
         return np.array(features_list)
 
@@ -249,22 +825,13 @@ class ScorePredictor:
         scores_df: pd.DataFrame,
         plans_df: pd.DataFrame | None,
         subject: str,
+        stats: TrendAccumulator | None = None,
     ) -> dict[str, Any]:
         """영향 요인 분석"""
-        factors = {}
-
-        # 최근 성적 변화
-        if len(scores_df) >= 2:
-            recent_change = scores_df["score"].iloc[-1] - scores_df["score"].iloc[-2]
-            factors["recent_change"] = round(float(recent_change), 1)
+        if stats is None:
+            stats = TrendAccumulator.from_scores(scores_df["score"].values)
 
-        # 평균과의 차이
-        avg = scores_df["score"].mean()
-        factors["average_score"] = round(float(avg), 1)
-
-        # 변동성
-        if len(scores_df) >= 3:
-            factors["volatility"] = round(float(scores_df["score"].std()), 1)
+        factors = self._factors_from_stats(stats)
 
         # 학습량 (플랜 데이터가 있는 경우)
         if plans_df is not None and not plans_df.empty:
@@ -276,3 +843,30 @@ class ScorePredictor:
                     factors["total_study_minutes"] = int(total_minutes)
 
         return factors
+
+    def _factors_from_stats(self, stats: TrendAccumulator) -> dict[str, Any]:
+        """누적 통계 기반 요인 (최근 변화, 평균, 변동성)"""
+        factors: dict[str, Any] = {}
+
+        # 최근 성적 변화
+        if stats.count >= 2:
+            factors["recent_change"] = round(float(stats.recent_change), 1)
+
+        # 평균과의 차이
+        factors["average_score"] = round(float(stats.mean), 1)
+
+        # 변동성
+        if stats.count >= 3:
+            factors["volatility"] = round(float(stats.volatility), 1)
+
+        return factors
+
+
+def _subject_score_values(scores_df: pd.DataFrame, subject: str) -> np.ndarray:
+    """과목 성적을 시간순 배열로 추출 (없으면 빈 배열)"""
+    if scores_df.empty or "subject" not in scores_df.columns:
+        return np.empty(0)
+    subject_scores = scores_df[scores_df["subject"] == subject]
+    if "created_at" in subject_scores.columns:
+        subject_scores = subject_scores.sort_values("created_at")
+    return subject_scores["score"].to_numpy(dtype=np.float64)
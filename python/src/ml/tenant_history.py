@@ -0,0 +1,411 @@
+"""
+테넌트 성적 이력 (열 지향 비정형 배열)
+
+테넌트 전체 성적을 (학생, 과목, 시간) 순으로 정렬한 연속 numpy 배열에 담고,
+CSR 방식 오프셋으로 (학생, 과목) 시리즈 경계를 표시합니다.
+세그먼트 커널(np.add.reduceat 기반)로 시리즈별 개수, 평균, 표준편차, EWMA,
+마지막 값, 선형 추세 기울기를 학생 단위 루프 없이 한 번에 계산합니다.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .trend_stats import DEFAULT_EWMA_DECAY
+
+# ============================================
+# 세그먼트 커널
+# ============================================
+
+
+def segment_counts(offsets: np.ndarray) -> np.ndarray:
+    """세그먼트 길이"""
+    return np.diff(offsets)
+
+
+def segment_positions(offsets: np.ndarray) -> np.ndarray:
+    """각 행의 세그먼트 내 순번 (0, 1, 2, ...)"""
+    counts = segment_counts(offsets)
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+
+
+def segment_sum(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """세그먼트 합 (빈 세그먼트는 0)"""
+    counts = segment_counts(offsets)
+    result = np.zeros(len(counts), dtype=np.float64)
+    nonempty = counts > 0
+    if nonempty.any():
+        result[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return result
+
+
+def segment_mean(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """세그먼트 평균 (빈 세그먼트는 NaN)"""
+    counts = segment_counts(offsets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return segment_sum(values, offsets) / counts
+
+
+def segment_std(values: np.ndarray, offsets: np.ndarray, ddof: int = 1) -> np.ndarray:
+    """
+    세그먼트 표준편차 (두 번 훑기로 수치 안정성 확보)
+
+    길이가 ddof 이하인 세그먼트는 0입니다 (TrendAccumulator.volatility와 동일).
+    """
+    counts = segment_counts(offsets)
+    means = segment_mean(values, offsets)
+    centered = values - np.repeat(np.nan_to_num(means), counts)
+    ss = segment_sum(centered * centered, offsets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.where(counts > ddof, ss / (counts - ddof), 0.0)
+    return np.sqrt(variance)
+
+
+def segment_last(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """세그먼트 마지막 값 (빈 세그먼트는 NaN)"""
+    counts = segment_counts(offsets)
+    result = np.full(len(counts), np.nan)
+    nonempty = counts > 0
+    result[nonempty] = values[offsets[1:][nonempty] - 1]
+    return result
+
+
+def segment_previous(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """세그먼트 끝에서 두 번째 값 (길이 2 미만이면 NaN)"""
+    counts = segment_counts(offsets)
+    result = np.full(len(counts), np.nan)
+    enough = counts > 1
+    result[enough] = values[offsets[1:][enough] - 2]
+    return result
+
+
+def segment_ewma(
+    values: np.ndarray,
+    offsets: np.ndarray,
+    decay: float = DEFAULT_EWMA_DECAY,
+) -> np.ndarray:
+    """
+    세그먼트 지수 가중 평균 (마지막 값 가중치 1, 한 칸 앞마다 decay배)
+
+    TrendAccumulator.weighted_average와 같은 정의입니다.
+    """
+    counts = segment_counts(offsets)
+    age = np.repeat(counts - 1, counts) - segment_positions(offsets)
+    weights = np.power(decay, age)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return segment_sum(weights * values, offsets) / segment_sum(weights, offsets)
+
+
+def segment_trend(
+    values: np.ndarray,
+    offsets: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    세그먼트별 순번 대비 최소제곱 기울기와 R²
+
+    x = 0..n-1이므로 Σx, Σx²은 닫힌 형태로 계산합니다.
+    길이 2 미만이거나 분산이 0인 세그먼트는 (0, 0)입니다 (TrendAccumulator와 동일).
+    """
+    counts = segment_counts(offsets).astype(np.float64)
+    x = segment_positions(offsets).astype(np.float64)
+
+    # 평균 중심화로 대형 합의 상쇄 오차 방지
+    means = np.nan_to_num(segment_mean(values, offsets))
+    centered = values - np.repeat(means, segment_counts(offsets))
+    sum_xy = segment_sum(x * centered, offsets)
+    sum_yy = segment_sum(centered * centered, offsets)
+
+    # Σ(x - x̄)² = n(n² - 1) / 12
+    sxx = counts * (counts * counts - 1) / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(sxx > 0, sum_xy / sxx, 0.0)
+        r_squared = np.where(
+            (sxx > 0) & (sum_yy > 0), sum_xy * sum_xy / (sxx * sum_yy), 0.0
+        )
+    return slope, np.minimum(r_squared, 1.0)
+
+
+# ============================================
+# 테넌트 이력
+# ============================================
+
+
+class TenantHistory:
+    """
+    테넌트 성적 이력
+
+    행 배열(scores, times, student_codes, subject_codes)은 (학생, 과목, 시간) 순으로
+    정렬되어 있으며, 시리즈 g의 행은 offsets[g]:offsets[g + 1]입니다.
+    학생의 시리즈는 연속하므로 student_offsets로 학생 단위 세그먼트도 얻을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        students: np.ndarray,
+        subjects: np.ndarray,
+        student_codes: np.ndarray,
+        subject_codes: np.ndarray,
+        scores: np.ndarray,
+        times: np.ndarray,
+    ):
+        """
+        정렬된 행 배열로 생성 (일반적으로 from_frame 사용)
+
+        Args:
+            students: 학생 ID 범주 (코드 → ID)
+            subjects: 과목 범주 (코드 → 과목)
+            student_codes: 행별 학생 코드 (정렬됨)
+            subject_codes: 행별 과목 코드 (학생 안에서 정렬됨)
+            scores: 행별 성적 (float64)
+            times: 행별 시각 (datetime64[ns])
+        """
+        self.students = students
+        self.subjects = subjects
+        self.student_codes = student_codes
+        self.subject_codes = subject_codes
+        self.scores = scores
+        self.times = times
+
+        # (학생, 과목) 경계
+        n = len(scores)
+        changed = np.flatnonzero(
+            (student_codes[1:] != student_codes[:-1]) | (subject_codes[1:] != subject_codes[:-1])
+        )
+        self.offsets = np.concatenate([[0], changed + 1, [n]]).astype(np.int64)
+        if n == 0:
+            self.offsets = np.zeros(1, dtype=np.int64)
+
+        starts = self.offsets[:-1]
+        self.group_student = student_codes[starts]
+        self.group_subject = subject_codes[starts]
+
+        # 학생 경계 (시리즈 기준)
+        student_changed = np.flatnonzero(self.group_student[1:] != self.group_student[:-1])
+        self.student_group_offsets = np.concatenate(
+            [[0], student_changed + 1, [self.n_groups]]
+        ).astype(np.int64)
+        if self.n_groups == 0:
+            self.student_group_offsets = np.zeros(1, dtype=np.int64)
+
+        self._group_lookup: dict[tuple[Any, Any], int] | None = None
+
+    @classmethod
+    def from_frame(cls, scores_df: pd.DataFrame) -> "TenantHistory":
+        """
+        성적 DataFrame으로 생성
+
+        Args:
+            scores_df: student_id, subject, score, created_at 컬럼
+        """
+        frame = scores_df.dropna(subset=["student_id", "subject", "score"])
+        student_codes, students = pd.factorize(frame["student_id"], sort=True)
+        subject_codes, subjects = pd.factorize(frame["subject"], sort=True)
+        times = pd.to_datetime(frame["created_at"]).to_numpy(dtype="datetime64[ns]")
+
+        order = np.lexsort((times, subject_codes, student_codes))
+        return cls(
+            np.asarray(students),
+            np.asarray(subjects),
+            student_codes[order].astype(np.int32),
+            subject_codes[order].astype(np.int32),
+            frame["score"].to_numpy(dtype=np.float64)[order],
+            times[order],
+        )
+
+    # ============================================
+    # 구조
+    # ============================================
+
+    @property
+    def n_rows(self) -> int:
+        """성적 행 수"""
+        return len(self.scores)
+
+    @property
+    def n_groups(self) -> int:
+        """(학생, 과목) 시리즈 수"""
+        return len(self.offsets) - 1
+
+    @property
+    def student_offsets(self) -> np.ndarray:
+        """학생 단위 행 오프셋"""
+        return self.offsets[self.student_group_offsets]
+
+    def group_index(self, student_id: Any, subject: Any) -> int | None:
+        """(학생, 과목) 시리즈 인덱스 (없으면 None)"""
+        if self._group_lookup is None:
+            self._group_lookup = {
+                (s, subj): g
+                for g, (s, subj) in enumerate(
+                    zip(self.students[self.group_student], self.subjects[self.group_subject])
+                )
+            }
+        return self._group_lookup.get((student_id, subject))
+
+    def series(self, group: int) -> np.ndarray:
+        """시리즈 성적 (복사 없는 뷰)"""
+        return self.scores[self.offsets[group] : self.offsets[group + 1]]
+
+    # ============================================
+    # 시리즈 통계
+    # ============================================
+
+    def count(self) -> np.ndarray:
+        """시리즈별 성적 수"""
+        return segment_counts(self.offsets)
+
+    def mean(self) -> np.ndarray:
+        """시리즈별 평균"""
+        return segment_mean(self.scores, self.offsets)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """시리즈별 표준편차"""
+        return segment_std(self.scores, self.offsets, ddof=ddof)
+
+    def last(self) -> np.ndarray:
+        """시리즈별 최근 성적"""
+        return segment_last(self.scores, self.offsets)
+
+    def ewma(self, decay: float = DEFAULT_EWMA_DECAY) -> np.ndarray:
+        """시리즈별 지수 가중 평균"""
+        return segment_ewma(self.scores, self.offsets, decay=decay)
+
+    def trend(self) -> tuple[np.ndarray, np.ndarray]:
+        """시리즈별 (기울기, R²)"""
+        return segment_trend(self.scores, self.offsets)
+
+    def summary(self) -> pd.DataFrame:
+        """시리즈별 통계 테이블"""
+        slope, r_squared = self.trend()
+        return pd.DataFrame(
+            {
+                "student_id": self.students[self.group_student],
+                "subject": self.subjects[self.group_subject],
+                "count": self.count(),
+                "mean": self.mean(),
+                "std": self.std(),
+                "last": self.last(),
+                "ewma": self.ewma(),
+                "slope": slope,
+                "r_squared": r_squared,
+            }
+        )
+
+    # ============================================
+    # 테넌트 분석
+    # ============================================
+
+    def student_mean(self) -> np.ndarray:
+        """학생별 전체 성적 평균 (행 가중)"""
+        return segment_mean(self.scores, self.student_offsets)
+
+    def subject_percentiles(
+        self,
+        q: tuple[float, ...] = (10, 25, 50, 75, 90),
+        values: np.ndarray | None = None,
+    ) -> pd.DataFrame:
+        """
+        과목 코호트별 시리즈 값 백분위수
+
+        Args:
+            q: 백분위수 목록 (0-100)
+            values: 시리즈별 값 (기본값: 시리즈 평균)
+
+        Returns:
+            과목 인덱스, p{q} 컬럼의 DataFrame
+        """
+        if values is None:
+            values = self.mean()
+
+        order = np.lexsort((values, self.group_subject))
+        sorted_values = values[order]
+        bounds = np.searchsorted(
+            self.group_subject[order], np.arange(len(self.subjects) + 1)
+        )
+
+        table = np.full((len(self.subjects), len(q)), np.nan)
+        for s in range(len(self.subjects)):
+            cohort = sorted_values[bounds[s] : bounds[s + 1]]
+            if len(cohort):
+                table[s] = np.percentile(cohort, q)
+
+        return pd.DataFrame(
+            table,
+            index=pd.Index(self.subjects, name="subject"),
+            columns=[f"p{int(p) if float(p).is_integer() else p}" for p in q],
+        )
+
+    def percentile_rank(self, values: np.ndarray | None = None) -> np.ndarray:
+        """
+        과목 코호트 안에서의 백분위 순위 (0-100, 자신보다 낮은 시리즈 비율)
+
+        Args:
+            values: 시리즈별 값 (기본값: 시리즈 평균)
+        """
+        if values is None:
+            values = self.mean()
+        if self.n_groups == 0:
+            return np.empty(0)
+
+        # 과목 코드를 값 범위보다 큰 간격으로 벌린 합성 키 하나로 정렬
+        span = float(np.nanmax(values) - np.nanmin(values)) + 1.0
+        keys = self.group_subject * span + (values - np.nanmin(values))
+        sorted_keys = np.sort(keys)
+
+        subject_start = np.searchsorted(sorted_keys, np.arange(len(self.subjects)) * span)
+        cohort_size = np.bincount(self.group_subject, minlength=len(self.subjects))
+
+        below = np.searchsorted(sorted_keys, keys, side="left") - subject_start[self.group_subject]
+        return 100.0 * below / cohort_size[self.group_subject]
+
+    def weak_subjects(self, threshold: float = 60.0) -> pd.DataFrame:
+        """
+        학생별 취약 과목 (ContentRecommender와 동일 기준)
+
+        과목 평균이 min(학생 전체 평균, threshold)보다 낮은 과목을 평균 오름차순으로
+        반환합니다.
+
+        Returns:
+            student_id, subject, mean 컬럼의 DataFrame (학생, 평균 순)
+        """
+        means = self.mean()
+        per_student = np.repeat(
+            np.minimum(self.student_mean(), threshold),
+            np.diff(self.student_group_offsets),
+        )
+        weak = np.flatnonzero(means < per_student)
+        weak = weak[np.lexsort((means[weak], self.group_student[weak]))]
+
+        return pd.DataFrame(
+            {
+                "student_id": self.students[self.group_student[weak]],
+                "subject": self.subjects[self.group_subject[weak]],
+                "mean": means[weak],
+            }
+        )
+
+    def predict_simple(self, days_ahead: int = 30) -> pd.DataFrame:
+        """
+        전체 시리즈 가중 평균 계층 일괄 예측
+
+        ScorePredictor의 가중 평균 계층과 같은 식입니다:
+        EWMA + 기울기 × (days_ahead / 30), 신뢰도 = 데이터 양 + 추세 일관성.
+
+        Returns:
+            student_id, subject, current_score, predicted_score, confidence 컬럼
+        """
+        counts = self.count()
+        slope, r_squared = self.trend()
+        predicted = self.ewma() + slope * (days_ahead / 30)
+        confidence = np.minimum(counts / 10, 1.0) * 0.5 + np.minimum(r_squared, 1.0) * 0.5
+
+        return pd.DataFrame(
+            {
+                "student_id": self.students[self.group_student],
+                "subject": self.subjects[self.group_subject],
+                "current_score": self.last(),
+                "predicted_score": np.clip(predicted, 0, 100),
+                "confidence": confidence,
+            }
+        )
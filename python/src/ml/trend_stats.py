@@ -0,0 +1,402 @@
+"""
+성적 트렌드 누적 통계
+
+(학생, 과목)별 충분 통계량(count, Σx, Σy, Σxy, Σx², Σy²)과 EWMA 상태를 유지하여
+기울기, R², 평균, 변동성, 가중 평균을 O(1)로 계산합니다.
+x는 해당 과목 내 성적의 순번(0, 1, 2, ...)입니다.
+
+TrendStatsStore는 누적기를 성적이 기록될 때마다(성적 이벤트) 갱신하고 npz 파일로 유지하므로,
+예측 요청은 성적 이력으로 누적기를 다시 만들지 않고 읽기만 합니다.
+"""
+
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from ..config import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 워커 간 잠금 없이 병합
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_TREND_STATS_PATH = DATA_DIR / "trend_stats.npz"
+
+# 기본 EWMA 감쇠율 (5회 이력에서 기존 exp(linspace(0, 1, n)) 가중치와 동일)
+DEFAULT_EWMA_DECAY = math.exp(-0.25)
+
+# 직렬화 시 상태 벡터 순서
+_STATE_FIELDS = (
+    "count",
+    "sum_x",
+    "sum_y",
+    "sum_xy",
+    "sum_xx",
+    "sum_yy",
+    "ewma_num",
+    "ewma_den",
+    "last",
+    "previous",
+    "decay",
+)
+
+
+class TrendAccumulator:
+    """
+    성적 트렌드 누적기
+
+    성적이 도착할 때마다 update()로 갱신하며,
+    모든 통계는 전체 이력을 다시 읽지 않고 상수 시간에 계산됩니다.
+    """
+
+    __slots__ = _STATE_FIELDS
+
+    def __init__(self, decay: float = DEFAULT_EWMA_DECAY):
+        """
+        Args:
+            decay: EWMA 감쇠율 (0 < decay <= 1, 클수록 과거 가중치가 큼)
+        """
+        if not 0 < decay <= 1:
+            raise ValueError("decay는 (0, 1] 범위여야 합니다.")
+
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.sum_xx = 0.0
+        self.sum_yy = 0.0
+        self.ewma_num = 0.0
+        self.ewma_den = 0.0
+        self.last = math.nan
+        self.previous = math.nan
+        self.decay = decay
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: Iterable[float],
+        decay: float = DEFAULT_EWMA_DECAY,
+    ) -> "TrendAccumulator":
+        """시간순 성적 목록으로 누적기 생성"""
+        acc = cls(decay=decay)
+        acc.extend(scores)
+        return acc
+
+    def update(self, score: float) -> None:
+        """새 성적 반영 (O(1))"""
+        y = float(score)
+        x = float(self.count)
+
+        self.count += 1
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_xx += x * x
+        self.sum_yy += y * y
+
+        self.ewma_num = self.ewma_num * self.decay + y
+        self.ewma_den = self.ewma_den * self.decay + 1.0
+
+        self.previous = self.last
+        self.last = y
+
+    def extend(self, scores: Iterable[float]) -> None:
+        """여러 성적을 순서대로 반영"""
+        for score in scores:
+            self.update(score)
+
+    def copy(self) -> "TrendAccumulator":
+        """독립 사본"""
+        return TrendAccumulator.from_array(self.to_array())
+
+    def agrees_with(self, scores: np.ndarray) -> bool:
+        """
+        최근 성적 목록과 어긋나지 않는지 여부 (이벤트 누락 감지용)
+
+        scores는 시간순 최근 성적 일부일 수 있으므로, 누적 개수가 그보다 적지 않고
+        마지막 두 성적이 같으면 같은 이력으로 봅니다.
+        """
+        n = len(scores)
+        if n == 0 or self.count < n or self.last != scores[-1]:
+            return False
+        return n < 2 or self.previous == scores[-2]
+
+    # ============================================
+    # 통계 (O(1))
+    # ============================================
+
+    @property
+    def mean(self) -> float:
+        """평균"""
+        return self.sum_y / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """표본 분산 (ddof=1, pandas std와 동일 기준)"""
+        if self.count < 2:
+            return 0.0
+        ss = self.sum_yy - self.sum_y * self.sum_y / self.count
+        return max(ss, 0.0) / (self.count - 1)
+
+    @property
+    def volatility(self) -> float:
+        """변동성 (표본 표준편차)"""
+        return math.sqrt(self.variance)
+
+    @property
+    def weighted_average(self) -> float:
+        """최근 성적에 높은 가중치를 둔 지수 가중 평균"""
+        return self.ewma_num / self.ewma_den if self.ewma_den else 0.0
+
+    @property
+    def recent_change(self) -> float:
+        """직전 성적 대비 변화량"""
+        if self.count < 2:
+            return 0.0
+        return self.last - self.previous
+
+    @property
+    def slope(self) -> float:
+        """순번 대비 성적의 최소제곱 기울기"""
+        denom = self.count * self.sum_xx - self.sum_x * self.sum_x
+        if self.count < 2 or denom == 0:
+            return 0.0
+        return (self.count * self.sum_xy - self.sum_x * self.sum_y) / denom
+
+    @property
+    def r_squared(self) -> float:
+        """선형 추세의 결정계수"""
+        if self.count < 2:
+            return 0.0
+        sxx = self.count * self.sum_xx - self.sum_x * self.sum_x
+        syy = self.count * self.sum_yy - self.sum_y * self.sum_y
+        if sxx <= 0 or syy <= 0:
+            return 0.0
+        sxy = self.count * self.sum_xy - self.sum_x * self.sum_y
+        return min(sxy * sxy / (sxx * syy), 1.0)
+
+    # ============================================
+    # 직렬화
+    # ============================================
+
+    def to_array(self) -> np.ndarray:
+        """상태를 float64 벡터로 변환"""
+        return np.array([getattr(self, f) for f in _STATE_FIELDS], dtype=np.float64)
+
+    @classmethod
+    def from_array(cls, state: np.ndarray) -> "TrendAccumulator":
+        """to_array() 결과로부터 복원"""
+        values = dict(zip(_STATE_FIELDS, (float(v) for v in state)))
+        acc = cls(decay=values.pop("decay"))
+        for field, value in values.items():
+            setattr(acc, field, value)
+        acc.count = int(acc.count)
+        return acc
+
+    def to_dict(self) -> dict[str, float | None]:
+        """JSON 직렬화용 딕셔너리 (NaN은 None으로 변환)"""
+        return {
+            f: (None if isinstance(v, float) and math.isnan(v) else v)
+            for f, v in ((f, getattr(self, f)) for f in _STATE_FIELDS)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TrendAccumulator":
+        """to_dict() 결과로부터 복원"""
+        state = np.array(
+            [math.nan if data.get(f) is None else data[f] for f in _STATE_FIELDS],
+            dtype=np.float64,
+        )
+        return cls.from_array(state)
+
+
+
+class TrendStatsStore:
+    """
+    (학생, 과목)별 트렌드 누적기 저장소 (프로세스당 1개)
+
+    성적 이벤트(update)는 성적 이력으로 초기화(seed)한 (학생, 과목)에만 반영합니다.
+    워커마다 마지막 병합 이후의 변경을 기록해 두었다가 sync()가 파일 잠금 안에서 공유 npz의
+    최신 상태에 다시 적용해 저장하므로, 여러 워커가 같은 파일을 써도 서로 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, decay: float = DEFAULT_EWMA_DECAY):
+        self.decay = decay
+        self._lock = threading.Lock()
+        self._accumulators: dict[tuple[str, str], TrendAccumulator] = {}
+        # 마지막 sync 이후 반영한 변경 (sync 때 공유 파일의 최신 상태에 다시 적용)
+        self._pending: list[tuple] = []
+        self._synced_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._accumulators)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._accumulators
+
+    def get(self, student_id: str, subject: str) -> TrendAccumulator | None:
+        """누적기 조회 (O(1), 이후 갱신과 무관한 사본)"""
+        with self._lock:
+            acc = self._accumulators.get((student_id, subject))
+            return acc.copy() if acc is not None else None
+
+    def update(self, student_id: str, subject: str, score: float) -> bool:
+        """
+        새 성적 반영 (O(1))
+
+        Returns:
+            반영 여부 (아직 초기화하지 않은 (학생, 과목)이면 False)
+        """
+        with self._lock:
+            return self._apply(("score", student_id, subject, float(score)))
+
+    def seed(self, student_id: str, subject: str, scores: Iterable[float]) -> TrendAccumulator:
+        """시간순 성적 이력으로 누적기 교체 (처음 보는 과목 또는 이벤트 누락 보정)"""
+        acc = TrendAccumulator.from_scores(scores, decay=self.decay)
+        with self._lock:
+            self._apply(("seeded", student_id, subject, acc.to_array()))
+        return acc.copy()
+
+    def current(self, student_id: str, subject: str, scores: np.ndarray) -> TrendAccumulator:
+        """
+        예측에 쓸 누적기 (저장된 누적기가 최근 성적과 맞으면 그대로, 아니면 다시 초기화)
+
+        Args:
+            student_id: 학생 ID
+            subject: 과목
+            scores: 조회한 시간순 최근 성적
+        """
+        acc = self.get(student_id, subject)
+        if acc is not None and acc.agrees_with(scores):
+            return acc
+        return self.seed(student_id, subject, scores)
+
+    # ============================================
+    # 직렬화 / 병합
+    # ============================================
+
+    def save(self, path: str | Path) -> None:
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        with self._lock:
+            keys = list(self._accumulators)
+            states = (
+                np.vstack([self._accumulators[k].to_array() for k in keys])
+                if keys
+                else np.empty((0, len(_STATE_FIELDS)))
+            )
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                student_ids=np.array([k[0] for k in keys], dtype=str),
+                subjects=np.array([k[1] for k in keys], dtype=str),
+                states=states,
+                decay=np.array(self.decay),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TrendStatsStore":
+        """npz 파일에서 복원"""
+        with np.load(path) as data:
+            store = cls(decay=float(data["decay"]))
+            for student_id, subject, state in zip(
+                data["student_ids"], data["subjects"], data["states"]
+            ):
+                store._accumulators[(str(student_id), str(subject))] = (
+                    TrendAccumulator.from_array(state)
+                )
+        return store
+
+    def sync(self, path: str | Path) -> None:
+        """
+        공유 누적기 파일과 병합
+
+        파일 잠금 안에서 최신 파일을 읽고 마지막 sync 이후 변경을 다시 적용해 저장한 뒤,
+        병합 결과(다른 워커의 변경 포함)를 이 저장소의 상태로 삼습니다.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            pending, self._pending = self._pending, []
+        try:
+            with _file_lock(path):
+                if path.exists():
+                    shared = TrendStatsStore.load(path)
+                else:
+                    shared = TrendStatsStore(self.decay)
+                for op in pending:
+                    shared._apply(op, log=False)
+                if pending:
+                    shared.save(path)
+        except BaseException:
+            with self._lock:
+                self._pending = pending + self._pending
+            raise
+
+        with self._lock:
+            # 병합하는 동안 들어온 변경은 새 상태에도 적용하고 다음 sync까지 보관
+            for op in self._pending:
+                shared._apply(op, log=False)
+            self._accumulators = shared._accumulators
+            self._synced_at = time.monotonic()
+
+    def sync_if_due(self, path: str | Path, min_interval_seconds: float) -> bool:
+        """마지막 sync 후 min_interval_seconds가 지났으면 병합"""
+        if time.monotonic() - self._synced_at < min_interval_seconds:
+            return False
+        self.sync(path)
+        return True
+
+    def _apply(self, op: tuple, log: bool = True) -> bool:
+        """변경 1건 적용 (잠금 안에서 호출, 반영했고 log이면 다음 sync를 위해 기록)"""
+        kind, student_id, subject, value = op
+        key = (student_id, subject)
+        if kind == "seeded":
+            self._accumulators[key] = TrendAccumulator.from_array(value)
+        else:
+            acc = self._accumulators.get(key)
+            if acc is None:
+                return False
+            acc.update(value)
+        if log:
+            self._pending.append(op)
+        return True
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """워커 간 누적기 파일 잠금 (path 옆 .lock 파일)"""
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+@lru_cache()
+def get_trend_stats() -> TrendStatsStore:
+    """
+    서비스용 누적기 저장소 (ML_TREND_STATS_PATH 또는 data/trend_stats.npz)
+
+    Returns:
+        파일이 있으면 복원한 저장소, 없으면 빈 저장소
+    """
+    path = trend_stats_path()
+    if not path.exists():
+        return TrendStatsStore()
+    return TrendStatsStore.load(path)
+
+
+def trend_stats_path() -> Path:
+    """누적기 파일 경로"""
+    return Path(os.getenv("ML_TREND_STATS_PATH", str(DEFAULT_TREND_STATS_PATH)))
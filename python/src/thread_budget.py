@@ -0,0 +1,169 @@
+"""
+CPU 스레드 예산 관리
+
+감지된 코어 수와 워커 수로 워커당 스레드 수를 정하고,
+XGBoost(n_jobs)와 BLAS(OpenBLAS/MKL/OpenMP) 스레드를 그 안으로 제한합니다.
+여러 uvicorn 워커가 각자 모든 코어를 쓰면서 발생하는 과다 구독을 막습니다.
+"""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from threadpoolctl import threadpool_limits
+
+# BLAS/OpenMP 스레드 수를 제어하는 환경 변수 (하위 프로세스에 상속됨)
+BLAS_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# 워커 수를 읽을 환경 변수 (uvicorn/gunicorn 관례)
+WORKER_ENV_VARS = ("ML_WORKERS", "WEB_CONCURRENCY", "UVICORN_WORKERS")
+
+
+def detect_cpu_count() -> int:
+    """
+    사용 가능한 CPU 코어 수 감지
+
+    CPU affinity와 cgroup v2 쿼터(cpu.max)를 모두 반영합니다.
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+
+    cpu_max = Path("/sys/fs/cgroup/cpu.max")
+    try:
+        quota, period = cpu_max.read_text().split()[:2]
+        if quota != "max":
+            cores = min(cores, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cores)
+
+
+def detect_worker_count() -> int:
+    """환경 변수에서 워커 프로세스 수 감지 (기본값 1)"""
+    for name in WORKER_ENV_VARS:
+        value = os.getenv(name)
+        if value and value.isdigit() and int(value) > 0:
+            return int(value)
+    return 1
+
+
+class ThreadBudget:
+    """
+    워커당 CPU 스레드 예산
+
+    XGBoost와 BLAS는 같은 예산을 공유합니다. 요청 스레드 풀(anyio, 약 40개)에서 모델을
+    학습하면 동시 요청 수만큼 예산이 곱해지므로, 모델 연산은 model_concurrency개 스레드의
+    전용 실행기(get_model_executor)에서만 실행하고 작업 하나에는
+    threads_per_worker // model_concurrency개 스레드만 줍니다.
+    """
+
+    def __init__(
+        self,
+        total_cores: int | None = None,
+        workers: int | None = None,
+        threads_per_worker: int | None = None,
+        model_concurrency: int | None = None,
+    ):
+        """
+        Args:
+            total_cores: 전체 코어 수 (None이면 자동 감지)
+            workers: 워커 프로세스 수 (None이면 환경 변수에서 감지)
+            threads_per_worker: 워커당 스레드 수 직접 지정 (ML_THREADS_PER_WORKER)
+            model_concurrency: 동시에 실행할 모델 작업 수 (ML_MODEL_CONCURRENCY, 기본값 1,
+                최대 threads_per_worker)
+        """
+        self.total_cores = total_cores or detect_cpu_count()
+        self.workers = workers or detect_worker_count()
+
+        if threads_per_worker is None:
+            override = os.getenv("ML_THREADS_PER_WORKER", "")
+            threads_per_worker = int(override) if override.isdigit() else None
+
+        self.threads_per_worker = max(
+            1, threads_per_worker or self.total_cores // self.workers
+        )
+
+        if model_concurrency is None:
+            override = os.getenv("ML_MODEL_CONCURRENCY", "")
+            model_concurrency = int(override) if override.isdigit() else None
+
+        self.model_concurrency = min(max(1, model_concurrency or 1), self.threads_per_worker)
+        self._blas_limiter: Any = None
+
+    @property
+    def threads_per_job(self) -> int:
+        """모델 작업 하나의 스레드 수 (동시 작업 전체가 워커 예산 안에 들어가도록)"""
+        return max(1, self.threads_per_worker // self.model_concurrency)
+
+    @property
+    def xgboost_threads(self) -> int:
+        """XGBoost n_jobs/nthread"""
+        return self.threads_per_job
+
+    @property
+    def blas_threads(self) -> int:
+        """BLAS 스레드 수"""
+        return self.threads_per_job
+
+    def xgboost_params(self) -> dict[str, int]:
+        """XGBRegressor 생성 인자"""
+        return {"n_jobs": self.xgboost_threads}
+
+    def apply(self) -> None:
+        """
+        현재 프로세스와 하위 프로세스에 예산 적용
+
+        환경 변수는 이후 생성되는 프로세스에, threadpoolctl은 이미 로드된
+        BLAS/OpenMP 라이브러리에 적용됩니다.
+        """
+        for name in BLAS_THREAD_ENV_VARS:
+            os.environ[name] = str(self.blas_threads)
+
+        self._blas_limiter = threadpool_limits(limits=self.blas_threads)
+
+    def as_dict(self) -> dict[str, int]:
+        """메트릭 노출용 딕셔너리"""
+        return {
+            "total_cores": self.total_cores,
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "model_concurrency": self.model_concurrency,
+            "xgboost_threads": self.xgboost_threads,
+            "blas_threads": self.blas_threads,
+        }
+
+
+@lru_cache()
+def get_thread_budget() -> ThreadBudget:
+    """
+    싱글톤 패턴으로 ThreadBudget 인스턴스 반환
+
+    Returns:
+        ThreadBudget 인스턴스
+    """
+    return ThreadBudget()
+
+
+@lru_cache()
+def get_model_executor() -> ThreadPoolExecutor:
+    """
+    모델 연산 전용 실행기 (프로세스당 1개, 스레드 model_concurrency개)
+
+    XGBoost 학습·배치 추론처럼 스레드 예산을 쓰는 작업은 요청 스레드 풀 대신 여기서
+    실행해야 동시에 실행되는 작업 수가 예산을 넘지 않습니다.
+    """
+    return ThreadPoolExecutor(
+        max_workers=get_thread_budget().model_concurrency, thread_name_prefix="ml-model"
+    )
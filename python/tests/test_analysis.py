@@ -0,0 +1,208 @@
+"""
+학습 데이터 분석 유틸리티 테스트
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis import (
+    PreparedPlans,
+    analyze_learning_patterns,
+    analyze_score_trends,
+    calculate_study_efficiency,
+    predict_weekly_workload,
+)
+
+
+@pytest.fixture
+def plans_df():
+    """연말연초에 걸친 학습 플랜"""
+    return pd.DataFrame(
+        {
+            "scheduled_date": ["2024-12-23", "2024-12-30", "2025-01-02", "2025-01-03", None],
+            "start_time": ["09:00", "09:00", "21:00", "bad", "10:00"],
+            "subject": ["수학", "수학", "영어", "국어", "수학"],
+            "status": ["completed", "pending", "completed", "completed", "pending"],
+            "actual_duration": [50, None, 40, 30, 20],
+        }
+    )
+
+
+class TestPreparedPlans:
+    """PreparedPlans 테스트"""
+
+    def test_derived_columns(self, plans_df):
+        """날짜/요일/ISO 연도-주/시간/범주형 컬럼"""
+        frame = PreparedPlans(plans_df).frame
+
+        assert pd.api.types.is_datetime64_any_dtype(frame["date"])
+        assert frame["day_of_week"].iloc[0] == 0
+        # 2024-12-30은 ISO 2025년 1주차
+        assert frame["year_week"].iloc[:4].tolist() == [202452, 202501, 202501, 202501]
+        assert frame["hour"].iloc[:3].tolist() == [9, 9, 21]
+        assert pd.isna(frame["hour"].iloc[3])
+        assert isinstance(frame["subject"].dtype, pd.CategoricalDtype)
+        assert isinstance(frame["status"].dtype, pd.CategoricalDtype)
+
+    def test_input_not_mutated(self, plans_df):
+        """입력 DataFrame은 그대로"""
+        original = plans_df.copy()
+        plans = PreparedPlans(plans_df)
+        analyze_learning_patterns(plans)
+        analyze_learning_patterns(plans_df)
+        predict_weekly_workload(plans_df, target_date=datetime(2025, 1, 6))
+
+        pd.testing.assert_frame_equal(plans_df, original)
+
+    def test_same_result_as_dataframe(self, plans_df):
+        """DataFrame과 PreparedPlans 입력 결과 동일"""
+        plans = PreparedPlans(plans_df)
+        scores_df = pd.DataFrame({"subject": ["수학", "영어", "국어"], "score": [70, 80, 60]})
+
+        assert analyze_learning_patterns(plans) == analyze_learning_patterns(plans_df)
+        assert calculate_study_efficiency(plans, scores_df) == calculate_study_efficiency(
+            plans_df, scores_df
+        )
+
+    def test_efficiency_ignores_unobserved_subjects(self, plans_df):
+        """범주에만 있고 플랜이 없는 과목은 학습 시간 0분 과목으로 상관관계에 넣지 않음"""
+        scores_df = pd.DataFrame(
+            {"subject": ["수학", "영어", "국어", "과학"], "score": [70, 80, 60, 90]}
+        )
+        with_unused = plans_df.assign(
+            subject=pd.Categorical(plans_df["subject"], categories=["수학", "영어", "국어", "과학"])
+        )
+
+        assert calculate_study_efficiency(with_unused, scores_df) == calculate_study_efficiency(
+            plans_df, scores_df
+        )
+
+    def test_learning_patterns(self, plans_df):
+        """요일/시간대/완료율 (파싱 실패한 시간은 제외)"""
+        analysis = analyze_learning_patterns(PreparedPlans(plans_df))
+
+        assert analysis["daily_distribution"]["counts"] == {0: 2, 3: 1, 4: 1}
+        assert analysis["hourly_distribution"]["peak_hours"][0] == 9
+        assert analysis["completion_rate"] == {"total": 5, "completed": 3, "rate": 60.0}
+        assert analysis["subject_distribution"]["most_studied"] == "수학"
+
+    def test_weekly_workload_iso_year_week(self, plans_df):
+        """ISO 연도-주 단위 주간 플랜 수 (2024-W52: 1건, 2025-W01: 3건)"""
+        prediction = predict_weekly_workload(
+            PreparedPlans(plans_df), target_date=datetime(2025, 1, 6)
+        )
+
+        assert prediction["predicted_plans"] == 2
+        assert prediction["target_week_start"] == "2025-01-06"
+
+    def test_weekly_workload_single_week(self, plans_df):
+        """최근 4주에 한 주만 있으면 표준편차 0"""
+        prediction = predict_weekly_workload(plans_df.iloc[1:4], target_date=datetime(2025, 1, 6))
+
+        assert prediction["predicted_plans"] == 3
+        assert prediction["std"] == 0.0
+        assert prediction["min_expected"] == prediction["max_expected"] == 3
+
+
+class TestFusedAggregation:
+    """결합 키 bincount 집계 테스트 (groupby 결과와 비교)"""
+
+    @pytest.fixture
+    def random_plans(self):
+        rng = np.random.default_rng(0)
+        n = 2000
+        return pd.DataFrame(
+            {
+                "scheduled_date": pd.Timestamp("2024-03-01")
+                + pd.to_timedelta(rng.integers(0, 120, n), unit="D"),
+                "start_time": rng.choice(["07:00", "13:30", "21:00", "25:99", None], n),
+                "subject": rng.choice(["국어", "수학", "영어", None], n),
+                "status": rng.choice(["completed", "pending", "skipped"], n),
+                "actual_duration": np.where(rng.random(n) < 0.3, np.nan, rng.integers(10, 90, n)),
+            }
+        )
+
+    def test_learning_patterns_match_groupby(self, random_plans):
+        """분포·완료율·평균 시간이 groupby/value_counts와 같음"""
+        analysis = analyze_learning_patterns(random_plans)
+
+        days = pd.to_datetime(random_plans["scheduled_date"]).dt.dayofweek.value_counts()
+        hours = pd.to_datetime(
+            random_plans["start_time"], format="%H:%M", errors="coerce"
+        ).dt.hour.dropna().value_counts()
+        subjects = random_plans["subject"].value_counts()
+
+        assert analysis["daily_distribution"]["counts"] == days.sort_index().to_dict()
+        assert analysis["daily_distribution"]["most_active_day"] == days.idxmax()
+        assert sorted(analysis["hourly_distribution"]["peak_hours"]) == [7, 13, 21]
+        assert analysis["subject_distribution"]["counts"] == subjects.to_dict()
+        assert analysis["completion_rate"]["completed"] == (
+            random_plans["status"] == "completed"
+        ).sum()
+        assert analysis["average_duration"]["minutes"] == round(
+            random_plans["actual_duration"].mean(), 1
+        )
+
+    def test_hour_ties_prefer_earlier_hour(self):
+        """시간대 동률은 이른 시간 우선"""
+        plans = pd.DataFrame({"start_time": ["21:00", "09:00", "14:00", "09:00", "21:00"]})
+        analysis = analyze_learning_patterns(plans)
+
+        assert analysis["hourly_distribution"]["peak_hours"] == [9, 21, 14]
+        assert analysis["hourly_distribution"]["low_hours"] == [14, 9, 21]
+
+    def test_subject_ties_follow_value_counts(self):
+        """과목 동률은 value_counts()와 같이 처음 나온 순서 (범주형은 범주 순)"""
+        plans = pd.DataFrame({"subject": ["영어", "수학", "국어", "수학", "영어", None]})
+
+        for frame in (plans, plans.astype({"subject": "category"})):
+            subjects = analyze_learning_patterns(frame)["subject_distribution"]
+            expected = frame["subject"].value_counts()
+            assert list(subjects["counts"].items()) == list(expected.items())
+            assert subjects["most_studied"] == expected.index[0]
+        assert analyze_learning_patterns(plans)["subject_distribution"]["most_studied"] == "영어"
+
+    def test_weak_subjects_keep_nan_mean(self):
+        """평균이 NaN인 과목도 nsmallest처럼 취약 과목 맨 뒤에 포함"""
+        scores = pd.DataFrame(
+            {"subject": ["수학", "영어", "국어", "국어"], "score": [80, np.nan, 70, 90]}
+        )
+        analysis = analyze_score_trends(scores)
+
+        weakest = scores.groupby("subject")["score"].mean().nsmallest(3)
+        assert list(analysis["weak_subjects"]) == weakest.index.tolist() == ["국어", "수학", "영어"]
+        assert np.isnan(analysis["weak_subjects"]["영어"])
+
+    def test_score_trends_match_groupby(self):
+        """과목 평균/표준편차/개수, 등급 분포, 취약 과목이 groupby와 같음"""
+        rng = np.random.default_rng(1)
+        n = 500
+        scores = pd.DataFrame(
+            {
+                "subject": rng.choice(["국어", "수학", "영어", "과학"], n),
+                "score": rng.uniform(30, 100, n).round(),
+                "grade": rng.integers(1, 10, n),
+                "created_at": pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(rng.integers(0, 60, n), unit="D"),
+            }
+        )
+        analysis = analyze_score_trends(scores)
+
+        expected = scores.groupby("subject")["score"].agg(["mean", "std", "count"])
+        for subject, row in expected.iterrows():
+            stats = analysis["subject_averages"][subject]
+            assert stats["mean"] == pytest.approx(row["mean"])
+            assert stats["std"] == pytest.approx(row["std"])
+            assert stats["count"] == row["count"]
+        assert analysis["grade_distribution"] == (
+            scores["grade"].value_counts().sort_index().to_dict()
+        )
+        weakest = scores.groupby("subject")["score"].mean().nsmallest(3)
+        assert list(analysis["weak_subjects"]) == weakest.index.tolist()
+
+        ordered = scores.sort_values("created_at", kind="stable")
+        assert analysis["overall_trend"]["first_score"] == ordered["score"].iloc[0]
+        assert analysis["overall_trend"]["last_score"] == ordered["score"].iloc[-1]
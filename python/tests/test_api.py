@@ -2,6 +2,8 @@
 FastAPI 엔드포인트 테스트
 """
 
+import json
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
@@ -9,6 +11,13 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.api.main import app
+from src.config import ML_CONFIG
+from src.ml.bandit_reranker import BanditReranker
+from src.ml.catalog_index import CatalogRegistry
+from src.ml.cooccurrence import CooccurrenceRegistry
+from src.ml.feature_store import FeatureStore
+from src.ml.pattern_counters import PatternCounterStore
+from src.ml.trend_stats import TrendStatsStore
 
 
 @pytest.fixture
@@ -17,6 +26,19 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def feature_store():
+    """테스트마다 빈 학생 특성 저장소와 트렌드 누적기"""
+    store = FeatureStore(trend_stats=TrendStatsStore())
+    with (
+        patch("src.api.routes.predictions.get_feature_store", return_value=store),
+        patch("src.api.routes.predictions.get_trend_stats", return_value=store.trend_stats),
+        patch("src.api.routes.recommendations.get_feature_store", return_value=store),
+        patch("src.api.routes.analysis.get_feature_store", return_value=store),
+    ):
+        yield store
+
+
 @pytest.fixture
 def mock_db():
     """모의 DB 커넥터"""
@@ -50,9 +72,29 @@ def mock_db():
         }
     )
 
+    mock.get_student_content_links.return_value = pd.DataFrame(
+        {
+            "student_content_id": ["b1", "l2", "v3"],
+            "content_id": ["c1", "c2", "c3"],
+            "tenant_id": ["t1", "t1", "t1"],
+            "content_type": ["book", "lecture", "video"],
+            "is_custom": [False, False, False],
+            "title": [None, None, None],
+            "subject": [None, None, None],
+            "difficulty": [None, None, None],
+        }
+    )
+
     return mock
 
 
+@pytest.fixture
+def catalog_registry(mock_db):
+    """학생 콘텐츠와 같은 속성의 공유 카탈로그"""
+    catalog = mock_db.get_student_contents.return_value
+    return CatalogRegistry(lambda tenant_id, since: catalog)
+
+
 class TestHealthCheck:
     """헬스체크 테스트"""
 
@@ -63,6 +105,14 @@ class TestHealthCheck:
         data = response.json()
         assert data["status"] == "healthy"
 
+    def test_metrics(self, client):
+        """메트릭 스냅샷에 스레드 예산 포함"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["thread_budget"]["threads_per_worker"] >= 1
+        assert "histograms" in data
+
 
 class TestPredictionsAPI:
     """예측 API 테스트"""
@@ -106,6 +156,105 @@ class TestPredictionsAPI:
 
         assert response.status_code == 404
 
+    @patch("src.api.routes.predictions.get_score_cache")
+    @patch("src.api.routes.predictions.get_connector")
+    def test_predict_score_latency_budget(
+        self, mock_get_connector, mock_get_cache, client, mock_db
+    ):
+        """지연 예산 소진 시 저하 응답, 캐시가 있으면 캐시로 응답"""
+        from src.deadline import ResultCache
+
+        mock_get_connector.return_value = mock_db
+        mock_get_cache.return_value = ResultCache()
+        body = {"student_id": "test-student", "subject": "수학", "days_ahead": 30}
+        tight = {"X-Latency-Budget-Ms": "0.000001"}
+
+        degraded = client.post("/api/predictions/score", json=body, headers=tight).json()
+        assert degraded["degraded"] is True
+        assert degraded["served_tier"] == "weighted_average"
+
+        full = client.post("/api/predictions/score", json=body).json()
+        assert full["degraded"] is False
+
+        cached = client.post("/api/predictions/score", json=body, headers=tight).json()
+        assert cached["served_tier"] == "cached"
+        assert cached["predicted_score"] == full["predicted_score"]
+
+    @patch("src.api.routes.predictions.trend_stats_path")
+    @patch("src.api.routes.predictions.get_connector")
+    def test_predict_score_reads_trend_stats(
+        self, mock_get_connector, mock_trend_path, client, mock_db, feature_store, tmp_path
+    ):
+        """예측은 저장된 누적기를 읽고, 성적 이벤트는 초기화한 과목에만 반영"""
+        mock_get_connector.return_value = mock_db
+        trend_stats = feature_store.trend_stats
+        mock_trend_path.return_value = tmp_path / "trend_stats.npz"
+        body = {"student_id": "test-student", "subject": "수학", "days_ahead": 30}
+        event = {"student_id": "test-student", "subject": "수학", "score": 90}
+
+        response = client.post("/api/predictions/score-events", json={"events": [event]})
+        assert response.json() == {"applied": 0, "skipped": 1}
+
+        assert client.post("/api/predictions/score", json=body).status_code == 200
+        assert trend_stats.get("test-student", "수학").count == 3
+
+        response = client.post("/api/predictions/score-events", json={"events": [event]})
+        assert response.json() == {"applied": 1, "skipped": 0}
+        assert trend_stats.get("test-student", "수학").last == 90
+
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    @patch("src.api.routes.predictions.get_connector")
+    def test_predict_and_recommend_share_feature_record(
+        self,
+        mock_get_connector,
+        mock_get_rec_connector,
+        mock_get_registry,
+        client,
+        mock_db,
+        catalog_registry,
+        feature_store,
+    ):
+        """예측과 추천은 같은 학생 기록을 읽고, 성적은 처음 한 번만 조회, 이벤트로 갱신"""
+        mock_get_connector.return_value = mock_db
+        mock_get_rec_connector.return_value = mock_db
+        mock_get_registry.return_value = catalog_registry
+        body = {"student_id": "test-student", "subject": "수학", "days_ahead": 30}
+
+        first = client.post("/api/predictions/score", json=body).json()
+        response = client.post(
+            "/api/recommendations/content", json={"student_id": "test-student", "limit": 3}
+        )
+        assert response.status_code == 200
+        assert mock_db.get_student_scores.call_count == 1
+        version = feature_store.get_version("test-student")
+
+        client.post(
+            "/api/predictions/score-events",
+            json={"events": [{"student_id": "test-student", "subject": "수학", "score": 95}]},
+        )
+        client.post(
+            "/api/analysis/plan-events",
+            json={
+                "events": [
+                    {
+                        "student_id": "test-student",
+                        "event": "created",
+                        "subject": "수학",
+                        "content_id": "c2",
+                        "actual_duration": 30,
+                    }
+                ]
+            },
+        )
+        assert feature_store.get_version("test-student") > version
+        assert "c2" in feature_store.get("test-student").studied_content_ids
+
+        second = client.post("/api/predictions/score", json=body).json()
+        assert mock_db.get_student_scores.call_count == 1
+        assert second["current_score"] == 95
+        assert second["factors"]["study_sessions"] == first["factors"]["study_sessions"] + 1
+
     @patch("src.api.routes.predictions.get_connector")
     def test_predict_workload(self, mock_get_connector, client, mock_db):
         """학습량 예측"""
@@ -141,10 +290,14 @@ class TestPredictionsAPI:
 class TestRecommendationsAPI:
     """추천 API 테스트"""
 
+    @patch("src.api.routes.recommendations.get_catalog_registry")
     @patch("src.api.routes.recommendations.get_connector")
-    def test_recommend_content(self, mock_get_connector, client, mock_db):
-        """콘텐츠 추천"""
+    def test_recommend_content(
+        self, mock_get_connector, mock_get_registry, client, mock_db, catalog_registry
+    ):
+        """콘텐츠 추천 (연결 행 + 공유 카탈로그)"""
         mock_get_connector.return_value = mock_db
+        mock_get_registry.return_value = catalog_registry
 
         response = client.post(
             "/api/recommendations/content",
@@ -160,6 +313,52 @@ class TestRecommendationsAPI:
         assert "recommendations" in data
         assert "weak_subjects" in data
         assert "strategy" in data
+        # 학생 콘텐츠 전체 행은 내려받지 않음
+        mock_db.get_student_contents.assert_not_called()
+        assert {r["content_id"] for r in data["recommendations"]} <= {"c1", "c2", "c3"}
+
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    def test_recommend_content_custom_and_studied_links(
+        self, mock_get_connector, mock_get_registry, client, mock_db, catalog_registry
+    ):
+        """마스터 연결 없는 콘텐츠도 후보, 플랜의 사본 ID는 마스터 ID로 변환해 학습 여부 판정"""
+        mock_get_connector.return_value = mock_db
+        mock_get_registry.return_value = catalog_registry
+        links = mock_db.get_student_content_links.return_value
+        mock_db.get_student_content_links.return_value = pd.concat(
+            [
+                links,
+                pd.DataFrame(
+                    {
+                        "student_content_id": ["x9"],
+                        "content_id": ["x9"],
+                        "tenant_id": ["t1"],
+                        "content_type": ["custom"],
+                        "is_custom": [True],
+                        "title": ["나만의 수학 노트"],
+                        "subject": ["수학"],
+                        "difficulty": ["easy"],
+                    }
+                ),
+            ],
+            ignore_index=True,
+        )
+        mock_db.get_student_plans.return_value = pd.DataFrame(
+            {"content_id": ["b1"], "content_type": ["book"], "subject": ["수학"]}
+        )
+
+        response = client.post(
+            "/api/recommendations/content",
+            json={"student_id": "test-student", "limit": 10},
+        )
+
+        assert response.status_code == 200
+        recommendations = {r["content_id"]: r for r in response.json()["recommendations"]}
+        assert set(recommendations) == {"c1", "c2", "c3", "x9"}
+        assert recommendations["x9"]["title"] == "나만의 수학 노트"
+        assert "신규" not in recommendations["c1"]["reason"]
+        assert "신규" in recommendations["x9"]["reason"]
 
     @patch("src.api.routes.recommendations.get_connector")
     def test_recommend_content_no_data(self, mock_get_connector, client):
@@ -167,7 +366,7 @@ class TestRecommendationsAPI:
         mock_db = MagicMock()
         mock_db.get_student_scores.return_value = pd.DataFrame()
         mock_db.get_student_plans.return_value = pd.DataFrame()
-        mock_db.get_student_contents.return_value = pd.DataFrame()
+        mock_db.get_student_content_links.return_value = pd.DataFrame()
         mock_get_connector.return_value = mock_db
 
         response = client.post(
@@ -179,6 +378,183 @@ class TestRecommendationsAPI:
 
         assert response.status_code == 404
 
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    def test_recommend_content_from_tenant_catalog(
+        self, mock_get_connector, mock_get_registry, client, mock_db
+    ):
+        """tenant_id가 있으면 테넌트 카탈로그에서 추천"""
+        mock_get_connector.return_value = mock_db
+        catalog = pd.DataFrame(
+            {
+                "id": ["m1", "m2", "m3"],
+                "title": ["수학 교재", "수학 강의", "영어 교재"],
+                "subject": ["수학", "수학", "영어"],
+                "content_type": ["book", "lecture", "book"],
+                "difficulty": ["easy", "hard", "medium"],
+            }
+        )
+        mock_get_registry.return_value = CatalogRegistry(lambda tenant_id, since: catalog)
+
+        response = client.post(
+            "/api/recommendations/content",
+            json={"student_id": "test-student", "tenant_id": "t1", "subject": "수학"},
+        )
+
+        assert response.status_code == 200
+        ids = {r["content_id"] for r in response.json()["recommendations"]}
+        assert ids == {"m1", "m2"}
+        mock_db.get_student_contents.assert_not_called()
+
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    def test_recommend_content_batch(self, mock_get_connector, mock_get_registry, client):
+        """반 단위 일괄 추천은 학생별 NDJSON 줄로 스트리밍"""
+        mock_db = MagicMock()
+        mock_db.get_scores_for_students.return_value = pd.DataFrame(
+            {
+                "student_id": ["s1", "s1", "s2"],
+                "subject": ["수학", "영어", "영어"],
+                "score": [40, 90, 55],
+            }
+        )
+        mock_db.get_plans_for_students.return_value = pd.DataFrame(
+            {"student_id": ["s2"], "content_id": ["m3"], "content_type": ["book"]}
+        )
+        mock_get_connector.return_value = mock_db
+        catalog = pd.DataFrame(
+            {
+                "id": ["m1", "m2", "m3"],
+                "title": ["수학 교재", "수학 강의", "영어 교재"],
+                "subject": ["수학", "수학", "영어"],
+                "content_type": ["book", "lecture", "book"],
+                "difficulty": ["easy", "hard", None],
+            }
+        )
+        mock_get_registry.return_value = CatalogRegistry(lambda tenant_id, since: catalog)
+
+        response = client.post(
+            "/api/recommendations/content/batch",
+            json={"tenant_id": "t1", "student_ids": ["s1", "s2", "s3"], "limit": 2},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["student_id"] for line in lines] == ["s1", "s2", "s3"]
+        assert lines[0]["weak_subjects"] == ["수학"]
+        assert len(lines[0]["recommendations"]) == 2
+        assert lines[2]["strategy"] == "exploration"
+        mock_db.get_scores_for_students.assert_called_once()
+
+    @patch("src.api.routes.recommendations.get_cooccurrence_registry")
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    def test_recommend_hybrid(
+        self, mock_get_connector, mock_get_registry, mock_get_cooccurrence, client, mock_db
+    ):
+        """협업 점수 혼합 추천 (테넌트 플랜은 미리 만든 모델에서만 읽음)"""
+        mock_get_connector.return_value = mock_db
+        mock_get_registry.return_value = CatalogRegistry(
+            lambda tenant_id, since: mock_db.get_student_contents.return_value
+        )
+        tenant_plans = pd.DataFrame(
+            {
+                "student_id": ["test-student", "s2", "s2", "s3", "s3"],
+                "content_id": ["c1", "c1", "c3", "c1", "c3"],
+                "id": ["p1", "p2", "p3", "p4", "p5"],
+                "created_at": pd.date_range("2024-01-01", periods=5, freq="D"),
+            }
+        )
+        mock_get_cooccurrence.return_value = CooccurrenceRegistry(
+            lambda tenant_id, after: tenant_plans, spawn=lambda task: task()
+        )
+
+        response = client.post(
+            "/api/recommendations/hybrid",
+            json={"student_id": "test-student", "tenant_id": "t1", "collaborative_weight": 0.9},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["collaborative_source"] == "cooccurrence"
+        assert data["collaborative_weight"] == 0.9
+        top = data["recommendations"][0]
+        assert top["content_id"] == "c3"
+        assert "비슷한 학생들이 함께 학습" in top["reason"]
+        mock_db.get_tenant_plan_contents.assert_not_called()
+
+        # 협업 신호가 없는 학생은 규칙 기반만
+        response = client.post(
+            "/api/recommendations/hybrid",
+            json={"student_id": "new-student", "tenant_id": "t1"},
+        )
+        assert response.json()["collaborative_source"] is None
+        assert response.json()["collaborative_weight"] == 0.0
+
+    @patch.dict(ML_CONFIG["content_recommendation"]["bandit"], {"enabled": True})
+    @patch("src.api.routes.recommendations.get_bandit_reranker")
+    @patch("src.api.routes.recommendations.get_catalog_registry")
+    @patch("src.api.routes.recommendations.get_connector")
+    def test_recommendation_feedback(
+        self,
+        mock_get_connector,
+        mock_get_registry,
+        mock_get_bandit,
+        client,
+        mock_db,
+        catalog_registry,
+    ):
+        """추천 응답의 feedback_token으로 완료 피드백 반영 (발급 학생·콘텐츠, 한 번만)"""
+        mock_get_connector.return_value = mock_db
+        mock_get_registry.return_value = catalog_registry
+        mock_get_bandit.return_value = BanditReranker(seed=0)
+
+        response = client.post(
+            "/api/recommendations/content",
+            json={"student_id": "test-student", "limit": 2},
+        )
+        recommendations = response.json()["recommendations"]
+        assert 0 < len(recommendations) <= 2
+        feedback = {
+            "student_id": "test-student",
+            "content_id": recommendations[0]["content_id"],
+            "feedback_token": recommendations[0]["feedback_token"],
+            "completed": True,
+        }
+
+        response = client.post(
+            "/api/recommendations/feedback", json={**feedback, "student_id": "other-student"}
+        )
+        assert response.status_code == 404
+
+        response = client.post("/api/recommendations/feedback", json=feedback)
+        assert response.status_code == 200
+        # 사전 Beta(1, 1) + 완료 1회
+        assert response.json()["completion_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+        response = client.post("/api/recommendations/feedback", json=feedback)
+        assert response.status_code == 409
+
+        response = client.post(
+            "/api/recommendations/feedback",
+            json={**feedback, "feedback_token": "unknown:weak|-|-"},
+        )
+        assert response.status_code == 404
+
+    def test_feedback_disabled_by_default(self, client):
+        """재정렬이 꺼져 있으면(기본값) 피드백을 받지 않음"""
+        response = client.post(
+            "/api/recommendations/feedback",
+            json={
+                "student_id": "test-student",
+                "content_id": "c1",
+                "feedback_token": "token",
+                "completed": True,
+            },
+        )
+        assert response.status_code == 404
+
     @patch("src.api.routes.recommendations.get_connector")
     def test_recommend_study_plan(self, mock_get_connector, client, mock_db):
         """학습 플랜 추천"""
@@ -218,7 +594,7 @@ class TestAnalysisAPI:
 
     @patch("src.api.routes.analysis.get_connector")
     def test_get_learning_patterns(self, mock_get_connector, client, mock_db):
-        """학습 패턴 분석"""
+        """학습 패턴 분석 (기본 90일 플랜 조회)"""
         mock_get_connector.return_value = mock_db
 
         response = client.get("/api/analysis/learning-patterns/test-student?days=30")
@@ -227,6 +603,77 @@ class TestAnalysisAPI:
         data = response.json()
         assert data["student_id"] == "test-student"
 
+        client.get("/api/analysis/learning-patterns/test-student")
+        start_date = mock_db.get_student_plans.call_args.kwargs["start_date"]
+        expected = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+        assert start_date == expected
+
+    @patch("src.api.routes.analysis.pattern_counters_path")
+    @patch("src.api.routes.analysis.get_pattern_counters")
+    @patch("src.api.routes.analysis.get_connector")
+    def test_learning_patterns_from_counters(
+        self,
+        mock_get_connector,
+        mock_get_counters,
+        mock_counters_path,
+        client,
+        mock_db,
+        tmp_path,
+    ):
+        """all_time=true면 누적 카운터로 응답 (처음 조회 때만 플랜 조회), 이벤트 즉시 반영"""
+        mock_get_connector.return_value = mock_db
+        counters = PatternCounterStore()
+        mock_get_counters.return_value = counters
+        mock_counters_path.return_value = tmp_path / "counters.npz"
+        url = "/api/analysis/learning-patterns/test-student?all_time=true"
+
+        # 초기화 전 학생의 이벤트는 건너뜀
+        response = client.post(
+            "/api/analysis/plan-events",
+            json={"events": [{"student_id": "test-student", "event": "created"}]},
+        )
+        assert response.json() == {"applied": 0, "skipped": 1}
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.json()["completion_rate"]["total"] == 2
+        assert mock_db.get_student_plans.call_count == 1
+
+        response = client.post(
+            "/api/analysis/plan-events",
+            json={
+                "events": [
+                    {
+                        "student_id": "test-student",
+                        "event": "created",
+                        "scheduled_date": "2024-01-03",
+                        "start_time": "19:00",
+                        "subject": "수학",
+                        "status": "completed",
+                    },
+                    {
+                        "student_id": "test-student",
+                        "event": "completed",
+                        "previous_status": "completed",
+                        "actual_duration": 30,
+                    },
+                ]
+            },
+        )
+        assert response.json() == {"applied": 1, "skipped": 1}
+
+        response = client.post(
+            "/api/analysis/plan-events",
+            json={"events": [{"student_id": "test-student", "event": "completed"}]},
+        )
+        assert response.status_code == 422
+
+        data = client.get(url).json()
+        assert data["completion_rate"] == {"total": 3, "completed": 1, "rate": 33.33}
+        assert data["subject_distribution"]["counts"] == {"수학": 2, "영어": 1}
+        assert data["hourly_distribution"]["peak_hours"] == [19]
+        assert mock_db.get_student_plans.call_count == 1
+
     @patch("src.api.routes.analysis.get_connector")
     def test_get_score_trends(self, mock_get_connector, client, mock_db):
         """성적 트렌드 분석"""
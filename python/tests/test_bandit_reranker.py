@@ -0,0 +1,144 @@
+"""
+톰슨 샘플링 재정렬기 테스트
+"""
+
+import sqlite3
+
+import pytest
+
+from src.ml.bandit_reranker import (
+    BanditReranker,
+    FeedbackTokenError,
+    FeedbackTokenReused,
+    arm_of,
+)
+
+
+def _recommendations():
+    """규칙 점수 내림차순 후보"""
+    return [
+        {"content_id": "c1", "subject": "수학", "difficulty": "hard", "content_type": "book",
+         "relevance_score": 80.0},
+        {"content_id": "c2", "subject": "영어", "difficulty": "easy", "content_type": "lecture",
+         "relevance_score": 75.0},
+        {"content_id": "c3", "subject": "국어", "difficulty": None, "content_type": "book",
+         "relevance_score": 70.0},
+    ]
+
+
+class TestBanditReranker:
+    """BanditReranker 테스트"""
+
+    def test_arm_of(self):
+        """팔 키 (취약 과목 여부|난이도|유형, 결측은 -)"""
+        recs = _recommendations()
+        assert arm_of(recs[0], ["수학"]) == "weak|hard|book"
+        assert arm_of(recs[2], ["수학"]) == "other|-|book"
+
+    def test_rerank_attaches_tokens(self):
+        """상위 limit개만 반환하고 항목마다 서명 토큰 부여"""
+        reranker = BanditReranker(seed=0)
+        reranked = reranker.rerank(_recommendations(), "weak_focus", ["수학"], 2, "s1")
+
+        assert len(reranked) == 2
+        tokens = [r["feedback_token"] for r in reranked]
+        assert len(set(tokens)) == 2
+        scores = [r["relevance_score"] for r in reranked]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_weight_zero_keeps_rule_order(self):
+        """weight=0이면 규칙 점수 순서 그대로"""
+        reranker = BanditReranker(weight=0.0, seed=0)
+        reranked = reranker.rerank(_recommendations(), "balanced", [], 3, "s1")
+        assert [r["content_id"] for r in reranked] == ["c1", "c2", "c3"]
+
+    def test_update_is_per_arm(self):
+        """피드백은 해당 (구간, 팔)의 α/β만 1 증가"""
+        reranker = BanditReranker(seed=0)
+        token = reranker.issue_token("balanced:other|easy|lecture", "s1", "c2")
+
+        assert reranker.update(token, "s1", "c2", completed=True) == (2.0, 1.0)
+        second = reranker.issue_token("balanced:other|easy|lecture", "s1", "c2")
+        assert reranker.update(second, "s1", "c2", completed=False) == (2.0, 2.0)
+        assert reranker.posterior_mean("balanced:other|easy|lecture") == pytest.approx(0.5)
+        assert reranker.posterior_mean("weak_focus:other|easy|lecture") is None
+
+    def test_token_is_bound_and_single_use(self):
+        """토큰은 발급한 학생·콘텐츠로만, 유효 기간 안에 한 번만 반영"""
+        now = [1_000_000.0]
+        reranker = BanditReranker(seed=0, token_ttl_seconds=100, clock=lambda: now[0])
+        token = reranker.issue_token("balanced:other|-|book", "s1", "c3")
+
+        with pytest.raises(FeedbackTokenError):
+            reranker.update(token, "s2", "c3", completed=True)
+        with pytest.raises(FeedbackTokenError):
+            reranker.update(token, "s1", "c1", completed=True)
+        with pytest.raises(FeedbackTokenError):
+            reranker.update(token[:-1] + ("0" if token[-1] != "0" else "1"), "s1", "c3", True)
+        with pytest.raises(FeedbackTokenError):
+            BanditReranker(seed=0).update(token, "s1", "c3", completed=True)
+
+        reranker.update(token, "s1", "c3", completed=True)
+        with pytest.raises(FeedbackTokenReused):
+            reranker.update(token, "s1", "c3", completed=True)
+
+        expired = reranker.issue_token("balanced:other|-|book", "s1", "c3")
+        now[0] += 101
+        with pytest.raises(FeedbackTokenError):
+            reranker.update(expired, "s1", "c3", completed=True)
+
+    def test_state_is_shared_between_workers(self, tmp_path):
+        """같은 상태 DB와 서명 키를 쓰면 다른 워커·재시작 후에도 사후분포와 사용 기록 유지"""
+        path = tmp_path / "bandit_state.sqlite3"
+        worker_a = BanditReranker(seed=0, state_path=path, secret=b"k")
+        worker_b = BanditReranker(seed=1, state_path=path, secret=b"k")
+        token = worker_a.issue_token("balanced:other|-|book", "s1", "c3")
+
+        assert worker_b.update(token, "s1", "c3", completed=True) == (2.0, 1.0)
+        with pytest.raises(FeedbackTokenReused):
+            worker_a.update(token, "s1", "c3", completed=True)
+        assert worker_a.posterior_mean("balanced:other|-|book") == pytest.approx(2 / 3)
+
+        restarted = BanditReranker(seed=2, state_path=path, secret=b"k")
+        assert restarted.posterior_mean("balanced:other|-|book") == pytest.approx(2 / 3)
+
+    def test_update_writes_one_arm_and_prunes_expired_nonces(self, tmp_path):
+        """피드백마다 팔 한 행과 nonce 한 행만 쓰고, 만료 nonce는 조금씩 정리"""
+        path = tmp_path / "bandit_state.sqlite3"
+        now = [1_000_000.0]
+        reranker = BanditReranker(
+            seed=0, state_path=path, secret=b"k", token_ttl_seconds=100, clock=lambda: now[0]
+        )
+        for i in range(40):
+            token = reranker.issue_token(f"balanced:arm{i % 4}", "s1", "c1")
+            reranker.update(token, "s1", "c1", completed=True)
+
+        with sqlite3.connect(path) as db:
+            assert db.execute("SELECT COUNT(*) FROM posteriors").fetchone() == (4,)
+            assert db.execute("SELECT COUNT(*) FROM spent").fetchone() == (40,)
+
+        now[0] += 101
+        token = reranker.issue_token("balanced:arm0", "s1", "c1")
+        assert reranker.update(token, "s1", "c1", completed=False) == (11.0, 2.0)
+
+        with sqlite3.connect(path) as db:
+            assert db.execute("SELECT COUNT(*) FROM spent").fetchone() == (40 - 16 + 1,)
+
+    def test_learns_from_completions(self):
+        """완료율이 높은 팔이 점수 차이를 넘어 상위로 올라옴"""
+        reranker = BanditReranker(weight=0.5, seed=0)
+        recs = _recommendations()
+        feedback = [
+            ("c3", "balanced:other|-|book", True),
+            ("c1", "balanced:other|hard|book", False),
+            ("c2", "balanced:other|easy|lecture", False),
+        ]
+        for _ in range(50):
+            for content_id, key, completed in feedback:
+                token = reranker.issue_token(key, "s1", content_id)
+                reranker.update(token, "s1", content_id, completed)
+
+        # 다른 구간의 사후분포는 영향 없음
+        assert reranker.posterior_mean("weak_focus:other|-|book") is None
+        tops = [reranker.rerank(recs, "balanced", [], 1, "s1")[0]["content_id"] for _ in range(20)]
+        assert tops.count("c3") == 20
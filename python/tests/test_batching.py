@@ -0,0 +1,153 @@
+"""
+MicroBatcher / ScorePredictor 배치 예측 테스트
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.metrics import MetricsRegistry
+from src.ml.batching import MicroBatcher
+from src.ml.score_predictor import ScorePredictor
+
+
+def _scores_frame(rng, n, subject="수학"):
+    return pd.DataFrame(
+        {
+            "subject": [subject] * n,
+            "score": np.round(rng.uniform(40, 95, size=n)),
+            "created_at": pd.date_range("2024-01-01", periods=n, freq="W"),
+        }
+    )
+
+
+class TestMicroBatcher:
+    """MicroBatcher 테스트"""
+
+    async def test_concurrent_requests_share_batch(self):
+        """동시 요청이 한 배치로 처리되고 순서대로 결과 반환"""
+        calls = []
+
+        def batch_fn(items):
+            calls.append(list(items))
+            return [x * 2 for x in items]
+
+        metrics = MetricsRegistry()
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=20, metrics=metrics)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        await batcher.close()
+
+        assert results == [0, 2, 4, 6, 8]
+        assert len(calls) == 1
+        snapshot = metrics.snapshot()["histograms"]
+        assert snapshot["batch.batch_size"]["sum"] == 5
+        assert snapshot["batch.wait_ms"]["count"] == 5
+
+    async def test_max_batch_size(self):
+        """배치 크기 상한"""
+        sizes = []
+
+        def batch_fn(items):
+            sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher(
+            batch_fn, max_batch_size=3, max_wait_ms=20, metrics=MetricsRegistry()
+        )
+        await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        await batcher.close()
+
+        assert max(sizes) <= 3
+        assert sum(sizes) == 7
+
+    async def test_exception_propagates(self):
+        """배치 함수 오류는 모든 대기 요청에 전달"""
+
+        def batch_fn(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(batch_fn, max_wait_ms=5, metrics=MetricsRegistry())
+        with pytest.raises(ValueError):
+            await batcher.submit(1)
+        await batcher.close()
+
+    async def test_batch_fn_runs_off_event_loop(self):
+        """배치 함수는 이벤트 루프 스레드가 아닌 실행기에서 실행"""
+        threads = []
+
+        def batch_fn(items):
+            threads.append(threading.get_ident())
+            return items
+
+        batcher = MicroBatcher(batch_fn, max_wait_ms=5, metrics=MetricsRegistry())
+        assert await batcher.submit(1) == 1
+        await batcher.close()
+
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_batch_fn_runs_on_given_executor(self):
+        """executor를 주면 그 실행기의 스레드에서만 배치 처리"""
+        names = []
+
+        def batch_fn(items):
+            names.append(threading.current_thread().name)
+            return items
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="model") as executor:
+            batcher = MicroBatcher(
+                batch_fn, max_wait_ms=5, metrics=MetricsRegistry(), executor=executor
+            )
+            await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+            await batcher.close()
+
+        assert names and all(name.startswith("model") for name in names)
+
+
+class TestPredictMany:
+    """ScorePredictor.predict_many 테스트"""
+
+    def test_matches_individual_predict(self):
+        """일괄 예측 결과가 개별 예측과 동일"""
+        rng = np.random.default_rng(11)
+        predictor = ScorePredictor()
+        requests = [
+            (_scores_frame(rng, n), None, "수학", 30) for n in (2, 5, 12, 15, 22)
+        ]
+
+        batched = predictor.predict_many(requests)
+        individual = [
+            predictor.predict(df, None, subject, days) for df, _, subject, days in requests
+        ]
+
+        for b, i in zip(batched, individual):
+            assert b["model_tier"] == i["model_tier"]
+            assert b["predicted_score"] == pytest.approx(i["predicted_score"])
+            assert b["confidence"] == pytest.approx(i["confidence"])
+
+    def test_batchable_excludes_xgboost(self):
+        """XGBoost 계층 요청은 배치 대상에서 제외"""
+        predictor = ScorePredictor()
+        assert predictor.batchable(2)
+        assert predictor.batchable(15)
+        assert not predictor.batchable(40)
+
+    def test_ridge_batch_matches_single(self):
+        """패딩된 배치 릿지 풀이가 단건 풀이와 일치"""
+        rng = np.random.default_rng(5)
+        X_list = [rng.normal(size=(m, 5)) for m in (6, 9, 14)]
+        y_list = [rng.normal(size=len(X)) for X in X_list]
+        x_next = [rng.normal(size=5) for _ in X_list]
+
+        predicted, r_squared = ScorePredictor._ridge_fit_predict_batch(
+            X_list, y_list, x_next, alpha=1.0
+        )
+
+        for b in range(3):
+            single, r2 = ScorePredictor._ridge_fit_predict(X_list[b], y_list[b], x_next[b], 1.0)
+            assert predicted[b] == pytest.approx(single)
+            assert r_squared[b] == pytest.approx(r2)
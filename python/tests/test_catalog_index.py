@@ -0,0 +1,299 @@
+"""
+테넌트 카탈로그 인덱스 테스트
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.catalog_index import (
+    CatalogIndex,
+    CatalogRegistry,
+    _table_bitset_count,
+    bitset_count,
+    bitset_positions,
+    empty_bitset,
+    set_bits,
+)
+from src.ml.content_recommender import ContentRecommender
+
+
+@pytest.fixture
+def contents():
+    """과목/난이도/유형이 섞인 콘텐츠 5개"""
+    return pd.DataFrame(
+        {
+            "id": ["c1", "c2", "c3", "c4", "c5"],
+            "title": ["수학 기초", "영어 문법", "과학 개념", "수학 심화", "영어 독해"],
+            "subject": ["수학", "영어", "과학", "수학", "영어"],
+            "content_type": ["book", "lecture", "video", "book", "lecture"],
+            "difficulty": ["easy", "medium", "easy", "hard", None],
+            "updated_at": pd.date_range("2024-01-01", periods=5, freq="D"),
+        }
+    )
+
+
+class TestBitset:
+    """비트셋 연산 테스트"""
+
+    def test_set_and_clear(self):
+        """비트 켜기/끄기 후 위치 복원"""
+        bits = empty_bitset(20)
+        set_bits(bits, np.array([0, 3, 9, 19]))
+        set_bits(bits, np.array([3]), on=False)
+
+        assert list(bitset_positions(bits, 20)) == [0, 9, 19]
+
+    def test_count_table_fallback(self):
+        """numpy 1.26용 테이블 비트 수가 bitset_count와 같음"""
+        rng = np.random.default_rng(0)
+        bits = rng.integers(0, 256, size=1000, dtype=np.uint8)
+
+        expected = int(np.unpackbits(bits).sum())
+        assert bitset_count(bits) == expected
+        assert _table_bitset_count(bits) == expected
+
+
+class TestCatalogIndex:
+    """CatalogIndex 단위 테스트"""
+
+    def test_filters_are_intersections(self, contents):
+        """속성 간 AND, 값 목록은 OR"""
+        index = CatalogIndex.build(contents)
+
+        assert list(index.select(subject="수학")) == [0, 3]
+        assert list(index.select(subject="수학", difficulty="easy")) == [0]
+        assert list(index.select(difficulty=["easy", "hard"])) == [0, 2, 3]
+        assert list(index.select(subject="국어")) == []
+        assert index.count() == 5
+
+    def test_unknown_attribute(self, contents):
+        """인덱스에 없는 속성 필터"""
+        with pytest.raises(KeyError):
+            CatalogIndex.build(contents).select(publisher="A")
+
+    def test_incremental_upsert(self, contents):
+        """수정은 위치를 유지하고 비트만 이동, 신규는 뒤에 추가"""
+        index = CatalogIndex.build(contents)
+        version = index.version
+
+        index.upsert(
+            pd.DataFrame(
+                {
+                    "id": ["c2", "c6"],
+                    "title": ["수학 문법?", "국어 문학"],
+                    "subject": ["수학", "국어"],
+                    "updated_at": pd.to_datetime(["2024-02-01", "2024-02-02"]),
+                }
+            )
+        )
+
+        assert index.version > version
+        assert list(index.select(subject="수학")) == [0, 1, 3]
+        assert list(index.select(subject="영어")) == [4]
+        assert list(index.select(subject="국어")) == [5]
+        # 난이도는 요청에 없었으므로 그대로
+        assert list(index.select(difficulty="medium")) == [1]
+        assert index.frame["title"].iloc[1] == "수학 문법?"
+        assert index.watermark == pd.Timestamp("2024-02-02")
+
+    def test_remove(self, contents):
+        """삭제된 콘텐츠는 필터/개수에서 제외"""
+        index = CatalogIndex.build(contents)
+
+        assert index.remove(["c1", "missing"]) == 1
+        assert "c1" not in index
+        assert len(index) == 4
+        assert list(index.select(subject="수학")) == [3]
+        assert index.facets("subject") == {"영어": 2, "과학": 1, "수학": 1}
+
+        # 다시 추가하면 같은 위치로 복귀
+        index.upsert(contents.iloc[[0]])
+        assert list(index.select(subject="수학")) == [0, 3]
+
+    def test_growth_beyond_capacity(self):
+        """초기 용량을 넘는 증분 추가"""
+        index = CatalogIndex()
+        for start in range(0, 3000, 500):
+            index.upsert(
+                pd.DataFrame(
+                    {
+                        "id": [f"c{i}" for i in range(start, start + 500)],
+                        "subject": ["수학" if i % 3 == 0 else "영어" for i in range(500)],
+                    }
+                )
+            )
+
+        assert len(index) == 3000
+        assert index.count(subject="수학") == 1002
+        assert index.frame["subject"].dtype == "category"
+
+    def test_recommend_matches_dataframe_path(self, contents):
+        """카탈로그 경로와 DataFrame 경로의 추천 결과 동일"""
+        recommender = ContentRecommender()
+        scores = pd.DataFrame({"subject": ["수학", "영어"], "score": [50, 80]})
+        plans = pd.DataFrame({"content_id": ["c1"], "content_type": ["book"]})
+        index = CatalogIndex.build(contents)
+
+        for subject in (None, "수학"):
+            expected = recommender.recommend(scores, contents, plans, subject=subject)
+            result = recommender.recommend(scores, None, plans, subject=subject, catalog=index)
+            assert result["recommendations"] == expected["recommendations"]
+
+
+class TestStudentOverlay:
+    """학생 연결 행 + 공유 카탈로그 조인 테스트"""
+
+    def test_overlay_resolves_positions(self, contents):
+        """카탈로그 위치로 변환, 중복/미존재/삭제 콘텐츠 제외"""
+        index = CatalogIndex.build(contents)
+        index.remove(["c5"])
+        links = pd.DataFrame(
+            {
+                "content_id": ["c4", "c1", "c4", "zz", "c5"],
+                "progress": [0.5, None, 0.9, 0.1, 0.2],
+                "is_studied": [True, False, False, False, False],
+            }
+        )
+
+        overlay = index.overlay(links)
+
+        assert list(overlay.positions) == [3, 0]
+        assert list(overlay.studied) == [True, False]
+        assert overlay.progress[0] == 0.5
+        assert overlay.n_unresolved == 2
+
+    def test_recommend_matches_student_rows(self, contents):
+        """연결 행 경로와 학생별 전체 행 경로의 추천 결과 동일"""
+        recommender = ContentRecommender()
+        scores = pd.DataFrame({"subject": ["수학", "영어"], "score": [50, 80]})
+        plans = pd.DataFrame({"content_id": ["c4"], "content_type": ["book"]})
+        index = CatalogIndex.build(contents)
+        owned = ["c4", "c2", "c1"]
+        overlay = index.overlay(pd.DataFrame({"content_id": owned}))
+        student_rows = contents.set_index("id").loc[owned].reset_index()
+
+        for subject in (None, "수학"):
+            expected = recommender.recommend(scores, student_rows, plans, subject=subject)
+            result = recommender.recommend(
+                scores, None, plans, subject=subject, catalog=index, overlay=overlay
+            )
+            assert result["recommendations"] == expected["recommendations"]
+
+    def test_overlay_studied_flag_lowers_novelty(self, contents):
+        """연결 행의 학습 완료 표시는 신규 가중치를 없앰"""
+        recommender = ContentRecommender()
+        index = CatalogIndex.build(contents)
+        links = pd.DataFrame({"content_id": ["c1", "c3"], "is_studied": [True, False]})
+
+        result = recommender.recommend(
+            pd.DataFrame(), None, None, catalog=index, overlay=index.overlay(links)
+        )
+        scores = {r["content_id"]: r["relevance_score"] for r in result["recommendations"]}
+
+        # c1, c3 모두 easy/비취약/신규 유형 → 학습 완료 여부만 다름
+        assert scores["c3"] - scores["c1"] == 10
+
+
+class TestCatalogRegistry:
+    """CatalogRegistry 갱신 주기 테스트"""
+
+    def test_incremental_and_full_refresh(self, contents):
+        """주기마다 watermark 이후 변경분만 조회, 전체 주기에는 재구성"""
+        now = [0.0]
+        calls = []
+
+        def fetch(tenant_id, since):
+            calls.append(since)
+            if since is None:
+                return contents
+            return contents[contents["updated_at"] > since]
+
+        registry = CatalogRegistry(
+            fetch, refresh_interval_seconds=10, full_refresh_seconds=100, clock=lambda: now[0]
+        )
+
+        index = registry.get("t1")
+        assert registry.get("t1") is index
+        assert calls == [None]
+
+        now[0] = 15
+        registry.get("t1")
+        assert calls[-1] == contents["updated_at"].max()
+
+        now[0] = 120
+        assert registry.get("t1") is not index
+        assert calls[-1] is None
+
+    def test_fetch_runs_outside_lock(self, contents):
+        """한 테넌트 조회가 막혀 있어도 다른 테넌트와 기존 인덱스 조회는 진행"""
+        now = [0.0]
+        release = threading.Event()
+        started = threading.Event()
+
+        def fetch(tenant_id, since):
+            if tenant_id == "slow" or since is not None:
+                started.set()
+                assert release.wait(5)
+            return contents if since is None else contents.iloc[:0]
+
+        registry = CatalogRegistry(
+            fetch, refresh_interval_seconds=10, full_refresh_seconds=100, clock=lambda: now[0]
+        )
+        index = registry.get("t1")
+
+        slow = threading.Thread(target=registry.get, args=("slow",))
+        slow.start()
+        assert started.wait(5)
+        assert len(registry.get("t2")) == len(contents)
+
+        # t1 증분 갱신이 진행 중이면 다른 요청은 기존 인덱스로 응답
+        now[0] = 15
+        started.clear()
+        refresh = threading.Thread(target=registry.get, args=("t1",))
+        refresh.start()
+        assert started.wait(5)
+        assert registry.get("t1") is index
+
+        release.set()
+        slow.join(5)
+        refresh.join(5)
+        assert "slow" in registry
+
+    def test_incremental_refresh_swaps_copy(self, contents):
+        """증분 변경은 사본에 반영하고 교체하므로 기존 인덱스의 frame/select는 그대로"""
+        now = [0.0]
+        changes = [contents.iloc[:0]]
+
+        def fetch(tenant_id, since):
+            return contents if since is None else changes[0]
+
+        registry = CatalogRegistry(
+            fetch, refresh_interval_seconds=10, full_refresh_seconds=100, clock=lambda: now[0]
+        )
+        index = registry.get("t1")
+        frame = index.frame
+
+        now[0] = 15
+        assert registry.get("t1") is index  # 변경이 없으면 복사하지 않음
+
+        now[0] = 30
+        changes[0] = pd.DataFrame(
+            {
+                "id": ["c1", "c6"],
+                "title": ["수학 기초", "과학 실험"],
+                "subject": ["과학", "과학"],
+                "content_type": ["book", "video"],
+                "difficulty": ["easy", "easy"],
+                "updated_at": pd.to_datetime(["2024-02-01", "2024-02-01"]),
+            }
+        )
+        refreshed = registry.get("t1")
+
+        assert refreshed is not index
+        assert index.frame is frame and len(index) == 5
+        assert index.select(subject="과학").tolist() == [2]
+        assert refreshed.select(subject="과학").tolist() == [0, 2, 5]
+        assert registry.get("t1") is refreshed
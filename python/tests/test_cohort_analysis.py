@@ -0,0 +1,151 @@
+"""
+테넌트 코호트 분석 테스트
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.analysis import (
+    analyze_learning_patterns,
+    analyze_score_trends,
+    calculate_study_efficiency,
+    predict_weekly_workload,
+)
+from src.cohort_analysis import (
+    analyze_cohort,
+    analyze_cohort_learning_patterns,
+    analyze_cohort_score_trends,
+    analyze_cohort_study_efficiency,
+    predict_cohort_weekly_workload,
+)
+from src.evaluation.data_sources import SyntheticDataSource
+
+
+@pytest.fixture(scope="module")
+def tenant():
+    """합성 테넌트 플랜/성적 (플랜 날짜는 DB 응답처럼 문자열)"""
+    source = SyntheticDataSource(n_students=60, seed=11)
+    plans = source.get_plans()
+    target = plans["scheduled_date"].max().to_pydatetime()
+    plans["scheduled_date"] = plans["scheduled_date"].dt.strftime("%Y-%m-%d")
+    return plans, source.get_scores(), target
+
+
+def _assert_same(actual, expected, abs_tol: float | None = None):
+    """중첩 dict 비교 (키 순서 포함, 실수는 근사·NaN끼리 같음)"""
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key in expected:
+            _assert_same(actual[key], expected[key], abs_tol)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, abs=abs_tol, nan_ok=True)
+    else:
+        assert actual == expected
+
+
+class TestCohortAnalysis:
+    """코호트 분석 테스트 (학생 단위 함수 결과와 비교)"""
+
+    def test_matches_per_student_functions(self, tenant):
+        """모든 학생의 결과 딕셔너리가 학생별 함수 호출 결과와 같음"""
+        plans, scores, target = tenant
+        results = analyze_cohort(plans, scores, target_date=target)
+        plans_by_student = dict(tuple(plans.groupby("student_id")))
+        scores_by_student = dict(tuple(scores.groupby("student_id")))
+
+        assert len(results["learning_patterns"]) == len(plans_by_student)
+        for student_id, group in plans_by_student.items():
+            _assert_same(results["learning_patterns"][student_id], analyze_learning_patterns(group))
+            _assert_same(results["workload"][student_id], predict_weekly_workload(group, target))
+        for student_id, group in scores_by_student.items():
+            _assert_same(results["score_trends"][student_id], analyze_score_trends(group))
+
+        # 상관계수/p값은 scipy.stats.pearsonr와 반올림 자리 차이까지 허용
+        for student_id, actual in results["efficiency"].items():
+            expected = calculate_study_efficiency(
+                plans_by_student.get(student_id, plans.iloc[:0]),
+                scores_by_student.get(student_id, scores.iloc[:0]),
+            )
+            _assert_same(actual, expected, abs_tol=1e-3)
+
+    def test_table_columns(self, tenant):
+        """학생당 한 행, 분포는 열로 펼침"""
+        plans, _, _ = tenant
+        table = analyze_cohort_learning_patterns(plans).table
+
+        assert table.index.name == "student_id"
+        assert table.index.is_monotonic_increasing
+        assert (table[[f"day_{d}" for d in range(7)]].sum(axis=1) == table["total"]).all()
+        assert {"most_active_day", "peak_hour", "most_studied", "subject_수학"} <= set(table)
+
+    def test_ties_and_nan_means_per_student(self):
+        """과목 동률 순서와 NaN 평균 취약 과목이 학생 단위 함수와 같음"""
+        plans = pd.DataFrame(
+            {
+                "student_id": ["s1", "s2", "s1", "s2", "s1", "s2"],
+                "subject": ["영어", "국어", "수학", "수학", "영어", "국어"],
+            }
+        )
+        scores = pd.DataFrame(
+            {"student_id": ["s1", "s1", "s1"], "subject": ["수학", "영어", "국어"]}
+        ).assign(score=[80, None, 70])
+
+        for frame in (plans, plans.astype({"subject": "category"})):
+            patterns = analyze_cohort_learning_patterns(frame)
+            for student_id, group in frame.groupby("student_id"):
+                expected = analyze_learning_patterns(group)
+                actual = patterns[student_id]["subject_distribution"]
+                assert list(actual["counts"]) == list(expected["subject_distribution"]["counts"])
+                assert patterns.table.loc[student_id, "most_studied"] == (
+                    expected["subject_distribution"]["most_studied"]
+                )
+        assert analyze_cohort_learning_patterns(plans).table["most_studied"].tolist() == [
+            "영어",
+            "국어",
+        ]
+
+        weak = analyze_cohort_score_trends(scores)["s1"]["weak_subjects"]
+        assert list(weak) == list(analyze_score_trends(scores)["weak_subjects"])
+        assert list(weak) == ["국어", "수학", "영어"]
+
+    def test_missing_data_per_student(self):
+        """날짜가 없는 학생은 NA, 성적이 없는 학생은 효율성 오류, 한 주뿐이면 표준편차 0"""
+        plans = pd.DataFrame(
+            {
+                "student_id": ["s1", "s1", "s1", "s2"],
+                "scheduled_date": ["2025-01-06", "2025-01-07", "2025-01-08", None],
+                "start_time": ["09:00", "10:00", "09:00", "bad"],
+                "subject": ["수학", "영어", "국어", "수학"],
+                "actual_duration": [30, 40, 50, 20],
+            }
+        )
+        scores = pd.DataFrame(
+            {
+                "student_id": ["s1", "s1", "s1", "s3"],
+                "subject": ["수학", "영어", "국어", "수학"],
+                "score": [70, 80, 90, 60],
+            }
+        )
+
+        patterns = analyze_cohort_learning_patterns(plans)
+        assert pd.isna(patterns.table.loc["s2", "most_active_day"])
+        assert patterns["s2"] == analyze_learning_patterns(plans[plans["student_id"] == "s2"])
+        with pytest.raises(KeyError):
+            patterns["missing"]
+
+        efficiency = analyze_cohort_study_efficiency(plans, scores)
+        assert list(efficiency) == ["s1", "s2", "s3"]
+        assert efficiency["s1"]["study_score_correlation"]["correlation"] == 1.0
+        assert efficiency["s2"] == efficiency["s3"] == {"error": "데이터가 부족합니다."}
+
+        workload = predict_cohort_weekly_workload(plans, target_date=datetime(2025, 1, 13))
+        assert workload["s1"] == {
+            "predicted_plans": 3,
+            "std": 0.0,
+            "min_expected": 3,
+            "max_expected": 3,
+            "target_week_start": "2025-01-13",
+        }
+        assert workload["s2"] == {"error": "날짜 데이터가 없습니다."}
@@ -0,0 +1,217 @@
+"""
+코호트 사전 분포 테스트
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.cohort_priors import (
+    NO_SCORE_BUCKET,
+    CohortPriorTable,
+    _load_priors,
+    get_cohort_priors,
+    priors_path,
+    score_bucket,
+)
+from src.ml.score_predictor import TIER_COHORT_PRIOR, ScorePredictor
+
+
+@pytest.fixture
+def students():
+    """학년/전공이 다른 학생 4명"""
+    return pd.DataFrame(
+        {
+            "id": ["a", "b", "c", "d"],
+            "grade": [1, 1, 2, 2],
+            "target_major": ["공학", "공학", "의예", None],
+        }
+    )
+
+
+@pytest.fixture
+def scores():
+    """학생별 수학 성적 시리즈"""
+    rows = []
+    series = {
+        "a": [50, 55, 60],
+        "b": [52, 58],
+        "c": [80, 85, 90],
+        "d": [70],
+    }
+    for student_id, values in series.items():
+        for i, score in enumerate(values):
+            rows.append(
+                {
+                    "student_id": student_id,
+                    "subject": "수학",
+                    "score": score,
+                    "created_at": pd.Timestamp("2024-01-01") + pd.Timedelta(days=30 * i),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+class TestCohortPriorTable:
+    """CohortPriorTable 단위 테스트"""
+
+    def test_score_bucket(self):
+        """점수 구간 변환"""
+        assert score_bucket(None) == NO_SCORE_BUCKET
+        assert score_bucket(0) == 0
+        assert score_bucket(55) == 5
+        assert score_bucket(100) == 9
+
+    def test_build_exact_cells(self, students, scores):
+        """표본 기준을 넘는 칸은 해당 코호트의 다음 성적 평균"""
+        table = CohortPriorTable.build(students, scores, min_count=1)
+
+        # 1학년 공학: 첫 성적 50, 52
+        expected, _, count = table.lookup(1, "공학", "수학", None)
+        assert expected == pytest.approx(51.0)
+        assert count == 2
+
+        # 1학년 공학, 직전 50점대 → 다음 55, 60, 58
+        expected, _, count = table.lookup(1, "공학", "수학", 55)
+        assert expected == pytest.approx(np.mean([55, 60, 58]))
+        assert count == 3
+
+    def test_sparse_cells_back_off(self, students, scores):
+        """표본이 부족하면 상위 코호트 값 사용"""
+        table = CohortPriorTable.build(students, scores, min_count=3)
+
+        # 2학년 의예 첫 성적(1개) → 2학년 전체(80, 70: 2개) → 과목 전체 구간(4개)
+        expected, _, count = table.lookup(2, "의예", "수학", None)
+        assert expected == pytest.approx(np.mean([50, 52, 80, 70]))
+        assert count == 4
+
+    def test_unknown_profile_uses_all_cohort(self, students, scores):
+        """모르는 학년/전공은 전체 코호트로 조회"""
+        table = CohortPriorTable.build(students, scores, min_count=1)
+
+        assert table.lookup(9, "미정", "수학", None) == table.lookup(None, None, "수학", None)
+        assert table.lookup(1, "공학", "물리", 50) is None
+
+    def test_save_load_roundtrip(self, students, scores, tmp_path):
+        """npz 저장 후 동일 조회 결과"""
+        table = CohortPriorTable.build(students, scores, min_count=1)
+        path = tmp_path / "priors.npz"
+        table.save(path)
+        loaded = CohortPriorTable.load(path)
+
+        assert loaded.grades == table.grades
+        assert loaded.lookup(1, "공학", "수학", 55) == table.lookup(1, "공학", "수학", 55)
+
+
+class TestTenantPriors:
+    """테넌트별 사전 분포 파일 테스트"""
+
+    def test_priors_are_per_tenant_and_reloaded(self, students, scores, tmp_path, monkeypatch):
+        """ML_COHORT_PRIORS_DIR/<tenant_id>.npz를 따로 읽고, 파일이 바뀌면 다시 읽음"""
+        monkeypatch.setenv("ML_COHORT_PRIORS_DIR", str(tmp_path))
+        path = priors_path("t1")
+        CohortPriorTable.build(students, scores, min_count=1).save(path)
+
+        try:
+            assert path == tmp_path / "t1.npz"
+            first = get_cohort_priors("t1")
+            assert get_cohort_priors("t1") is first
+            assert get_cohort_priors("t2") is None
+
+            CohortPriorTable.build(students[:2], scores, min_count=1).save(path)
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+            reloaded = get_cohort_priors("t1")
+            assert reloaded is not first
+            assert reloaded.grades != first.grades
+        finally:
+            _load_priors.cache_clear()
+
+        with pytest.raises(ValueError):
+            priors_path("../t1")
+
+    def test_predictor_uses_profile_tenant(self, students, scores):
+        """고정 테이블이 없으면 프로필의 tenant_id로 사전 분포 조회"""
+        table = CohortPriorTable.build(students, scores, min_count=1)
+        predictor = ScorePredictor(tenant_priors={"t1": table}.get)
+        profile = {"grade": 1, "target_major": "공학"}
+
+        with_tenant = predictor.predict(
+            pd.DataFrame(), None, "수학", student_profile={**profile, "tenant_id": "t1"}
+        )
+        other_tenant = predictor.predict(
+            pd.DataFrame(), None, "수학", student_profile={**profile, "tenant_id": "t2"}
+        )
+
+        assert with_tenant["model_tier"] == TIER_COHORT_PRIOR
+        assert other_tenant["model_tier"] is None
+
+
+class TestColdStartPrediction:
+    """ScorePredictor 콜드 스타트 예측 테스트"""
+
+    @pytest.fixture
+    def predictor(self, students, scores):
+        table = CohortPriorTable.build(students, scores, min_count=1)
+        return ScorePredictor(cohort_priors=table, prior_strength=3.0)
+
+    def test_no_scores_uses_prior(self, predictor):
+        """성적이 없으면 사전 기댓값 그대로"""
+        result = predictor.predict(
+            pd.DataFrame(),
+            None,
+            "수학",
+            student_profile={"grade": 1, "target_major": "공학"},
+        )
+
+        assert result["model_tier"] == TIER_COHORT_PRIOR
+        assert result["current_score"] is None
+        assert result["predicted_score"] == pytest.approx(51.0)
+        assert 0 < result["confidence"] <= 0.5
+
+    def test_blends_observed_scores(self, predictor):
+        """관측 성적과 사전 기댓값을 n / (n + k)로 혼합"""
+        scores_df = pd.DataFrame(
+            {
+                "subject": ["수학", "수학"],
+                "score": [54.0, 56.0],
+                "created_at": pd.date_range("2024-01-01", periods=2, freq="MS"),
+            }
+        )
+        result = predictor.predict(
+            scores_df,
+            None,
+            "수학",
+            student_profile={"grade": 1, "target_major": "공학"},
+        )
+
+        prior = np.mean([55, 60, 58])
+        expected = 0.4 * 55.0 + 0.6 * prior
+        assert result["predicted_score"] == pytest.approx(round(expected, 1))
+        assert result["current_score"] == 56.0
+        assert result["factors"]["observed_scores"] == 2
+
+    def test_without_profile_is_insufficient(self, predictor):
+        """프로필이 없으면 기존 데이터 부족 응답"""
+        result = predictor.predict(pd.DataFrame(), None, "수학")
+        assert result["model_tier"] is None
+        assert result["confidence"] == 0
+
+    def test_predict_many_accepts_profile(self, predictor):
+        """배치 요청의 다섯 번째 요소로 프로필 전달"""
+        profile = {"grade": 1, "target_major": "공학"}
+        [with_profile, without_profile] = predictor.predict_many(
+            [
+                (pd.DataFrame(), None, "수학", 30, profile),
+                (pd.DataFrame(), None, "수학", 30),
+            ]
+        )
+
+        assert with_profile["model_tier"] == TIER_COHORT_PRIOR
+        assert without_profile["model_tier"] is None
+
+    def test_cold_start_without_priors_returns_none(self):
+        """사전 분포 없이 직접 호출해도 예외 대신 None"""
+        predictor = ScorePredictor()
+        assert predictor._cold_start_predict(np.array([50.0]), "수학", {"grade": 1}) is None
@@ -0,0 +1,79 @@
+"""
+XGBoost 트리 컴파일 테스트
+"""
+
+import numpy as np
+import pytest
+
+from src.ml.compiled_trees import CompiledForest
+
+xgboost = pytest.importorskip("xgboost")
+
+
+@pytest.fixture(scope="module")
+def model():
+    """결측값이 섞인 데이터로 학습한 회귀 모델"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 5)).astype(np.float32)
+    y = 70 + 5 * X[:, 0] - 3 * X[:, 1] * X[:, 2] + rng.normal(0, 1, size=500)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    return xgboost.XGBRegressor(
+        n_estimators=60, max_depth=4, learning_rate=0.1, random_state=42, n_jobs=1
+    ).fit(X, y)
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(3000, 5)).astype(np.float32)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    return X
+
+
+class TestCompiledForest:
+    """CompiledForest 단위 테스트"""
+
+    def test_bit_exact_batch(self, model, rows):
+        """배치 예측이 XGBoost predict와 비트 단위로 동일"""
+        forest = CompiledForest.from_model(model)
+
+        np.testing.assert_array_equal(forest.predict(rows), model.predict(rows))
+        np.testing.assert_array_equal(
+            forest.predict(rows, chunk_rows=256), model.predict(rows)
+        )
+
+    def test_single_row(self, model, rows):
+        """1차원 입력은 한 행으로 처리"""
+        forest = CompiledForest.from_model(model)
+        assert forest.predict(rows[0])[0] == model.predict(rows[:1])[0]
+
+    def test_structure(self, model):
+        """트리 수와 깊이"""
+        forest = CompiledForest.from_model(model)
+        assert forest.n_trees == 60
+        assert 1 <= forest.max_depth <= 4
+        assert (forest.left[forest.roots] >= 0).any()
+
+    def test_save_load_roundtrip(self, model, rows, tmp_path):
+        """npz 저장 후 동일 예측"""
+        forest = CompiledForest.from_model(model)
+        path = tmp_path / "trees.npz"
+        forest.save(path)
+
+        np.testing.assert_array_equal(CompiledForest.load(path).predict(rows), forest.predict(rows))
+
+    def test_wrong_feature_count(self, model):
+        """특성 수가 다르면 ValueError"""
+        forest = CompiledForest.from_model(model)
+        with pytest.raises(ValueError):
+            forest.predict(np.zeros((2, 3), dtype=np.float32))
+
+    def test_unsupported_objective(self):
+        """비항등 목적 함수는 ValueError"""
+        rng = np.random.default_rng(2)
+        X = rng.normal(size=(100, 3))
+        y = (X[:, 0] > 0).astype(int)
+        classifier = xgboost.XGBClassifier(n_estimators=5, max_depth=2, n_jobs=1).fit(X, y)
+
+        with pytest.raises(ValueError):
+            CompiledForest.from_model(classifier)
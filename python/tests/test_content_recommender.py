@@ -2,10 +2,15 @@
 ContentRecommender 테스트
 """
 
+import numpy as np
 import pandas as pd
 import pytest
 
+from src.deadline import Deadline
+from src.ml.catalog_index import CatalogIndex
 from src.ml.content_recommender import ContentRecommender, CollaborativeRecommender
+from src.ml.feature_store import FeatureStore, StudentFeatures
+from src.ml.interaction_matrix import InteractionMatrix
 
 
 class TestContentRecommender:
@@ -104,6 +109,31 @@ class TestContentRecommender:
         for rec in result["recommendations"]:
             assert rec.get("reason") is None
 
+    def test_recommend_skips_reasons_when_out_of_budget(
+        self, recommender, sample_scores, sample_contents, sample_plans
+    ):
+        """데드라인이 부족하면 추천 이유 생략"""
+        full = recommender.recommend(
+            scores_df=sample_scores,
+            contents_df=sample_contents,
+            plans_df=sample_plans,
+            deadline=Deadline(None),
+        )
+        degraded = recommender.recommend(
+            scores_df=sample_scores,
+            contents_df=sample_contents,
+            plans_df=sample_plans,
+            deadline=Deadline(0),
+        )
+
+        assert full["served_tier"] == "full"
+        assert degraded["served_tier"] == "no_reasons"
+        assert [r["content_id"] for r in degraded["recommendations"]] == [
+            r["content_id"] for r in full["recommendations"]
+        ]
+        for rec in degraded["recommendations"]:
+            assert rec.get("reason") is None
+
     def test_identify_weak_subjects(self, recommender, sample_scores):
         """취약 과목 식별"""
         weak = recommender._identify_weak_subjects(sample_scores)
@@ -151,49 +181,64 @@ class TestContentRecommender:
         strategy = recommender._determine_strategy([], empty_df)
         assert strategy == "exploration"
 
-    def test_filter_contents(self, recommender, sample_contents):
-        """콘텐츠 필터링"""
-        filtered = recommender._filter_contents(
-            contents_df=sample_contents,
-            subject="수학",
-            studied_ids={"c1"},
-        )
-
-        assert len(filtered) == 2  # 수학 콘텐츠 2개
-        assert filtered[filtered["id"] == "c1"]["is_studied"].iloc[0] == True
-        assert filtered[filtered["id"] == "c4"]["is_studied"].iloc[0] == False
+    def test_candidate_positions_and_studied_mask(self, recommender, sample_contents):
+        """과목 필터 후보 위치와 학습 여부"""
+        positions = recommender._candidate_positions(sample_contents, "수학")
+        studied = recommender._studied_mask(sample_contents, positions, {"c1"})
 
-    def test_score_contents(self, recommender, sample_contents, sample_scores):
-        """콘텐츠 점수 계산"""
-        weak_subjects = ["수학", "과학"]
-        contents = sample_contents.copy()
-        contents["is_studied"] = False
+        assert list(sample_contents["id"].iloc[positions]) == ["c1", "c4"]  # 수학 콘텐츠 2개
+        assert list(studied) == [True, False]
 
-        scored = recommender._score_contents(
-            contents=contents,
+    def _kernel(self, recommender, contents, weak_subjects, avg_score, recent_types, studied):
+        return recommender._relevance_kernel(
+            contents,
+            np.arange(len(contents)),
             weak_subjects=weak_subjects,
-            scores_df=sample_scores,
-            plans_df=None,
+            avg_score=avg_score,
+            recent_types=recent_types,
+            is_studied=np.asarray(studied, dtype=bool),
+        )
+
+    def test_relevance_kernel_weak_subjects(self, recommender, sample_contents, sample_scores):
+        """취약 과목 콘텐츠가 더 높은 점수 (0-100 범위)"""
+        relevance = self._kernel(
+            recommender,
+            sample_contents,
+            ["수학", "과학"],
+            sample_scores["score"].mean(),
+            set(),
+            [False] * len(sample_contents),
         )
 
-        assert "relevance_score" in scored.columns
-        # 취약 과목 콘텐츠가 더 높은 점수
-        math_scores = scored[scored["subject"] == "수학"]["relevance_score"].values
-        english_scores = scored[scored["subject"] == "영어"]["relevance_score"].values
-        assert math_scores.mean() > english_scores.mean()
-
-    def test_calculate_difficulty_score(self, recommender, sample_contents, sample_scores):
-        """난이도 점수 계산"""
-        scores = recommender._calculate_difficulty_score(sample_contents, sample_scores)
-        assert len(scores) == len(sample_contents)
-        assert all(0 <= s <= 30 for s in scores)
-
-    def test_calculate_diversity_score(self, recommender, sample_contents, sample_plans):
-        """다양성 점수 계산"""
-        scores = recommender._calculate_diversity_score(sample_contents, sample_plans)
-        assert len(scores) == len(sample_contents)
-        # book과 lecture는 이미 학습함 → 낮은 점수
-        # video는 새로운 유형 → 높은 점수
+        assert all(0 <= r <= 100 for r in relevance)
+        subjects = sample_contents["subject"].to_numpy()
+        assert relevance[subjects == "수학"].mean() > relevance[subjects == "영어"].mean()
+
+    def test_relevance_kernel_difficulty(self, recommender, sample_contents):
+        """학생 수준에 맞는 난이도가 더 높은 점수 (최대 30점 차이)"""
+        kwargs = dict(weak_subjects=[], recent_types=set(), studied=[False] * 5)
+        low = self._kernel(recommender, sample_contents, avg_score=40.0, **kwargs)
+        high = self._kernel(recommender, sample_contents, avg_score=90.0, **kwargs)
+
+        easy = (sample_contents["difficulty"] == "easy").to_numpy()
+        hard = (sample_contents["difficulty"] == "hard").to_numpy()
+        assert low[easy].min() > low[hard].max()
+        assert high[hard].min() > high[easy].max()
+        assert np.all(np.abs(low - high) <= 30)
+
+    def test_relevance_kernel_diversity_and_novelty(
+        self, recommender, sample_contents, sample_plans
+    ):
+        """최근 학습하지 않은 유형과 신규 콘텐츠에 가중치"""
+        recent_types = recommender._get_studied_content_types(sample_plans)
+        fresh = self._kernel(recommender, sample_contents, [], None, set(), [False] * 5)
+        recent = self._kernel(recommender, sample_contents, [], None, recent_types, [False] * 5)
+        studied = self._kernel(recommender, sample_contents, [], None, set(), [True] * 5)
+
+        # book과 lecture는 이미 학습함 → 낮은 점수, video는 새로운 유형
+        is_video = (sample_contents["content_type"] == "video").to_numpy()
+        np.testing.assert_array_equal(fresh - recent, np.where(is_video, 0.0, 10.0))
+        np.testing.assert_array_equal(fresh - studied, np.full(5, 10.0))
 
     def test_generate_reason(self, recommender):
         """추천 이유 생성"""
@@ -213,6 +258,21 @@ class TestContentRecommender:
         assert "난이도" in reason
         assert "신규" in reason
 
+    def test_generate_reason_skips_missing_categories(self, recommender):
+        """범주형 결측(NaN) 난이도·유형은 이유에 넣지 않음"""
+        frame = pd.DataFrame(
+            {
+                "subject": ["영어"],
+                "difficulty": pd.Categorical.from_codes([-1], categories=["easy"]),
+                "content_type": pd.Categorical.from_codes([-1], categories=["book"]),
+                "is_studied": [True],
+            }
+        )
+
+        reason = recommender._generate_reason(frame.iloc[0], ["수학"])
+
+        assert reason == "맞춤 추천"
+
     def test_empty_contents(self, recommender, sample_scores):
         """빈 콘텐츠 데이터"""
         empty_contents = pd.DataFrame()
@@ -226,6 +286,122 @@ class TestContentRecommender:
         assert result["recommendations"] == []
         assert result["strategy"] == "no_content"
 
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_kernel_matches_nlargest(self, recommender, sample_scores, seed):
+        """동점이 많은 카탈로그에서도 nlargest(keep='first')와 같은 순서"""
+        rng = np.random.default_rng(seed)
+        n = 500
+        contents = pd.DataFrame(
+            {
+                "id": [f"c{i}" for i in range(n)],
+                "subject": rng.choice(["수학", "영어", "과학", None], n),
+                "content_type": rng.choice(["book", "lecture", "video", None], n),
+                "difficulty": rng.choice(["easy", "medium", "hard", "unknown"], n),
+            }
+        )
+        plans = pd.DataFrame(
+            {"content_id": [f"c{i}" for i in range(0, n, 7)], "content_type": "book"}
+        )
+
+        result = recommender.recommend(
+            scores_df=sample_scores, contents_df=contents, plans_df=plans, limit=20
+        )
+
+        positions = np.arange(n)
+        expected = contents.assign(
+            relevance_score=recommender._relevance_kernel(
+                contents,
+                positions,
+                weak_subjects=result["weak_subjects"],
+                avg_score=sample_scores["score"].mean(),
+                recent_types=recommender._get_studied_content_types(plans),
+                is_studied=recommender._studied_mask(
+                    contents, positions, recommender._get_studied_content_ids(plans)
+                ),
+            )
+        ).nlargest(20, "relevance_score")
+
+        assert [r["content_id"] for r in result["recommendations"]] == list(expected["id"])
+        assert [r["relevance_score"] for r in result["recommendations"]] == list(
+            expected["relevance_score"]
+        )
+
+    def test_categorical_columns(self, recommender, sample_scores, sample_contents):
+        """범주형 컬럼은 기존 코드를 그대로 사용"""
+        categorical = sample_contents.astype(
+            {"subject": "category", "content_type": "category", "difficulty": "category"}
+        )
+
+        plain = recommender.recommend(sample_scores, sample_contents, None, limit=5)
+        result = recommender.recommend(sample_scores, categorical, None, limit=5)
+
+        assert result["recommendations"] == plain["recommendations"]
+
+
+class TestRecommendMany:
+    """ContentRecommender.recommend_many 테스트"""
+
+    @pytest.fixture
+    def catalog(self):
+        """결측값과 동점이 많은 카탈로그"""
+        rng = np.random.default_rng(7)
+        n = 400
+        return CatalogIndex.build(
+            pd.DataFrame(
+                {
+                    "id": [f"c{i}" for i in range(n)],
+                    "title": [f"콘텐츠 {i}" for i in range(n)],
+                    "subject": rng.choice(["수학", "영어", "과학", None], n),
+                    "content_type": rng.choice(["book", "lecture", "video"], n),
+                    "difficulty": rng.choice(["easy", "medium", "hard", None], n),
+                }
+            )
+        )
+
+    @pytest.fixture
+    def students(self):
+        """성적/학습 이력이 다른 학생 30명 (이력 없는 학생 포함)"""
+        rng = np.random.default_rng(11)
+        ids = [f"s{i}" for i in range(30)]
+        scores = pd.DataFrame(
+            {
+                "student_id": rng.choice(ids[:25], 300),
+                "subject": rng.choice(["수학", "영어", "과학"], 300),
+                "score": rng.integers(30, 100, 300),
+            }
+        )
+        plans = pd.DataFrame(
+            {
+                "student_id": rng.choice(ids[:20], 200),
+                "content_id": rng.choice([f"c{i}" for i in range(0, 400, 3)], 200),
+                "content_type": rng.choice(["book", "lecture"], 200),
+            }
+        )
+        store = FeatureStore.build(scores, plans)
+        return [store.get(s) or StudentFeatures(s) for s in ids]
+
+    @pytest.mark.parametrize("subject", [None, "수학", "국어"])
+    def test_matches_single_recommend(self, catalog, students, subject):
+        """학생별 결과가 recommend(student_features=...)와 동일"""
+        recommender = ContentRecommender()
+
+        results = list(
+            recommender.recommend_many(students, catalog, subject=subject, limit=8, chunk_size=7)
+        )
+
+        assert [r["student_id"] for r in results] == [s.student_id for s in students]
+        for features, result in zip(students, results):
+            expected = recommender.recommend(
+                pd.DataFrame(),
+                None,
+                None,
+                subject=subject,
+                limit=8,
+                student_features=features,
+                catalog=catalog,
+            )
+            assert {k: v for k, v in result.items() if k != "student_id"} == expected
+
 
 class TestCollaborativeRecommender:
     """CollaborativeRecommender 테스트"""
@@ -262,6 +438,42 @@ class TestCollaborativeRecommender:
         similar = recommender.find_similar_students("unknown", all_plans)
         assert similar == []
 
+    def test_find_similar_students_matches_set_jaccard(self):
+        """희소 행렬 경로와 집합 기반 Jaccard 순위 동일 (동점은 학생 ID 순)"""
+        rng = np.random.default_rng(0)
+        plans = pd.DataFrame(
+            {
+                "student_id": [f"s{i:02d}" for i in rng.integers(0, 40, 600)],
+                "content_id": [f"c{i}" for i in rng.integers(0, 30, 600)],
+            }
+        )
+        sets = plans.groupby("student_id")["content_id"].apply(set)
+        recommender = CollaborativeRecommender(min_common_items=4)
+        matrix = InteractionMatrix.from_plans(plans)
+
+        for student_id, target in sets.items():
+            expected = sorted(
+                (
+                    (-len(target & other) / len(target | other), other_id)
+                    for other_id, other in sets.items()
+                    if other_id != student_id and len(target & other) >= 4
+                ),
+            )[:10]
+            assert recommender.find_similar_students(student_id, matrix=matrix) == [
+                other_id for _, other_id in expected
+            ]
+
+    def test_find_similar_students_min_common_mask(self, all_plans):
+        """공통 콘텐츠 수 미달 학생은 제외, 중복 플랜은 한 번만 계산"""
+        plans = pd.concat([all_plans, all_plans.iloc[[0, 0]]], ignore_index=True)
+
+        assert CollaborativeRecommender(min_common_items=3).find_similar_students(
+            "s1", plans
+        ) == []
+        assert CollaborativeRecommender(min_common_items=0).find_similar_students(
+            "s1", plans
+        ) == ["s2", "s3"]
+
     def test_get_collaborative_recommendations(self, recommender, all_plans):
         """협업 필터링 추천"""
         contents_df = pd.DataFrame(
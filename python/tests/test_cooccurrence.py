@@ -0,0 +1,295 @@
+"""
+콘텐츠 동시 학습 모델 테스트
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.catalog_index import CatalogIndex
+from src.ml.content_recommender import CollaborativeRecommender, ContentRecommender
+from src.ml.cooccurrence import CooccurrenceRegistry, ItemCooccurrence
+from src.ml.hybrid_recommender import HybridRecommender
+
+
+@pytest.fixture
+def plans():
+    """학생 4명의 플랜 (중복 플랜 포함)"""
+    return pd.DataFrame(
+        {
+            "student_id": ["s1", "s1", "s2", "s2", "s2", "s3", "s3", "s4", "s4"],
+            "content_id": ["c1", "c2", "c1", "c2", "c3", "c1", "c3", "c4", "c4"],
+        }
+    )
+
+
+class TestItemCooccurrence:
+    """ItemCooccurrence 단위 테스트"""
+
+    def test_scores_are_row_sums(self, plans):
+        """학습한 콘텐츠 행의 합 = 함께 학습한 학생 수 합, 자기 자신과 중복 플랜 제외"""
+        model = ItemCooccurrence.from_plans(plans)
+
+        # s1은 c1, c2 학습: c3은 c1과 2명(s2, s3), c2와 1명(s2)
+        assert model.recommend("s1") == [("c3", 3.0)]
+        assert list(model.item_counts) == [3, 2, 2, 1]
+        assert model.recommend("s4") == []
+        assert model.recommend("unknown") == []
+
+    def test_incremental_add_matches_rebuild(self):
+        """플랜 추가 후 결과는 전체 재생성과 동일 (새 콘텐츠, 합치기 포함)"""
+        rng = np.random.default_rng(7)
+        plans = pd.DataFrame(
+            {
+                "student_id": [f"s{i}" for i in rng.integers(0, 40, 800)],
+                "content_id": [f"c{i}" for i in rng.integers(0, 50, 800)],
+            }
+        )
+        head = plans[plans["content_id"] != "c49"].iloc[:300]
+        model = ItemCooccurrence.from_plans(head, compact_threshold=100)
+        for student_id, group in plans.drop(head.index).groupby("student_id", sort=False):
+            model.add(student_id, group["content_id"])
+        rebuilt = ItemCooccurrence.from_plans(plans)
+
+        assert "c49" in model
+        for student_id in plans["student_id"].unique():
+            assert model.recommend(student_id, limit=10) == rebuilt.recommend(
+                student_id, limit=10
+            )
+
+    def test_add_ignores_already_studied(self, plans):
+        """이미 학습한 콘텐츠 재추가는 반영하지 않음"""
+        model = ItemCooccurrence.from_plans(plans)
+
+        assert model.add("s1", ["c1", "c2", None]) == 0
+        assert model.add("s1", ["c4"]) == 1
+        assert model.recommend("s4") == [("c1", 1.0), ("c2", 1.0)]
+
+
+class TestItemBasedRecommendations:
+    """CollaborativeRecommender 아이템 기반 추천 테스트"""
+
+    def test_metadata_lookup(self, plans):
+        """메타데이터는 첫 행 기준, 카탈로그에 없는 콘텐츠는 제외"""
+        contents_df = pd.DataFrame(
+            {
+                "id": ["c3", "c1", "c3"],
+                "title": ["콘텐츠3", "콘텐츠1", "중복"],
+                "subject": ["수학", "영어", "국어"],
+            }
+        )
+        model = ItemCooccurrence.from_plans(plans)
+        recommender = CollaborativeRecommender()
+
+        assert recommender.get_item_based_recommendations("s1", model, contents_df) == [
+            {
+                "content_id": "c3",
+                "title": "콘텐츠3",
+                "subject": "수학",
+                "reason": "이 콘텐츠를 학습한 학생들이 함께 학습한 콘텐츠",
+            }
+        ]
+        assert recommender.get_item_based_recommendations("s3", model, contents_df[:0]) == []
+
+
+def run_now(task):
+    """백그라운드 대신 호출 스레드에서 바로 갱신"""
+    task()
+
+
+class TestCooccurrenceRegistry:
+    """CooccurrenceRegistry 갱신 주기 테스트"""
+
+    @staticmethod
+    def _keyset_fetch(visible, calls, page_size):
+        """(created_at, id) 키셋 페이지를 돌려주는 fetch"""
+
+        def fetch(tenant_id, after):
+            calls.append(after)
+            rows = visible[0].sort_values(["created_at", "id"])
+            if after is not None:
+                created_at, plan_id = after
+                rows = rows[
+                    (rows["created_at"] > created_at)
+                    | ((rows["created_at"] == created_at) & (rows["id"] > plan_id))
+                ]
+            return rows.head(page_size)
+
+        return fetch
+
+    def test_incremental_and_full_refresh(self, plans):
+        """주기마다 watermark 이후 생성된 플랜만 add, 전체 주기에는 재구성"""
+        plans = plans.assign(
+            id=[f"p{i}" for i in range(9)],
+            created_at=pd.date_range("2024-01-01", periods=9, freq="D"),
+        )
+        visible = [plans.iloc[:7]]
+        now = [0.0]
+        calls = []
+
+        registry = CooccurrenceRegistry(
+            self._keyset_fetch(visible, calls, 1000),
+            refresh_interval_seconds=10,
+            full_refresh_seconds=100,
+            clock=lambda: now[0],
+            spawn=run_now,
+        )
+        model = registry.get("t1")
+        assert registry.get("t1") is model
+        assert calls == [None]
+        assert "c4" not in model
+
+        visible[0] = plans
+        now[0] = 15
+        assert registry.get("t1") is model
+        assert calls[-1] == (pd.Timestamp("2024-01-07"), "p6")
+        assert "c4" in model
+
+        now[0] = 120
+        assert registry.get("t1") is not model
+        assert calls[-1] is None
+
+    def test_pages_past_row_cap_with_tied_created_at(self, plans):
+        """max-rows보다 많은 플랜과 같은 created_at 플랜도 빠짐없이 페이지로 읽음"""
+        plans = plans.assign(
+            id=[f"p{i}" for i in range(9)],
+            created_at=pd.to_datetime(["2024-01-01"] * 5 + ["2024-01-02"] * 4),
+        )
+        visible = [plans.iloc[:6]]
+        now = [0.0]
+        calls = []
+
+        registry = CooccurrenceRegistry(
+            self._keyset_fetch(visible, calls, 2),
+            refresh_interval_seconds=10,
+            page_size=2,
+            clock=lambda: now[0],
+            spawn=run_now,
+        )
+        model = registry.get("t1")
+        assert len(calls) == 4
+        assert calls[-1] == (pd.Timestamp("2024-01-02"), "p5")
+        assert "c3" in model
+
+        visible[0] = plans
+        now[0] = 15
+        registry.get("t1")
+        rebuilt = ItemCooccurrence.from_plans(plans)
+        for student_id in plans["student_id"].unique():
+            assert model.recommend(student_id, limit=10) == rebuilt.recommend(
+                student_id, limit=10
+            )
+
+
+    def test_builds_in_background_outside_lock(self, plans):
+        """구성은 백그라운드에서 진행하고, 조회는 기다리지 않으며 다른 테넌트도 막지 않음"""
+        plans = plans.assign(
+            id=[f"p{i}" for i in range(9)],
+            created_at=pd.date_range("2024-01-01", periods=9, freq="D"),
+        )
+        release = threading.Event()
+        started = threading.Event()
+        calls = []
+        keyset = self._keyset_fetch([plans], calls, 1000)
+
+        def fetch(tenant_id, after):
+            if tenant_id == "slow":
+                started.set()
+                assert release.wait(5)
+            return keyset(tenant_id, after)
+
+        threads = []
+
+        def spawn(task):
+            thread = threading.Thread(target=task)
+            threads.append(thread)
+            thread.start()
+
+        registry = CooccurrenceRegistry(fetch, spawn=spawn)
+        assert registry.get("slow") is None
+        assert started.wait(5)
+        assert registry.get("slow") is None
+        assert len(threads) == 1
+
+        assert registry.refresh("t2") is not None
+        assert "c4" in registry.get("t2")
+
+        release.set()
+        threads[0].join(5)
+        assert "c4" in registry.get("slow")
+
+    def test_failed_refresh_keeps_model(self, plans):
+        """갱신이 실패하면 기존 모델을 유지하고 다음 조회 때 다시 시도"""
+        plans = plans.assign(
+            id=[f"p{i}" for i in range(9)],
+            created_at=pd.date_range("2024-01-01", periods=9, freq="D"),
+        )
+        now = [0.0]
+        fail = [False]
+        keyset = self._keyset_fetch([plans], [], 1000)
+
+        def fetch(tenant_id, after):
+            if fail[0]:
+                raise ConnectionError("db down")
+            return keyset(tenant_id, after)
+
+        registry = CooccurrenceRegistry(
+            fetch, refresh_interval_seconds=10, clock=lambda: now[0], spawn=run_now
+        )
+        model = registry.get("t1")
+
+        now[0] = 15
+        fail[0] = True
+        with pytest.raises(ConnectionError):
+            registry.get("t1")
+
+        fail[0] = False
+        assert registry.get("t1") is model
+
+
+class TestHybridRecommender:
+    """규칙 기반 + 협업 점수 혼합 테스트"""
+
+    @pytest.fixture
+    def catalog(self):
+        return CatalogIndex.build(
+            pd.DataFrame(
+                {
+                    "id": ["c4", "c3", "c2", "c1"],
+                    "title": ["콘텐츠4", "콘텐츠3", "콘텐츠2", "콘텐츠1"],
+                    "subject": ["수학"] * 4,
+                    "content_type": ["book"] * 4,
+                    "difficulty": ["easy"] * 4,
+                }
+            )
+        )
+
+    def test_catalog_scores_are_aligned_and_normalized(self, plans, catalog):
+        """모델 콘텐츠 순서 → 카탈로그 행 순서, 최댓값 1"""
+        model = ItemCooccurrence.from_plans(plans)
+        hybrid = HybridRecommender()
+
+        scores = hybrid.catalog_scores(model, "s1", catalog)
+
+        assert list(scores) == [0.0, 1.0, 0.0, 0.0]
+        assert hybrid.catalog_scores(model, "s4", catalog) is None
+
+    def test_zero_weight_matches_rule_based(self, plans, catalog):
+        """비중 0이면 규칙 기반 결과와 동일, 비중이 있으면 협업 점수가 순위를 바꿈"""
+        model = ItemCooccurrence.from_plans(plans)
+        hybrid = HybridRecommender()
+        student_plans = plans[plans["student_id"] == "s1"]
+        args = dict(scores_df=pd.DataFrame(), plans_df=student_plans, catalog=catalog)
+
+        expected = ContentRecommender().recommend(
+            pd.DataFrame(), None, student_plans, catalog=catalog
+        )
+        plain = hybrid.recommend("s1", model=model, collaborative_weight=0.0, **args)
+        blended = hybrid.recommend("s1", model=model, collaborative_weight=0.5, **args)
+
+        assert plain["recommendations"] == expected["recommendations"]
+        assert plain["collaborative_weight"] == 0.0
+        assert blended["recommendations"][0]["content_id"] == "c3"
+        assert blended["collaborative_weight"] == 0.5
@@ -0,0 +1,95 @@
+"""
+SupabaseConnector 페이지 조회 테스트
+"""
+
+from src.db_connector import SupabaseConnector
+
+
+class FakeQuery:
+    """range 이전 필터는 무시하고, 정렬된 행을 offset/limit으로 잘라 주는 쿼리"""
+
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.window = None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    @property
+    def not_(self):
+        return self
+
+    def range(self, start, end):
+        assert self.window is None, "range는 쿼리마다 한 번만 적용"
+        self.window = (start, end)
+        self.calls.append(self.window)
+        return self
+
+    def execute(self):
+        start, end = self.window
+        return type("Response", (), {"data": self.rows[start : end + 1]})()
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self.rows, self.calls)
+
+
+def _connector(rows):
+    connector = object.__new__(SupabaseConnector)
+    connector.client = FakeClient(rows)
+    return connector
+
+
+class TestFetchPages:
+    """_fetch_pages 테스트"""
+
+    def test_reads_every_page(self):
+        """페이지 크기의 배수여도 마지막 빈 페이지까지 읽음"""
+        rows = [{"id": i} for i in range(6)]
+        connector = _connector(rows)
+
+        result = connector._fetch_pages(lambda: connector.client.table("t"), page_size=3)
+
+        assert result == rows
+        assert connector.client.calls == [(0, 2), (3, 5), (6, 8)]
+
+    def test_scores_for_students_limit(self):
+        """페이지로 모은 뒤 학생별 최근 N개만 남김"""
+        rows = [
+            {"id": i, "student_id": f"s{i % 2}", "score": i, "created_at": 100 - i}
+            for i in range(2500)
+        ]
+        connector = _connector(rows)
+
+        scores = connector.get_scores_for_students(["s0", "s1"], limit_per_student=3)
+
+        assert len(connector.client.calls) == 3
+        assert scores.groupby("student_id").size().to_dict() == {"s0": 3, "s1": 3}
+        assert scores[scores["student_id"] == "s0"]["id"].tolist() == [0, 2, 4]
+
+    def test_tenant_catalog_reads_past_page_limit(self):
+        """교재·강의 모두 1000건을 넘어도 잘리지 않음"""
+        rows = [
+            {"id": f"c{i:05d}", "title": "t", "subject": "수학", "difficulty_level": "중"}
+            for i in range(1500)
+        ]
+        connector = _connector(rows)
+
+        catalog = connector.get_tenant_catalog("tenant-a")
+
+        assert len(catalog) == 3000
+        assert catalog["content_type"].value_counts().to_dict() == {"book": 1500, "lecture": 1500}
+
+    def test_student_plans_and_students_read_past_page_limit(self):
+        """플랜이 1000개를 넘는 학생과 1000명을 넘는 테넌트도 잘리지 않음"""
+        rows = [{"id": i, "student_id": "s1", "scheduled_date": "2024-01-01"} for i in range(1200)]
+        connector = _connector(rows)
+
+        assert len(connector.get_student_plans("s1")) == 1200
+        assert len(connector.get_students("tenant-a")) == 1200
@@ -0,0 +1,91 @@
+"""
+요청 데드라인 및 결과 캐시 테스트
+"""
+
+import math
+
+import pytest
+
+from src.deadline import Deadline, ResultCache, record_served_tier
+from src.metrics import MetricsRegistry
+
+
+class FakeClock:
+    """수동으로 진행하는 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeadline:
+    """Deadline 단위 테스트"""
+
+    def test_remaining_and_expired(self):
+        """경과 시간만큼 남은 시간 감소"""
+        clock = FakeClock()
+        deadline = Deadline(100.0, clock=clock)
+
+        clock.now = 0.04
+        assert deadline.remaining_ms() == pytest.approx(60.0)
+        assert deadline.allows(50.0)
+        assert not deadline.allows(70.0)
+        assert not deadline.expired
+
+        clock.now = 0.1
+        assert deadline.expired
+
+    def test_no_budget_is_unbounded(self):
+        """예산이 없으면 만료되지 않음"""
+        deadline = Deadline(None)
+        assert deadline.remaining_ms() == math.inf
+        assert not deadline.expired
+
+    def test_from_budget_falls_back_to_default(self):
+        """헤더 값이 없거나 0 이하이면 기본 예산"""
+        assert Deadline.from_budget(None, 500.0).budget_ms == 500.0
+        assert Deadline.from_budget(0, 500.0).budget_ms == 500.0
+        assert Deadline.from_budget(20.0, 500.0).budget_ms == 20.0
+
+
+class TestResultCache:
+    """ResultCache 단위 테스트"""
+
+    def test_ttl_expiry(self):
+        """유효 시간이 지나면 None"""
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 5
+        assert cache.get("a") == 1
+        clock.now = 11
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """최대 크기 초과 시 가장 오래 쓰지 않은 항목 제거"""
+        cache = ResultCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+def test_record_served_tier():
+    """계층/저하 카운터 기록"""
+    metrics = MetricsRegistry()
+    record_served_tier("predictions.score", "ridge", False, metrics=metrics)
+    record_served_tier("predictions.score", "cached", True, metrics=metrics)
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["predictions.score.requests"] == 2
+    assert counters["predictions.score.served_tier.cached"] == 1
+    assert counters["predictions.score.degraded"] == 1
+
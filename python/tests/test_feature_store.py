@@ -0,0 +1,207 @@
+"""
+FeatureStore 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.content_recommender import ContentRecommender
+from src.ml.feature_store import FeatureStore
+from src.ml.score_predictor import ScorePredictor
+from src.ml.trend_stats import TrendStatsStore
+
+
+@pytest.fixture
+def scores_df():
+    rng = np.random.default_rng(3)
+    n = 14
+    return pd.DataFrame(
+        {
+            "student_id": ["s1"] * n + ["s2"] * 3,
+            "subject": ["수학"] * 8 + ["영어"] * 6 + ["수학"] * 3,
+            "score": np.round(rng.uniform(40, 95, size=n + 3)),
+            "created_at": pd.date_range("2024-01-01", periods=n + 3, freq="W"),
+        }
+    )
+
+
+@pytest.fixture
+def plans_df():
+    return pd.DataFrame(
+        {
+            "student_id": ["s1", "s1", "s1", "s2"],
+            "subject": ["수학", "수학", "영어", "수학"],
+            "content_id": ["c1", "c2", "c3", "c1"],
+            "content_type": ["book", "book", "lecture", "video"],
+            "actual_duration": [60, np.nan, 30, 40],
+            "status": ["completed", "pending", "completed", "completed"],
+        }
+    )
+
+
+class TestFeatureStore:
+    """FeatureStore 단위 테스트"""
+
+    def test_incremental_features_match_batch(self, scores_df):
+        """점진 갱신 특성이 ScorePredictor 일괄 추출과 동일"""
+        store = FeatureStore.build(scores_df)
+        math = store.get("s1").subject("수학")
+
+        expected = ScorePredictor._features_from_scores(
+            scores_df[(scores_df["student_id"] == "s1") & (scores_df["subject"] == "수학")][
+                "score"
+            ].to_numpy(dtype=float)
+        )
+
+        np.testing.assert_allclose(math.features, expected)
+        assert math.count == 8
+
+    def test_plan_aggregates(self, scores_df, plans_df):
+        """플랜 기반 학습량/완료율/학습 이력"""
+        store = FeatureStore.build(scores_df, plans_df)
+        student = store.get("s1")
+
+        assert student.studied_content_ids == {"c1", "c2", "c3"}
+        assert student.studied_content_types == {"book", "lecture"}
+        assert student.completion_rate == pytest.approx(2 / 3)
+        assert student.subject("수학").study_sessions == 2
+        assert student.subject("수학").study_minutes == 60
+
+    def test_version_increments(self, scores_df):
+        """갱신 시 학생 버전 증가"""
+        store = FeatureStore.build(scores_df)
+        before = store.get_version("s2")
+
+        assert store.record_score("s2", "수학", 77)
+
+        assert store.get_version("s2") > before
+        assert store.get_version("unknown") == 0
+        assert not store.record_score("unknown", "수학", 77)
+        assert store.stats()["students"] == 2
+
+    def test_events_replace_record(self, scores_df, plans_df):
+        """이벤트는 사본을 갱신해 교체하므로 먼저 조회한 기록은 그대로"""
+        store = FeatureStore.build(scores_df, plans_df)
+        before = store.get("s1")
+        scores = before.subject("수학").scores.copy()
+
+        store.record_score("s1", "수학", 99)
+        store.record_plan("s1", "과학", content_id="c9", content_type="video", completed=True)
+        store.mark_plan_completed("s1", "수학", actual_duration=20)
+
+        np.testing.assert_array_equal(before.subject("수학").scores, scores)
+        assert "c9" not in before.studied_content_ids
+        after = store.get("s1")
+        assert after.subject("수학").scores[-1] == 99
+        assert after.subject("수학").features[-1][0] == scores[-1]
+        assert after.subject("수학").study_minutes == 80
+        assert after.completed_plans == before.completed_plans + 2
+        assert "c9" in after.studied_content_ids
+
+    def test_get_or_load(self, scores_df, plans_df):
+        """기록이 있으면 조회 없이 반환, 오래됐거나 넘치면 다시 조회"""
+        s1 = (
+            scores_df[scores_df["student_id"] == "s1"].drop(columns="student_id"),
+            plans_df[plans_df["student_id"] == "s1"].drop(columns="student_id"),
+        )
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return s1
+
+        store = FeatureStore(max_students=1)
+        first = store.get_or_load("s1", fetch)
+        assert store.get_or_load("s1", fetch) is first
+        assert len(calls) == 1
+        assert first.subject("수학").count == 8
+
+        store.get_or_load_many(
+            ["s2"], lambda ids: (scores_df[scores_df["student_id"].isin(ids)], None)
+        )
+        assert "s1" not in store
+        store.get_or_load("s1", fetch)
+        assert len(calls) == 2
+
+        store.max_age_seconds = 0.0
+        store.get_or_load("s1", fetch)
+        assert len(calls) == 3
+
+    def test_load_uses_stored_trend(self, scores_df):
+        """기록을 만들 때 과목 트렌드는 누적기 저장소 값 사용 (더 긴 이력)"""
+        s2_math = scores_df[scores_df["student_id"] == "s2"]["score"].to_numpy(dtype=float)
+        trend_stats = TrendStatsStore()
+        trend_stats.seed("s2", "수학", np.concatenate([[50.0, 60.0], s2_math]))
+
+        store = FeatureStore(trend_stats=trend_stats)
+        [student] = store.get_or_load_many(["s2"], lambda ids: (scores_df, None))
+
+        math = student.subject("수학")
+        assert math.count == 3
+        assert math.trend.count == 5
+
+    def test_predict_from_features_matches_predict(self, scores_df, plans_df):
+        """저장소 경로 예측이 DataFrame 경로와 동일"""
+        predictor = ScorePredictor()
+        store = FeatureStore.build(scores_df, plans_df)
+        s1_scores = scores_df[scores_df["student_id"] == "s1"]
+        s1_plans = plans_df[plans_df["student_id"] == "s1"]
+
+        direct = predictor.predict(s1_scores, s1_plans, "수학")
+        cached = predictor.predict_from_features(store.get("s1"), "수학")
+
+        assert cached == direct
+
+    def test_predict_many_from_features_matches_predict_many(self):
+        """저장소 경로 일괄 예측이 DataFrame 경로 일괄 예측과 동일 (릿지 일괄 풀이 포함)"""
+        rng = np.random.default_rng(5)
+        frames = [
+            pd.DataFrame(
+                {
+                    "student_id": f"s{n}",
+                    "subject": "수학",
+                    "score": np.round(rng.uniform(40, 95, size=n)),
+                    "created_at": pd.date_range("2024-01-01", periods=n, freq="W"),
+                }
+            )
+            for n in (2, 5, 12, 15, 22)
+        ]
+        predictor = ScorePredictor()
+        store = FeatureStore.build(pd.concat(frames, ignore_index=True))
+
+        direct = predictor.predict_many([(df, None, "수학", 30) for df in frames])
+        cached = predictor.predict_many_from_features(
+            [(store.get(df["student_id"].iloc[0]), "수학", 30) for df in frames]
+        )
+
+        assert cached == direct
+
+    def test_predict_from_features_insufficient(self, scores_df):
+        """데이터 부족 과목"""
+        store = FeatureStore.build(scores_df)
+        result = ScorePredictor().predict_from_features(store.get("s1"), "과학")
+        assert result["confidence"] == 0
+
+    def test_recommend_with_features_matches_frames(self, scores_df, plans_df):
+        """저장소 경로 추천이 DataFrame 경로와 동일"""
+        recommender = ContentRecommender()
+        contents = pd.DataFrame(
+            {
+                "id": ["c1", "c2", "c3", "c4", "c5"],
+                "title": ["a", "b", "c", "d", "e"],
+                "subject": ["수학", "수학", "영어", "영어", "과학"],
+                "content_type": ["book", "video", "lecture", "book", "video"],
+                "difficulty": ["easy", "hard", "medium", "easy", "medium"],
+            }
+        )
+        store = FeatureStore.build(scores_df, plans_df)
+        s1_scores = scores_df[scores_df["student_id"] == "s1"]
+        s1_plans = plans_df[plans_df["student_id"] == "s1"]
+
+        direct = recommender.recommend(s1_scores, contents, s1_plans, limit=5)
+        cached = recommender.recommend(
+            pd.DataFrame(), contents, None, limit=5, student_features=store.get("s1")
+        )
+
+        assert cached == direct
@@ -0,0 +1,154 @@
+"""
+암묵적 피드백 ALS 테스트
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.content_recommender import CollaborativeRecommender
+from src.ml.implicit_als import (
+    ImplicitFactors,
+    _load_factors,
+    factors_path,
+    get_implicit_factors,
+    main,
+    plan_confidence,
+)
+
+
+@pytest.fixture
+def cluster_plans():
+    """두 취향 군집 (군집마다 콘텐츠 10개 중 대부분을 학습)"""
+    rng = np.random.default_rng(5)
+    rows = []
+    for cluster in range(2):
+        for s in range(30):
+            for c in range(10):
+                if rng.random() < 0.7:
+                    rows.append(
+                        (f"s{cluster}-{s:02d}", f"c{cluster}-{c}", "completed", 40.0)
+                    )
+    return pd.DataFrame(rows, columns=["student_id", "content_id", "status", "actual_duration"])
+
+
+class TestPlanConfidence:
+    """플랜 신뢰도 테스트"""
+
+    def test_completion_and_duration_raise_confidence(self):
+        """중복 플랜은 합산, 완료와 학습 시간이 신뢰도를 높임"""
+        plans = pd.DataFrame(
+            {
+                "student_id": ["s1", "s1", "s1", "s2"],
+                "content_id": ["c1", "c1", "c2", "c1"],
+                "status": ["completed", "pending", "pending", None],
+                "actual_duration": [30.0, None, None, 60.0],
+            }
+        )
+
+        result = plan_confidence(plans, alpha=1.0).set_index(["student_id", "content_id"])
+
+        assert result.loc[("s1", "c1"), "confidence"] == pytest.approx(1 + 2 + 1 + np.log(2))
+        assert result.loc[("s1", "c2"), "confidence"] == pytest.approx(2.0)
+        assert result.loc[("s2", "c1"), "confidence"] == pytest.approx(2 + np.log(3))
+
+
+class TestImplicitFactors:
+    """ImplicitFactors 단위 테스트"""
+
+    def test_recommends_within_cluster(self, cluster_plans):
+        """같은 군집의 미학습 콘텐츠를 추천하고 학습한 콘텐츠는 제외"""
+        model = ImplicitFactors.train(cluster_plans, factors=4, iterations=10)
+
+        assert model.student_factors.dtype == np.float32
+        for student_id, group in cluster_plans.groupby("student_id"):
+            studied = set(group["content_id"])
+            if len(studied) == 10:
+                continue
+            recommended = [c for c, _ in model.recommend(student_id, limit=10 - len(studied))]
+            cluster = student_id.split("-")[0][1:]
+            assert all(c.startswith(f"c{cluster}-") for c in recommended)
+            assert not studied & set(recommended)
+
+    def test_save_and_load(self, cluster_plans, tmp_path):
+        """npz 저장/복원 후 추천 동일"""
+        model = ImplicitFactors.train(cluster_plans, factors=4, iterations=3)
+        path = tmp_path / "factors.npz"
+        model.save(path)
+        loaded = ImplicitFactors.load(path)
+
+        assert loaded.recommend("s0-01") == model.recommend("s0-01")
+        assert loaded.recommend("unknown") == []
+
+    def test_factors_are_per_tenant(self, cluster_plans, tmp_path, monkeypatch):
+        """테넌트마다 ML_IMPLICIT_FACTORS_DIR/<tenant_id>.npz를 따로 읽고 캐시"""
+        monkeypatch.setenv("ML_IMPLICIT_FACTORS_DIR", str(tmp_path))
+        _load_factors.cache_clear()
+        model = ImplicitFactors.train(cluster_plans, factors=4, iterations=3)
+        model.save(factors_path("t1"))
+
+        try:
+            assert factors_path("t1") == tmp_path / "t1.npz"
+            assert get_implicit_factors("t1").recommend("s0-01") == model.recommend("s0-01")
+            assert get_implicit_factors("t1") is get_implicit_factors("t1")
+            assert get_implicit_factors("t2") is None
+        finally:
+            _load_factors.cache_clear()
+
+        with pytest.raises(ValueError):
+            factors_path("../t1")
+
+    def test_retrained_file_is_reloaded(self, cluster_plans, tmp_path, monkeypatch):
+        """재학습으로 파일이 바뀌면 재시작 없이 새 잠재 벡터 사용"""
+        monkeypatch.setenv("ML_IMPLICIT_FACTORS_DIR", str(tmp_path))
+        path = factors_path("t1")
+        ImplicitFactors.train(cluster_plans, factors=4, iterations=3).save(path)
+
+        try:
+            first = get_implicit_factors("t1")
+            retrained = ImplicitFactors.train(cluster_plans.iloc[:10], factors=2, iterations=2)
+            retrained.save(path)
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+
+            reloaded = get_implicit_factors("t1")
+            assert reloaded is not first
+            assert reloaded.item_factors.shape == retrained.item_factors.shape
+            assert list(tmp_path.iterdir()) == [path]
+        finally:
+            _load_factors.cache_clear()
+
+    def test_trainer_writes_tenant_path(self, cluster_plans, tmp_path, monkeypatch):
+        """--tenant-id 학습 결과는 --output 없이 서비스가 읽는 테넌트 경로에 저장"""
+        monkeypatch.setenv("ML_IMPLICIT_FACTORS_DIR", str(tmp_path))
+        connector = MagicMock()
+        connector.get_tenant_plan_contents.return_value = cluster_plans
+        monkeypatch.setattr("src.db_connector.get_connector", lambda: connector)
+
+        main(["--tenant-id", "t1", "--factors", "4", "--iterations", "1"])
+
+        connector.get_tenant_plan_contents.assert_called_once_with("t1")
+        assert (tmp_path / "t1.npz").exists()
+        with pytest.raises(SystemExit):
+            main(["--source", "synthetic"])
+
+    def test_factor_recommendations(self, cluster_plans):
+        """CollaborativeRecommender 잠재 요인 추천 형식"""
+        model = ImplicitFactors.train(cluster_plans, factors=4, iterations=5)
+        contents_df = pd.DataFrame(
+            {
+                "id": [f"c{k}-{c}" for k in range(2) for c in range(10)],
+                "title": [f"콘텐츠 {i}" for i in range(20)],
+                "subject": ["수학"] * 20,
+            }
+        )
+
+        recommendations = CollaborativeRecommender().get_factor_recommendations(
+            "s1-00", model, contents_df, limit=2
+        )
+
+        assert len(recommendations) <= 2
+        assert all(r["content_id"].startswith("c1-") for r in recommendations)
+        assert all(r["reason"] for r in recommendations)
@@ -0,0 +1,76 @@
+"""
+MinHash-LSH 유사 학생 인덱스 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.content_recommender import CollaborativeRecommender
+from src.ml.interaction_matrix import InteractionMatrix
+from src.ml.minhash_lsh import MinHashLSH
+
+
+@pytest.fixture
+def cohort_plans():
+    """커리큘럼을 공유하는 두 반 + 혼자 다른 콘텐츠를 학습한 학생"""
+    rng = np.random.default_rng(3)
+    rows = []
+    for cohort, curriculum in enumerate((range(0, 20), range(100, 120))):
+        for s in range(15):
+            taken = [c for c in curriculum if rng.random() < 0.85]
+            rows += [(f"s{cohort}-{s:02d}", f"c{c}") for c in taken]
+    rows += [("loner", f"c{c}") for c in range(500, 510)]
+    return pd.DataFrame(rows, columns=["student_id", "content_id"])
+
+
+class TestMinHashLSH:
+    """MinHashLSH 단위 테스트"""
+
+    def test_candidates_stay_within_cohort(self, cohort_plans):
+        """겹치는 콘텐츠가 없는 학생은 후보가 되지 않음"""
+        lsh = MinHashLSH.from_plans(cohort_plans)
+
+        similar = lsh.query("s0-00", limit=10)
+
+        assert len(similar) == 10
+        assert all(s.startswith("s0-") for s in similar)
+        assert lsh.query("loner") == []
+        assert lsh.query("unknown") == []
+
+    def test_query_reranks_exactly(self, cohort_plans):
+        """후보 안에서의 순서는 정확한 Jaccard 순서와 동일"""
+        lsh = MinHashLSH.from_plans(cohort_plans, num_perm=64, bands=32)
+        matrix = InteractionMatrix.from_plans(cohort_plans)
+        exact = CollaborativeRecommender(min_common_items=0)
+
+        for student_id in ("s0-03", "s1-07"):
+            approx = lsh.query(student_id, limit=100)
+            ranked = exact.find_similar_students(student_id, matrix=matrix, limit=100)
+            assert approx == [s for s in ranked if s in set(approx)]
+
+    def test_incremental_add_matches_rebuild(self, cohort_plans):
+        """콘텐츠 추가 후 결과는 전체 재생성과 동일"""
+        head, tail = cohort_plans.iloc[:200], cohort_plans.iloc[200:]
+        incremental = MinHashLSH.from_plans(head)
+        for student_id, group in tail.groupby("student_id", sort=False):
+            incremental.add(student_id, group["content_id"])
+        rebuilt = MinHashLSH.from_plans(cohort_plans)
+
+        assert len(incremental) == len(rebuilt)
+        for student_id in cohort_plans["student_id"].unique():
+            assert incremental.query(student_id, limit=30) == rebuilt.query(
+                student_id, limit=30
+            )
+
+    def test_min_common_items(self, cohort_plans):
+        """최소 공통 콘텐츠 수는 재정렬 단계에서 적용"""
+        recommender = CollaborativeRecommender(min_common_items=50)
+        lsh = MinHashLSH.from_plans(cohort_plans)
+
+        assert recommender.find_similar_students("s0-00", lsh=lsh) == []
+
+    def test_bands_must_divide_num_perm(self):
+        """num_perm이 bands의 배수가 아니면 오류"""
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=100, bands=32)
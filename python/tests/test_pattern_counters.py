@@ -0,0 +1,193 @@
+"""
+학습 패턴 누적 카운터 테스트
+"""
+
+import pandas as pd
+import pytest
+
+from src.analysis import analyze_learning_patterns
+from src.evaluation.data_sources import SyntheticDataSource
+from src.ml.pattern_counters import PatternCounterStore
+
+
+@pytest.fixture
+def plans_df():
+    """합성 플랜 (DB 응답처럼 날짜는 문자열)"""
+    plans = SyntheticDataSource(n_students=30, seed=3).get_plans()
+    plans["scheduled_date"] = plans["scheduled_date"].dt.strftime("%Y-%m-%d")
+    return plans
+
+
+def _replay(store: PatternCounterStore, plans: pd.DataFrame) -> None:
+    """빈 카운터로 초기화한 뒤 플랜 행마다 생성 이벤트 반영"""
+    store.reconcile(pd.DataFrame(), plans["student_id"].unique().tolist())
+    for row in plans.itertuples():
+        store.record_created(
+            row.student_id,
+            scheduled_date=row.scheduled_date,
+            start_time=row.start_time,
+            subject=row.subject,
+            completed=row.status == "completed",
+            actual_duration=row.actual_duration,
+        )
+
+
+class TestPatternCounterStore:
+    """PatternCounterStore 테스트"""
+
+    def test_from_plans_matches_batch_analysis(self, plans_df):
+        """일괄 생성한 카운터의 결과가 학생별 analyze_learning_patterns와 같음"""
+        store = PatternCounterStore.from_plans(plans_df)
+
+        assert len(store) == plans_df["student_id"].nunique()
+        for student_id, group in plans_df.groupby("student_id"):
+            assert store.patterns(student_id) == analyze_learning_patterns(group)
+
+    def test_events_match_rebuild(self, plans_df):
+        """생성 이벤트를 하나씩 반영한 결과가 일괄 생성과 같음 (대사 차이 0)"""
+        store = PatternCounterStore()
+        _replay(store, plans_df)
+
+        rebuilt = PatternCounterStore.from_plans(plans_df)
+        for student_id in rebuilt.student_ids:
+            assert store.patterns(student_id) == rebuilt.patterns(student_id)
+        assert store.reconcile(plans_df)["drifted"] == 0
+
+    def test_subject_ties_follow_first_appearance(self):
+        """과목 동률은 일괄 분석처럼 처음 나온 순서 (일괄 생성, 이벤트, 대사 모두)"""
+        plans = pd.DataFrame(
+            {
+                "student_id": ["s1"] * 3,
+                "subject": ["영어", "수학", "국어"],
+                "status": "pending",
+                "actual_duration": 30,
+            }
+        )
+        store = PatternCounterStore.from_plans(plans)
+        assert store.patterns("s1") == analyze_learning_patterns(plans)
+
+        store.record_created("s1", subject="과학", actual_duration=30)
+        store.record_created("s1", subject="수학", actual_duration=30)
+        grown = pd.concat(
+            [plans, pd.DataFrame({"student_id": "s1", "subject": ["과학", "수학"]})],
+            ignore_index=True,
+        ).assign(status="pending", actual_duration=30)
+        expected = analyze_learning_patterns(grown)
+        assert store.patterns("s1") == expected
+        assert list(expected["subject_distribution"]["counts"]) == ["수학", "영어", "국어", "과학"]
+
+        assert store.reconcile(grown)["drifted"] == 0
+        assert store.patterns("s1") == expected
+
+    def test_record_completed(self):
+        """완료 이벤트는 완료 수와 학습 시간만 갱신"""
+        store = PatternCounterStore()
+        store.reconcile(pd.DataFrame(), ["s1"])
+        store.record_created("s1", "2024-03-04", "09:00", "수학")
+        store.record_created("s1", "2024-03-05", "9:30", "영어")
+        store.record_completed("s1", "pending", actual_duration=40)
+
+        patterns = store.patterns("s1")
+        assert patterns["daily_distribution"]["counts"] == {0: 1, 1: 1}
+        assert patterns["hourly_distribution"]["peak_hours"] == [9]
+        assert patterns["subject_distribution"]["counts"] == {"수학": 1, "영어": 1}
+        assert patterns["completion_rate"] == {"total": 2, "completed": 1, "rate": 50.0}
+        assert patterns["average_duration"] == {"minutes": 40.0}
+
+    def test_completed_is_idempotent_per_plan(self):
+        """완료 상태로 생성된 플랜의 완료 이벤트는 다시 세지 않음"""
+        store = PatternCounterStore()
+        store.reconcile(pd.DataFrame(), ["s1"])
+        assert store.record_created("s1", "2024-03-04", "09:00", "수학", completed=True)
+        assert not store.record_completed("s1", "completed", actual_duration=40)
+
+        assert store.patterns("s1")["completion_rate"] == {
+            "total": 1,
+            "completed": 1,
+            "rate": 100.0,
+        }
+
+    def test_events_never_create_students(self, plans_df):
+        """초기화하지 않은 학생의 이벤트는 무시하고, 이후 플랜으로 초기화"""
+        store = PatternCounterStore()
+        student_id = plans_df["student_id"].iloc[0]
+        assert not store.record_created(student_id, "2024-03-04", "10:00", "수학")
+        assert not store.record_completed(student_id, "pending", actual_duration=30)
+        assert student_id not in store
+
+        group = plans_df[plans_df["student_id"] == student_id]
+        store.reconcile(group, [student_id])
+        assert store.patterns(student_id) == analyze_learning_patterns(group)
+
+    def test_unknown_and_empty_students(self):
+        """카운터가 없으면 None, 플랜이 없으면 analyze_learning_patterns와 같은 오류"""
+        store = PatternCounterStore()
+        assert store.patterns("missing") is None
+
+        store.reconcile(pd.DataFrame(), ["s1"])
+        assert store.patterns("s1") == {"error": "플랜 데이터가 없습니다."}
+
+    def test_reconcile_fixes_drift(self, plans_df):
+        """중복 이벤트로 생긴 차이를 대사가 보고하고 바로잡음"""
+        store = PatternCounterStore.from_plans(plans_df)
+        student_id = plans_df["student_id"].iloc[0]
+        store.record_completed(student_id, "pending", actual_duration=30)
+        store.reconcile(pd.DataFrame(), ["removed-student"])
+        store.record_created("removed-student", "2024-03-04", "10:00", "수학")
+
+        report = store.reconcile(plans_df, [student_id, "removed-student"], now=100.0)
+
+        assert report == {"students": 2, "drifted": 2, "abs_diff": 2 + 4}
+        group = plans_df[plans_df["student_id"] == student_id]
+        assert store.patterns(student_id) == analyze_learning_patterns(group)
+        assert not store.is_stale(student_id, 60.0, now=150.0)
+        assert store.is_stale(student_id, 60.0, now=200.0)
+
+    def test_save_load_roundtrip(self, plans_df, tmp_path):
+        """npz 저장 후 복원하면 같은 결과, 복원 후에도 이벤트 반영"""
+        store = PatternCounterStore()
+        _replay(store, plans_df)
+        path = tmp_path / "counters.npz"
+        store.save(path)
+
+        loaded = PatternCounterStore.load(path)
+        assert loaded.student_ids == store.student_ids
+        for student_id in store.student_ids:
+            assert loaded.patterns(student_id) == store.patterns(student_id)
+
+        student_id = store.student_ids[0]
+        total = loaded.patterns(student_id)["completion_rate"]["total"]
+        loaded.record_created(student_id, "2024-03-04", "10:00", "과학")
+        assert loaded.patterns(student_id)["completion_rate"]["total"] == total + 1
+
+    def test_sync_merges_workers(self, tmp_path):
+        """두 워커가 같은 파일과 병합해도 서로의 변경을 덮어쓰지 않음"""
+        path = tmp_path / "counters.npz"
+        worker_a, worker_b = PatternCounterStore(), PatternCounterStore()
+        worker_a.reconcile(pd.DataFrame(), ["s1"])
+        worker_a.sync(path)
+        worker_b.sync(path)
+
+        worker_a.record_created("s1", "2024-03-04", "09:00", "수학")
+        worker_b.record_created("s1", "2024-03-05", "10:00", "영어")
+        worker_b.reconcile(pd.DataFrame(), ["s2"])
+        worker_b.record_created("s2", "2024-03-05", "10:00", "영어")
+        worker_a.sync(path)
+        worker_b.sync(path)
+        worker_a.sync(path)
+
+        for worker in (worker_a, worker_b, PatternCounterStore.load(path)):
+            assert worker.patterns("s1")["subject_distribution"]["counts"] == {
+                "수학": 1,
+                "영어": 1,
+            }
+            assert worker.patterns("s2")["completion_rate"]["total"] == 1
+
+    def test_sync_if_due(self, tmp_path):
+        """마지막 병합 후 간격이 지나지 않았으면 병합하지 않음"""
+        store = PatternCounterStore()
+        path = tmp_path / "counters.npz"
+        store.reconcile(pd.DataFrame(), ["s1"])
+        assert not store.sync_if_due(path, 3600.0)
+        assert store.sync_if_due(path, 0.0)
+        assert path.exists()
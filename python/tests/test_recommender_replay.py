@@ -0,0 +1,124 @@
+"""
+추천 리플레이 평가 테스트
+"""
+
+import pandas as pd
+import pytest
+
+from src.evaluation.data_sources import SyntheticDataSource
+from src.evaluation.recommender_replay import (
+    ALL_VARIANTS,
+    cutoff_dates,
+    precision_recall,
+    run_replay,
+    summarize_replay,
+)
+from src.ml.cooccurrence import ItemCooccurrence
+
+
+@pytest.fixture(scope="module")
+def source():
+    return SyntheticDataSource(n_students=60, n_contents=80, seed=3)
+
+
+class TestRecommenderReplay:
+    """리플레이 평가 테스트"""
+
+    def test_precision_recall(self):
+        """적중 수 / 추천 수, 적중 수 / 정답 수"""
+        assert precision_recall(["a", "b", "c", "d"], {"b", "d", "x"}) == (2, 0.5, 2 / 3)
+        assert precision_recall([], {"a"}) == (0, 0.0, 0.0)
+
+    def test_cutoff_dates_leave_horizon(self, source):
+        """마지막 기준 시점 뒤에도 정답 구간 확보"""
+        plans = source.get_plans()
+        cutoffs = cutoff_dates(plans, n_cutoffs=3, horizon_days=30)
+
+        assert len(cutoffs) == 3
+        assert cutoffs == sorted(cutoffs)
+        assert cutoffs[-1] <= plans["scheduled_date"].max() - pd.Timedelta(days=30)
+
+    def test_replay_hides_future_plans(self):
+        """기준 시점 이후 플랜은 이력에 쓰이지 않고, 이전에 학습한 콘텐츠는 정답에서 제외"""
+        day = pd.Timestamp("2024-01-01")
+        offsets = [0, 0, 100, 0, 0, 1, 100, 200]
+        plans = pd.DataFrame(
+            {
+                "student_id": ["s1"] * 3 + ["s2"] * 4 + ["s3"],
+                "content_id": ["a", "b", "c", "a", "b", "c", "a", "a"],
+                "scheduled_date": [day + pd.Timedelta(days=d) for d in offsets],
+            }
+        )
+        contents = pd.DataFrame({"id": ["a", "b", "c"], "subject": ["수학"] * 3})
+
+        records = run_replay(
+            plans,
+            pd.DataFrame(),
+            contents,
+            variants=["popularity", "cooccurrence"],
+            k=2,
+            n_cutoffs=1,
+            horizon_days=150,
+            min_history=2,
+        )
+
+        # 기준 시점(25일) 이후 s1만 새 콘텐츠(c)를 학습, s2의 a는 이미 학습한 콘텐츠
+        assert set(records["student_id"]) == {"s1"}
+        by_variant = records.set_index("variant")
+        assert by_variant.loc["popularity", "relevant"] == 1
+        # 기준 시점 이전 c의 동시 학습은 s2에서만 나옴
+        assert by_variant.loc["cooccurrence", "hits"] == 1
+        assert by_variant.loc["cooccurrence", "recall"] == 1.0
+
+    def test_run_replay_and_summarize(self, source):
+        """병렬 실행 결과가 단일 프로세스와 같고 추천기별 요약 생성"""
+        kwargs = dict(variants=ALL_VARIANTS, k=5, n_cutoffs=2, min_history=3)
+        records = run_replay(
+            source.get_plans(), source.get_scores(), source.get_contents(), **kwargs
+        )
+        parallel = run_replay(
+            source.get_plans(), source.get_scores(), source.get_contents(), workers=2, **kwargs
+        )
+
+        assert len(records) > 0
+        key = ["cutoff", "student_id", "variant"]
+        pd.testing.assert_frame_equal(
+            records.sort_values(key, ignore_index=True).drop(columns="latency_ms"),
+            parallel.sort_values(key, ignore_index=True).drop(columns="latency_ms"),
+        )
+        assert records["recommended"].le(5).all()
+
+        summary = summarize_replay(records)
+        assert set(summary) == set(ALL_VARIANTS)
+        for stats in summary.values():
+            assert 0 <= stats["precision_at_k"] <= 1
+            assert 0 <= stats["recall_at_k"] <= 1
+            assert stats["latency_ms_p95"] >= stats["latency_ms_p50"]
+
+    def test_models_built_once_per_cutoff(self, source, monkeypatch):
+        """학생 샤드가 여러 개여도 협업 모델은 기준 시점마다 한 번만 구성"""
+        built = []
+        from_plans = ItemCooccurrence.from_plans.__func__
+
+        def counting_from_plans(cls, plans_df, **kwargs):
+            built.append(len(plans_df))
+            return from_plans(cls, plans_df, **kwargs)
+
+        monkeypatch.setattr(ItemCooccurrence, "from_plans", classmethod(counting_from_plans))
+        records = run_replay(
+            source.get_plans(),
+            source.get_scores(),
+            source.get_contents(),
+            variants=["cooccurrence", "hybrid"],
+            n_cutoffs=2,
+            min_history=3,
+            n_shards=4,
+        )
+
+        assert len(records) > 0
+        assert len(built) == 2
+
+    def test_unknown_variant(self, source):
+        """알 수 없는 추천기 이름"""
+        with pytest.raises(ValueError):
+            run_replay(source.get_plans(), source.get_scores(), source.get_contents(), ["x"])
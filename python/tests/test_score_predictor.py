@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from src.deadline import Deadline
 from src.ml.score_predictor import ScorePredictor
 
 
@@ -140,7 +141,7 @@ class TestScorePredictor:
         """특성 추출 테스트"""
         subject_scores = sample_scores[sample_scores["subject"] == "수학"]
 
-        features = predictor._extract_features(subject_scores, None)
+        features = predictor._extract_features(subject_scores)
 
         assert features is not None
         assert isinstance(features, np.ndarray)
@@ -151,7 +152,7 @@ class TestScorePredictor:
         """특성 추출 - 데이터 부족"""
         scores_df = pd.DataFrame({"score": [75, 80]})
 
-        features = predictor._extract_features(scores_df, None)
+        features = predictor._extract_features(scores_df)
 
         assert features is None
 
@@ -207,3 +208,95 @@ class TestScorePredictor:
         # 결과가 반환되어야 함 (ML 또는 폴백)
         assert result["predicted_score"] > 0
         assert result["confidence"] > 0
+
+    def test_select_tier_by_history_length(self):
+        """이력 길이에 따른 계층 선택"""
+        predictor = ScorePredictor(min_samples_for_ml=10, min_samples_for_xgboost=30)
+
+        assert predictor._select_tier(5) == "weighted_average"
+        assert predictor._select_tier(15) == "ridge"
+        assert predictor._select_tier(40) == "xgboost"
+
+    def test_select_tier_by_latency_budget(self):
+        """지연 예산이 작으면 저비용 계층으로 강등"""
+        predictor = ScorePredictor(latency_budget_ms=1.0)
+        assert predictor._select_tier(100) == "ridge"
+
+        predictor = ScorePredictor(latency_budget_ms=0.01)
+        assert predictor._select_tier(100) == "weighted_average"
+
+    def test_select_tier_by_deadline(self):
+        """요청 데드라인의 남은 시간이 고정 예산보다 작으면 그 값으로 선택"""
+        predictor = ScorePredictor()
+
+        assert predictor._select_tier(100, Deadline(None)) == "xgboost"
+        assert predictor._select_tier(100, Deadline(1.0)) == "ridge"
+        assert predictor._select_tier(100, Deadline(0)) == "weighted_average"
+
+    def test_predict_with_expired_deadline_degrades(self, sample_plans):
+        """예산 소진 시 가중 평균 계층 + 플랜 요인 분석 생략"""
+        predictor = ScorePredictor(min_samples_for_ml=3)
+        scores_df = pd.DataFrame(
+            {
+                "subject": ["수학"] * 12,
+                "score": np.linspace(60, 80, 12),
+                "created_at": pd.date_range("2024-01-01", periods=12, freq="W"),
+            }
+        )
+
+        full = predictor.predict(scores_df, sample_plans, "수학")
+        degraded = predictor.predict(scores_df, sample_plans, "수학", deadline=Deadline(0))
+
+        assert full["model_tier"] == "ridge"
+        assert not full["degraded"]
+        assert degraded["model_tier"] == "weighted_average"
+        assert degraded["degraded"]
+        assert "study_sessions" not in degraded["factors"]
+
+    def test_fallback_reports_actual_tier(self):
+        """특성이 부족해 폴백하면 실제 사용한 가중 평균 계층을 반환 (degraded 아님)"""
+        predictor = ScorePredictor(min_samples_for_ml=3, min_samples_for_xgboost=3)
+        scores = np.array([60.0, 65.0, 70.0])
+
+        for tier in ("ridge", "xgboost"):
+            _, _, used = predictor.predict_history(scores, tier=tier)
+            assert used == "weighted_average"
+
+        scores_df = pd.DataFrame(
+            {
+                "subject": ["수학"] * 3,
+                "score": scores,
+                "created_at": pd.date_range("2024-01-01", periods=3, freq="W"),
+            }
+        )
+        result = predictor.predict(scores_df, None, "수학")
+        assert result["model_tier"] == "weighted_average"
+        assert not result["degraded"]
+
+    def test_ridge_predict(self, predictor):
+        """릿지 계층 예측"""
+        scores_df = pd.DataFrame(
+            {
+                "subject": ["수학"] * 15,
+                "score": [60 + 2 * i for i in range(15)],
+                "created_at": pd.date_range("2024-01-01", periods=15, freq="W"),
+            }
+        )
+
+        result = predictor.predict(scores_df, None, "수학")
+
+        assert result["model_tier"] == "ridge"
+        assert result["predicted_score"] == pytest.approx(90, abs=2)
+        assert 0.2 <= result["confidence"] <= 1
+
+    def test_ridge_fit_predict_matches_lstsq(self):
+        """alpha=0이면 최소제곱 해와 일치"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(20, 5))
+        y = X @ np.array([1.0, -2.0, 0.5, 0.0, 3.0]) + 4.0
+        x_next = rng.normal(size=5)
+
+        predicted, r_squared = ScorePredictor._ridge_fit_predict(X, y, x_next, alpha=0.0)
+
+        assert predicted == pytest.approx(x_next @ np.array([1.0, -2.0, 0.5, 0.0, 3.0]) + 4.0)
+        assert r_squared == pytest.approx(1.0)
@@ -0,0 +1,135 @@
+"""
+테넌트 이력 세그먼트 커널 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.evaluation.data_sources import SyntheticDataSource
+from src.ml.content_recommender import ContentRecommender
+from src.ml.score_predictor import ScorePredictor
+from src.ml.tenant_history import (
+    TenantHistory,
+    segment_ewma,
+    segment_std,
+    segment_sum,
+    segment_trend,
+)
+from src.ml.trend_stats import TrendAccumulator
+
+
+@pytest.fixture(scope="module")
+def scores_df():
+    """합성 테넌트 성적"""
+    return SyntheticDataSource(n_students=200, seed=7).get_scores()
+
+
+@pytest.fixture(scope="module")
+def history(scores_df):
+    return TenantHistory.from_frame(scores_df)
+
+
+class TestSegmentKernels:
+    """세그먼트 커널 단위 테스트"""
+
+    def test_empty_segments(self):
+        """빈 세그먼트는 합 0, 표준편차 0"""
+        values = np.array([1.0, 2.0, 3.0])
+        offsets = np.array([0, 0, 2, 2, 3])
+
+        np.testing.assert_array_equal(segment_sum(values, offsets), [0, 3, 0, 3])
+        np.testing.assert_array_equal(
+            segment_std(values, offsets), [0, np.std([1, 2], ddof=1), 0, 0]
+        )
+
+    def test_matches_trend_accumulator(self):
+        """EWMA, 기울기, R²가 TrendAccumulator와 동일"""
+        rng = np.random.default_rng(0)
+        series = [rng.normal(70, 10, size=n) for n in (1, 2, 5, 17)]
+        values = np.concatenate(series)
+        offsets = np.concatenate([[0], np.cumsum([len(s) for s in series])])
+
+        ewma = segment_ewma(values, offsets)
+        slope, r_squared = segment_trend(values, offsets)
+        for g, s in enumerate(series):
+            acc = TrendAccumulator.from_scores(s)
+            assert ewma[g] == pytest.approx(acc.weighted_average)
+            assert slope[g] == pytest.approx(acc.slope, abs=1e-9)
+            assert r_squared[g] == pytest.approx(acc.r_squared, abs=1e-9)
+
+
+class TestTenantHistory:
+    """TenantHistory 단위 테스트"""
+
+    def test_layout(self, history, scores_df):
+        """(학생, 과목, 시간) 정렬과 CSR 오프셋"""
+        assert history.n_rows == len(scores_df)
+        assert history.offsets[-1] == history.n_rows
+        assert history.n_groups == scores_df.groupby(["student_id", "subject"]).ngroups
+
+        g = history.group_index("s000003", "수학")
+        expected = (
+            scores_df[(scores_df["student_id"] == "s000003") & (scores_df["subject"] == "수학")]
+            .sort_values("created_at")["score"]
+            .to_numpy()
+        )
+        np.testing.assert_array_equal(history.series(g), expected)
+
+    def test_summary_matches_groupby(self, history, scores_df):
+        """시리즈 통계가 pandas groupby와 동일"""
+        summary = history.summary().set_index(["student_id", "subject"])
+        grouped = scores_df.groupby(["student_id", "subject"])["score"]
+
+        pd.testing.assert_series_equal(
+            summary["mean"], grouped.mean(), check_names=False, check_index_type=False
+        )
+        pd.testing.assert_series_equal(
+            summary["std"], grouped.std().fillna(0.0), check_names=False, check_index_type=False
+        )
+        assert (summary["count"] == grouped.size()).all()
+
+    def test_weak_subjects_match_recommender(self, history, scores_df):
+        """취약 과목이 ContentRecommender 기준과 동일"""
+        weak = history.weak_subjects()
+        recommender = ContentRecommender()
+
+        for student_id, group in list(scores_df.groupby("student_id"))[:50]:
+            expected = recommender._identify_weak_subjects(group)
+            assert weak[weak["student_id"] == student_id]["subject"].tolist() == expected
+
+    def test_predict_simple_matches_predictor(self, history):
+        """일괄 예측이 가중 평균 계층과 동일"""
+        predictions = history.predict_simple(days_ahead=45)
+        predictor = ScorePredictor()
+
+        for g in range(0, history.n_groups, 97):
+            scores = history.series(g)
+            predicted, confidence = predictor._fallback_predict(
+                TrendAccumulator.from_scores(scores), 45
+            )
+            assert predictions["predicted_score"].iloc[g] == pytest.approx(
+                np.clip(predicted, 0, 100)
+            )
+            assert predictions["confidence"].iloc[g] == pytest.approx(confidence)
+
+    def test_percentiles_and_rank(self, history):
+        """과목 코호트 백분위수와 순위"""
+        means = history.mean()
+        table = history.subject_percentiles(q=(50,))
+        ranks = history.percentile_rank()
+
+        for s, subject in enumerate(history.subjects):
+            cohort = means[history.group_subject == s]
+            assert table.loc[subject, "p50"] == pytest.approx(np.median(cohort))
+
+            g = np.flatnonzero(history.group_subject == s)[0]
+            assert ranks[g] == pytest.approx(100 * np.mean(cohort < means[g]))
+
+    def test_empty_frame(self):
+        """빈 성적"""
+        history = TenantHistory.from_frame(
+            pd.DataFrame(columns=["student_id", "subject", "score", "created_at"])
+        )
+        assert history.n_groups == 0
+        assert history.summary().empty
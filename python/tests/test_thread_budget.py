@@ -0,0 +1,94 @@
+"""
+ThreadBudget / MetricsRegistry 테스트
+"""
+
+import os
+
+import pytest
+
+from src.metrics import Histogram, MetricsRegistry
+from src.thread_budget import BLAS_THREAD_ENV_VARS, ThreadBudget, detect_worker_count
+
+
+class TestThreadBudget:
+    """ThreadBudget 단위 테스트"""
+
+    def test_divides_cores_among_workers(self):
+        """코어를 워커 수로 나눔"""
+        budget = ThreadBudget(total_cores=16, workers=4)
+
+        assert budget.threads_per_worker == 4
+        assert budget.xgboost_params() == {"n_jobs": 4}
+        assert budget.blas_threads == 4
+
+    def test_at_least_one_thread(self):
+        """워커가 코어보다 많아도 최소 1스레드"""
+        budget = ThreadBudget(total_cores=2, workers=8)
+        assert budget.threads_per_worker == 1
+
+    def test_override(self, monkeypatch):
+        """ML_THREADS_PER_WORKER로 직접 지정"""
+        monkeypatch.setenv("ML_THREADS_PER_WORKER", "3")
+        budget = ThreadBudget(total_cores=16, workers=2)
+        assert budget.threads_per_worker == 3
+
+    def test_model_concurrency_splits_budget(self, monkeypatch):
+        """동시 모델 작업 수로 나눈 스레드만 작업 하나에 배정"""
+        monkeypatch.delenv("ML_MODEL_CONCURRENCY", raising=False)
+        assert ThreadBudget(total_cores=8, workers=1).model_concurrency == 1
+
+        budget = ThreadBudget(total_cores=8, workers=1, model_concurrency=3)
+        assert budget.xgboost_params() == {"n_jobs": 2}
+        assert budget.model_concurrency * budget.blas_threads <= budget.threads_per_worker
+
+        monkeypatch.setenv("ML_MODEL_CONCURRENCY", "16")
+        budget = ThreadBudget(total_cores=8, workers=2)
+        assert budget.model_concurrency == 4
+        assert budget.threads_per_job == 1
+
+    def test_detect_worker_count(self, monkeypatch):
+        """환경 변수에서 워커 수 감지"""
+        for name in ("ML_WORKERS", "WEB_CONCURRENCY", "UVICORN_WORKERS"):
+            monkeypatch.delenv(name, raising=False)
+        assert detect_worker_count() == 1
+
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert detect_worker_count() == 4
+
+    def test_apply_sets_env(self, monkeypatch):
+        """apply()가 BLAS 환경 변수 설정"""
+        for name in BLAS_THREAD_ENV_VARS:
+            monkeypatch.delenv(name, raising=False)
+
+        budget = ThreadBudget(total_cores=8, workers=4)
+        budget.apply()
+
+        assert all(os.environ[name] == "2" for name in BLAS_THREAD_ENV_VARS)
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 테스트"""
+
+    def test_histogram_buckets(self):
+        """누적 버킷 개수"""
+        histogram = Histogram(buckets=(1, 5, 10))
+        for value in (0.5, 3, 3, 7, 20):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 5
+        assert snapshot["buckets"] == {"1": 1, "5": 3, "10": 4, "+Inf": 5}
+        assert snapshot["mean"] == pytest.approx(6.7)
+
+    def test_registry_snapshot(self):
+        """게이지/카운터/히스토그램 스냅샷"""
+        registry = MetricsRegistry()
+        registry.set_gauge("threads", 4)
+        registry.inc("requests")
+        registry.inc("requests", 2)
+        registry.observe("latency_ms", 12.0)
+
+        snapshot = registry.snapshot()
+        assert snapshot["gauges"]["threads"] == 4
+        assert snapshot["counters"]["requests"] == 3
+        assert snapshot["histograms"]["latency_ms"]["count"] == 1
@@ -0,0 +1,147 @@
+"""
+TrendAccumulator / TrendStatsStore 테스트
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.trend_stats import TrendAccumulator, TrendStatsStore
+
+
+class TestTrendAccumulator:
+    """TrendAccumulator 단위 테스트"""
+
+    @pytest.fixture
+    def scores(self):
+        return [60.0, 72.0, 65.0, 80.0, 78.0, 85.0, 83.0]
+
+    def test_matches_polyfit(self, scores):
+        """기울기/R²가 polyfit 결과와 일치"""
+        acc = TrendAccumulator.from_scores(scores)
+
+        x = np.arange(len(scores))
+        coeffs = np.polyfit(x, scores, 1)
+        y_pred = np.polyval(coeffs, x)
+        ss_res = np.sum((np.array(scores) - y_pred) ** 2)
+        ss_tot = np.sum((np.array(scores) - np.mean(scores)) ** 2)
+
+        assert acc.slope == pytest.approx(coeffs[0])
+        assert acc.r_squared == pytest.approx(1 - ss_res / ss_tot)
+
+    def test_mean_and_volatility(self, scores):
+        """평균/표준편차가 pandas와 일치"""
+        acc = TrendAccumulator.from_scores(scores)
+        series = pd.Series(scores)
+
+        assert acc.count == len(scores)
+        assert acc.mean == pytest.approx(series.mean())
+        assert acc.volatility == pytest.approx(series.std())
+        assert acc.recent_change == pytest.approx(scores[-1] - scores[-2])
+
+    def test_weighted_average_favors_recent(self):
+        """지수 가중 평균은 최근 성적 쪽으로 치우침"""
+        acc = TrendAccumulator.from_scores([50, 60, 70, 80, 90])
+        assert acc.weighted_average > acc.mean
+
+    def test_incremental_equals_batch(self, scores):
+        """점진 갱신과 일괄 생성 결과 동일"""
+        incremental = TrendAccumulator()
+        for s in scores:
+            incremental.update(s)
+
+        batch = TrendAccumulator.from_scores(scores)
+        np.testing.assert_array_equal(incremental.to_array(), batch.to_array())
+
+    def test_degenerate_cases(self):
+        """데이터 부족/상수 성적"""
+        empty = TrendAccumulator()
+        assert empty.mean == 0.0
+        assert empty.slope == 0.0
+        assert math.isnan(empty.last)
+
+        flat = TrendAccumulator.from_scores([70, 70, 70])
+        assert flat.slope == 0.0
+        assert flat.r_squared == 0.0
+        assert flat.volatility == 0.0
+
+    def test_invalid_decay(self):
+        """잘못된 감쇠율"""
+        with pytest.raises(ValueError):
+            TrendAccumulator(decay=0)
+
+    def test_dict_roundtrip(self, scores):
+        """딕셔너리 직렬화 왕복"""
+        acc = TrendAccumulator.from_scores(scores)
+        restored = TrendAccumulator.from_dict(acc.to_dict())
+        np.testing.assert_array_equal(restored.to_array(), acc.to_array())
+
+        empty = TrendAccumulator.from_dict(TrendAccumulator().to_dict())
+        assert empty.count == 0
+
+
+
+class TestTrendStatsStore:
+    """TrendStatsStore 단위 테스트"""
+
+    @pytest.fixture
+    def scores(self):
+        return [60.0, 72.0, 65.0, 80.0, 78.0]
+
+    def test_update_after_seed(self, scores):
+        """초기화한 (학생, 과목)만 이벤트 반영, 결과는 전체 이력으로 만든 누적기와 같음"""
+        store = TrendStatsStore()
+        assert not store.update("s1", "수학", 70.0)
+        assert store.get("s1", "수학") is None
+
+        store.seed("s1", "수학", scores[:-1])
+        assert store.update("s1", "수학", scores[-1])
+        np.testing.assert_array_equal(
+            store.get("s1", "수학").to_array(), TrendAccumulator.from_scores(scores).to_array()
+        )
+
+        # get은 사본이므로 호출자가 바꿔도 저장소는 그대로
+        store.get("s1", "수학").update(100.0)
+        assert store.get("s1", "수학").count == len(scores)
+
+    def test_current_reseeds_on_mismatch(self, scores):
+        """최근 성적과 맞으면 저장된 누적기, 이벤트가 누락됐으면 최근 성적으로 다시 초기화"""
+        store = TrendStatsStore()
+        store.seed("s1", "수학", [50.0] + scores)
+        assert store.current("s1", "수학", np.array(scores[-3:])).count == len(scores) + 1
+
+        acc = store.current("s1", "수학", np.array(scores + [90.0]))
+        assert acc.count == len(scores) + 1
+        assert acc.last == 90.0
+        assert store.get("s1", "수학").last == 90.0
+
+    def test_sync_merges_workers(self, scores, tmp_path):
+        """두 워커가 같은 파일과 병합해도 서로의 이벤트를 덮어쓰지 않음"""
+        path = tmp_path / "trend_stats.npz"
+        worker_a, worker_b = TrendStatsStore(), TrendStatsStore()
+        worker_a.seed("s1", "수학", scores[:3])
+        worker_a.sync(path)
+        worker_b.sync(path)
+
+        worker_a.update("s1", "수학", scores[3])
+        worker_a.sync(path)
+        worker_b.update("s1", "수학", scores[4])
+        worker_b.seed("s2", "영어", scores)
+        worker_b.sync(path)
+        worker_a.sync(path)
+
+        expected = TrendAccumulator.from_scores(scores).to_array()
+        for worker in (worker_a, worker_b, TrendStatsStore.load(path)):
+            np.testing.assert_array_equal(worker.get("s1", "수학").to_array(), expected)
+            np.testing.assert_array_equal(worker.get("s2", "영어").to_array(), expected)
+
+    def test_sync_if_due(self, scores, tmp_path):
+        """마지막 병합 후 간격이 지나지 않았으면 병합하지 않음"""
+        store = TrendStatsStore()
+        path = tmp_path / "trend_stats.npz"
+        store.seed("s1", "수학", scores)
+        assert not store.sync_if_due(path, 3600.0)
+        assert store.sync_if_due(path, 0.0)
+        assert len(TrendStatsStore.load(path)) == 1